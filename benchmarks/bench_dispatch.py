@@ -0,0 +1,38 @@
+"""
+micro-benchmarks for the search and assignment operations used by the instruction generators
+"""
+import pytest
+
+from nrel.hive.dispatcher.instruction_generator.assignment_ops import (
+    find_assignment,
+    h3_distance_cost,
+)
+from nrel.hive.util.h3_ops import H3Ops
+
+from conftest import synthetic_fleet
+
+
+@pytest.mark.parametrize("size", [50, 200])
+def bench_find_assignment(benchmark, denver, size):
+    sim = synthetic_fleet(denver, size, size)
+    vehicles = sim.get_vehicles()
+    requests = sim.get_requests()
+    benchmark(find_assignment, vehicles, requests, h3_distance_cost)
+
+
+def bench_nearest_entity(benchmark, denver):
+    sim = synthetic_fleet(denver, 200, 0)
+    vehicles = sim.get_vehicles()
+    stations = sim.get_stations()
+
+    def _search_from_each_vehicle():
+        for vehicle in vehicles:
+            H3Ops.nearest_entity(
+                geoid=vehicle.geoid,
+                entities=stations,
+                entity_search=sim.s_search,
+                sim_h3_search_resolution=sim.sim_h3_search_resolution,
+                distance_function=lambda s: H3Ops.great_circle_distance(vehicle.geoid, s.geoid),
+            )
+
+    benchmark(_search_from_each_vehicle)
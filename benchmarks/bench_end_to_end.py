@@ -0,0 +1,19 @@
+"""
+end-to-end runs of the built-in scenarios, from a loaded scenario to the final time step
+"""
+import pytest
+
+from nrel.hive.runner.local_simulation_runner import LocalSimulationRunner
+
+from conftest import load_scenario
+
+
+@pytest.mark.end_to_end
+@pytest.mark.parametrize("scenario_file", ["denver_demo.yaml", "manhattan.yaml"])
+def bench_run_scenario(benchmark, scenario_file):
+    benchmark.pedantic(
+        LocalSimulationRunner.run,
+        setup=lambda: ((load_scenario(scenario_file),), {}),
+        rounds=1,
+        iterations=1,
+    )
@@ -0,0 +1,45 @@
+"""
+micro-benchmarks for the charging models
+"""
+import pytest
+
+from nrel.hive.model.energy.energytype import EnergyType
+from nrel.hive.model.vehicle.mechatronics.powercurve import powercurve_ops
+
+BEV_ID = "leaf_50"
+CHARGER_ID = "DCFC"
+
+
+@pytest.fixture(scope="module")
+def low_soc_bev(denver):
+    mechatronics = denver.e.mechatronics[BEV_ID]
+    vehicle = next(v for v in denver.s.get_vehicles() if v.mechatronics_id == BEV_ID)
+    return vehicle.modify_energy(mechatronics.initial_energy(0.1)), mechatronics
+
+
+def bench_tabular_powercurve_charge(benchmark, denver, low_soc_bev):
+    _, mechatronics = low_soc_bev
+    powercurve = mechatronics.powercurve
+    charger = denver.e.chargers[CHARGER_ID]
+    start_kwh = 0.1 * mechatronics.battery_capacity_kwh
+    benchmark(
+        powercurve.charge,
+        start_kwh,
+        mechatronics.battery_capacity_kwh,
+        charger.rate,
+        denver.e.config.sim.timestep_duration_seconds,
+    )
+
+
+def bench_time_to_full(benchmark, denver, low_soc_bev):
+    vehicle, mechatronics = low_soc_bev
+    charger = denver.e.chargers[CHARGER_ID]
+    benchmark(
+        powercurve_ops.time_to_full,
+        vehicle,
+        mechatronics,
+        charger,
+        0.8,
+        denver.e.config.sim.timestep_duration_seconds,
+        denver.e.config.sim.min_delta_energy_change,
+    )
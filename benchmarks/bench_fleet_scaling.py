@@ -0,0 +1,17 @@
+"""
+a single simulation step over synthetic fleets sampled onto the denver road network
+"""
+import pytest
+
+from conftest import synthetic_fleet
+
+# one request per ten vehicles, all departing at the current sim time
+REQUESTS_PER_VEHICLE = 0.1
+
+
+@pytest.mark.scaling
+@pytest.mark.parametrize("vehicle_count", [1_000, 10_000, 50_000])
+def bench_step_simulation(benchmark, denver, vehicle_count):
+    sim = synthetic_fleet(denver, vehicle_count, int(vehicle_count * REQUESTS_PER_VEHICLE))
+    step_update = denver.u.step_update
+    benchmark.pedantic(step_update.update, args=(sim, denver.e), rounds=1, iterations=1)
@@ -0,0 +1,48 @@
+"""
+micro-benchmarks for the search collection operations with GeoId and integer h3 keys
+"""
+import pytest
+
+from nrel.hive.state.simulation_state import simulation_state_ops
+from nrel.hive.util.h3_ops import H3Ops
+
+from conftest import synthetic_fleet
+
+FLEET_SIZE = 200
+
+
+@pytest.fixture(params=["geoid", "int"])
+def scenario(request, denver, denver_int):
+    return denver_int if request.param == "int" else denver
+
+
+def bench_modify_vehicle(benchmark, scenario):
+    sim = synthetic_fleet(scenario, FLEET_SIZE, 0)
+    vehicles = sim.get_vehicles()
+    # move each vehicle to the position of the next one, which changes its search cell
+    moved = [v.modify_position(n.position) for v, n in zip(vehicles, vehicles[1:] + vehicles[:1])]
+
+    def _modify_each_vehicle():
+        for vehicle in moved:
+            simulation_state_ops.modify_vehicle(sim, vehicle)
+
+    benchmark(_modify_each_vehicle)
+
+
+def bench_nearest_entity(benchmark, scenario):
+    sim = synthetic_fleet(scenario, FLEET_SIZE, 0)
+    vehicles = sim.get_vehicles()
+    stations = sim.get_stations()
+
+    def _search_from_each_vehicle():
+        for vehicle in vehicles:
+            H3Ops.nearest_entity(
+                geoid=vehicle.geoid,
+                entities=stations,
+                entity_search=sim.s_search,
+                sim_h3_search_resolution=sim.sim_h3_search_resolution,
+                sim_h3_int_search=sim.sim_h3_int_search,
+                distance_function=lambda s: H3Ops.great_circle_distance(vehicle.geoid, s.geoid),
+            )
+
+    benchmark(_search_from_each_vehicle)
@@ -0,0 +1,91 @@
+"""
+micro-benchmarks for routing and route traversal on the denver road network
+"""
+import random
+
+import h3
+import pytest
+
+from nrel.hive.model.entity_position import EntityPosition
+from nrel.hive.model.roadnetwork.routetraversal import traverse
+
+from conftest import BENCHMARK_SEED
+
+ROUTE_COUNT = 50
+GEOID_COUNT = 200
+
+
+@pytest.fixture(scope="module")
+def od_pairs(denver):
+    rng = random.Random(BENCHMARK_SEED)
+    links = sorted(denver.s.road_network.link_helper.links.values(), key=lambda l: l.link_id)
+    pairs = []
+    for _ in range(ROUTE_COUNT):
+        src, dst = rng.sample(links, 2)
+        pairs.append((EntityPosition(src.link_id, src.start), EntityPosition(dst.link_id, dst.end)))
+    return pairs
+
+
+@pytest.fixture(scope="module")
+def geoids(denver):
+    rng = random.Random(BENCHMARK_SEED)
+    links = sorted(denver.s.road_network.link_helper.links.values(), key=lambda l: l.link_id)
+    resolution = denver.e.config.sim.sim_h3_resolution
+    result = []
+    for link in rng.choices(links, k=GEOID_COUNT):
+        (lat0, lon0), (lat1, lon1) = h3.h3_to_geo(link.start), h3.h3_to_geo(link.end)
+        t = rng.random()
+        lat = lat0 + t * (lat1 - lat0) + rng.uniform(-1e-4, 1e-4)
+        lon = lon0 + t * (lon1 - lon0) + rng.uniform(-1e-4, 1e-4)
+        result.append(h3.geo_to_h3(lat, lon, resolution))
+    return result
+
+
+def bench_osm_route(benchmark, denver, od_pairs):
+    road_network = denver.s.road_network
+
+    def _route_all():
+        for origin, destination in od_pairs:
+            road_network.route(origin, destination)
+
+    benchmark(_route_all)
+
+
+def bench_traverse(benchmark, denver, od_pairs):
+    road_network = denver.s.road_network
+    routes = [road_network.route(o, d) for o, d in od_pairs]
+    timestep = denver.e.config.sim.timestep_duration_seconds
+
+    def _traverse_all():
+        for route in routes:
+            traverse(route, timestep, road_network)
+
+    benchmark(_traverse_all)
+
+
+def bench_travel_time_matrix(benchmark, denver, od_pairs):
+    road_network = denver.s.road_network
+    origins = [o for o, _ in od_pairs]
+    destinations = [d for _, d in od_pairs]
+
+    benchmark(road_network.travel_time_matrix, origins, destinations)
+
+
+def bench_link_by_geoid(benchmark, denver, geoids):
+    link_helper = denver.s.road_network.link_helper
+
+    def _snap_each():
+        for geoid in geoids:
+            link_helper.link_by_geoid(geoid)
+
+    benchmark(_snap_each)
+
+
+def bench_position_from_geoid(benchmark, denver, geoids):
+    road_network = denver.s.road_network
+
+    def _position_each():
+        for geoid in geoids:
+            road_network.position_from_geoid(geoid)
+
+    benchmark(_position_each)
@@ -0,0 +1,50 @@
+"""
+micro-benchmarks for the pre-step request loading and the state log handler
+"""
+import tempfile
+from pathlib import Path
+
+from nrel.hive.model.sim_time import SimTime
+from nrel.hive.reporting.handler.stateful_handler import StatefulHandler
+from nrel.hive.reporting.report_type import ReportType
+from nrel.hive.state.simulation_state.update.update_requests_from_file import (
+    UpdateRequestsFromFile,
+)
+
+from conftest import synthetic_fleet
+
+# the denver demo requests are spread over one day; load the first six hours in one step
+REQUEST_HORIZON = SimTime.build("1970-01-01T06:00:00")
+
+
+def bench_update_requests_from_file(benchmark, denver):
+    config = denver.e.config
+    sim = denver.s._replace(sim_time=REQUEST_HORIZON)
+
+    def _setup():
+        # the request file stepper is consumed by an update, so each round gets a fresh one
+        update = UpdateRequestsFromFile.build(
+            config.input_config.requests_file, config.input_config.rate_structure_file
+        )
+        return (update, sim, denver.e), {}
+
+    def _update(update, s, e):
+        return update.update(s, e)
+
+    benchmark.pedantic(_update, setup=_setup, rounds=5, iterations=1)
+
+
+def bench_stateful_handler(benchmark, denver):
+    sim = synthetic_fleet(denver, 1_000, 0)
+    rp = denver._replace(s=sim)
+    global_config = denver.e.config.global_config._replace(
+        log_sim_config={
+            ReportType.VEHICLE_STATE,
+            ReportType.DRIVER_STATE,
+            ReportType.STATION_STATE,
+        }
+    )
+    with tempfile.TemporaryDirectory() as output_directory:
+        handler = StatefulHandler(global_config, Path(output_directory))
+        benchmark(handler.handle, [], rp)
+        handler.close(rp)
@@ -0,0 +1,83 @@
+"""
+shared fixtures for the HIVE benchmark suite.
+
+scenarios are loaded with all logging suppressed so the benchmarks measure
+the simulation and not the disk.
+"""
+from __future__ import annotations
+
+import random
+from dataclasses import replace
+import immutables
+import numpy
+import pytest
+
+from nrel.hive.initialization.load import load_config, load_simulation
+from nrel.hive.initialization.sample_requests import default_request_sampler
+from nrel.hive.initialization.sample_vehicles import (
+    build_default_location_sampling_fn,
+    build_default_soc_sampling_fn,
+    sample_vehicles,
+)
+from nrel.hive.runner.runner_payload import RunnerPayload
+from nrel.hive.state.simulation_state import simulation_state_ops
+from nrel.hive.state.simulation_state.simulation_state import SimulationState
+
+BENCHMARK_SEED = 0
+
+
+def load_scenario(scenario_file: str, h3_int_search: bool = False) -> RunnerPayload:
+    """
+    loads a scenario with all outputs turned off and the random state seeded
+
+    :param scenario_file: a built-in scenario name or path to a scenario file
+    :param h3_int_search: key the search collections by integer h3 indices
+    :return: the initial runner payload for the scenario
+    """
+    config = load_config(scenario_file).suppress_logging()
+    config = config._replace(sim=config.sim._replace(h3_int_search=h3_int_search))
+    seed = config.sim.seed if config.sim.seed is not None else BENCHMARK_SEED
+    random.seed(seed)
+    numpy.random.seed(seed)
+    return load_simulation(config)
+
+
+def synthetic_fleet(
+    rp: RunnerPayload, vehicle_count: int, request_count: int
+) -> SimulationState:
+    """
+    replaces the vehicles of a scenario with a sampled fleet of the requested size
+    and fills the request queue with uniformly sampled requests
+
+    :param rp: the scenario payload to scale up
+    :param vehicle_count: the number of vehicles to sample
+    :param request_count: the number of requests to add
+    :return: the scaled simulation state
+    """
+    sim = rp.s
+    without_vehicles = sim._replace(
+        vehicles=immutables.Map(), v_locations=immutables.Map(), v_search=immutables.Map()
+    )
+    with_vehicles = sample_vehicles(
+        count=vehicle_count,
+        sim=without_vehicles,
+        env=rp.e,
+        location_sampling_function=build_default_location_sampling_fn(seed=BENCHMARK_SEED),
+        soc_sampling_function=build_default_soc_sampling_fn(0.2, 1.0, seed=BENCHMARK_SEED),
+    ).unwrap()
+    requests = default_request_sampler(
+        request_count, with_vehicles, rp.e, random_seed=BENCHMARK_SEED
+    )
+    departing_now = tuple(replace(r, departure_time=sim.sim_time) for r in requests)
+    with_requests = simulation_state_ops.add_entities(with_vehicles, departing_now)
+    return with_requests
+
+
+@pytest.fixture(scope="session")
+def denver() -> RunnerPayload:
+    return load_scenario("denver_demo.yaml")
+
+
+@pytest.fixture(scope="session")
+def denver_int() -> RunnerPayload:
+    return load_scenario("denver_demo.yaml", h3_int_search=True)
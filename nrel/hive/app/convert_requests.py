@@ -0,0 +1,53 @@
+from __future__ import annotations
+
+import argparse
+import logging
+from pathlib import Path
+
+from nrel.hive.model.request.request_arrays import RequestArrays
+
+parser = argparse.ArgumentParser(
+    description="convert a hive requests csv into memory-mappable request arrays (.npz)"
+)
+parser.add_argument("requests_file", help="the requests csv file to convert")
+parser.add_argument(
+    "output_file",
+    nargs="?",
+    default=None,
+    help="the .npz file to write; by default, the requests file with a .npz suffix",
+)
+parser.add_argument(
+    "--sim-h3-resolution",
+    type=int,
+    default=15,
+    help="the sim_h3_resolution of the scenarios which will use the converted requests",
+)
+
+log = logging.getLogger(__name__)
+
+
+def run() -> int:
+    """
+    entry point for converting requests files
+
+    :return: 0 for success
+    """
+    logging.basicConfig(level=logging.INFO)
+    args = parser.parse_args()
+
+    requests_file = Path(args.requests_file)
+    output_file = (
+        Path(args.output_file) if args.output_file else requests_file.with_suffix(".npz")
+    )
+    if output_file.suffix != ".npz":
+        raise ValueError(f"request arrays must be written to a .npz file, found {output_file}")
+
+    arrays = RequestArrays.from_csv(requests_file, args.sim_h3_resolution)
+    arrays.save(output_file)
+    log.info(f"wrote {len(arrays.departure_time)} requests to {output_file}")
+
+    return 0
+
+
+if __name__ == "__main__":
+    run()
@@ -0,0 +1,286 @@
+from __future__ import annotations
+
+import argparse
+import csv
+import itertools
+import logging
+import math
+import shutil
+from pathlib import Path
+from typing import Any, Dict, Iterable, Optional, Sequence, Tuple, Union
+
+import h3
+import yaml
+
+from nrel.hive.initialization.sample_infrastructure import (
+    base_station_rows,
+    sample_base_rows,
+    sample_station_rows,
+)
+from nrel.hive.initialization.sample_requests import poisson_request_rows
+from nrel.hive.initialization.sample_vehicles import (
+    build_default_soc_sampling_fn,
+    sample_vehicle_rows,
+)
+from nrel.hive.model.roadnetwork.osm.osm_roadnetwork import OSMRoadNetwork
+from nrel.hive.model.sim_time import SimTime
+from nrel.hive.util.typealiases import ChargerId, MechatronicsId
+
+parser = argparse.ArgumentParser(description="generate a synthetic hive scenario")
+parser.add_argument("road_network_file", help="the osm road network file to generate a scenario for")
+parser.add_argument("output_directory", help="where to write the scenario files")
+parser.add_argument("--name", default="synthetic", help="the scenario name")
+parser.add_argument("--vehicles", type=int, default=20000, help="number of vehicles")
+parser.add_argument("--bases", type=int, default=50, help="number of bases")
+parser.add_argument("--stations", type=int, default=200, help="number of stations")
+parser.add_argument(
+    "--requests-per-day", type=float, default=2000000, help="expected requests per simulated day"
+)
+parser.add_argument("--start-time", default="1970-01-01T00:00:00", help="simulation start time")
+parser.add_argument("--end-time", default="1970-01-02T00:00:00", help="simulation end time")
+parser.add_argument("--timestep-duration-seconds", type=int, default=60)
+parser.add_argument(
+    "--mechatronics-ids",
+    nargs="+",
+    default=["leaf_50"],
+    help="mechatronics ids sampled uniformly for each vehicle",
+)
+parser.add_argument(
+    "--station-chargers",
+    nargs="+",
+    default=["DCFC:10"],
+    help="chargers at every station as charger_id:count pairs",
+)
+parser.add_argument(
+    "--base-stall-count",
+    type=int,
+    default=None,
+    help="stalls per base; by default, enough stalls for the whole fleet",
+)
+parser.add_argument(
+    "--base-charger-id",
+    default="LEVEL_2",
+    help='charger at each base stall, or "none" for bases without charging',
+)
+parser.add_argument(
+    "--demand-h3-resolution",
+    type=int,
+    default=8,
+    help="h3 resolution of the cells which request demand is sampled over",
+)
+parser.add_argument("--seed", type=int, default=0, help="random seed value")
+
+log = logging.getLogger(__name__)
+
+VEHICLES_FIELDNAMES = ("vehicle_id", "lat", "lon", "mechatronics_id", "initial_soc")
+BASES_FIELDNAMES = ("base_id", "lat", "lon", "station_id", "stall_count")
+STATIONS_FIELDNAMES = (
+    "station_id",
+    "lat",
+    "lon",
+    "charger_count",
+    "charger_id",
+    "on_shift_access",
+)
+REQUESTS_FIELDNAMES = (
+    "request_id",
+    "o_lat",
+    "o_lon",
+    "d_lat",
+    "d_lon",
+    "departure_time",
+    "passengers",
+)
+
+
+def _write_csv(file: Path, fieldnames: Sequence[str], rows: Iterable[Dict[str, Any]]) -> int:
+    """
+    streams rows to a csv file
+
+    :param file: the file to write
+    :param fieldnames: the csv header
+    :param rows: the rows to write
+    :return: the number of rows written
+    """
+    file.parent.mkdir(parents=True, exist_ok=True)
+    count = 0
+    with file.open("w", newline="") as f:
+        writer = csv.DictWriter(f, fieldnames=fieldnames)
+        writer.writeheader()
+        for row in rows:
+            writer.writerow(row)
+            count += 1
+    return count
+
+
+def generate_scenario(
+    road_network_file: Union[Path, str],
+    output_directory: Union[Path, str],
+    scenario_name: str = "synthetic",
+    vehicle_count: int = 20000,
+    base_count: int = 50,
+    station_count: int = 200,
+    requests_per_day: float = 2000000,
+    start_time: Union[str, int] = "1970-01-01T00:00:00",
+    end_time: Union[str, int] = "1970-01-02T00:00:00",
+    timestep_duration_seconds: int = 60,
+    mechatronics_ids: Sequence[MechatronicsId] = ("leaf_50",),
+    station_chargers: Sequence[Tuple[ChargerId, int]] = (("DCFC", 10),),
+    base_stall_count: Optional[int] = None,
+    base_charger_id: Optional[ChargerId] = "LEVEL_2",
+    demand_h3_resolution: int = 8,
+    seed: int = 0,
+) -> Path:
+    """
+    writes a synthetic scenario for an osm road network. vehicles start at uniformly
+    sampled bases, stations are placed uniformly across the network and requests follow
+    a diurnal Poisson process per H3 cell. all entity files are streamed to disk.
+
+    :param road_network_file: the osm road network file
+    :param output_directory: where to write the scenario
+    :param scenario_name: the name of the scenario
+    :param vehicle_count: the number of vehicles
+    :param base_count: the number of bases
+    :param station_count: the number of stations, excluding any base stations
+    :param requests_per_day: the expected number of requests per simulated day
+    :param start_time: the simulation start time
+    :param end_time: the simulation end time
+    :param timestep_duration_seconds: the simulation time step duration
+    :param mechatronics_ids: the mechatronics ids to sample vehicles from
+    :param station_chargers: the (charger id, charger count) pairs at every station
+    :param base_stall_count: the stalls at each base; by default, enough for the whole fleet
+    :param base_charger_id: the charger at each base stall, or None for no base charging
+    :param demand_h3_resolution: the h3 resolution of the demand cells
+    :param seed: random seed value
+    :return: the path to the generated scenario file
+    """
+    output_path = Path(output_directory)
+    start = SimTime.build(start_time)
+    end = SimTime.build(end_time)
+
+    log.info(f"loading road network {road_network_file}")
+    road_network = OSMRoadNetwork.from_file(road_network_file)
+    if road_network.link_helper is None:
+        raise Exception("Expected link helper on OSMRoadNetwork but found None")
+    # sorted, since link iteration order is not stable across runs
+    links = sorted(road_network.link_helper.links.values(), key=lambda l: l.link_id)
+    network_file = output_path / "road_network" / Path(road_network_file).name
+    network_file.parent.mkdir(parents=True, exist_ok=True)
+    shutil.copy(road_network_file, network_file)
+    road_network.save_link_index(network_file)
+
+    stalls = (
+        base_stall_count
+        if base_stall_count is not None
+        else math.ceil(vehicle_count / max(base_count, 1))
+    )
+    base_rows = list(sample_base_rows(base_count, links, stalls, base_charger_id, seed))
+    bases_file = output_path / "bases" / f"{scenario_name}_bases.csv"
+    _write_csv(bases_file, BASES_FIELDNAMES, base_rows)
+    log.info(f"wrote {len(base_rows)} bases to {bases_file}")
+
+    stations_file = output_path / "stations" / f"{scenario_name}_stations.csv"
+    station_rows = sample_station_rows(station_count, links, station_chargers, random_seed=seed)
+    if base_charger_id is not None:
+        station_rows = itertools.chain(station_rows, base_station_rows(base_rows, base_charger_id))
+    n_station_rows = _write_csv(stations_file, STATIONS_FIELDNAMES, station_rows)
+    log.info(f"wrote {n_station_rows} station chargers to {stations_file}")
+
+    # vehicles start at their bases, or anywhere on the network if there are no bases
+    if base_rows:
+        vehicle_locations = [(row["lat"], row["lon"]) for row in base_rows]
+    else:
+        vehicle_locations = [
+            (round(lat, 6), round(lon, 6)) for lat, lon in (h3.h3_to_geo(l.start) for l in links)
+        ]
+    vehicles_file = output_path / "vehicles" / f"{scenario_name}_vehicles.csv"
+    vehicle_rows = sample_vehicle_rows(
+        vehicle_count,
+        vehicle_locations,
+        mechatronics_ids,
+        build_default_soc_sampling_fn(0.5, 1.0, seed=seed),
+        random_seed=seed,
+    )
+    n_vehicles = _write_csv(vehicles_file, VEHICLES_FIELDNAMES, vehicle_rows)
+    log.info(f"wrote {n_vehicles} vehicles to {vehicles_file}")
+
+    requests_file = output_path / "requests" / f"{scenario_name}_requests.csv"
+    request_rows = poisson_request_rows(
+        links,
+        requests_per_day,
+        start,
+        end,
+        timestep_duration_seconds,
+        demand_h3_resolution=demand_h3_resolution,
+        random_seed=seed,
+    )
+    n_requests = _write_csv(requests_file, REQUESTS_FIELDNAMES, request_rows)
+    log.info(f"wrote {n_requests} requests to {requests_file}")
+
+    scenario = {
+        "sim": {
+            "sim_name": scenario_name,
+            "start_time": start.as_iso_time(),
+            "end_time": end.as_iso_time(),
+            "timestep_duration_seconds": timestep_duration_seconds,
+            "seed": seed,
+        },
+        "network": {"network_type": "osm_network"},
+        "dispatcher": {},
+        "input": {
+            "vehicles_file": vehicles_file.name,
+            "requests_file": requests_file.name,
+            "bases_file": bases_file.name,
+            "stations_file": stations_file.name,
+            "road_network_file": network_file.name,
+        },
+    }
+    scenario_file = output_path / f"{scenario_name}.yaml"
+    with scenario_file.open("w") as f:
+        yaml.safe_dump(scenario, f, sort_keys=False)
+    log.info(f"wrote scenario {scenario_file}")
+
+    return scenario_file
+
+
+def _parse_charger(arg: str) -> Tuple[ChargerId, int]:
+    charger_id, _, count = arg.rpartition(":")
+    if not charger_id:
+        raise argparse.ArgumentTypeError(f"expected charger_id:count but found {arg}")
+    return charger_id, int(count)
+
+
+def run() -> int:
+    """
+    entry point for the hive scenario generator
+
+    :return: 0 for success
+    """
+    logging.basicConfig(level=logging.INFO)
+    args = parser.parse_args()
+
+    base_charger_id = None if args.base_charger_id.lower() == "none" else args.base_charger_id
+    generate_scenario(
+        road_network_file=args.road_network_file,
+        output_directory=args.output_directory,
+        scenario_name=args.name,
+        vehicle_count=args.vehicles,
+        base_count=args.bases,
+        station_count=args.stations,
+        requests_per_day=args.requests_per_day,
+        start_time=args.start_time,
+        end_time=args.end_time,
+        timestep_duration_seconds=args.timestep_duration_seconds,
+        mechatronics_ids=args.mechatronics_ids,
+        station_chargers=[_parse_charger(c) for c in args.station_chargers],
+        base_stall_count=args.base_stall_count,
+        base_charger_id=base_charger_id,
+        demand_h3_resolution=args.demand_h3_resolution,
+        seed=args.seed,
+    )
+
+    return 0
+
+
+if __name__ == "__main__":
+    run()
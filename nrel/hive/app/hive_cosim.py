@@ -87,5 +87,6 @@ def close(runner_payload: RunnerPayload):
     :param runner_payload: the final HIVE state to commit to logging
     """
     runner_payload.e.reporter.close(runner_payload)
+    runner_payload.s.road_network.close()
     if runner_payload.e.config.global_config.write_outputs:
         runner_payload.e.config.to_yaml()
@@ -75,6 +75,7 @@ def run_sim(
     log.info(f"done! time elapsed: {round(end - start, 2)} seconds")
 
     sim_result.e.reporter.close(sim_result)
+    sim_result.s.road_network.close()
 
     if initial_payload.e.config.global_config.write_outputs:
         initial_payload.e.config.to_yaml()
@@ -3,12 +3,17 @@ from __future__ import annotations
 from typing import NamedTuple, Dict, Tuple, Optional
 
 from nrel.hive.config.config_builder import ConfigBuilder
+from nrel.hive.dispatcher.instruction_generator.charging_assignment_type import (
+    ChargingAssignmentType,
+)
 from nrel.hive.dispatcher.instruction_generator.charging_search_type import ChargingSearchType
+from nrel.hive.dispatcher.instruction_generator.matching_cost_type import MatchingCostType
 from nrel.hive.util.units import Ratio, Seconds, Kilometers
 
 
 class DispatcherConfig(NamedTuple):
     default_update_interval_seconds: Seconds
+    matching_window_seconds: Seconds
     matching_range_km_threshold: Kilometers
     charging_range_km_threshold: Kilometers
     charging_range_km_soft_threshold: Kilometers
@@ -16,10 +21,13 @@ class DispatcherConfig(NamedTuple):
     ideal_fastcharge_soc_limit: Ratio
     max_search_radius_km: Kilometers
     charging_search_type: ChargingSearchType
+    charging_assignment_type: ChargingAssignmentType
+    matching_cost_type: MatchingCostType
 
     human_driver_off_shift_charge_target: Ratio
 
     idle_time_out_seconds: Seconds
+    human_driver_reposition_top_k: int
 
     valid_dispatch_states: Tuple[str, ...]
 
@@ -45,6 +53,10 @@ class DispatcherConfig(NamedTuple):
         try:
             d["valid_dispatch_states"] = tuple(s.lower() for s in d["valid_dispatch_states"])
             d["charging_search_type"] = ChargingSearchType.from_string(d["charging_search_type"])
+            d["charging_assignment_type"] = ChargingAssignmentType.from_string(
+                d["charging_assignment_type"]
+            )
+            d["matching_cost_type"] = MatchingCostType.from_string(d["matching_cost_type"])
         except ValueError:
             raise IOError("valid_dispatch_states and active_states must be in a list format")
 
@@ -23,6 +23,7 @@ class GlobalConfig(NamedTuple):
     log_station_capacities: bool
     log_time_step_stats: bool
     log_fleet_time_step_stats: bool
+    log_profile: bool
     lazy_file_reading: bool
     wkt_x_y_ordering: bool
     verbose: bool
@@ -47,6 +48,7 @@ class GlobalConfig(NamedTuple):
             "log_sim_config",
             "log_time_step_stats",
             "log_fleet_time_step_stats",
+            "log_profile",
             "lazy_file_reading",
             "wkt_x_y_ordering",
             "verbose",
@@ -96,4 +98,5 @@ class GlobalConfig(NamedTuple):
             or self.log_instructions
             or self.log_time_step_stats
             or self.log_fleet_time_step_stats
+            or self.log_profile
         )
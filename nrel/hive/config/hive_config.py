@@ -159,6 +159,7 @@ class HiveConfig(NamedTuple):
             log_instructions=False,
             log_time_step_stats=False,
             log_fleet_time_step_stats=False,
+            log_profile=False,
         )
         return self._replace(global_config=updated_gconfig)
 
@@ -8,6 +8,7 @@ from nrel.hive.config.config_builder import ConfigBuilder
 class Network(NamedTuple):
     network_type: str
     default_speed_kmph: float
+    routing_processes: int = 0
 
     @classmethod
     def default_config(cls) -> Dict:
@@ -18,6 +18,8 @@ class Sim(NamedTuple):
     sim_h3_search_resolution: int
     request_cancel_time_seconds: int
     schedule_type: ScheduleType
+    event_driven: bool = False
+    h3_int_search: bool = False
     min_delta_energy_change: Ratio = 0.0001
     seed: Optional[int] = 0
 
@@ -65,6 +67,8 @@ class Sim(NamedTuple):
             sim_h3_search_resolution=sim_h3_search_resolution,
             request_cancel_time_seconds=int(d["request_cancel_time_seconds"]),
             schedule_type=schedule_type,
+            event_driven=bool(d.get("event_driven", False)),
+            h3_int_search=bool(d.get("h3_int_search", False)),
         )
 
     def asdict(self) -> Dict:
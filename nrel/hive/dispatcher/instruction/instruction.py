@@ -10,6 +10,7 @@ from nrel.hive.dispatcher.instruction.instruction_result import InstructionResul
 from nrel.hive.util.typealiases import VehicleId
 
 if TYPE_CHECKING:
+    from nrel.hive.model.entity_position import EntityPosition
     from nrel.hive.state.simulation_state.simulation_state import SimulationState
     from nrel.hive.runner.environment import Environment
 
@@ -37,6 +38,18 @@ class InstructionABC(ABC):
         """
         pass
 
+    def route_request(
+        self, sim_state: SimulationState
+    ) -> Optional[Tuple[EntityPosition, EntityPosition]]:
+        """
+        the route this instruction will request from the road network when applied, so
+        that the routes of a batch of instructions can be computed together
+
+        :param sim_state: the state of the simulation
+        :return: the (origin, destination) of the route, or None if it does not route
+        """
+        return None
+
 
 class Instruction(InstructionMixin, InstructionABC):
     """"""
@@ -67,6 +67,15 @@ class DispatchTripInstruction(Instruction):
     vehicle_id: VehicleId
     request_id: RequestId
 
+    def route_request(
+        self, sim_state: SimulationState
+    ) -> Optional[Tuple[EntityPosition, EntityPosition]]:
+        vehicle = sim_state.vehicles.get(self.vehicle_id)
+        request = sim_state.requests.get(self.request_id)
+        if not vehicle or not request:
+            return None
+        return vehicle.position, request.position
+
     def apply_instruction(
         self, sim_state: SimulationState, env: Environment
     ) -> Tuple[Optional[Exception], Optional[InstructionResult]]:
@@ -169,6 +178,15 @@ class DispatchStationInstruction(Instruction):
     station_id: StationId
     charger_id: ChargerId
 
+    def route_request(
+        self, sim_state: SimulationState
+    ) -> Optional[Tuple[EntityPosition, EntityPosition]]:
+        vehicle = sim_state.vehicles.get(self.vehicle_id)
+        station = sim_state.stations.get(self.station_id)
+        if not vehicle or not station:
+            return None
+        return vehicle.position, station.position
+
     def apply_instruction(
         self, sim_state: SimulationState, env: Environment
     ) -> Tuple[Optional[Exception], Optional[InstructionResult]]:
@@ -254,6 +272,15 @@ class DispatchBaseInstruction(Instruction):
     vehicle_id: VehicleId
     base_id: BaseId
 
+    def route_request(
+        self, sim_state: SimulationState
+    ) -> Optional[Tuple[EntityPosition, EntityPosition]]:
+        vehicle = sim_state.vehicles.get(self.vehicle_id)
+        base = sim_state.bases.get(self.base_id)
+        if not vehicle or not base:
+            return None
+        return vehicle.position, base.position
+
     def apply_instruction(
         self, sim_state: SimulationState, env: Environment
     ) -> Tuple[Optional[Exception], Optional[InstructionResult]]:
@@ -289,6 +316,15 @@ class RepositionInstruction(Instruction):
     vehicle_id: VehicleId
     destination: LinkId
 
+    def route_request(
+        self, sim_state: SimulationState
+    ) -> Optional[Tuple[EntityPosition, EntityPosition]]:
+        vehicle = sim_state.vehicles.get(self.vehicle_id)
+        link = sim_state.road_network.link_from_link_id(self.destination)
+        if not vehicle or not link:
+            return None
+        return vehicle.position, EntityPosition(link.link_id, link.end)
+
     def apply_instruction(
         self, sim_state: SimulationState, env: Environment
     ) -> Tuple[Optional[Exception], Optional[InstructionResult]]:
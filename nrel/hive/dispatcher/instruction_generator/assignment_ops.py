@@ -2,30 +2,29 @@ from __future__ import annotations
 
 import functools as ft
 import logging
-from typing import Dict, Tuple, Callable, NamedTuple, Optional, TYPE_CHECKING
+from typing import Tuple, Callable, NamedTuple, Optional, Union, TYPE_CHECKING
 import sys
 import h3
 import numpy as np
 from scipy.optimize import linear_sum_assignment
 
-from nrel.hive.model.roadnetwork.route import (
-    route_distance_km,
-    route_travel_time_seconds,
+from nrel.hive.dispatcher.instruction_generator.charge_time_estimates import (
+    ChargeTimeEstimates,
 )
+from nrel.hive.dispatcher.instruction_generator.charging_search_type import ChargingSearchType
 from nrel.hive.model.station.station import Station
-from nrel.hive.model.vehicle.mechatronics.powercurve import powercurve_ops
 from nrel.hive.model.vehicle.vehicle import Vehicle
 from nrel.hive.runner import Environment
 from nrel.hive.state.simulation_state.simulation_state import SimulationState
-from nrel.hive.state.vehicle_state.charge_queueing import ChargeQueueing
-from nrel.hive.state.vehicle_state.charging_station import ChargingStation
 from nrel.hive.util.h3_ops import H3Ops
 from nrel.hive.util.tuple_ops import TupleOps
 
 if TYPE_CHECKING:
-    from nrel.hive.util.units import Ratio, Seconds
+    from nrel.hive.model.roadnetwork.roadnetwork import RoadNetwork
+    from nrel.hive.util.units import Kilometers, Ratio, Seconds
     from nrel.hive.util.typealiases import *
-    from nrel.hive.model.entity import EntityABC
+    from nrel.hive.model.entity import Entity, EntityABC
+    from nrel.hive.model.entity_position import EntityPosition
 
 
 log = logging.getLogger(__name__)
@@ -33,6 +32,9 @@ log = logging.getLogger(__name__)
 MAX_DIST = 999999999.0
 MAX_TIME = 999999999.0
 
+# the most rounds of plugs at a station charger that a charging assignment fills
+MAX_QUEUE_ROUNDS = 4
+
 
 class AssignmentSolution(NamedTuple):
     """
@@ -71,12 +73,34 @@ def find_assignment(
         table = np.full((len(assignees), len(targets)), initial_cost)
 
         # evaluate the cost of all possible assignments between each assignee/target pair
-        upper_bound = float("-inf")
         for i in range(len(assignees)):
             for j in range(len(targets)):
-                cost = cost_fn(assignees[i], targets[j])
-                upper_bound = cost if cost > upper_bound and cost != float("inf") else upper_bound
-                table[i][j] = cost
+                table[i][j] = cost_fn(assignees[i], targets[j])
+
+        return find_assignment_from_table(assignees, targets, table)
+
+
+def find_assignment_from_table(
+    assignees: Tuple[EntityABC, ...],
+    targets: Tuple[Union[EntityABC, ChargerSlot], ...],
+    table: np.ndarray,
+) -> AssignmentSolution:
+    """
+    solves an assignment problem with a cost table that has already been computed
+
+    :param assignees: entities we are assigning to. assumed to have an id field.
+    :param targets: the different entities that each assignee can be assigned to. assumed to have an id field.
+    :param table: the cost of each assignee (rows) and target (columns) pair,
+                  where float("inf") marks pairs that should not be assigned
+    :return: a collection of pairs of (AssigneeId, TargetId) indicating the solution, along with it's cost
+    """
+
+    if len(assignees) == 0 or len(targets) == 0:
+        return AssignmentSolution()
+    else:
+        table = np.array(table, dtype=np.float64)
+        finite = table[table != float("inf")]
+        upper_bound = finite.max() if len(finite) > 0 else 0.0
 
         # linear_sum_assignment borks with infinite values; this 2nd step replaces
         # float("inf") values with an upper-bound value which is 1 beyond our highest-observed value
@@ -97,6 +121,239 @@ def find_assignment(
         return solution
 
 
+class AssignmentCostTable(NamedTuple):
+    """
+    the cost table of a previous assignment, kept so that the next assignment only has to
+    compute the costs for the assignees and targets which entered, or which moved, since.
+    entities are identified by their id and position, so cost functions must only depend
+    on those, as both h3_distance_cost and travel_time_cost_matrix do.
+
+    scipy's linear_sum_assignment has no warm start, so the assignment itself is solved
+    again from the updated table.
+    """
+
+    row_keys: Tuple[Tuple[EntityId, EntityPosition], ...] = ()
+    col_keys: Tuple[Tuple[EntityId, EntityPosition], ...] = ()
+    table: np.ndarray = np.zeros((0, 0))
+
+    def update(
+        self,
+        assignees: Tuple[Entity, ...],
+        targets: Tuple[Entity, ...],
+        cost_fn: Callable[[Entity, Entity], float],
+    ) -> AssignmentCostTable:
+        """
+        builds the cost table for a new set of assignees and targets, reusing the costs
+        of the pairs which were in this table
+
+        :param assignees: entities we are assigning to. assumed to have an id and position field.
+        :param targets: the different entities that each assignee can be assigned to.
+        :param cost_fn: computes the cost of choosing a specific assignee with a specific target
+        :return: the updated cost table
+        """
+        updated, kept_rows, kept_cols = self._reuse(assignees, targets)
+
+        # evaluate the cost of the pairs with a new assignee or a new target
+        new_cols = np.flatnonzero(~kept_cols)
+        for i in range(len(assignees)):
+            cols = new_cols if kept_rows[i] else range(len(targets))
+            for j in cols:
+                updated.table[i][j] = cost_fn(assignees[i], targets[j])
+
+        return updated
+
+    def update_by_matrix(
+        self,
+        assignees: Tuple[Entity, ...],
+        targets: Tuple[Entity, ...],
+        cost_matrix_fn: Callable[[Tuple[Entity, ...], Tuple[Entity, ...]], np.ndarray],
+    ) -> AssignmentCostTable:
+        """
+        builds the cost table for a new set of assignees and targets, as with update, but
+        computes the new costs in two blocks, such as with RoadNetwork.travel_time_matrix
+
+        :param assignees: entities we are assigning to. assumed to have an id and position field.
+        :param targets: the different entities that each assignee can be assigned to.
+        :param cost_matrix_fn: computes the cost of choosing each of some assignees (rows) with
+                               each of some targets (columns)
+        :return: the updated cost table
+        """
+        updated, kept_rows, kept_cols = self._reuse(assignees, targets)
+
+        # evaluate the new targets for the kept assignees, then every target for the new assignees
+        kept_row_idx, new_row_idx = np.flatnonzero(kept_rows), np.flatnonzero(~kept_rows)
+        new_col_idx = np.flatnonzero(~kept_cols)
+        if len(kept_row_idx) > 0 and len(new_col_idx) > 0:
+            updated.table[np.ix_(kept_row_idx, new_col_idx)] = cost_matrix_fn(
+                tuple(assignees[i] for i in kept_row_idx),
+                tuple(targets[j] for j in new_col_idx),
+            )
+        if len(new_row_idx) > 0 and len(targets) > 0:
+            updated.table[new_row_idx, :] = cost_matrix_fn(
+                tuple(assignees[i] for i in new_row_idx), targets
+            )
+
+        return updated
+
+    def _reuse(
+        self, assignees: Tuple[Entity, ...], targets: Tuple[Entity, ...]
+    ) -> Tuple[AssignmentCostTable, np.ndarray, np.ndarray]:
+        """
+        the cost table for a new set of assignees and targets with the costs of the pairs
+        which were in this table, and inf for the rest
+
+        :return: the table, along with which rows and which columns were kept
+        """
+        row_keys = tuple((a.id, a.position) for a in assignees)
+        col_keys = tuple((t.id, t.position) for t in targets)
+
+        row_lookup = {key: i for i, key in enumerate(self.row_keys)}
+        col_lookup = {key: j for j, key in enumerate(self.col_keys)}
+        prev_rows = np.array([row_lookup.get(key, -1) for key in row_keys], dtype=np.int64)
+        prev_cols = np.array([col_lookup.get(key, -1) for key in col_keys], dtype=np.int64)
+        kept_rows, kept_cols = prev_rows >= 0, prev_cols >= 0
+
+        table = np.full((len(assignees), len(targets)), float("inf"))
+        table[np.ix_(kept_rows, kept_cols)] = self.table[
+            np.ix_(prev_rows[kept_rows], prev_cols[kept_cols])
+        ]
+
+        updated = AssignmentCostTable(row_keys=row_keys, col_keys=col_keys, table=table)
+        return updated, kept_rows, kept_cols
+
+
+class ChargerSlot(NamedTuple):
+    """
+    a place for one more vehicle at a station charger, used as an assignment target when
+    assigning many vehicles to station chargers at once. slot k is for the k-th vehicle
+    assigned to the same station charger.
+    """
+
+    id: str
+    station_id: StationId
+    charger_id: ChargerId
+    slot: int
+
+
+def charging_assignment_table(
+    vehicles: Tuple[Vehicle, ...],
+    sim: SimulationState,
+    env: Environment,
+    max_search_radius_km: Kilometers,
+    target_soc: Ratio,
+    charging_search_type: ChargingSearchType,
+    charge_time_estimates: Optional[ChargeTimeEstimates] = None,
+) -> Tuple[Tuple[ChargerSlot, ...], np.ndarray]:
+    """
+    builds the cost of assigning each vehicle to each station charger, with one column
+    per slot so that a charger can be assigned more than one vehicle. each slot costs more
+    than the one before it, so that vehicles assigned together spread over the chargers
+    instead of all choosing the same one. a station charger has as many slots as vehicles
+    can use it, up to MAX_QUEUE_ROUNDS rounds of its plugs.
+
+    with ChargingSearchType.NEAREST_SHORTEST_QUEUE, slot k costs as much as the
+    nearest_shortest_queue_ranking would if k more vehicles were enqueued. with
+    ChargingSearchType.SHORTEST_TIME_TO_CHARGE, slot k adds the vehicle's own charge time
+    for each full round of plugs ahead of it to the shortest_time_to_charge_ranking.
+
+    :param vehicles: the vehicles to assign
+    :param sim: the simulation state
+    :param env: the simulation environment
+    :param max_search_radius_km: ignore stations further away than this
+    :param target_soc: when ranking alternatives, use this target SoC value
+    :param charging_search_type: the ranking to use as the assignment cost
+    :param charge_time_estimates: this time step's charge time estimates, if already built
+    :return: the charger slots, and an array of shape (vehicles, slots) of costs which is
+             inf where a vehicle can't use the slot
+    """
+    stations = sim.get_stations()
+    compatibility = env.get_charger_compatibility()
+
+    if charging_search_type == ChargingSearchType.NEAREST_SHORTEST_QUEUE:
+        station_chargers = [
+            sorted(c for c in s.on_shift_access_chargers if s.get_total_chargers(c))
+            for s in stations
+        ]
+    else:
+        station_chargers = [
+            sorted(c for c in s.state.keys() if s.get_total_chargers(c)) for s in stations
+        ]
+        estimates = (
+            charge_time_estimates
+            if charge_time_estimates is not None
+            else ChargeTimeEstimates(sim, env, target_soc)
+        )
+    groups = [(i, c) for i, chargers in enumerate(station_chargers) for c in chargers]
+    total_chargers = np.array(
+        [stations[i].get_total_chargers(c) or 0 for i, c in groups], dtype=np.int64
+    ).reshape(len(groups))
+
+    station_coordinates = H3Ops.coordinates(s.geoid for s in stations)
+    base_cost = np.full((len(vehicles), len(groups)), np.inf)
+    slot_cost = np.zeros((len(vehicles), len(groups)))
+    for row, vehicle in enumerate(vehicles):
+        mechatronics = env.mechatronics.get(vehicle.mechatronics_id)
+        if mechatronics is None:
+            log.error(f"mechatronics {vehicle.mechatronics_id} not found for vehicle {vehicle.id}")
+            continue
+
+        distances = H3Ops.great_circle_distances(vehicle.geoid, station_coordinates)
+        in_range = [
+            s.membership.grant_access_to_membership(vehicle.membership)
+            and distance <= max_search_radius_km
+            for s, distance in zip(stations, distances.tolist())
+        ]
+        if charging_search_type == ChargingSearchType.SHORTEST_TIME_TO_CHARGE:
+            candidates = tuple(s for s, valid in zip(stations, in_range) if valid)
+            charger_ids, times = estimates.station_charge_times(vehicle, candidates)
+            candidate_times = iter(times)
+            station_times = [
+                dict(zip(charger_ids, next(candidate_times))) if valid else {}
+                for valid in in_range
+            ]
+
+        for col, (i, charger_id) in enumerate(groups):
+            station = stations[i]
+            if not in_range[i] or not compatibility.compatible(
+                vehicle.mechatronics_id, charger_id
+            ):
+                continue
+            if charging_search_type == ChargingSearchType.NEAREST_SHORTEST_QUEUE:
+                distance = h3.h3_distance(vehicle.geoid, station.geoid)
+                plugs = int(total_chargers[col])
+                enqueued = station.enqueued_vehicle_count_for_charger(charger_id) or 0
+                base_cost[row, col] = distance + distance * (enqueued / plugs)
+                slot_cost[row, col] = distance / plugs
+            else:
+                time = station_times[i].get(charger_id, np.inf)
+                if not np.isfinite(time):
+                    continue
+                charger = station.state[charger_id].charger
+                base_cost[row, col] = time
+                slot_cost[row, col] = estimates.charge_time(vehicle, mechatronics, charger)
+
+    # each station charger gets a slot for each vehicle that can use it, up to a bounded
+    # number of rounds of its plugs, and the cost of each slot k is the base cost plus
+    # the slot cost times a step in k
+    reachable = np.isfinite(base_cost).sum(axis=0)
+    group_slots = np.minimum(reachable, total_chargers * MAX_QUEUE_ROUNDS)
+    slot_groups = np.repeat(np.arange(len(groups)), group_slots)
+    first_slots = np.cumsum(group_slots) - group_slots
+    k = np.arange(len(slot_groups)) - np.repeat(first_slots, group_slots)
+    if charging_search_type == ChargingSearchType.NEAREST_SHORTEST_QUEUE:
+        steps = k.astype(np.float64)
+    else:
+        steps = np.floor_divide(k, total_chargers[slot_groups]).astype(np.float64)
+    costs = base_cost[:, slot_groups] + slot_cost[:, slot_groups] * steps[np.newaxis, :]
+
+    slots = []
+    for group, slot in zip(slot_groups.tolist(), k.tolist()):
+        i, charger_id = groups[group]
+        slot_id = f"{stations[i].id}:{charger_id}:{slot}"
+        slots.append(ChargerSlot(slot_id, stations[i].id, charger_id, slot))
+    return tuple(slots), costs
+
+
 def h3_distance_cost(a: EntityABC, b: EntityABC) -> float:
     """
     cost function based on the h3_distance between two entities
@@ -109,6 +366,24 @@ def h3_distance_cost(a: EntityABC, b: EntityABC) -> float:
     return distance
 
 
+def travel_time_cost_matrix(
+    road_network: RoadNetwork,
+) -> Callable[[Tuple[Entity, ...], Tuple[Entity, ...]], np.ndarray]:
+    """
+    cost matrix function based on the road network travel time between entities, for use
+    with AssignmentCostTable.update_by_matrix
+
+    :param road_network: the road network to measure travel times on
+    :return: a function which computes the travel time in seconds from each of some entities
+             to each of some others, with inf where there is no route
+    """
+
+    def _costs(a: Tuple[Entity, ...], b: Tuple[Entity, ...]) -> np.ndarray:
+        return road_network.travel_time_matrix([e.position for e in a], [e.position for e in b])
+
+    return _costs
+
+
 def great_circle_distance_cost(a: EntityABC, b: EntityABC) -> float:
     """
     cost function based on the great circle distance between two entities.
@@ -163,26 +438,17 @@ def nearest_shortest_queue_ranking(
 
     distance = h3.h3_distance(vehicle.geoid, station.geoid)
 
+    if vehicle.mechatronics_id not in env.mechatronics:
+        log.error(f"mechatronics {vehicle.mechatronics_id} not found for vehicle {vehicle.id}")
+        return (None, 0.0)
+
+    compatibility = env.get_charger_compatibility()
+
     def _inner(
         acc: Tuple[Optional[ChargerId], float], charger_id: ChargerId
     ) -> Tuple[Optional[ChargerId], float]:
-        vehicle_mechatronics = env.mechatronics.get(vehicle.mechatronics_id)
-        if vehicle_mechatronics is None:
-            log.error(f"mechatronics {vehicle.mechatronics_id} not found for vehicle {vehicle.id}")
-            return (None, 0.0)
-
-        charger = env.chargers.get(charger_id)
-        if charger is None:
-            log.error(f"charger id {charger_id} not found in environment")
-            return (None, 0.0)
-
         total_chargers = station.get_total_chargers(charger_id)
-        if (
-            not vehicle_mechatronics.valid_charger(charger)
-            or total_chargers is None
-            or total_chargers == 0
-        ):
-            # vehicle can't use this charger so we skip it, or,
+        if total_chargers is None or total_chargers == 0:
             # station doesn't actually have this charger (an error condition really)
             return acc
         else:
@@ -199,12 +465,15 @@ def nearest_shortest_queue_ranking(
             else:
                 return charger_id, this_distance_metric
 
-    # find the lowest nearest_shortest_queue distance metric
-    # amongst the possible on-shift charging options at this station
-    initial: Tuple[Optional[str], float] = (None, max_dist)
-    best_charger_id, best_charger_rank = ft.reduce(
-        _inner, station.on_shift_access_chargers, initial
+    # find the lowest nearest_shortest_queue distance metric amongst the possible
+    # on-shift charging options at this station which the vehicle can use
+    compatible_chargers = (
+        charger_id
+        for charger_id in station.on_shift_access_chargers
+        if compatibility.compatible(vehicle.mechatronics_id, charger_id)
     )
+    initial: Tuple[Optional[str], float] = (None, max_dist)
+    best_charger_id, best_charger_rank = ft.reduce(_inner, compatible_chargers, initial)
 
     return (
         None if best_charger_id is None else best_charger_id,
@@ -213,7 +482,7 @@ def nearest_shortest_queue_ranking(
 
 
 def shortest_time_to_charge_distance(
-    vehicle: Vehicle, sim: SimulationState, env: Environment, target_soc: Ratio
+    vehicle: Vehicle, charge_time_estimates: ChargeTimeEstimates
 ) -> Callable[[Station], float]:
     """
     ranks this station by an estimate of the time which would pass until this agent reaches a target charge level
@@ -222,213 +491,31 @@ def shortest_time_to_charge_distance(
 
 
     :param vehicle: a vehicle
-    :param sim: the simulation state
-    :param env: the simulation environment
-    :param target_soc: the SoC we are attempting to reach in this charge session
+    :param charge_time_estimates: this time step's charge time estimates, built with the
+                                  SoC we are attempting to reach in this charge session
     :return: the distance metric for this vehicle/station pair (lower is better)
     """
 
     def fn(station: Station) -> float:
-        result = shortest_time_to_charge_ranking(sim, env, vehicle, station, target_soc)
-        dist = 999999999.0 if result is None else result[1]
-        return dist
+        ranks, _ = charge_time_estimates.rank_stations(vehicle, (station,), MAX_DIST)
+        return float(ranks[0])
 
     return fn
 
 
 def shortest_time_to_charge_ranking(
-    sim: SimulationState,
-    env: Environment,
     vehicle: Vehicle,
     station: Station,
-    target_soc: Ratio,
+    charge_time_estimates: ChargeTimeEstimates,
 ) -> Optional[Tuple[ChargerId, float]]:
     """
     given a station charging alternative, determine the time it would take to charge
     using the best charger type available
 
-    :param sim: simulation state
-    :param env: the simulation environment
     :param vehicle: the vehicle
     :param station: the station to rank
-    :param target_soc: target vehicle charging SoC percentage
+    :param charge_time_estimates: this time step's charge time estimates, built with the
+                                  target vehicle charging SoC percentage
     :return: a ranking (estimated travel + queue + charge time) for accessing the best-ranked charger
     """
-
-    vehicle_mechatronics = env.mechatronics.get(vehicle.mechatronics_id)
-    remaining_range = (
-        vehicle_mechatronics.range_remaining_km(vehicle) if vehicle_mechatronics else 0.0
-    )
-    route = sim.road_network.route(vehicle.position, station.position)
-    distance_km = route_distance_km(route)
-
-    if not vehicle_mechatronics or remaining_range < distance_km:
-        # vehicle does not have remaining range to reach this station
-        # return a signal that demotes this Station alternative to the bottom of the ranking
-        return None
-    else:
-
-        def _veh_at_station(v: Vehicle) -> bool:
-            return (
-                isinstance(v.vehicle_state, ChargingStation)
-                and v.vehicle_state.station_id == station.id
-            )
-
-        def _veh_enqueued(v: Vehicle) -> bool:
-            return (
-                isinstance(v.vehicle_state, ChargeQueueing)
-                and v.vehicle_state.station_id == station.id
-            )
-
-        def _simulate_charge_session(c: ChargerId):
-            def _sim(v: Vehicle) -> Seconds:
-                _mech = env.mechatronics.get(v.mechatronics_id)
-                _charger = env.chargers.get(c)
-                if not _mech or not _charger:
-                    return 0
-                else:
-                    max_iter = (
-                        int(env.config.sim.end_time - sim.sim_time)
-                        / sim.sim_timestep_duration_seconds
-                    )
-                    time_est = powercurve_ops.time_to_full(
-                        v,
-                        _mech,
-                        _charger,
-                        target_soc,
-                        sim.sim_timestep_duration_seconds,
-                        min_delta_energy_change=env.config.sim.min_delta_energy_change,
-                        max_iterations=int(max_iter),
-                    )
-                    return time_est
-
-            return _sim
-
-        def _sort_enqueue_time(v: Vehicle) -> Tuple[int, str]:
-            if isinstance(v.vehicle_state, ChargeQueueing):
-                enqueue_time = int(v.vehicle_state.enqueue_time)
-            else:
-                log.error(
-                    "calling _sort_enqueue_time on a vehicle state that is not ChargeQueueing"
-                )
-                enqueue_time = 0
-            return (enqueue_time, v.id)
-
-        def _greedy_assignment(
-            vehicles_at_station: Tuple[Vehicle, ...], charger_id: ChargerId
-        ) -> Seconds:
-            """
-            computes the time estimated that a slot opens up for this vehicle to begin charging
-
-            :param _charging: a sorted list of remaining charge time estimates
-            :param _enqueued: a sorted list of charge time estimates for enqueued vehicles
-            :param _charger_id: the id of the charger these vehicles are competing for
-            :param time_passed: the amount of time that has been estimated
-            :param depth: recursion depth
-            :return: the time in the future we should expect to begin charging, determined by a greedy assignment
-            """
-
-            def _using_charger(charging_vehicle: Vehicle) -> bool:
-                if isinstance(charging_vehicle.vehicle_state, ChargingStation):
-                    if charging_vehicle.vehicle_state.charger_id == charger_id:
-                        return True
-                return False
-
-            def _waiting_for_charger(enqueued_vehicle: Vehicle) -> bool:
-                if isinstance(enqueued_vehicle.vehicle_state, ChargeQueueing):
-                    if enqueued_vehicle.vehicle_state.charger_id == charger_id:
-                        return True
-                return False
-
-            # collect all estimated remaining charge times for charging vehicles and sort them
-            charge_times = list(
-                sorted(
-                    map(
-                        _simulate_charge_session(charger_id),
-                        filter(_using_charger, vehicles_at_station),
-                    )
-                )
-            )
-
-            # collect estimated remaining charge times for vehicles enqueued for this charger
-            # leave them sorted by enqueue time
-            enqueue_times = list(
-                map(
-                    _simulate_charge_session(charger_id),
-                    filter(_waiting_for_charger, vehicles_enqueued),
-                )
-            )
-
-            def _simulating():
-                return len(charge_times) > 0 and len(enqueue_times) > 0
-
-            total_chargers = station.get_total_chargers(charger_id)
-            if total_chargers is None:
-                log.warn(f"charger id {charger_id} not found at station {station.id}")
-                return 0
-            else:
-                time_passed = 0
-                while _simulating():
-                    # advance time
-                    next_delta = charge_times.pop(0)
-                    time_passed += next_delta
-
-                    # remove charging agents who are done, shift times by delta
-                    charging_times = list(
-                        filter(lambda t: t > 0, map(lambda t: t - next_delta, charge_times))
-                    )
-                    vacancies = (total_chargers - len(charging_times)) > 0
-
-                    if vacancies:
-                        # move enqueued vehicles into the station
-                        charging_times.extend(enqueue_times[0:vacancies])
-                        enqueue_times = enqueue_times[vacancies:]
-            return time_passed
-
-        # collect all vehicles that are either charging or enqueued at this station
-        vehicles_at_station = sim.get_vehicles(filter_function=_veh_at_station)
-        vehicles_enqueued = sim.get_vehicles(
-            filter_function=_veh_enqueued,
-            sort_key=_sort_enqueue_time,
-        )
-
-        estimates: Dict[ChargerId, int] = {}
-        for charger_id in sorted(station.state.keys()):
-            charger_state = station.state.get(charger_id)
-            charger = charger_state.charger if charger_state is not None else None
-
-            if charger is None or not vehicle_mechatronics.valid_charger(charger):
-                # vehicle can't use this charger so we skip it
-                continue
-
-            # compute the charge time for the vehicle we are ranking
-            max_iter = (
-                int(env.config.sim.end_time - sim.sim_time) / sim.sim_timestep_duration_seconds
-            )
-            this_vehicle_charge_time = powercurve_ops.time_to_full(
-                vehicle,
-                vehicle_mechatronics,
-                charger,
-                target_soc,
-                sim.sim_timestep_duration_seconds,
-                min_delta_energy_change=env.config.sim.min_delta_energy_change,
-                max_iterations=int(max_iter),
-            )
-
-            # compute the estimated wait time to access a charger for the vehicle we are ranking
-            wait_estimate_for_charger = _greedy_assignment(vehicles_at_station, charger_id)
-
-            # combine wait time with charge time
-            overall_time_est = this_vehicle_charge_time + wait_estimate_for_charger
-            estimates.update({charger_id: overall_time_est})
-
-        if not estimates:
-            # there are no chargers the vehicle can use.
-            return None
-
-        best_charger_id = min(estimates, key=estimates.__getitem__)
-
-        # return the best "distance" aka shortest estimated time to finish charging
-        best_overall_time = estimates[best_charger_id]
-        dispatch_time_seconds = route_travel_time_seconds(route)
-        return best_charger_id, dispatch_time_seconds + best_overall_time
+    return charge_time_estimates.rank_station(vehicle, station)
@@ -0,0 +1,307 @@
+from __future__ import annotations
+
+import logging
+from typing import TYPE_CHECKING, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from nrel.hive.model.roadnetwork.route import route_distance_km, route_travel_time_seconds
+from nrel.hive.model.vehicle.mechatronics.powercurve import powercurve_ops
+from nrel.hive.state.vehicle_state.charge_queueing import ChargeQueueing
+from nrel.hive.state.vehicle_state.charging_station import ChargingStation
+
+if TYPE_CHECKING:
+    from nrel.hive.model.energy.charger import Charger
+    from nrel.hive.model.station.station import Station
+    from nrel.hive.model.vehicle.mechatronics import MechatronicsInterface
+    from nrel.hive.model.vehicle.vehicle import Vehicle
+    from nrel.hive.runner.environment import Environment
+    from nrel.hive.state.simulation_state.simulation_state import SimulationState
+    from nrel.hive.util.typealiases import ChargerId, StationId, VehicleId
+    from nrel.hive.util.units import Ratio, Seconds
+
+log = logging.getLogger(__name__)
+
+# the wait times at a set of stations for each compatible charger type (inf where a station
+# does not have the charger), and which of the unique chargers each entry refers to
+_StationTable = Tuple[np.ndarray, np.ndarray, Tuple["Charger", ...]]
+
+# the vehicles at each station charger, in the order they will charge
+_StationQueues = Dict[Tuple["StationId", "ChargerId"], List["Vehicle"]]
+
+
+class ChargeTimeEstimates:
+    """
+    estimates of the time it would take vehicles to finish charging at stations, for one
+    time step.
+
+    the vehicles charging and queueing at each station are collected in one pass over the
+    simulation, the first time a wait time is estimated. the time until each station charger
+    frees up is estimated once per (station, charger) and reused for every vehicle ranked
+    against it, and a vehicle's own charge time is estimated once per charger it could use.
+    ranking a vehicle against a set of stations is then an array operation over travel time
+    + wait time + charge time.
+    """
+
+    def __init__(self, sim: SimulationState, env: Environment, target_soc: Ratio):
+        """
+        :param sim: the simulation state for this time step
+        :param env: the simulation environment
+        :param target_soc: the SoC which vehicles charge to
+        """
+        self.sim = sim
+        self.env = env
+        self.target_soc = target_soc
+        self._max_iterations = int(
+            int(env.config.sim.end_time - sim.sim_time) / sim.sim_timestep_duration_seconds
+        )
+
+        self._queues: Optional[Tuple[_StationQueues, _StationQueues]] = None
+        self._wait_times: Dict[Tuple[StationId, ChargerId], Seconds] = {}
+        self._charge_times: Dict[Tuple[VehicleId, Charger], Seconds] = {}
+        self._station_tables: Dict[
+            Tuple[Tuple[StationId, ...], Tuple[ChargerId, ...]], _StationTable
+        ] = {}
+
+    def wait_time(self, station: Station, charger_id: ChargerId) -> Seconds:
+        """
+        estimates the time until a charger at a station is free for another vehicle, by a
+        greedy assignment of the vehicles queued for it to the vehicles charging on it
+
+        :param station: the station
+        :param charger_id: the charger type at the station
+        :return: the estimated wait time
+        """
+        key = (station.id, charger_id)
+        wait_time = self._wait_times.get(key)
+        if wait_time is None:
+            wait_time = self._greedy_assignment(station, charger_id)
+            self._wait_times[key] = wait_time
+        return wait_time
+
+    def charge_time(
+        self, vehicle: Vehicle, mechatronics: MechatronicsInterface, charger: Charger
+    ) -> Seconds:
+        """
+        estimates the time it would take a vehicle to charge to the target SoC
+
+        :param vehicle: the vehicle
+        :param mechatronics: the vehicle's mechatronics
+        :param charger: the charger used
+        :return: the estimated charge time
+        """
+        key = (vehicle.id, charger)
+        charge_time = self._charge_times.get(key)
+        if charge_time is None:
+            charge_time = powercurve_ops.time_to_full(
+                vehicle,
+                mechatronics,
+                charger,
+                self.target_soc,
+                self.sim.sim_timestep_duration_seconds,
+                min_delta_energy_change=self.env.config.sim.min_delta_energy_change,
+                max_iterations=self._max_iterations,
+            )
+            self._charge_times[key] = charge_time
+        return charge_time
+
+    def station_charge_times(
+        self, vehicle: Vehicle, stations: Sequence[Station]
+    ) -> Tuple[Tuple[ChargerId, ...], np.ndarray]:
+        """
+        estimates the time until a vehicle would finish charging at each station with each
+        charger it can use, which is the sum of travel time, wait time and charge time
+
+        :param vehicle: the vehicle
+        :param stations: the stations to estimate
+        :return: the chargers the vehicle can use, and an array of shape (stations, chargers)
+                 of estimated times, which is inf where the vehicle can't reach the station
+                 or the station doesn't have the charger
+        """
+        compatibility = self.env.get_charger_compatibility()
+        charger_ids = compatibility.compatible_charger_ids(vehicle.mechatronics_id)
+        times = np.full((len(stations), len(charger_ids)), np.inf)
+
+        mechatronics = self.env.mechatronics.get(vehicle.mechatronics_id)
+        if mechatronics is None:
+            return charger_ids, times
+
+        candidates = [
+            i
+            for i, station in enumerate(stations)
+            if self.env.station_has_compatible_charger(vehicle.mechatronics_id, station)
+        ]
+        if not candidates:
+            return charger_ids, times
+
+        routes = [
+            self.sim.road_network.route(vehicle.position, stations[i].position)
+            for i in candidates
+        ]
+        distance_km = np.array([route_distance_km(route) for route in routes])
+        travel_time = np.array([route_travel_time_seconds(route) for route in routes])
+        reachable = ~(mechatronics.range_remaining_km(vehicle) < distance_km)
+
+        wait_times, charger_index, chargers = self._station_table(
+            tuple(stations[i] for i in candidates), charger_ids
+        )
+        charge_times = np.array(
+            [self.charge_time(vehicle, mechatronics, charger) for charger in chargers],
+            dtype=np.float64,
+        )
+        candidate_times = travel_time[:, np.newaxis] + (charge_times[charger_index] + wait_times)
+        candidate_times[~reachable] = np.inf
+        times[candidates] = candidate_times
+        return charger_ids, times
+
+    def rank_stations(
+        self, vehicle: Vehicle, stations: Sequence[Station], max_dist: float = 999999999.0
+    ) -> Tuple[np.ndarray, Tuple[Optional[ChargerId], ...]]:
+        """
+        ranks stations by the estimated time until a vehicle would finish charging there
+        with the best charger, see station_charge_times
+
+        :param vehicle: the vehicle
+        :param stations: the stations to rank
+        :param max_dist: the rank of stations the vehicle can't reach or charge at
+        :return: the rank of each station, and the best charger at each station
+        """
+        charger_ids, times = self.station_charge_times(vehicle, stations)
+        if len(charger_ids) == 0:
+            return np.full(len(stations), max_dist), (None,) * len(stations)
+
+        best = np.argmin(times, axis=1)
+        best_times = times[np.arange(len(stations)), best]
+        valid = np.isfinite(best_times)
+
+        ranks = np.where(valid, best_times, max_dist)
+        best_chargers = tuple(
+            charger_ids[col] if is_valid else None for col, is_valid in zip(best, valid)
+        )
+        return ranks, best_chargers
+
+    def rank_station(
+        self, vehicle: Vehicle, station: Station
+    ) -> Optional[Tuple[ChargerId, float]]:
+        """
+        ranks a single station, see rank_stations
+
+        :param vehicle: the vehicle
+        :param station: the station to rank
+        :return: the best charger and its rank, or None if the vehicle can't reach or
+                 charge at the station
+        """
+        ranks, best_chargers = self.rank_stations(vehicle, (station,))
+        charger_id = best_chargers[0]
+        if charger_id is None:
+            return None
+        return charger_id, float(ranks[0])
+
+    def _station_table(
+        self, stations: Tuple[Station, ...], charger_ids: Tuple[ChargerId, ...]
+    ) -> _StationTable:
+        """
+        the wait times at a set of stations for each charger type, with the charger at each
+        station, which are shared by every vehicle that can use the same charger types
+        """
+        key = (tuple(s.id for s in stations), charger_ids)
+        table = self._station_tables.get(key)
+        if table is not None:
+            return table
+
+        wait_times = np.full((len(stations), len(charger_ids)), np.inf)
+        charger_index = np.zeros((len(stations), len(charger_ids)), dtype=np.int64)
+        unique_chargers: Dict[Charger, int] = {}
+        for row, station in enumerate(stations):
+            for col, charger_id in enumerate(charger_ids):
+                charger_state = station.state.get(charger_id)
+                if charger_state is None:
+                    # station doesn't have this charger so we skip it
+                    continue
+                wait_times[row, col] = self.wait_time(station, charger_id)
+                charger_index[row, col] = unique_chargers.setdefault(
+                    charger_state.charger, len(unique_chargers)
+                )
+
+        table = (wait_times, charger_index, tuple(unique_chargers.keys()))
+        self._station_tables[key] = table
+        return table
+
+    def _simulate_charge_session(self, vehicle: Vehicle, charger_id: ChargerId) -> Seconds:
+        mechatronics = self.env.mechatronics.get(vehicle.mechatronics_id)
+        charger = self.env.chargers.get(charger_id)
+        if not mechatronics or not charger:
+            return 0
+        else:
+            return powercurve_ops.time_to_full(
+                vehicle,
+                mechatronics,
+                charger,
+                self.target_soc,
+                self.sim.sim_timestep_duration_seconds,
+                min_delta_energy_change=self.env.config.sim.min_delta_energy_change,
+                max_iterations=self._max_iterations,
+            )
+
+    def _station_queues(self) -> Tuple[_StationQueues, _StationQueues]:
+        """
+        the vehicles charging and the vehicles enqueued at each station charger
+        """
+        if self._queues is None:
+            charging: _StationQueues = {}
+            enqueued: _StationQueues = {}
+            for vehicle in self.sim.vehicles.values():
+                state = vehicle.vehicle_state
+                if isinstance(state, ChargingStation):
+                    charging.setdefault((state.station_id, state.charger_id), []).append(vehicle)
+                elif isinstance(state, ChargeQueueing):
+                    enqueued.setdefault((state.station_id, state.charger_id), []).append(vehicle)
+            for queue in enqueued.values():
+                queue.sort(
+                    key=lambda v: (int(v.vehicle_state.enqueue_time), v.id)
+                    if isinstance(v.vehicle_state, ChargeQueueing)
+                    else (0, v.id)
+                )
+            self._queues = (charging, enqueued)
+        return self._queues
+
+    def _greedy_assignment(self, station: Station, charger_id: ChargerId) -> Seconds:
+        key = (station.id, charger_id)
+        charging, enqueued = self._station_queues()
+
+        # collect all estimated remaining charge times for charging vehicles and sort them
+        charge_times = sorted(
+            self._simulate_charge_session(v, charger_id) for v in charging.get(key, ())
+        )
+
+        # collect estimated remaining charge times for vehicles enqueued for this charger
+        # leave them sorted by enqueue time
+        enqueue_times = [
+            self._simulate_charge_session(v, charger_id) for v in enqueued.get(key, ())
+        ]
+
+        def _simulating():
+            return len(charge_times) > 0 and len(enqueue_times) > 0
+
+        total_chargers = station.get_total_chargers(charger_id)
+        if total_chargers is None:
+            log.warning(f"charger id {charger_id} not found at station {station.id}")
+            return 0
+        else:
+            time_passed = 0
+            while _simulating():
+                # advance time
+                next_delta = charge_times.pop(0)
+                time_passed += next_delta
+
+                # remove charging agents who are done, shift times by delta
+                charging_times = list(
+                    filter(lambda t: t > 0, map(lambda t: t - next_delta, charge_times))
+                )
+                vacancies = (total_chargers - len(charging_times)) > 0
+
+                if vacancies:
+                    # move enqueued vehicles into the station
+                    charging_times.extend(enqueue_times[0:vacancies])
+                    enqueue_times = enqueue_times[vacancies:]
+            return time_passed
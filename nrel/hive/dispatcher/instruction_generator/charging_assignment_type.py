@@ -0,0 +1,28 @@
+from __future__ import annotations
+
+from enum import Enum
+
+
+class ChargingAssignmentType(Enum):
+    GREEDY = 1
+    GLOBAL = 2
+
+    @staticmethod
+    def from_string(string: str) -> ChargingAssignmentType:
+        """
+        parses an input configuration string as a ChargingAssignmentType
+
+        :param string: the input string
+        :return: a ChargingAssignmentType or an Error
+        :raises: ValueError when the charging assignment type is unknown
+        """
+        cleaned = string.lower()
+        if cleaned == "greedy":
+            return ChargingAssignmentType.GREEDY
+        elif cleaned == "global":
+            return ChargingAssignmentType.GLOBAL
+        else:
+            valid_names = "{greedy|global}"
+            raise NameError(
+                f"charging assignment type {string} is not known, must be one of {valid_names}"
+            )
@@ -1,8 +1,10 @@
 from __future__ import annotations
 
 import logging
-from dataclasses import dataclass
-from typing import Tuple, TYPE_CHECKING
+from dataclasses import dataclass, replace
+from typing import FrozenSet, Optional, Tuple, TYPE_CHECKING
+
+import immutables
 
 from nrel.hive.reporting import instruction_generator_event_ops
 from nrel.hive.state.vehicle_state.idle import Idle
@@ -14,12 +16,23 @@ if TYPE_CHECKING:
     from nrel.hive.runner.environment import Environment
     from nrel.hive.dispatcher.instruction.instruction import Instruction
     from nrel.hive.config.dispatcher_config import DispatcherConfig
+    from nrel.hive.model.sim_time import SimTime
+    from nrel.hive.util.typealiases import H3Cell, StationId
 
+from nrel.hive.dispatcher.instruction_generator.charging_assignment_type import (
+    ChargingAssignmentType,
+)
+from nrel.hive.dispatcher.instruction_generator.charging_search_type import ChargingSearchType
 from nrel.hive.dispatcher.instruction_generator.instruction_generator import InstructionGenerator
 from nrel.hive.dispatcher.instruction_generator.instruction_generator_ops import (
+    instruct_vehicles_to_charge_by_assignment,
     instruct_vehicles_to_dispatch_to_station,
     get_nearest_valid_station_distance,
 )
+from nrel.hive.dispatcher.instruction_generator.nearest_station_search import (
+    NearestStationSearch,
+    StationRings,
+)
 
 log = logging.getLogger(__name__)
 
@@ -31,6 +44,10 @@ class ChargingFleetManager(InstructionGenerator):
     """
 
     config: DispatcherConfig
+    # the stations around each search cell, valid for the station search collection
+    # that they were built from
+    station_rings: immutables.Map[H3Cell, StationRings] = immutables.Map()
+    station_search: Optional[immutables.Map[H3Cell, FrozenSet[StationId]]] = None
 
     def generate_instructions(
         self,
@@ -46,6 +63,22 @@ class ChargingFleetManager(InstructionGenerator):
         :return: the updated ChargingFleetManager along with instructions
         """
 
+        # each vehicle searches for a station at most once this time step, and the static
+        # station rings are kept for as long as the stations don't change
+        station_rings = (
+            self.station_rings
+            if self.station_search is simulation_state.s_search
+            else immutables.Map()
+        )
+        station_search = NearestStationSearch(
+            sim=simulation_state,
+            env=environment,
+            max_search_radius_km=self.config.max_search_radius_km,
+            target_soc=environment.config.dispatcher.ideal_fastcharge_soc_limit,
+            charging_search_type=environment.config.dispatcher.charging_search_type,
+            station_rings=station_rings,
+        )
+
         # find vehicles that fall below the sum of the threshold distance and nearest valid station distance
 
         def charge_candidate(v: Vehicle) -> bool:
@@ -73,6 +106,7 @@ class ChargingFleetManager(InstructionGenerator):
                 environment=environment,
                 target_soc=environment.config.dispatcher.ideal_fastcharge_soc_limit,
                 charging_search_type=environment.config.dispatcher.charging_search_type,
+                station_search=station_search,
             )
             is_charge_candidate = (
                 environment.config.dispatcher.charging_range_km_threshold + nearest_station_distance
@@ -90,14 +124,51 @@ class ChargingFleetManager(InstructionGenerator):
             )
             environment.reporter.file_report(report)
 
-        charge_instructions = instruct_vehicles_to_dispatch_to_station(
-            n=len(low_soc_vehicles),
-            max_search_radius_km=self.config.max_search_radius_km,
-            vehicles=low_soc_vehicles,
-            simulation_state=simulation_state,
-            environment=environment,
-            target_soc=environment.config.dispatcher.ideal_fastcharge_soc_limit,
-            charging_search_type=environment.config.dispatcher.charging_search_type,
+        if self.config.charging_assignment_type == ChargingAssignmentType.GLOBAL:
+            search_type = environment.config.dispatcher.charging_search_type
+            charge_time_estimates = (
+                station_search.charge_time_estimates
+                if search_type == ChargingSearchType.SHORTEST_TIME_TO_CHARGE and low_soc_vehicles
+                else None
+            )
+            charge_instructions = instruct_vehicles_to_charge_by_assignment(
+                max_search_radius_km=self.config.max_search_radius_km,
+                vehicles=low_soc_vehicles,
+                simulation_state=simulation_state,
+                environment=environment,
+                target_soc=environment.config.dispatcher.ideal_fastcharge_soc_limit,
+                charging_search_type=search_type,
+                charge_time_estimates=charge_time_estimates,
+            )
+        else:
+            charge_instructions = instruct_vehicles_to_dispatch_to_station(
+                n=len(low_soc_vehicles),
+                max_search_radius_km=self.config.max_search_radius_km,
+                vehicles=low_soc_vehicles,
+                simulation_state=simulation_state,
+                environment=environment,
+                target_soc=environment.config.dispatcher.ideal_fastcharge_soc_limit,
+                charging_search_type=environment.config.dispatcher.charging_search_type,
+                station_search=station_search,
+            )
+
+        updated_self = replace(
+            self,
+            station_rings=station_search.station_rings,
+            station_search=simulation_state.s_search,
         )
+        return updated_self, charge_instructions
 
-        return self, charge_instructions
+    def next_event_time(
+        self,
+        simulation_state: SimulationState,
+        environment: Environment,
+    ) -> Optional[SimTime]:
+        """
+        charging decisions only depend on the vehicles and stations, not on the time itself
+
+        :param simulation_state: The current simulation state
+        :param environment: The simulation environment
+        :return: None
+        """
+        return None
@@ -2,10 +2,13 @@ from __future__ import annotations
 
 import functools as ft
 import logging
-from dataclasses import dataclass
+from dataclasses import dataclass, replace
 from typing import Tuple, TYPE_CHECKING, Optional
 
+import immutables
+
 from nrel.hive.dispatcher.instruction_generator import assignment_ops
+from nrel.hive.dispatcher.instruction_generator.matching_cost_type import MatchingCostType
 from nrel.hive.state.vehicle_state.charging_base import ChargingBase
 
 if TYPE_CHECKING:
@@ -15,6 +18,7 @@ if TYPE_CHECKING:
     from nrel.hive.model.vehicle.vehicle import Vehicle
     from nrel.hive.model.request.request import Request
     from nrel.hive.config.dispatcher_config import DispatcherConfig
+    from nrel.hive.model.sim_time import SimTime
     from nrel.hive.util.typealiases import MembershipId
 
 from nrel.hive.dispatcher.instruction_generator.instruction_generator import InstructionGenerator
@@ -30,6 +34,13 @@ class Dispatcher(InstructionGenerator):
     """
 
     config: DispatcherConfig
+    # the cost table of the previous assignment for each fleet, reused for the
+    # vehicles and requests which are still candidates with the same location
+    cost_tables: immutables.Map[
+        Optional[MembershipId], assignment_ops.AssignmentCostTable
+    ] = immutables.Map()
+    # the sim time of the last assignment, when matching once per window
+    last_assignment_time: Optional[SimTime] = None
 
     def generate_instructions(
         self,
@@ -43,14 +54,25 @@ class Dispatcher(InstructionGenerator):
         :param simulation_state: The current simulation state
         :return: the updated Dispatcher along with instructions
         """
+        window = self.config.matching_window_seconds
+        if (
+            window > 0
+            and self.last_assignment_time is not None
+            and simulation_state.sim_time - self.last_assignment_time < window
+        ):
+            # requests accumulate until the end of the current matching window
+            return self, ()
+
         base_charging_range_km_threshold = (
             environment.config.dispatcher.base_charging_range_km_threshold
         )
 
         def _solve_assignment(
-            inst_acc: Tuple[DispatchTripInstruction, ...],
+            acc: Tuple[Tuple[DispatchTripInstruction, ...], immutables.Map],
             membership_id: Optional[MembershipId],
-        ) -> Tuple[DispatchTripInstruction, ...]:
+        ) -> Tuple[Tuple[DispatchTripInstruction, ...], immutables.Map]:
+            inst_acc, cost_tables = acc
+
             def _is_valid_for_dispatch(vehicle: Vehicle) -> bool:
                 vehicle_state_str = vehicle.vehicle_state.__class__.__name__.lower()
                 if vehicle_state_str not in environment.config.dispatcher.valid_dispatch_states:
@@ -100,11 +122,27 @@ class Dispatcher(InstructionGenerator):
                 filter_function=_valid_request,
             )
 
-            # select assignment of vehicles to requests
-            solution = assignment_ops.find_assignment(
+            # select assignment of vehicles to requests, only computing the costs
+            # of the vehicles and requests which changed since the previous assignment
+            prev_cost_table = self.cost_tables.get(
+                membership_id, assignment_ops.AssignmentCostTable()
+            )
+            if self.config.matching_cost_type == MatchingCostType.TRAVEL_TIME:
+                cost_table = prev_cost_table.update_by_matrix(
+                    available_vehicles,
+                    unassigned_requests,
+                    assignment_ops.travel_time_cost_matrix(simulation_state.road_network),
+                )
+            else:
+                cost_table = prev_cost_table.update(
+                    available_vehicles,
+                    unassigned_requests,
+                    assignment_ops.h3_distance_cost,
+                )
+            solution = assignment_ops.find_assignment_from_table(
                 available_vehicles,
                 unassigned_requests,
-                assignment_ops.h3_distance_cost,
+                cost_table.table,
             )
             instructions = ft.reduce(
                 lambda acc, pair: (
@@ -115,7 +153,7 @@ class Dispatcher(InstructionGenerator):
                 inst_acc,
             )
 
-            return instructions
+            return instructions, cost_tables.set(membership_id, cost_table)
 
         if len(environment.fleet_ids) > 0:
             fleet_ids = environment.fleet_ids
@@ -123,11 +161,37 @@ class Dispatcher(InstructionGenerator):
             fleet_ids = frozenset([None])
 
         initial_instructions: Tuple[DispatchTripInstruction, ...] = tuple()
+        initial_cost_tables: immutables.Map[
+            Optional[MembershipId], assignment_ops.AssignmentCostTable
+        ] = immutables.Map()
 
-        all_instructions = ft.reduce(
+        all_instructions, cost_tables = ft.reduce(
             _solve_assignment,
             fleet_ids,
-            initial_instructions,
+            (initial_instructions, initial_cost_tables),
+        )
+
+        updated_self = replace(
+            self,
+            cost_tables=cost_tables,
+            last_assignment_time=simulation_state.sim_time,
         )
+        return updated_self, all_instructions
 
-        return self, all_instructions
+    def next_event_time(
+        self,
+        simulation_state: SimulationState,
+        environment: Environment,
+    ) -> Optional[SimTime]:
+        """
+        when matching once per window, the next match happens at the end of the window;
+        otherwise, the dispatcher only reacts to changes in the simulation state
+
+        :param simulation_state: The current simulation state
+        :param environment: The simulation environment
+        :return: the end of the current matching window, if any
+        """
+        window = self.config.matching_window_seconds
+        if window > 0 and self.last_assignment_time is not None:
+            return self.last_assignment_time + window
+        return None
@@ -1,9 +1,10 @@
 from __future__ import annotations
 
 from abc import abstractmethod, ABC
-from typing import Tuple, TYPE_CHECKING
+from typing import Optional, Tuple, TYPE_CHECKING
 
 if TYPE_CHECKING:
+    from nrel.hive.model.sim_time import SimTime
     from nrel.hive.state.simulation_state.simulation_state import SimulationState
     from nrel.hive.runner.environment import Environment
     from nrel.hive.dispatcher.instruction.instruction import Instruction
@@ -40,3 +41,20 @@ class InstructionGenerator(ABC):
         :return: the updated InstructionGenerator along with generated instructions
         """
         pass
+
+    def next_event_time(
+        self,
+        simulation_state: SimulationState,
+        environment: Environment,
+    ) -> Optional[SimTime]:
+        """
+        the earliest time at which this generator could produce different instructions for
+        an unchanged simulation state. by default, a generator may depend on the time itself.
+
+        :param simulation_state: the current simulation state
+        :param environment: the simulation environment
+
+        :return: the time of the next event, or None if this generator only reacts to changes
+                 in the simulation state
+        """
+        return simulation_state.sim_time
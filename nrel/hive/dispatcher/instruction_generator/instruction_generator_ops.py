@@ -2,14 +2,18 @@ from __future__ import annotations
 
 import functools as ft
 import random
-from typing import List, Callable, NamedTuple
+from typing import List, Callable, NamedTuple, Optional
 
 import immutables
+import numpy as np
 
 from nrel.hive.dispatcher.instruction.instructions import *
 from nrel.hive.dispatcher.instruction_generator import assignment_ops
+from nrel.hive.dispatcher.instruction_generator.charge_time_estimates import ChargeTimeEstimates
 from nrel.hive.dispatcher.instruction_generator.charging_search_type import ChargingSearchType
+from nrel.hive.dispatcher.instruction_generator.nearest_station_search import NearestStationSearch
 from nrel.hive.model.station.station import Station
+from nrel.hive.state.driver_state.demand_heatmap import DemandHeatmap
 from nrel.hive.util.dict_ops import DictOps
 from nrel.hive.util.h3_ops import H3Ops
 from nrel.hive.util.units import Kilometers
@@ -17,6 +21,7 @@ from nrel.hive.util.units import Kilometers
 log = logging.getLogger(__name__)
 
 if TYPE_CHECKING:
+    from nrel.hive.model.entity import Entity
     from nrel.hive.model.vehicle.vehicle import Vehicle
     from nrel.hive.state.simulation_state.simulation_state import SimulationState
     from nrel.hive.dispatcher.instruction_generator.instruction_generator import (
@@ -48,10 +53,13 @@ class InstructionGenerationResult(NamedTuple):
         :param environment: the simulation environment
         :return: the updated accumulator
         """
-        (
-            updated_gen,
-            new_instructions,
-        ) = instruction_generator.generate_instructions(simulation_state, environment)
+        with environment.reporter.profiler.timed(
+            f"generate_instructions.{instruction_generator.name}"
+        ):
+            (
+                updated_gen,
+                new_instructions,
+            ) = instruction_generator.generate_instructions(simulation_state, environment)
 
         updated_instruction_stack = ft.reduce(
             lambda acc, i: DictOps.add_to_stack_dict(acc, i.vehicle_id, i),
@@ -68,18 +76,30 @@ class InstructionGenerationResult(NamedTuple):
         """
         drivers are given a chance to optionally generate instructions;
         each of these instructions are added to the stack for the appropriate vehicle id;
+        the demand heatmap and the charge time estimates of the simulation state are built once
+        here and shared by all drivers;
 
 
         :param simulation_state: the current simulation state
         :param environment: the simulation environment
         :return:
         """
+        demand_heatmap = DemandHeatmap.build(
+            simulation_state, environment.config.dispatcher.human_driver_reposition_top_k
+        )
+        charge_time_estimates = ChargeTimeEstimates(
+            simulation_state,
+            environment,
+            environment.config.dispatcher.human_driver_off_shift_charge_target,
+        )
         new_instructions = ft.reduce(
             lambda acc, v: (
                 v.driver_state.generate_instruction(
                     simulation_state,
                     environment,
                     self.instruction_stack.get(v.id),
+                    demand_heatmap,
+                    charge_time_estimates,
                 ),
             )
             + acc,
@@ -123,7 +143,8 @@ def generate_instructions(
     )
 
     # give drivers a chance to add instructions
-    driver_result = result.add_driver_instructions(simulation_state, environment)
+    with environment.reporter.profiler.timed("generate_instructions.driver_instructions"):
+        driver_result = result.add_driver_instructions(simulation_state, environment)
 
     return driver_result
 
@@ -136,21 +157,18 @@ def valid_station_for_vehicle(vehicle: Vehicle, env: Environment) -> Callable[[S
     :param env: simulation environment
     :return: valid station function
     """
-    mechatronics = env.mechatronics.get(vehicle.mechatronics_id)
+    compatibility = env.get_charger_compatibility()
+    mechatronics_mask = compatibility.mechatronics_mask(vehicle.mechatronics_id)
+    if vehicle.mechatronics_id not in env.mechatronics:
+        # TODO: make a safe version of this using returns
+        log.error(f"mechatronics {vehicle.mechatronics_id} not found in environment")
 
     def _inner(station: Station):
-        if mechatronics is None:
-            # TODO: make a safe version of this using returns
-            log.error(f"mechatronics {vehicle.mechatronics_id} not found in environment")
-            return False
-
         vehicle_has_access = station.membership.grant_access_to_membership(vehicle.membership)
         if not vehicle_has_access:
             return False
         else:
-            station_has_valid_charger = any(
-                [mechatronics.valid_charger(env.chargers[cid]) for cid in station.state.keys()]
-            )
+            station_has_valid_charger = (mechatronics_mask & station.charger_mask) != 0
             return station_has_valid_charger
 
     return _inner
@@ -164,6 +182,8 @@ def instruct_vehicles_to_dispatch_to_station(
     environment: Environment,
     target_soc: Ratio,
     charging_search_type: ChargingSearchType,
+    station_search: Optional[NearestStationSearch] = None,
+    charge_time_estimates: Optional[ChargeTimeEstimates] = None,
 ) -> Tuple[Instruction, ...]:
     """
     a helper function to set n vehicles to charge at a station
@@ -175,6 +195,11 @@ def instruct_vehicles_to_dispatch_to_station(
     :param environment: the simulation environment
     :param target_soc: when ranking alternatives, use this target SoC value
     :param charging_search_type: the type of search to conduct
+    :param station_search: optional memo of this time step's station searches, built
+                           with the same search radius, target SoC and search type
+    :param charge_time_estimates: optional charge time estimates of this time step, built
+                                  with the same target SoC. without a station search,
+                                  they are built on first use if not provided
     :return: instructions for vehicles to charge at stations
     """
 
@@ -184,36 +209,44 @@ def instruct_vehicles_to_dispatch_to_station(
         if len(instructions) >= n:
             break
 
-        valid_stations = simulation_state.get_stations(
-            filter_function=lambda s: s.membership.grant_access_to_membership(veh.membership)
-        )
-        if len(valid_stations) == 0:
-            break
+        nearest_station: Optional[Entity]
+        if station_search is not None:
+            if not station_search.station_accessible(veh.membership):
+                break
+            nearest_station = station_search.nearest_station(veh)
+        else:
+            valid_stations = simulation_state.get_stations(
+                filter_function=lambda s: s.membership.grant_access_to_membership(veh.membership)
+            )
+            if len(valid_stations) == 0:
+                break
 
-        if charging_search_type == ChargingSearchType.NEAREST_SHORTEST_QUEUE:
-            # use the simple weighted euclidean distance ranking
+            if charging_search_type == ChargingSearchType.NEAREST_SHORTEST_QUEUE:
+                # use the simple weighted euclidean distance ranking
 
-            distance_fn = assignment_ops.nearest_shortest_queue_distance(veh, environment)
+                distance_fn = assignment_ops.nearest_shortest_queue_distance(veh, environment)
 
-        else:  # charging_search_type == ChargingSearchType.SHORTEST_TIME_TO_CHARGE:
-            # use the search-based metric which considers travel, queueing, and charging time
+            else:  # charging_search_type == ChargingSearchType.SHORTEST_TIME_TO_CHARGE:
+                # use the search-based metric which considers travel, queueing, and charging time
+
+                if charge_time_estimates is None:
+                    charge_time_estimates = ChargeTimeEstimates(
+                        simulation_state, environment, target_soc
+                    )
+                distance_fn = assignment_ops.shortest_time_to_charge_distance(
+                    vehicle=veh, charge_time_estimates=charge_time_estimates
+                )
 
-            distance_fn = assignment_ops.shortest_time_to_charge_distance(
-                vehicle=veh,
-                sim=simulation_state,
-                env=environment,
-                target_soc=target_soc,
+            nearest_station = H3Ops.nearest_entity(
+                geoid=veh.geoid,
+                entities=valid_stations,
+                entity_search=simulation_state.s_search,
+                sim_h3_search_resolution=simulation_state.sim_h3_search_resolution,
+                sim_h3_int_search=simulation_state.sim_h3_int_search,
+                max_search_distance_km=max_search_radius_km,
+                is_valid=valid_station_for_vehicle(veh, environment),
+                distance_function=distance_fn,
             )
-
-        nearest_station = H3Ops.nearest_entity(
-            geoid=veh.geoid,
-            entities=valid_stations,
-            entity_search=simulation_state.s_search,
-            sim_h3_search_resolution=simulation_state.sim_h3_search_resolution,
-            max_search_distance_km=max_search_radius_km,
-            is_valid=valid_station_for_vehicle(veh, environment),
-            distance_function=distance_fn,
-        )
         if nearest_station is not None:
             if not isinstance(nearest_station, Station):
                 log.error(
@@ -222,9 +255,11 @@ def instruct_vehicles_to_dispatch_to_station(
                 )
                 continue
             # get the best charger id for this station. re-computes distance ranking one last time
-            # this could be removed if our nearest entity search also returned the best charger id
+            # unless the station search already found the best charger id along with the station
             # these both could return "None" but that shouldn't be possible if we found a nearest station
-            if charging_search_type == ChargingSearchType.NEAREST_SHORTEST_QUEUE:
+            if station_search is not None:
+                best_charger_id = station_search.best_charger(veh)
+            elif charging_search_type == ChargingSearchType.NEAREST_SHORTEST_QUEUE:
                 queue_result = assignment_ops.nearest_shortest_queue_ranking(
                     veh, nearest_station, environment
                 )
@@ -237,12 +272,14 @@ def instruct_vehicles_to_dispatch_to_station(
                     ) = queue_result
 
             else:  # charging_search_type == ChargingSearchType.SHORTEST_TIME_TO_CHARGE:
+                if charge_time_estimates is None:
+                    charge_time_estimates = ChargeTimeEstimates(
+                        simulation_state, environment, target_soc
+                    )
                 time_result = assignment_ops.shortest_time_to_charge_ranking(
                     vehicle=veh,
                     station=nearest_station,
-                    sim=simulation_state,
-                    env=environment,
-                    target_soc=target_soc,
+                    charge_time_estimates=charge_time_estimates,
                 )
                 if time_result is None:
                     continue
@@ -266,6 +303,61 @@ def instruct_vehicles_to_dispatch_to_station(
     return instructions
 
 
+def instruct_vehicles_to_charge_by_assignment(
+    max_search_radius_km: float,
+    vehicles: Tuple[Vehicle, ...],
+    simulation_state: SimulationState,
+    environment: Environment,
+    target_soc: Ratio,
+    charging_search_type: ChargingSearchType,
+    charge_time_estimates: Optional[ChargeTimeEstimates] = None,
+) -> Tuple[Instruction, ...]:
+    """
+    a helper function to assign all vehicles that need to charge to station chargers at
+    once, by solving one assignment problem over the vehicles and the station charger
+    slots. unlike instruct_vehicles_to_dispatch_to_station, vehicles assigned earlier in the
+    same time step count against the chargers they were assigned to.
+
+    :param max_search_radius_km: the max kilometers to search for a station
+    :param vehicles: the vehicles that should charge
+    :param simulation_state: the simulation state
+    :param environment: the simulation environment
+    :param target_soc: when ranking alternatives, use this target SoC value
+    :param charging_search_type: the ranking to use as the assignment cost
+    :param charge_time_estimates: this time step's charge time estimates, if already built
+    :return: instructions for vehicles to charge at stations
+    """
+    if len(vehicles) == 0:
+        return ()
+
+    slots, table = assignment_ops.charging_assignment_table(
+        vehicles=vehicles,
+        sim=simulation_state,
+        env=environment,
+        max_search_radius_km=max_search_radius_km,
+        target_soc=target_soc,
+        charging_search_type=charging_search_type,
+        charge_time_estimates=charge_time_estimates,
+    )
+    solution = assignment_ops.find_assignment_from_table(vehicles, slots, table)
+
+    # vehicles with no station they can use are assigned to an infeasible slot
+    vehicle_rows = {v.id: row for row, v in enumerate(vehicles)}
+    slot_cols = {slot.id: (col, slot) for col, slot in enumerate(slots)}
+    instructions = []
+    for vehicle_id, slot_id in solution.solution:
+        col, slot = slot_cols[slot_id]
+        if np.isfinite(table[vehicle_rows[vehicle_id], col]):
+            instruction = DispatchStationInstruction(
+                vehicle_id=vehicle_id,
+                station_id=slot.station_id,
+                charger_id=slot.charger_id,
+            )
+            instructions.append(instruction)
+
+    return tuple(sorted(instructions, key=lambda i: i.vehicle_id))
+
+
 def get_nearest_valid_station_distance(
     max_search_radius_km: float,
     vehicle: Vehicle,
@@ -274,6 +366,8 @@ def get_nearest_valid_station_distance(
     environment: Environment,
     target_soc: Ratio,
     charging_search_type: ChargingSearchType,
+    station_search: Optional[NearestStationSearch] = None,
+    charge_time_estimates: Optional[ChargeTimeEstimates] = None,
 ) -> Kilometers:
     """
     a helper function to find the distance between a vehicle and the closest valid station
@@ -285,8 +379,24 @@ def get_nearest_valid_station_distance(
     :param environment: the simulation environment
     :param target_soc: when ranking alternatives, use this target SoC value
     :param charging_search_type: the type of search to conduct
+    :param station_search: optional memo of this time step's station searches, built
+                           with the same search radius, target SoC and search type.
+                           its nearest station is only used when searching from the
+                           vehicle's own location, but its charge time estimates are
+                           used for any location.
+    :param charge_time_estimates: optional charge time estimates of this time step, built
+                                  with the same target SoC, used without a station search
     :return: the distance in km to the nearest valid station
     """
+    if station_search is not None and geoid == vehicle.geoid:
+        if not station_search.station_accessible(vehicle.membership):
+            return 99999999999999
+        memo_station = station_search.nearest_station(vehicle)
+        if memo_station is None:
+            return 99999999999999
+        return simulation_state.road_network.distance_by_geoid_km(
+            origin=geoid, destination=memo_station.geoid
+        )
 
     valid_stations = simulation_state.get_stations(
         filter_function=lambda s: s.membership.grant_access_to_membership(vehicle.membership)
@@ -302,11 +412,12 @@ def get_nearest_valid_station_distance(
     else:  # charging_search_type == ChargingSearchType.SHORTEST_TIME_TO_CHARGE:
         # use the search-based metric which considers travel, queueing, and charging time
 
+        if station_search is not None:
+            charge_time_estimates = station_search.charge_time_estimates
+        elif charge_time_estimates is None:
+            charge_time_estimates = ChargeTimeEstimates(simulation_state, environment, target_soc)
         distance_fn = assignment_ops.shortest_time_to_charge_distance(
-            vehicle=vehicle,
-            sim=simulation_state,
-            env=environment,
-            target_soc=target_soc,
+            vehicle=vehicle, charge_time_estimates=charge_time_estimates
         )
 
     nearest_station = H3Ops.nearest_entity(
@@ -314,6 +425,7 @@ def get_nearest_valid_station_distance(
         entities=simulation_state.get_stations(),
         entity_search=simulation_state.s_search,
         sim_h3_search_resolution=simulation_state.sim_h3_search_resolution,
+        sim_h3_int_search=simulation_state.sim_h3_int_search,
         max_search_distance_km=max_search_radius_km,
         is_valid=valid_station_for_vehicle(vehicle, environment),
         distance_function=distance_fn,
@@ -0,0 +1,28 @@
+from __future__ import annotations
+
+from enum import Enum
+
+
+class MatchingCostType(Enum):
+    H3_DISTANCE = 1
+    TRAVEL_TIME = 2
+
+    @staticmethod
+    def from_string(string: str) -> MatchingCostType:
+        """
+        parses an input configuration string as a MatchingCostType
+
+        :param string: the input string
+        :return: a MatchingCostType or an Error
+        :raises: ValueError when the matching cost type is unknown
+        """
+        cleaned = string.lower()
+        if cleaned == "h3_distance":
+            return MatchingCostType.H3_DISTANCE
+        elif cleaned == "travel_time":
+            return MatchingCostType.TRAVEL_TIME
+        else:
+            valid_names = "{h3_distance|travel_time}"
+            raise NameError(
+                f"matching cost type {string} is not known, must be one of {valid_names}"
+            )
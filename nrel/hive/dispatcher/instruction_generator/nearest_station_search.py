@@ -0,0 +1,246 @@
+from __future__ import annotations
+
+import logging
+from math import ceil
+from typing import TYPE_CHECKING, Dict, FrozenSet, Optional, Tuple
+
+import h3
+import immutables
+import numpy as np
+
+from nrel.hive.dispatcher.instruction_generator import assignment_ops
+from nrel.hive.dispatcher.instruction_generator.charge_time_estimates import (
+    ChargeTimeEstimates,
+)
+from nrel.hive.dispatcher.instruction_generator.charging_search_type import ChargingSearchType
+from nrel.hive.util import h3_cells
+from nrel.hive.util.exception import H3Error
+
+if TYPE_CHECKING:
+    from nrel.hive.model.membership import Membership
+    from nrel.hive.model.station.station import Station
+    from nrel.hive.model.vehicle.vehicle import Vehicle
+    from nrel.hive.runner.environment import Environment
+    from nrel.hive.state.simulation_state.simulation_state import SimulationState
+    from nrel.hive.util.typealiases import ChargerId, H3Cell, StationId, VehicleId
+    from nrel.hive.util.units import Kilometers, Ratio
+
+log = logging.getLogger(__name__)
+
+# the stations around a search cell, grouped by the grid distance (ring) of their search cell
+StationRings = Tuple[Tuple["StationId", ...], ...]
+
+# distance values at or above this are never selected, as in H3Ops.nearest_entity
+_NO_STATION_DISTANCE = 1000000.0
+
+
+def build_station_rings(
+    search_cell: H3Cell,
+    s_search: immutables.Map[H3Cell, FrozenSet[StationId]],
+    sim_h3_search_resolution: int,
+    max_search_radius_km: Kilometers,
+) -> StationRings:
+    """
+    finds the stations around a search cell in the rings which H3Ops.nearest_entity
+    would visit them in. within a ring, stations are ordered by search cell and StationId.
+    stations do not move, so this only changes when stations are added or removed.
+
+    :param search_cell: the search cell to build the rings around
+    :param s_search: the station search collection
+    :param sim_h3_search_resolution: the h3 resolution of the search collection
+    :param max_search_radius_km: the max kilometers to search for a station
+    :return: the non-empty station rings, nearest first
+    """
+    k_dist_km = h3.edge_length(sim_h3_search_resolution, unit="km") * 2
+    max_k = ceil(max_search_radius_km / k_dist_km)
+    rings = []
+    for ring_cells in h3_cells.k_ring_distances(search_cell, max_k):
+        station_ids = tuple(
+            station_id
+            for cell in sorted(ring_cells)
+            for station_id in sorted(s_search.get(cell, ()))
+        )
+        if station_ids:
+            rings.append(station_ids)
+    return tuple(rings)
+
+
+class NearestStationSearch:
+    """
+    a memo of nearest station searches for one time step.
+
+    the valid stations around a vehicle only depend on its search cell, its membership
+    and which chargers its mechatronics can use, so they are found once per time step for
+    each combination. the ranking of those stations still depends on the vehicle, and is
+    computed once per vehicle, with any per-station charge time estimates shared between
+    vehicles. the station rings around each search cell are static, and
+    are kept between time steps in a table which this search extends.
+    """
+
+    def __init__(
+        self,
+        sim: SimulationState,
+        env: Environment,
+        max_search_radius_km: Kilometers,
+        target_soc: Ratio,
+        charging_search_type: ChargingSearchType,
+        station_rings: immutables.Map[H3Cell, StationRings] = immutables.Map(),
+    ):
+        """
+        :param sim: the simulation state for this time step
+        :param env: the simulation environment
+        :param max_search_radius_km: the max kilometers to search for a station
+        :param target_soc: when ranking alternatives, use this target SoC value
+        :param charging_search_type: the type of search to conduct
+        :param station_rings: the static station rings table from previous time steps,
+                              which must have been built for the same station search
+                              collection and search radius
+        """
+        self.sim = sim
+        self.env = env
+        self.max_search_radius_km = max_search_radius_km
+        self.target_soc = target_soc
+        self.charging_search_type = charging_search_type
+        self._station_rings = station_rings
+        self._new_station_rings: Dict[H3Cell, StationRings] = {}
+        self._compatibility = env.get_charger_compatibility()
+        self._valid_rings: Dict[
+            Tuple[H3Cell, Membership, int], Tuple[Tuple[Station, ...], ...]
+        ] = {}
+        self._accessible: Dict[Membership, bool] = {}
+        self._nearest: Dict[VehicleId, Optional[Tuple[Station, Optional[ChargerId]]]] = {}
+        self._charge_time_estimates: Optional[ChargeTimeEstimates] = None
+
+    @property
+    def station_rings(self) -> immutables.Map[H3Cell, StationRings]:
+        """
+        the static station rings table, including any search cells added during this time step
+        """
+        if not self._new_station_rings:
+            return self._station_rings
+        return self._station_rings.update(self._new_station_rings)
+
+    @property
+    def charge_time_estimates(self) -> ChargeTimeEstimates:
+        """
+        the charge time estimates for this time step, built on first use
+        """
+        if self._charge_time_estimates is None:
+            self._charge_time_estimates = ChargeTimeEstimates(self.sim, self.env, self.target_soc)
+        return self._charge_time_estimates
+
+    def station_accessible(self, membership: Membership) -> bool:
+        """
+        tests if any station grants access to a membership
+
+        :param membership: the membership to test
+        :return: True if at least one station grants access
+        """
+        accessible = self._accessible.get(membership)
+        if accessible is None:
+            accessible = any(
+                s.membership.grant_access_to_membership(membership)
+                for s in self.sim.stations.values()
+            )
+            self._accessible[membership] = accessible
+        return accessible
+
+    def nearest_station(self, vehicle: Vehicle) -> Optional[Station]:
+        """
+        finds the best station for a vehicle within the search radius, by the same
+        ring search and ranking as H3Ops.nearest_entity
+
+        :param vehicle: the vehicle searching for a station
+        :return: the best ranked valid station in the nearest ring with one, if any
+        """
+        nearest = self._nearest_station_and_charger(vehicle)
+        return nearest[0] if nearest is not None else None
+
+    def best_charger(self, vehicle: Vehicle) -> Optional[ChargerId]:
+        """
+        the best ranked charger for a vehicle at its nearest station
+
+        :param vehicle: the vehicle searching for a station
+        :return: the best charger at the station found by nearest_station, if any
+        """
+        nearest = self._nearest_station_and_charger(vehicle)
+        return nearest[1] if nearest is not None else None
+
+    def _nearest_station_and_charger(
+        self, vehicle: Vehicle
+    ) -> Optional[Tuple[Station, Optional[ChargerId]]]:
+        if vehicle.id in self._nearest:
+            return self._nearest[vehicle.id]
+
+        if h3.h3_get_resolution(vehicle.geoid) < self.sim.sim_h3_search_resolution:
+            raise H3Error("search resolution must be less than geoid resolution")
+        search_cell = self.sim.search_cell(vehicle.geoid)
+
+        nearest = None
+        for ring in self._valid_station_rings(search_cell, vehicle):
+            ranks, chargers = self._rank_stations(vehicle, ring)
+            # the first station with the lowest rank, as a strict less-than scan would find
+            best = int(np.argmin(ranks))
+            if ranks[best] < _NO_STATION_DISTANCE:
+                nearest = ring[best], chargers[best]
+                break
+
+        self._nearest[vehicle.id] = nearest
+        return nearest
+
+    def _rank_stations(
+        self, vehicle: Vehicle, stations: Tuple[Station, ...]
+    ) -> Tuple[np.ndarray, Tuple[Optional[ChargerId], ...]]:
+        if self.charging_search_type == ChargingSearchType.NEAREST_SHORTEST_QUEUE:
+            rankings = [
+                assignment_ops.nearest_shortest_queue_ranking(
+                    vehicle, station, self.env, assignment_ops.MAX_DIST
+                )
+                for station in stations
+            ]
+            ranks = np.array([rank for _, rank in rankings], dtype=np.float64)
+            return ranks, tuple(charger_id for charger_id, _ in rankings)
+        else:
+            return self.charge_time_estimates.rank_stations(
+                vehicle, stations, assignment_ops.MAX_DIST
+            )
+
+    def _valid_station_rings(
+        self, search_cell: H3Cell, vehicle: Vehicle
+    ) -> Tuple[Tuple[Station, ...], ...]:
+        """
+        the stations in the rings around a search cell which a vehicle has access to
+        and has a compatible charger at, see valid_station_for_vehicle
+        """
+        mechatronics_mask = self._compatibility.mechatronics_mask(vehicle.mechatronics_id)
+        key = (search_cell, vehicle.membership, mechatronics_mask)
+        valid_rings = self._valid_rings.get(key)
+        if valid_rings is not None:
+            return valid_rings
+
+        rings = self._station_rings.get(search_cell, self._new_station_rings.get(search_cell))
+        if rings is None:
+            rings = build_station_rings(
+                search_cell,
+                self.sim.s_search,
+                self.sim.sim_h3_search_resolution,
+                self.max_search_radius_km,
+            )
+            self._new_station_rings[search_cell] = rings
+
+        def _valid(station: Station) -> bool:
+            return station.membership.grant_access_to_membership(vehicle.membership) and (
+                mechatronics_mask & station.charger_mask
+            ) != 0
+
+        stations = self.sim.stations
+        valid_rings = tuple(
+            ring
+            for ring in (
+                tuple(s for s in (stations.get(s_id) for s_id in ids) if s and _valid(s))
+                for ids in rings
+            )
+            if ring
+        )
+        self._valid_rings[key] = valid_rings
+        return valid_rings
@@ -7,6 +7,7 @@ import logging
 from pathlib import Path
 from typing import TYPE_CHECKING, Callable, Iterable, Optional, Tuple, Dict
 
+import h3
 import immutables
 
 from nrel.hive.config import HiveConfig
@@ -15,8 +16,10 @@ from nrel.hive.initialization.initialize_ops import (
     read_fleet_ids_from_file,
 )
 from nrel.hive.model.base import Base
+from nrel.hive.model.entity_position import EntityPosition
 from nrel.hive.model.energy.charger import build_chargers_table
 from nrel.hive.model.roadnetwork.osm.osm_roadnetwork import OSMRoadNetwork
+from nrel.hive.model.roadnetwork.roadnetwork import RoadNetwork
 from nrel.hive.model.station.station import Station
 from nrel.hive.model.vehicle.mechatronics import build_mechatronics_table
 from nrel.hive.model.vehicle.schedules import build_schedules_table
@@ -24,9 +27,11 @@ from nrel.hive.model.vehicle.vehicle import Vehicle
 from nrel.hive.reporting.handler.eventful_handler import EventfulHandler
 from nrel.hive.reporting.handler.instruction_handler import InstructionHandler
 from nrel.hive.reporting.handler.kepler_handler import KeplerHandler
+from nrel.hive.reporting.handler.profile_handler import ProfileHandler
 from nrel.hive.reporting.handler.stateful_handler import StatefulHandler
 from nrel.hive.reporting.handler.stats_handler import StatsHandler
 from nrel.hive.reporting.handler.time_step_stats_handler import TimeStepStatsHandler
+from nrel.hive.reporting.profiler import Profiler
 from nrel.hive.reporting.reporter import Reporter
 from nrel.hive.runner.environment import Environment
 from nrel.hive.state.simulation_state import simulation_state_ops
@@ -34,7 +39,7 @@ from nrel.hive.state.simulation_state.simulation_state import SimulationState
 from nrel.hive.util.dict_ops import DictOps
 
 if TYPE_CHECKING:
-    from nrel.hive.util.typealiases import ScheduleId
+    from nrel.hive.util.typealiases import GeoId, ScheduleId
     from nrel.hive.model.vehicle.schedules import ScheduleFunction
 
 log = logging.getLogger(__name__)
@@ -77,6 +82,7 @@ def initialize(
         sim_timestep_duration_seconds=config.sim.timestep_duration_seconds,
         sim_h3_location_resolution=config.sim.sim_h3_resolution,
         sim_h3_search_resolution=config.sim.sim_h3_search_resolution,
+        sim_h3_int_search=config.sim.h3_int_search,
     )
 
     environment = Environment(config=config)
@@ -131,6 +137,7 @@ def initialize_environment_schedules(
         )
 
     environment = environment._replace(schedules=schedules)
+    environment = environment.build_schedule_table()
 
     return simulation_state, environment
 
@@ -151,6 +158,7 @@ def initialize_environment_mechatronics(
         config.input_config.mechatronics_file, config.input_config.scenario_directory
     )
     environment = environment._replace(mechatronics=mechatronics_table)
+    environment = environment.build_charger_compatibility()
 
     return simulation_state, environment
 
@@ -169,6 +177,7 @@ def initialize_environment_chargers(
     """
     chargers_table = build_chargers_table(config.input_config.chargers_file)
     environment = environment._replace(chargers=chargers_table)
+    environment = environment.build_charger_compatibility()
 
     return simulation_state, environment
 
@@ -186,7 +195,7 @@ def initialize_environment_reporting(
     :return: a SimulationState and Environment with reporting added
     """
     # configure reporting
-    reporter = Reporter()
+    reporter = Reporter(Profiler(enabled=config.global_config.log_profile))
     if config.global_config.log_events:
         reporter.add_handler(
             EventfulHandler(config.global_config, config.scenario_output_directory)
@@ -207,6 +216,8 @@ def initialize_environment_reporting(
         reporter.add_handler(
             TimeStepStatsHandler(config, config.scenario_output_directory, environment.fleet_ids)
         )
+    if config.global_config.log_profile:
+        reporter.add_handler(ProfileHandler(config.scenario_output_directory))
 
     environment = environment.set_reporter(reporter)
 
@@ -252,6 +263,7 @@ def osm_init_function(
             sim_h3_resolution=config.sim.sim_h3_resolution,
             road_network_file=config.input_config.road_network_file,
             default_speed_kmph=config.network.default_speed_kmph,
+            routing_processes=config.network.routing_processes,
         )
     elif config.input_config.geofence_file:
         try:
@@ -269,6 +281,7 @@ def osm_init_function(
             default_speed_kmph=config.network.default_speed_kmph,
             polygon=polygon_union,
             cache_dir=cache_dir,
+            routing_processes=config.network.routing_processes,
         )
     else:
         raise IOError(
@@ -280,6 +293,32 @@ def osm_init_function(
     return sim_w_osm, environment
 
 
+def _row_positions(
+    rows: Iterable[Dict[str, str]], road_network: RoadNetwork
+) -> Tuple[Optional[EntityPosition], ...]:
+    """
+    positions the lat/lon of each row of an entity file on the road network, snapping
+    all distinct locations in one batch
+
+    :param rows: the rows of an entity file
+    :param road_network: the road network to position the rows on
+    :return: the position of each row, or None where the row has no valid lat/lon,
+             leaving the error to be raised when the entity is parsed
+    """
+
+    def _geoid(row: Dict[str, str]) -> Optional[GeoId]:
+        try:
+            lat, lon = float(row["lat"]), float(row["lon"])
+            return h3.geo_to_h3(lat, lon, road_network.sim_h3_resolution)
+        except (KeyError, TypeError, ValueError):
+            return None
+
+    geoids = [_geoid(row) for row in rows]
+    distinct = list(dict.fromkeys(g for g in geoids if g is not None))
+    positions = dict(zip(distinct, road_network.positions_from_geoids(distinct)))
+    return tuple(positions[g] if g is not None else None for g in geoids)
+
+
 def vehicle_init_function(
     config: HiveConfig, simulation_state: SimulationState, environment: Environment
 ) -> Tuple[SimulationState, Environment]:
@@ -300,8 +339,10 @@ def vehicle_init_function(
         else None
     )
 
-    def _collect_vehicle(row: Dict[str, str]) -> Optional[Vehicle]:
-        veh = Vehicle.from_row(row, simulation_state.road_network, environment)
+    def _collect_vehicle(
+        row: Dict[str, str], position: Optional[EntityPosition]
+    ) -> Optional[Vehicle]:
+        veh = Vehicle.from_row(row, simulation_state.road_network, environment, position)
 
         if vehicle_member_ids is not None:
             if veh.id in vehicle_member_ids:
@@ -311,8 +352,9 @@ def vehicle_init_function(
 
     # open vehicles file and add each row
     with open(vehicles_file, "r", encoding="utf-8-sig") as vf:
-        reader = csv.DictReader(vf)
-        vehicles_or_none = [_collect_vehicle(row) for row in reader]
+        rows = list(csv.DictReader(vf))
+        positions = _row_positions(rows, simulation_state.road_network)
+        vehicles_or_none = [_collect_vehicle(row, pos) for row, pos in zip(rows, positions)]
         vehicles = [v for v in vehicles_or_none if v is not None]
         sim_with_vehicles = simulation_state_ops.add_entities(simulation_state, vehicles)
 
@@ -339,8 +381,8 @@ def base_init_function(
         else None
     )
 
-    def _collect_base(row: Dict[str, str]) -> Optional[Base]:
-        base = Base.from_row(row, simulation_state.road_network)
+    def _collect_base(row: Dict[str, str], position: Optional[EntityPosition]) -> Optional[Base]:
+        base = Base.from_row(row, simulation_state.road_network, position)
 
         if base_member_ids is not None:
             if base.id in base_member_ids:
@@ -349,8 +391,9 @@ def base_init_function(
 
     # add all bases from the base file
     with open(config.input_config.bases_file, "r", encoding="utf-8-sig") as bf:
-        reader = csv.DictReader(bf)
-        bases_or_none = [_collect_base(row) for row in reader]
+        rows = list(csv.DictReader(bf))
+        positions = _row_positions(rows, simulation_state.road_network)
+        bases_or_none = [_collect_base(row, pos) for row, pos in zip(rows, positions)]
         bases = [b for b in bases_or_none if b is not None]
 
     sim_w_bases = simulation_state_ops.add_entities(simulation_state, bases)
@@ -445,9 +488,13 @@ def station_init_function(
     )
 
     def _add_row_unsafe(
-        builder: immutables.Map[str, Station], row: Dict[str, str]
+        builder: immutables.Map[str, Station],
+        row_and_position: Tuple[Dict[str, str], Optional[EntityPosition]],
     ) -> immutables.Map[str, Station]:
-        station = Station.from_row(row, builder, simulation_state.road_network, environment)
+        row, position = row_and_position
+        station = Station.from_row(
+            row, builder, simulation_state.road_network, environment, position
+        )
 
         if station_member_ids is not None:
             if station.id in station_member_ids:
@@ -458,9 +505,10 @@ def station_init_function(
 
     # grab all stations (some may exist on multiple rows)
     with open(config.input_config.stations_file, "r", encoding="utf-8-sig") as bf:
-        reader = csv.DictReader(bf)
+        rows = list(csv.DictReader(bf))
+        positions = _row_positions(rows, simulation_state.road_network)
         stations_builder: immutables.Map[str, Station] = ft.reduce(
-            _add_row_unsafe, reader, immutables.Map()
+            _add_row_unsafe, zip(rows, positions), immutables.Map()
         )
 
     # add all stations to the simulation once we know they are complete
@@ -63,6 +63,7 @@ def initialize_simulation_with_sampling(
             sim_timestep_duration_seconds=config.sim.timestep_duration_seconds,
             sim_h3_location_resolution=config.sim.sim_h3_resolution,
             sim_h3_search_resolution=config.sim.sim_h3_search_resolution,
+            sim_h3_int_search=config.sim.h3_int_search,
         )
     elif config.network.network_type == "osm_network":
         if config.input_config.road_network_file is None:
@@ -72,6 +73,7 @@ def initialize_simulation_with_sampling(
             sim_h3_resolution=config.sim.sim_h3_resolution,
             road_network_file=Path(config.input_config.road_network_file),
             default_speed_kmph=config.network.default_speed_kmph,
+            routing_processes=config.network.routing_processes,
         )
         sim_initial = SimulationState(
             road_network=osm_road_network,
@@ -79,6 +81,7 @@ def initialize_simulation_with_sampling(
             sim_timestep_duration_seconds=config.sim.timestep_duration_seconds,
             sim_h3_location_resolution=config.sim.sim_h3_resolution,
             sim_h3_search_resolution=config.sim.sim_h3_search_resolution,
+            sim_h3_int_search=config.sim.h3_int_search,
         )
     else:
         raise IOError(
@@ -99,7 +102,7 @@ def initialize_simulation_with_sampling(
             config.sim.schedule_type, config.input_config.schedules_file
         )
 
-    env = Environment(
+    initial_env = Environment(
         config=config,
         mechatronics=build_mechatronics_table(
             config.input_config.mechatronics_file,
@@ -108,6 +111,7 @@ def initialize_simulation_with_sampling(
         chargers=build_chargers_table(config.input_config.chargers_file),
         schedules=schedules,
     )
+    env = initial_env.build_charger_compatibility().build_schedule_table()
 
     # populate simulation with static entities
     sim_with_bases = _build_bases(config.input_config.bases_file, sim_initial)
@@ -0,0 +1,108 @@
+import random
+from typing import Any, Dict, Iterator, Optional, Sequence, Tuple
+
+import h3
+
+from nrel.hive.model.roadnetwork.link import Link
+from nrel.hive.util.typealiases import ChargerId
+
+
+def _sample_lat_lon(links: Sequence[Link], rng: random.Random) -> Tuple[float, float]:
+    lat, lon = h3.h3_to_geo(rng.choice(links).start)
+    return round(lat, 6), round(lon, 6)
+
+
+def sample_base_rows(
+    count: int,
+    links: Sequence[Link],
+    stall_count: int,
+    station_charger_id: Optional[ChargerId] = None,
+    random_seed: int = 0,
+) -> Iterator[Dict[str, Any]]:
+    """
+    lazily samples {count} base rows in the bases file format, located uniformly
+    at random across the road network links
+
+    :param count: the number of bases to sample
+    :param links: the road network links to locate bases on
+    :param stall_count: the number of stalls at each base
+    :param station_charger_id: if provided, each base is given a co-located station
+                               (see base_station_rows) with this charger
+    :param random_seed: random seed value
+    :return: base rows, one at a time
+    """
+    if len(links) == 0:
+        raise AssertionError("must have at least one link to sample from")
+
+    rng = random.Random(random_seed)
+    for i in range(count):
+        lat, lon = _sample_lat_lon(links, rng)
+        yield {
+            "base_id": f"b{i}",
+            "lat": lat,
+            "lon": lon,
+            "station_id": f"bs{i}" if station_charger_id is not None else "",
+            "stall_count": stall_count,
+        }
+
+
+def base_station_rows(
+    base_rows: Sequence[Dict[str, Any]], charger_id: ChargerId
+) -> Iterator[Dict[str, Any]]:
+    """
+    creates the station rows for the stations co-located with sampled bases,
+    with one charger per base stall
+
+    :param base_rows: base rows produced by sample_base_rows
+    :param charger_id: the charger installed at each base
+    :return: station rows, one at a time
+    """
+    for row in base_rows:
+        if not row["station_id"]:
+            continue
+        yield {
+            "station_id": row["station_id"],
+            "lat": row["lat"],
+            "lon": row["lon"],
+            "charger_count": row["stall_count"],
+            "charger_id": charger_id,
+            "on_shift_access": "true",
+        }
+
+
+def sample_station_rows(
+    count: int,
+    links: Sequence[Link],
+    chargers: Sequence[Tuple[ChargerId, int]],
+    on_shift_access: bool = True,
+    random_seed: int = 0,
+) -> Iterator[Dict[str, Any]]:
+    """
+    lazily samples {count} stations in the stations file format, located uniformly
+    at random across the road network links. each station is written as one row
+    per charger type.
+
+    :param count: the number of stations to sample
+    :param links: the road network links to locate stations on
+    :param chargers: the (charger id, charger count) pairs installed at every station
+    :param on_shift_access: whether human drivers can charge at the stations while on shift
+    :param random_seed: random seed value
+    :return: station rows, one at a time
+    """
+    if len(links) == 0:
+        raise AssertionError("must have at least one link to sample from")
+    if len(chargers) == 0:
+        raise AssertionError("stations must have at least one charger type")
+
+    rng = random.Random(random_seed)
+    for i in range(count):
+        lat, lon = _sample_lat_lon(links, rng)
+        for charger_id, charger_count in chargers:
+            yield {
+                "station_id": f"s{i}",
+                "lat": lat,
+                "lon": lon,
+                "charger_count": charger_count,
+                "charger_id": charger_id,
+                "on_shift_access": str(on_shift_access).lower(),
+            }
@@ -1,11 +1,27 @@
 import random
-from typing import Tuple, List
+from typing import Any, Dict, Iterator, List, Sequence, Tuple
+
+import h3
+import numpy as np
 
 from nrel.hive.model.request import Request
+from nrel.hive.model.roadnetwork.link import Link
 from nrel.hive.model.roadnetwork.osm.osm_roadnetwork import OSMRoadNetwork
 from nrel.hive.model.sim_time import SimTime
 from nrel.hive.runner import Environment
 from nrel.hive.state.simulation_state.simulation_state import SimulationState
+from nrel.hive.util.typealiases import H3Resolution
+from nrel.hive.util.units import Seconds
+
+# relative ride-hail demand for each hour of the day, starting at midnight;
+# a quiet early morning, a morning peak and a larger evening peak
+DEFAULT_DIURNAL_PROFILE: Tuple[float, ...] = (
+    0.55, 0.40, 0.30, 0.22, 0.20, 0.28, 0.55, 0.95, 1.20, 1.15, 1.05, 1.05,
+    1.10, 1.10, 1.15, 1.25, 1.35, 1.45, 1.55, 1.50, 1.40, 1.30, 1.15, 0.85,
+)  # fmt: skip
+
+# probability of a request having 1, 2, 3 or 4 passengers
+DEFAULT_PASSENGER_DISTRIBUTION: Tuple[float, ...] = (0.70, 0.20, 0.07, 0.03)
 
 
 def default_request_sampler(
@@ -70,3 +86,116 @@ def default_request_sampler(
     sorted_reqeusts = sorted(requests, key=lambda r: (r.departure_time, r.id))
 
     return tuple(sorted_reqeusts)
+
+
+def poisson_request_rows(
+    links: Sequence[Link],
+    requests_per_day: float,
+    start_time: SimTime,
+    end_time: SimTime,
+    timestep_duration_seconds: Seconds,
+    demand_h3_resolution: H3Resolution = 8,
+    diurnal_profile: Sequence[float] = DEFAULT_DIURNAL_PROFILE,
+    cell_weight_sigma: float = 1.0,
+    random_seed: int = 0,
+) -> Iterator[Dict[str, Any]]:
+    """
+    lazily samples requests in the requests file format from a time-varying Poisson
+    process per H3 cell, one time step at a time, so rows are produced in departure
+    time order and only a single time step of requests is ever held in memory.
+
+    each cell's share of the demand is proportional to the number of links in the cell,
+    scaled by a log-normal "attractiveness" so that demand is not uniform across
+    the network. the hourly diurnal profile is normalized so that, on average,
+    requests_per_day requests are sampled per simulated day.
+
+    :param links: the road network links which requests may start and end on
+    :param requests_per_day: the expected number of requests per simulated day
+    :param start_time: the departure time of the first time step
+    :param end_time: the end of the sampled time range (exclusive)
+    :param timestep_duration_seconds: the duration of each time step
+    :param demand_h3_resolution: the resolution of the H3 cells which demand is sampled over
+    :param diurnal_profile: relative demand for each hour of the day, starting at midnight
+    :param cell_weight_sigma: the spread of the log-normal cell attractiveness; 0 for uniform cells
+    :param random_seed: random seed value
+    :return: request rows, one at a time, in departure time order
+    """
+    if len(links) == 0:
+        raise AssertionError("must have at least one link to sample from")
+    if len(diurnal_profile) != 24:
+        raise AssertionError(
+            f"diurnal profile must have one value per hour but found {len(diurnal_profile)}"
+        )
+    profile = np.array(diurnal_profile, dtype=np.float64)
+    if np.any(profile < 0) or profile.sum() == 0:
+        raise AssertionError("diurnal profile must be non-negative with at least one positive hour")
+    profile = profile / profile.mean()
+
+    rng = np.random.default_rng(random_seed)
+
+    # group the links by demand cell so a cell's links are a contiguous slice
+    cells = [h3.h3_to_parent(link.start, demand_h3_resolution) for link in links]
+    order = sorted(range(len(links)), key=lambda i: (cells[i], links[i].link_id))
+    cell_ids, cell_index = np.unique([cells[i] for i in order], return_inverse=True)
+    cell_sizes = np.bincount(cell_index)
+    cell_offsets = np.concatenate(([0], np.cumsum(cell_sizes)[:-1]))
+
+    def _lat_lon(geoids: List[str]) -> np.ndarray:
+        return np.round(np.array([h3.h3_to_geo(g) for g in geoids]), 6)
+
+    origins = _lat_lon([links[i].start for i in order])
+    destinations = _lat_lon([links[i].end for i in order])
+
+    attractiveness = rng.lognormal(mean=0.0, sigma=cell_weight_sigma, size=len(cell_ids))
+    cell_weights = cell_sizes * attractiveness
+    cell_weights = cell_weights / cell_weights.sum()
+
+    passenger_counts = np.arange(1, len(DEFAULT_PASSENGER_DISTRIBUTION) + 1)
+    requests_per_step = requests_per_day * timestep_duration_seconds / 86400
+
+    def _sample_links(cell: np.ndarray) -> np.ndarray:
+        return cell_offsets[cell] + (rng.random(len(cell)) * cell_sizes[cell]).astype(np.int64)
+
+    id_counter = 0
+    for t in range(int(start_time), int(end_time), timestep_duration_seconds):
+        hour = (t % 86400) // 3600
+        counts = rng.poisson(requests_per_step * profile[hour] * cell_weights)
+        n = int(counts.sum())
+        if n == 0:
+            continue
+
+        o_links = _sample_links(np.repeat(np.arange(len(cell_ids)), counts))
+        d_links = _sample_links(rng.choice(len(cell_ids), size=n, p=cell_weights))
+        # avoid requests which start and end at the same location
+        # by moving to the next link, up to once per link
+        same = np.all(origins[o_links] == destinations[d_links], axis=1)
+        for _ in range(len(links)):
+            if not np.any(same):
+                break
+            d_links[same] = (d_links[same] + 1) % len(links)
+            same = np.all(origins[o_links] == destinations[d_links], axis=1)
+        if np.any(same):
+            lat, lon = origins[o_links[same][0]]
+            raise ValueError(
+                f"cannot sample a request destination for origin ({lat}, {lon}), "
+                "every link ends at that origin"
+            )
+
+        # shuffle so that request ids are not ordered by cell within a time step
+        permutation = rng.permutation(n)
+        o_lat_lon = origins[o_links[permutation]]
+        d_lat_lon = destinations[d_links[permutation]]
+        passengers = rng.choice(passenger_counts, size=n, p=DEFAULT_PASSENGER_DISTRIBUTION)
+        departure_time = SimTime(t).as_iso_time()
+
+        for i in range(n):
+            yield {
+                "request_id": f"r{id_counter}",
+                "o_lat": o_lat_lon[i, 0],
+                "o_lon": o_lat_lon[i, 1],
+                "d_lat": d_lat_lon[i, 0],
+                "d_lon": d_lat_lon[i, 1],
+                "departure_time": departure_time,
+                "passengers": passengers[i],
+            }
+            id_counter += 1
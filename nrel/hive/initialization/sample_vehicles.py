@@ -1,7 +1,7 @@
 import functools as ft
 import logging
 import random
-from typing import Callable
+from typing import Any, Callable, Dict, Iterator, Sequence, Tuple
 
 from returns.result import Result, Failure, Success
 
@@ -21,6 +21,7 @@ from nrel.hive.state.simulation_state.simulation_state import SimulationState
 from nrel.hive.state.simulation_state.simulation_state_ops import add_vehicle_safe
 from nrel.hive.state.vehicle_state.idle import Idle
 from nrel.hive.util import Ratio
+from nrel.hive.util.typealiases import MechatronicsId
 
 log = logging.getLogger(__name__)
 
@@ -177,3 +178,40 @@ def build_default_soc_sampling_fn(
         return sampled_soc
 
     return _inner
+
+
+def sample_vehicle_rows(
+    count: int,
+    locations: Sequence[Tuple[float, float]],
+    mechatronics_ids: Sequence[MechatronicsId],
+    soc_sampling_function: Callable[[], Ratio],
+    offset: int = 0,
+    random_seed: int = 0,
+) -> Iterator[Dict[str, Any]]:
+    """
+    lazily samples {count} vehicle rows in the vehicles file format, for writing
+    synthetic scenarios to disk without building the vehicles in memory
+
+    :param count: the number of vehicle rows to sample
+    :param locations: the (lat, lon) pairs to sample initial vehicle locations from
+    :param mechatronics_ids: the mechatronics ids to sample from, uniformly
+    :param soc_sampling_function: samples the initial state of charge for a vehicle
+    :param offset: number to begin counting vehicle ids from (by default, begin counting from zero)
+    :param random_seed: random seed value
+    :return: vehicle rows, one at a time
+    """
+    if len(locations) == 0:
+        raise AssertionError("must have at least one location to sample from")
+    if len(mechatronics_ids) == 0:
+        raise AssertionError("must have at least one mechatronics id to sample from")
+
+    rng = random.Random(random_seed)
+    for i in range(offset, offset + count):
+        lat, lon = rng.choice(locations)
+        yield {
+            "vehicle_id": f"v{i}",
+            "lat": lat,
+            "lon": lon,
+            "mechatronics_id": rng.choice(mechatronics_ids),
+            "initial_soc": round(soc_sampling_function(), 4),
+        }
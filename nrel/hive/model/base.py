@@ -58,8 +58,10 @@ class Base(Entity):
         station_id: Optional[StationId],
         stall_count: int,
         membership: Membership = Membership(),
+        position: Optional[EntityPosition] = None,
     ):
-        position = road_network.position_from_geoid(geoid)
+        if position is None:
+            position = road_network.position_from_geoid(geoid)
         if position is None:
             raise ValueError("cannot position base on road network")
 
@@ -77,12 +79,14 @@ class Base(Entity):
         cls,
         row: Dict[str, str],
         road_network: RoadNetwork,
+        position: Optional[EntityPosition] = None,
     ) -> Base:
         """
         converts a csv row to a base
 
         :param row:
         :param road_network:
+        :param position: the row's location already positioned on the road network, if known
         :return:
         """
         if "base_id" not in row:
@@ -113,6 +117,7 @@ class Base(Entity):
                     road_network=road_network,
                     station_id=station_id,
                     stall_count=stall_count,
+                    position=position,
                 )
 
             except ValueError as e:
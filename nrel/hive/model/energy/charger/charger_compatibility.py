@@ -0,0 +1,133 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Iterable, NamedTuple, Tuple
+
+import immutables
+import numpy as np
+
+if TYPE_CHECKING:
+    from nrel.hive.model.energy.charger.charger import Charger
+    from nrel.hive.model.vehicle.mechatronics.mechatronics_interface import MechatronicsInterface
+    from nrel.hive.util.typealiases import ChargerId, MechatronicsId
+
+
+class ChargerCompatibility(NamedTuple):
+    """
+    which chargers each mechatronics type can use, precomputed from the environment.
+
+    chargers are numbered by sorted ChargerId, and a set of chargers is represented as a
+    bitmask with bit i set for charger i. a station offers a compatible charger for a
+    vehicle exactly when the bitmask of its chargers and the bitmask of the chargers the
+    vehicle's mechatronics can use have a bit in common.
+
+    :param mechatronics: the mechatronics table this was built from
+    :param chargers: the chargers table this was built from
+    :param mechatronics_ids: the row order of the matrix
+    :param charger_ids: the column order of the matrix, which is also the bit order
+    :param matrix: a boolean array of shape (mechatronics, chargers), True where compatible
+    :param charger_bits: the bit of each charger
+    :param mechatronics_masks: the bitmask of the chargers each mechatronics can use
+    """
+
+    mechatronics: immutables.Map[MechatronicsId, MechatronicsInterface]
+    chargers: immutables.Map[ChargerId, Charger]
+    mechatronics_ids: Tuple[MechatronicsId, ...]
+    charger_ids: Tuple[ChargerId, ...]
+    matrix: np.ndarray
+    charger_bits: immutables.Map[ChargerId, int]
+    mechatronics_masks: immutables.Map[MechatronicsId, int]
+
+    @classmethod
+    def build(
+        cls,
+        mechatronics: immutables.Map[MechatronicsId, MechatronicsInterface],
+        chargers: immutables.Map[ChargerId, Charger],
+    ) -> ChargerCompatibility:
+        """
+        tests every mechatronics type against every charger type
+
+        :param mechatronics: the environment mechatronics table
+        :param chargers: the environment chargers table
+        :return: the compatibility table
+        """
+        mechatronics_ids = tuple(sorted(mechatronics.keys()))
+        charger_ids = tuple(sorted(chargers.keys()))
+        matrix = np.array(
+            [
+                [mechatronics[m_id].valid_charger(chargers[c_id]) for c_id in charger_ids]
+                for m_id in mechatronics_ids
+            ],
+            dtype=bool,
+        ).reshape(len(mechatronics_ids), len(charger_ids))
+
+        charger_bits = {c_id: 1 << i for i, c_id in enumerate(charger_ids)}
+        mechatronics_masks = {
+            m_id: sum(charger_bits[c_id] for c_id, valid in zip(charger_ids, row) if valid)
+            for m_id, row in zip(mechatronics_ids, matrix)
+        }
+
+        return ChargerCompatibility(
+            mechatronics=mechatronics,
+            chargers=chargers,
+            mechatronics_ids=mechatronics_ids,
+            charger_ids=charger_ids,
+            matrix=matrix,
+            charger_bits=immutables.Map(charger_bits),
+            mechatronics_masks=immutables.Map(mechatronics_masks),
+        )
+
+    def built_for(
+        self,
+        mechatronics: immutables.Map[MechatronicsId, MechatronicsInterface],
+        chargers: immutables.Map[ChargerId, Charger],
+    ) -> bool:
+        """
+        tests if this table was built from these mechatronics and chargers tables
+
+        :param mechatronics: a mechatronics table
+        :param chargers: a chargers table
+        :return: True if this table describes them
+        """
+        return self.mechatronics is mechatronics and self.chargers is chargers
+
+    def mechatronics_mask(self, mechatronics_id: MechatronicsId) -> int:
+        """
+        the bitmask of the chargers a mechatronics type can use
+
+        :param mechatronics_id: the mechatronics type
+        :return: the bitmask, which is 0 for an unknown mechatronics type
+        """
+        return self.mechatronics_masks.get(mechatronics_id, 0)
+
+    def charger_mask(self, charger_ids: Iterable[ChargerId]) -> int:
+        """
+        the bitmask of a set of chargers, such as the chargers offered by a station
+
+        :param charger_ids: the chargers
+        :return: the bitmask, ignoring unknown chargers
+        """
+        mask = 0
+        for charger_id in charger_ids:
+            mask |= self.charger_bits.get(charger_id, 0)
+        return mask
+
+    def compatible(self, mechatronics_id: MechatronicsId, charger_id: ChargerId) -> bool:
+        """
+        tests if a mechatronics type can use a charger type
+
+        :param mechatronics_id: the mechatronics type
+        :param charger_id: the charger type
+        :return: True if compatible, False if not or if either is unknown
+        """
+        mask = self.mechatronics_mask(mechatronics_id)
+        return (mask & self.charger_bits.get(charger_id, 0)) != 0
+
+    def compatible_charger_ids(self, mechatronics_id: MechatronicsId) -> Tuple[ChargerId, ...]:
+        """
+        the chargers a mechatronics type can use
+
+        :param mechatronics_id: the mechatronics type
+        :return: the compatible ChargerIds, in sorted order
+        """
+        mask = self.mechatronics_mask(mechatronics_id)
+        return tuple(c_id for c_id in self.charger_ids if mask & self.charger_bits[c_id])
@@ -1,7 +1,7 @@
 from __future__ import annotations
 
 from dataclasses import dataclass, replace
-from typing import Optional, Dict, TYPE_CHECKING
+from typing import Optional, Dict, Sequence, TYPE_CHECKING
 
 import h3
 
@@ -12,7 +12,7 @@ from nrel.hive.model.passenger import Passenger, create_passenger_id
 from nrel.hive.model.roadnetwork.roadnetwork import RoadNetwork
 from nrel.hive.model.sim_time import SimTime
 from nrel.hive.util.exception import TimeParseError
-from nrel.hive.util.units import Currency, KM_TO_MILE
+from nrel.hive.util.units import Currency, Kilometers, KM_TO_MILE
 
 if TYPE_CHECKING:
     from nrel.hive.model.request import RequestRateStructure
@@ -76,14 +76,41 @@ class Request(Entity):
         fleet_id: Optional[MembershipId] = None,
         value: Currency = 0,
     ) -> Request:
+        return cls.build_from_positions(
+            request_id=request_id,
+            origin_position=road_network.position_from_geoid(origin),
+            destination_position=road_network.position_from_geoid(destination),
+            departure_time=departure_time,
+            passengers=passengers,
+            allows_pooling=allows_pooling,
+            fleet_id=fleet_id,
+            value=value,
+        )
+
+    @classmethod
+    def build_from_positions(
+        cls,
+        request_id: RequestId,
+        origin_position: Optional[EntityPosition],
+        destination_position: Optional[EntityPosition],
+        departure_time: SimTime,
+        passengers: int,
+        allows_pooling: bool,
+        fleet_id: Optional[MembershipId] = None,
+        value: Currency = 0,
+    ) -> Request:
+        """
+        builds a request from origin and destination positions which were already
+        snapped to the road network, such as by RoadNetwork.positions_from_geoids
+
+        :raises: ValueError if either position is missing
+        """
         assert departure_time >= 0
         assert passengers > 0
-        origin_position = road_network.position_from_geoid(origin)
         if origin_position is None:
             raise ValueError(
                 f"request {request_id} origin cannot be positioned on the road network"
             )
-        destination_position = road_network.position_from_geoid(destination)
         if destination_position is None:
             raise ValueError(
                 f"request {request_id} destination cannot be positioned on the road network"
@@ -131,78 +158,57 @@ class Request(Entity):
         :param road_network: the road network
         :return: a Request, or an error
         """
-        if "request_id" not in row:
-            return (
-                IOError("cannot load a request without a 'request_id'"),
-                None,
-            )
-        elif "o_lat" not in row:
-            return (
-                IOError("cannot load a request without an 'o_lat' value"),
-                None,
-            )
-        elif "o_lon" not in row:
-            return (
-                IOError("cannot load a request without an 'o_lon' value"),
-                None,
-            )
-        elif "d_lat" not in row:
-            return (
-                IOError("cannot load a request without a 'd_lat' value"),
-                None,
-            )
-        elif "d_lon" not in row:
-            return (
-                IOError("cannot load a request without a 'd_lon' value"),
-                None,
-            )
-        elif "departure_time" not in row:
-            return (
-                IOError("cannot load a request without a 'departure_time'"),
-                None,
-            )
-        elif "passengers" not in row:
-            return (
-                IOError("cannot load a request without a number of 'passengers'"),
-                None,
-            )
-        else:
-            request_id = row["request_id"]
-            fleet_id = row.get("fleet_id")
-            try:
-                o_lat, o_lon = float(row["o_lat"]), float(row["o_lon"])
-                d_lat, d_lon = float(row["d_lat"]), float(row["d_lon"])
-                o_geoid = h3.geo_to_h3(o_lat, o_lon, env.config.sim.sim_h3_resolution)
-                d_geoid = h3.geo_to_h3(d_lat, d_lon, env.config.sim.sim_h3_resolution)
-
-                try:
-                    departure_time_result = SimTime.build(row["departure_time"])
-                except TimeParseError as e:
-                    return e, None
-
-                passengers = int(row["passengers"])
-                allows_pooling = (
-                    bool(row["allows_pooling"]) if row.get("allows_pooling") is not None else False
-                )
+        error, parsed = _parse_row(row, env.config.sim.sim_h3_resolution)
+        if error or parsed is None:
+            return error, None
+        try:
+            request = Request.build(road_network=road_network, **parsed)
+            return None, request
+        except ValueError:
+            return _invalid_row_error(row), None
 
-                request = Request.build(
-                    request_id=request_id,
-                    fleet_id=fleet_id,
-                    origin=o_geoid,
-                    destination=d_geoid,
-                    road_network=road_network,
-                    departure_time=departure_time_result,
-                    passengers=passengers,
-                    allows_pooling=allows_pooling,
+    @classmethod
+    def from_rows(
+        cls, rows: Sequence[Dict[str, str]], env: Environment, road_network: RoadNetwork
+    ) -> Tuple[Tuple[Optional[Exception], Optional[Request]], ...]:
+        """
+        takes a batch of csv rows and turns each into a Request, snapping all origins and
+        destinations to the road network together
+
+
+        :param rows: rows as interpreted by csv.DictReader
+        :param env: the static environment variables
+        :param road_network: the road network
+        :return: a Request, or an error, for each row
+        """
+        parsed_rows = [_parse_row(row, env.config.sim.sim_h3_resolution) for row in rows]
+        valid = [parsed for error, parsed in parsed_rows if error is None and parsed is not None]
+        positions = road_network.positions_from_geoids(
+            [p["origin"] for p in valid] + [p["destination"] for p in valid]
+        )
+        origin_positions = iter(positions[: len(valid)])
+        destination_positions = iter(positions[len(valid) :])
+
+        def _build(
+            row: Dict[str, str], parsed_row: Tuple[Optional[Exception], Optional[Dict]]
+        ) -> Tuple[Optional[Exception], Optional[Request]]:
+            error, parsed = parsed_row
+            if error or parsed is None:
+                return error, None
+            origin_position = next(origin_positions)
+            destination_position = next(destination_positions)
+            del parsed["origin"], parsed["destination"]
+            try:
+                request = Request.build_from_positions(
+                    origin_position=origin_position,
+                    destination_position=destination_position,
+                    **parsed,
                 )
                 return None, request
             except ValueError:
-                return (
-                    IOError(
-                        f"unable to parse request {request_id} from row due to invalid value(s): {row}"
-                    ),
-                    None,
-                )
+                return _invalid_row_error(row), None
+
+        return tuple(_build(row, parsed_row) for row, parsed_row in zip(rows, parsed_rows))
 
     def assign_dispatched_vehicle(self, vehicle_id: VehicleId, current_time: SimTime) -> Request:
         """
@@ -239,10 +245,25 @@ class Request(Entity):
         """
         if rate_structure.price_per_mile > 0:
             distance_km = road_network.distance_by_geoid_km(self.origin, self.destination)
-            distance_miles = distance_km * KM_TO_MILE
-            distance_price = rate_structure.price_per_mile * distance_miles
         else:
-            distance_price = 0
+            distance_km = 0
+        return self.assign_value_by_distance(rate_structure, distance_km)
+
+    def assign_value_by_distance(
+        self, rate_structure: RequestRateStructure, distance_km: Kilometers
+    ) -> Request:
+        """
+        assigns a value to this request from a trip distance that was already computed,
+        such as by RoadNetwork.distances_by_geoid_km
+
+
+        :param rate_structure: the rate structure to apply to the request value
+        :param distance_km: the road network distance from origin to destination
+
+        :return: the updated request
+        """
+        distance_miles = distance_km * KM_TO_MILE
+        distance_price = rate_structure.price_per_mile * distance_miles
         price = rate_structure.base_price + distance_price
         return replace(self, value=max(rate_structure.minimum_price, price))
 
@@ -264,3 +285,64 @@ class Request(Entity):
         """
         updated_membership = self.membership.add_membership(membership_id)
         return replace(self, membership=updated_membership)
+
+
+_REQUIRED_ROW_FIELDS = (
+    ("request_id", "a 'request_id'"),
+    ("o_lat", "an 'o_lat' value"),
+    ("o_lon", "an 'o_lon' value"),
+    ("d_lat", "a 'd_lat' value"),
+    ("d_lon", "a 'd_lon' value"),
+    ("departure_time", "a 'departure_time'"),
+    ("passengers", "a number of 'passengers'"),
+)
+
+
+def _parse_row(
+    row: Dict[str, str], sim_h3_resolution: int
+) -> Tuple[Optional[Exception], Optional[Dict]]:
+    """
+    parses the fields of a request csv row into the arguments of Request.build (without the road network)
+
+    :param row: a row as interpreted by csv.DictReader
+    :param sim_h3_resolution: the h3 resolution of the simulation
+    :return: the Request.build arguments, or an error
+    """
+    for field, description in _REQUIRED_ROW_FIELDS:
+        if field not in row:
+            return IOError(f"cannot load a request without {description}"), None
+
+    try:
+        o_lat, o_lon = float(row["o_lat"]), float(row["o_lon"])
+        d_lat, d_lon = float(row["d_lat"]), float(row["d_lon"])
+        o_geoid = h3.geo_to_h3(o_lat, o_lon, sim_h3_resolution)
+        d_geoid = h3.geo_to_h3(d_lat, d_lon, sim_h3_resolution)
+
+        try:
+            departure_time_result = SimTime.build(row["departure_time"])
+        except TimeParseError as e:
+            return e, None
+
+        passengers = int(row["passengers"])
+        allows_pooling = (
+            bool(row["allows_pooling"]) if row.get("allows_pooling") is not None else False
+        )
+    except ValueError:
+        return _invalid_row_error(row), None
+
+    parsed = {
+        "request_id": row["request_id"],
+        "fleet_id": row.get("fleet_id"),
+        "origin": o_geoid,
+        "destination": d_geoid,
+        "departure_time": departure_time_result,
+        "passengers": passengers,
+        "allows_pooling": allows_pooling,
+    }
+    return None, parsed
+
+
+def _invalid_row_error(row: Dict[str, str]) -> Exception:
+    return IOError(
+        f"unable to parse request {row.get('request_id')} from row due to invalid value(s): {row}"
+    )
@@ -0,0 +1,229 @@
+from __future__ import annotations
+
+import csv
+import zipfile
+from pathlib import Path
+from typing import Dict, List, NamedTuple, Optional, Tuple, Union
+
+import h3
+import numpy as np
+
+from nrel.hive.model.request.request import Request
+from nrel.hive.model.roadnetwork.roadnetwork import RoadNetwork
+from nrel.hive.model.sim_time import SimTime
+from nrel.hive.util.typealiases import H3Resolution
+
+NO_FLEET = -1
+
+# the array fields of RequestArrays, each stored as one array in the .npz file
+COLUMNS = (
+    "departure_time",
+    "request_id",
+    "origin",
+    "destination",
+    "passengers",
+    "allows_pooling",
+    "fleet",
+    "fleet_ids",
+)
+
+
+class RequestArrays(NamedTuple):
+    """
+    a preprocessed, columnar representation of a requests file, sorted by departure time.
+
+    geoids are stored as H3 integers at the simulation resolution they were converted for
+    and fleets as indices into fleet_ids, so a time step's batch of requests is found with
+    np.searchsorted over departure_time and built without any per-row string parsing.
+    when loaded from disk, each column is a read-only memory map into the file.
+    """
+
+    departure_time: np.ndarray
+    request_id: np.ndarray
+    origin: np.ndarray
+    destination: np.ndarray
+    passengers: np.ndarray
+    allows_pooling: np.ndarray
+    fleet: np.ndarray
+    fleet_ids: np.ndarray
+    sim_h3_resolution: H3Resolution
+
+    @classmethod
+    def from_csv(
+        cls, request_file: Union[str, Path], sim_h3_resolution: H3Resolution = 15
+    ) -> RequestArrays:
+        """
+        converts a requests csv file into columnar arrays
+
+        :param request_file: the requests file, in the same format read by Request.from_row
+        :param sim_h3_resolution: the simulation h3 resolution to store geoids at
+        :return: the request arrays, sorted by departure time
+        :raises: IOError if a row cannot be parsed
+        """
+        departure_time: List[int] = []
+        request_id: List[str] = []
+        origin: List[int] = []
+        destination: List[int] = []
+        passengers: List[int] = []
+        allows_pooling: List[bool] = []
+        fleet: List[int] = []
+        fleet_index: Dict[str, int] = {}
+
+        with Path(request_file).open("r", encoding="utf-8-sig") as f:
+            for row in csv.DictReader(f):
+                try:
+                    o_geoid = h3.geo_to_h3(
+                        float(row["o_lat"]), float(row["o_lon"]), sim_h3_resolution
+                    )
+                    d_geoid = h3.geo_to_h3(
+                        float(row["d_lat"]), float(row["d_lon"]), sim_h3_resolution
+                    )
+                    departure_time.append(SimTime.build(row["departure_time"]))
+                    passengers.append(int(row["passengers"]))
+                except (KeyError, ValueError) as e:
+                    raise IOError(f"unable to convert request row {row}") from e
+                request_id.append(row["request_id"])
+                origin.append(h3.string_to_h3(o_geoid))
+                destination.append(h3.string_to_h3(d_geoid))
+                allows_pooling.append(
+                    bool(row["allows_pooling"]) if row.get("allows_pooling") is not None else False
+                )
+                fleet_id = row.get("fleet_id")
+                if fleet_id:
+                    fleet.append(fleet_index.setdefault(fleet_id, len(fleet_index)))
+                else:
+                    fleet.append(NO_FLEET)
+
+        departures = np.array(departure_time, dtype=np.int64)
+        # stable, so requests sharing a departure time keep their file order
+        order = np.argsort(departures, kind="stable")
+
+        return RequestArrays(
+            departure_time=departures[order],
+            request_id=np.array(request_id, dtype=np.str_)[order],
+            origin=np.array(origin, dtype=np.uint64)[order],
+            destination=np.array(destination, dtype=np.uint64)[order],
+            passengers=np.array(passengers, dtype=np.int16)[order],
+            allows_pooling=np.array(allows_pooling, dtype=np.bool_)[order],
+            fleet=np.array(fleet, dtype=np.int16)[order],
+            fleet_ids=np.array(list(fleet_index.keys()), dtype=np.str_),
+            sim_h3_resolution=sim_h3_resolution,
+        )
+
+    def save(self, file: Union[str, Path]):
+        """
+        writes the arrays to an uncompressed .npz file, which can be memory-mapped by RequestArrays.load
+
+        :param file: the file to write
+        """
+        columns = {c: getattr(self, c) for c in COLUMNS}
+        with Path(file).open("wb") as f:
+            np.savez(f, sim_h3_resolution=np.array(self.sim_h3_resolution), **columns)
+
+    @classmethod
+    def load(cls, file: Union[str, Path]) -> RequestArrays:
+        """
+        memory-maps the columns of a file written by RequestArrays.save
+
+        :param file: the file to load
+        :return: the request arrays, backed by read-only memory maps
+        :raises: IOError if the file is not a valid request arrays file
+        """
+        columns = {}
+        with zipfile.ZipFile(file) as zf, open(file, "rb") as f:
+            for info in zf.infolist():
+                if info.compress_type != zipfile.ZIP_STORED:
+                    raise IOError(f"cannot memory-map compressed column {info.filename} in {file}")
+                name = info.filename[: -len(".npy")]
+                columns[name] = _memmap_npy_member(file, f, info)
+
+        missing = [c for c in COLUMNS + ("sim_h3_resolution",) if c not in columns]
+        if missing:
+            raise IOError(f"request arrays file {file} is missing columns {missing}")
+
+        return RequestArrays(
+            sim_h3_resolution=int(columns.pop("sim_h3_resolution")),
+            **{c: columns[c] for c in COLUMNS},
+        )
+
+    def departing_before(self, start: int, time: SimTime) -> int:
+        """
+        finds the end of the batch of requests departing before a time
+
+        :param start: the index to search from
+        :param time: the (exclusive) departure time bound
+        :return: the index after the last request departing before the time
+        """
+        return start + int(np.searchsorted(self.departure_time[start:], time, side="left"))
+
+    def build_requests(
+        self, start: int, end: int, road_network: RoadNetwork
+    ) -> Tuple[Tuple[Optional[Exception], Optional[Request]], ...]:
+        """
+        builds the Requests stored between two indices, snapping all origins and
+        destinations to the road network together
+
+        :param start: the index of the first request
+        :param end: the index after the last request
+        :param road_network: the road network
+        :return: a Request, or an error, for each index
+        """
+        origins = [h3.h3_to_string(int(g)) for g in self.origin[start:end]]
+        destinations = [h3.h3_to_string(int(g)) for g in self.destination[start:end]]
+        positions = road_network.positions_from_geoids(origins + destinations)
+        n = end - start
+
+        def _build(i: int) -> Tuple[Optional[Exception], Optional[Request]]:
+            index = start + i
+            fleet = int(self.fleet[index])
+            try:
+                request = Request.build_from_positions(
+                    request_id=str(self.request_id[index]),
+                    origin_position=positions[i],
+                    destination_position=positions[n + i],
+                    departure_time=SimTime(int(self.departure_time[index])),
+                    passengers=int(self.passengers[index]),
+                    allows_pooling=bool(self.allows_pooling[index]),
+                    fleet_id=str(self.fleet_ids[fleet]) if fleet != NO_FLEET else None,
+                )
+                return None, request
+            except ValueError as e:
+                return e, None
+
+        return tuple(_build(i) for i in range(n))
+
+
+def _memmap_npy_member(file: Union[str, Path], f, info: zipfile.ZipInfo) -> np.ndarray:
+    """
+    memory-maps an uncompressed .npy member of a zip archive in place
+
+    :param file: the archive path
+    :param f: the archive opened in binary mode
+    :param info: the zip entry for the member
+    :return: a read-only memory map of the member's array
+    """
+    # the local file header is 30 bytes plus the (local) file name and extra fields
+    f.seek(info.header_offset + 26)
+    name_length, extra_length = np.frombuffer(f.read(4), dtype="<u2")
+    f.seek(info.header_offset + 30 + int(name_length) + int(extra_length))
+
+    version = np.lib.format.read_magic(f)
+    if version == (1, 0):
+        shape, fortran_order, dtype = np.lib.format.read_array_header_1_0(f)
+    elif version == (2, 0):
+        shape, fortran_order, dtype = np.lib.format.read_array_header_2_0(f)
+    else:
+        raise IOError(f"unsupported npy format version {version} in {file}")
+    if dtype.hasobject:
+        raise IOError(f"cannot memory-map object column {info.filename} in {file}")
+    if len(shape) == 0 or 0 in shape:
+        # empty and scalar arrays cannot be memory-mapped, and are small enough to read
+        return np.fromfile(f, dtype=dtype, count=int(np.prod(shape))).reshape(shape)
+    return np.memmap(
+        file,
+        dtype=dtype,
+        mode="r",
+        offset=f.tell(),
+        shape=shape,
+        order="F" if fortran_order else "C",
+    )
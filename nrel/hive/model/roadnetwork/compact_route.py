@@ -0,0 +1,188 @@
+from __future__ import annotations
+
+from collections.abc import Sequence
+from typing import TYPE_CHECKING, Dict, Iterator, Mapping, NamedTuple, Optional, Tuple, Union
+
+import numpy as np
+
+from nrel.hive.model.roadnetwork.linktraversal import LinkTraversal
+
+if TYPE_CHECKING:
+    from nrel.hive.model.roadnetwork.link import Link
+    from nrel.hive.util.typealiases import LinkId
+
+
+class LinkTable(NamedTuple):
+    """
+    the links of a road network by ordinal, which compact routes refer to.
+
+    :param link_traversals: a LinkTraversal over each whole link, by link ordinal
+    :param ordinals: the ordinal of each link by LinkId
+    """
+
+    link_traversals: Tuple[LinkTraversal, ...]
+    ordinals: Dict[LinkId, int]
+
+    @classmethod
+    def build(cls, link_ids: Tuple[LinkId, ...], links: Mapping[LinkId, Link]) -> LinkTable:
+        """
+        builds the link table for a road network
+
+        :param link_ids: the LinkId of each link ordinal
+        :param links: the road network Links by LinkId
+        :return: the link table
+        """
+        return LinkTable(
+            link_traversals=tuple(links[link_id].to_link_traversal() for link_id in link_ids),
+            ordinals={link_id: ordinal for ordinal, link_id in enumerate(link_ids)},
+        )
+
+
+class CompactRoute(Sequence):
+    """
+    a route stored as an array of link ordinals into a road network LinkTable.
+
+    only the first and last link of a route may cover part of a link, which are kept as
+    LinkTraversals. a compact route behaves as a read-only tuple of LinkTraversals, and
+    slicing it shares the ordinal array, so consumers of a Route do not need to know
+    about it. concatenation materializes a tuple, except for replacing the head link
+    with a partial traversal of the same link, which is how traverse updates a route.
+    """
+
+    __slots__ = ("table", "ordinals", "head", "last")
+
+    def __init__(
+        self,
+        table: LinkTable,
+        ordinals: np.ndarray,
+        head: Optional[LinkTraversal] = None,
+        last: Optional[LinkTraversal] = None,
+    ):
+        """
+        :param table: the link table of the road network
+        :param ordinals: the ordinal of each link in the route
+        :param head: the first link, if it is not the whole link from the table
+        :param last: the last link, if it is not the whole link from the table
+        """
+        self.table = table
+        self.ordinals = ordinals
+        self.head = head
+        self.last = last
+
+    @classmethod
+    def from_route(
+        cls, route: Tuple[LinkTraversal, ...], table: LinkTable
+    ) -> Union[CompactRoute, Tuple[LinkTraversal, ...]]:
+        """
+        compacts a route
+
+        :param route: the route to compact
+        :param table: the link table of the road network the route is on
+        :return: the compact route, or the route unchanged if it is empty or contains a
+                 link which is not in the table
+        """
+        if len(route) == 0:
+            return route
+        ordinals = np.empty(len(route), dtype=np.int32)
+        for i, link in enumerate(route):
+            ordinal = table.ordinals.get(link.link_id)
+            if ordinal is None:
+                return route
+            ordinals[i] = ordinal
+
+        inner = zip(ordinals[1:-1].tolist(), route[1:-1])
+        if any(table.link_traversals[ordinal] != link for ordinal, link in inner):
+            return route
+        head, last = route[0], route[-1]
+        return CompactRoute(
+            table=table,
+            ordinals=ordinals,
+            head=head if head != table.link_traversals[ordinals[0]] else None,
+            last=last if len(route) > 1 and last != table.link_traversals[ordinals[-1]] else None,
+        )
+
+    def to_route(self) -> Tuple[LinkTraversal, ...]:
+        """
+        materializes the route as LinkTraversals
+
+        :return: the route as a tuple
+        """
+        return tuple(self)
+
+    def __len__(self) -> int:
+        return len(self.ordinals)
+
+    def __getitem__(self, index):
+        n = len(self.ordinals)
+        if isinstance(index, slice):
+            start, stop, step = index.indices(n)
+            if step != 1:
+                return self.to_route()[index]
+            elif stop <= start:
+                return ()
+            return CompactRoute(
+                table=self.table,
+                ordinals=self.ordinals[start:stop],
+                head=self.head if start == 0 else None,
+                last=self.last if stop == n else None,
+            )
+        if index < 0:
+            index += n
+        if not 0 <= index < n:
+            raise IndexError("route index out of range")
+        if index == n - 1 and self.last is not None:
+            return self.last
+        elif index == 0 and self.head is not None:
+            return self.head
+        return self.table.link_traversals[self.ordinals[index]]
+
+    def __iter__(self) -> Iterator[LinkTraversal]:
+        link_traversals = self.table.link_traversals
+        n = len(self.ordinals)
+        for index, ordinal in enumerate(self.ordinals.tolist()):
+            if index == n - 1 and self.last is not None:
+                yield self.last
+            elif index == 0 and self.head is not None:
+                yield self.head
+            else:
+                yield link_traversals[ordinal]
+
+    def __add__(self, other):
+        return self.to_route() + tuple(other)
+
+    def __radd__(self, other):
+        if len(other) == 0:
+            return self
+        elif len(other) == 1:
+            return self.prepend(other[0])
+        return tuple(other) + self.to_route()
+
+    def prepend(self, link: LinkTraversal) -> Union[CompactRoute, Tuple[LinkTraversal, ...]]:
+        """
+        adds a link to the front of the route, such as a partial link followed by the rest
+        of the route. the result stays compact if the link is in the table and the route
+        does not already start with a partial link.
+
+        :param link: the link to add
+        :return: the longer route
+        """
+        ordinal = self.table.ordinals.get(link.link_id)
+        if ordinal is None or self.head is not None:
+            return (link,) + self.to_route()
+        return CompactRoute(
+            table=self.table,
+            ordinals=np.concatenate((np.array([ordinal], dtype=np.int32), self.ordinals)),
+            head=link if link != self.table.link_traversals[ordinal] else None,
+            last=self.last,
+        )
+
+    def __eq__(self, other) -> bool:
+        if isinstance(other, (tuple, CompactRoute)):
+            return self.to_route() == tuple(other)
+        return NotImplemented
+
+    def __hash__(self) -> int:
+        return hash(self.to_route())
+
+    def __repr__(self) -> str:
+        return f"CompactRoute{self.to_route()!r}"
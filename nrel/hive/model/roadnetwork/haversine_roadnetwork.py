@@ -1,6 +1,8 @@
 from __future__ import annotations
 
-from typing import Optional
+from typing import Dict, List, Optional, Sequence
+
+import numpy as np
 
 import nrel.hive.model.roadnetwork.haversine_link_id_ops as h_ops
 from nrel.hive.model.entity_position import EntityPosition
@@ -12,7 +14,7 @@ from nrel.hive.model.roadnetwork.route import Route, empty_route
 from nrel.hive.model.sim_time import SimTime
 from nrel.hive.util.h3_ops import H3Ops
 from nrel.hive.util.typealiases import GeoId, LinkId, H3Resolution
-from nrel.hive.util.units import Kilometers
+from nrel.hive.util.units import Kilometers, SECONDS_IN_HOUR
 
 
 class HaversineRoadNetwork(RoadNetwork):
@@ -60,6 +62,42 @@ class HaversineRoadNetwork(RoadNetwork):
 
         return route
 
+    def travel_time_matrix(
+        self, origins: Sequence[EntityPosition], destinations: Sequence[EntityPosition]
+    ) -> np.ndarray:
+        """
+        the travel time between each origin and destination at the network speed
+
+        :param origins: the origin positions
+        :param destinations: the destination positions
+        :return: an array of shape (len(origins), len(destinations)) of travel times in seconds
+        """
+        distances = self.distance_matrix(origins, destinations)
+        # whole seconds, as with LinkTraversal.travel_time_seconds
+        return np.floor(distances / self._AVG_SPEED_KMPH * SECONDS_IN_HOUR)
+
+    def distance_matrix(
+        self, origins: Sequence[EntityPosition], destinations: Sequence[EntityPosition]
+    ) -> np.ndarray:
+        """
+        the great circle distance between each origin and destination, computed at once
+
+        :param origins: the origin positions
+        :param destinations: the destination positions
+        :return: an array of shape (len(origins), len(destinations)) of distances in kilometers
+        """
+        distances = H3Ops.great_circle_distance_matrix(
+            H3Ops.coordinates(o.geoid for o in origins),
+            H3Ops.coordinates(d.geoid for d in destinations),
+        )
+        # the route between equal positions is empty
+        destination_columns: Dict[EntityPosition, List[int]] = {}
+        for j, d in enumerate(destinations):
+            destination_columns.setdefault(d, []).append(j)
+        for i, o in enumerate(origins):
+            distances[i, destination_columns.get(o, [])] = 0.0
+        return distances
+
     def distance_by_geoid_km(self, origin: GeoId, destination: GeoId) -> Kilometers:
         return H3Ops.great_circle_distance(origin, destination)
 
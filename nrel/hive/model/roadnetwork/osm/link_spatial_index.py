@@ -0,0 +1,259 @@
+from __future__ import annotations
+
+import math
+from pathlib import Path
+from typing import NamedTuple, Sequence, Tuple, Union
+
+import numpy as np
+from scipy.spatial import cKDTree
+
+from nrel.hive.util.typealiases import LinkId
+from nrel.hive.util.units import Meters
+
+EARTH_RADIUS_M = 6371008.8
+DEFAULT_SAMPLE_SPACING_M: Meters = 25.0
+
+# when a point is equidistant (within this tolerance) to two links, as happens with the two
+# directions of a road, it is snapped to the link whose start it is closest to
+_TIE_TOLERANCE_M = 1e-6
+
+# the number of nearest sample points a single point query refines before falling back to
+# gathering every sample point within the candidate radius
+_NEAREST_SAMPLES = 8
+
+
+class LinkSpatialIndex(NamedTuple):
+    """
+    a spatial index over the road network link segments, in a local equirectangular
+    projection (meters) centered on the network.
+
+    each link segment is sampled at most sample_spacing_m apart and the sample points are
+    indexed in a KD-tree. a nearest link query finds the nearest sample point, gathers every
+    sample point that could belong to a nearer segment, and then refines those candidates
+    with an exact point-to-segment distance.
+
+    :param origin: the (lat, lon) origin of the projection
+    :param link_ids: the LinkId of each segment, in link ordinal order
+    :param segments: an array of shape (n, 4) of projected segment endpoints (x0, y0, x1, y1)
+    :param sample_spacing_m: the maximum distance between sample points along a segment
+    :param sample_links: the link ordinal of each sample point in the tree
+    :param tree: a KD-tree over the sample points
+    """
+
+    origin: Tuple[float, float]
+    link_ids: Tuple[LinkId, ...]
+    segments: np.ndarray
+    sample_spacing_m: Meters
+    sample_links: np.ndarray
+    tree: cKDTree
+
+    @classmethod
+    def build(
+        cls,
+        link_ids: Sequence[LinkId],
+        coordinates: np.ndarray,
+        sample_spacing_m: Meters = DEFAULT_SAMPLE_SPACING_M,
+    ) -> LinkSpatialIndex:
+        """
+        builds a spatial index over a set of straight link segments
+
+        :param link_ids: the LinkId of each link
+        :param coordinates: an array of shape (n, 4) of (src_lat, src_lon, dst_lat, dst_lon)
+        :param sample_spacing_m: the maximum distance between sample points along a segment
+        :return: the spatial index
+        """
+        coordinates = np.asarray(coordinates, dtype=np.float64).reshape(-1, 4)
+        if len(coordinates) > 0:
+            lats = np.concatenate([coordinates[:, 0], coordinates[:, 2]])
+            lons = np.concatenate([coordinates[:, 1], coordinates[:, 3]])
+            origin = (
+                float((lats.min() + lats.max()) / 2),
+                float((lons.min() + lons.max()) / 2),
+            )
+        else:
+            origin = (0.0, 0.0)
+
+        start = _project(coordinates[:, 0:2], origin)
+        end = _project(coordinates[:, 2:4], origin)
+        segments = np.hstack([start, end])
+        return cls.from_segments(origin, tuple(link_ids), segments, sample_spacing_m)
+
+    @classmethod
+    def from_segments(
+        cls,
+        origin: Tuple[float, float],
+        link_ids: Tuple[LinkId, ...],
+        segments: np.ndarray,
+        sample_spacing_m: Meters,
+    ) -> LinkSpatialIndex:
+        """
+        samples a set of projected segments and builds the KD-tree over the samples
+
+        :param origin: the (lat, lon) origin of the projection
+        :param link_ids: the LinkId of each segment
+        :param segments: an array of shape (n, 4) of projected segment endpoints
+        :param sample_spacing_m: the maximum distance between sample points along a segment
+        :return: the spatial index
+        """
+        start, end = segments[:, 0:2], segments[:, 2:4]
+        lengths = np.linalg.norm(end - start, axis=1)
+        intervals = np.maximum(np.ceil(lengths / sample_spacing_m), 1).astype(np.int64)
+
+        # each segment is sampled at t = 0, 1/k, ..., 1 for its k intervals
+        counts = intervals + 1
+        sample_links = np.repeat(np.arange(len(segments), dtype=np.int64), counts)
+        first_sample = np.repeat(np.cumsum(counts) - counts, counts)
+        t = (np.arange(len(sample_links)) - first_sample) / np.repeat(intervals, counts)
+        samples = start[sample_links] + t[:, np.newaxis] * (end - start)[sample_links]
+
+        return LinkSpatialIndex(
+            origin=origin,
+            link_ids=link_ids,
+            segments=segments,
+            sample_spacing_m=sample_spacing_m,
+            sample_links=sample_links,
+            tree=cKDTree(samples.reshape(-1, 2)),
+        )
+
+    def nearest_links(self, latlon: np.ndarray) -> np.ndarray:
+        """
+        finds the nearest link segment to each of a batch of coordinates
+
+        :param latlon: an array of shape (n, 2) of lat/lon pairs
+        :return: an array of shape (n,) of link ordinals
+        """
+        points = _project(np.asarray(latlon, dtype=np.float64).reshape(-1, 2), self.origin)
+        if len(points) == 0:
+            return np.zeros(0, dtype=np.int64)
+
+        # the nearest segment's closest point is within half a sample spacing of one of
+        # its samples, so every sample within that distance of the nearest sample's
+        # distance is a candidate
+        nearest_sample_distance, _ = self.tree.query(points, workers=-1)
+        radius = nearest_sample_distance + self.sample_spacing_m / 2 + _TIE_TOLERANCE_M
+        candidates = self.tree.query_ball_point(points, radius, workers=-1)
+
+        counts = np.fromiter((len(c) for c in candidates), dtype=np.int64, count=len(points))
+        query_index = np.repeat(np.arange(len(points)), counts)
+        candidate_links = self.sample_links[np.concatenate(candidates).astype(np.int64)]
+
+        distance, t = _point_to_segment(points[query_index], self.segments[candidate_links])
+        score = distance + _TIE_TOLERANCE_M * t
+
+        # sort candidates by query, then by score, then by ordinal, and keep the first of each
+        order = np.lexsort((candidate_links, score, query_index))
+        first_of_query = np.cumsum(counts) - counts
+        return candidate_links[order[first_of_query]]
+
+    def nearest_link(self, lat: float, lon: float) -> int:
+        """
+        finds the nearest link segment to a single coordinate, with the same result as
+        nearest_links. the candidates are almost always among a few nearest sample points,
+        so those are refined directly instead of with the batch query.
+
+        :param lat: the latitude of the point
+        :param lon: the longitude of the point
+        :return: the link ordinal, or -1 if the index is empty
+        """
+        sample_count = len(self.sample_links)
+        if sample_count == 0:
+            return -1
+        lat0, lon0 = self.origin
+        x = math.radians(lon - lon0) * math.cos(math.radians(lat0)) * EARTH_RADIUS_M
+        y = math.radians(lat - lat0) * EARTH_RADIUS_M
+
+        k = min(_NEAREST_SAMPLES, sample_count)
+        distances, samples = self.tree.query((x, y), k=k)
+        distances, samples = np.atleast_1d(distances), np.atleast_1d(samples)
+        radius = distances[0] + self.sample_spacing_m / 2 + _TIE_TOLERANCE_M
+        if k < sample_count and distances[-1] <= radius:
+            # the nearest samples may not hold every candidate
+            samples = self.tree.query_ball_point((x, y), radius)
+
+        candidate_links = list(dict.fromkeys(self.sample_links[samples].tolist()))
+        best = (math.inf, -1)
+        for link, (x0, y0, x1, y1) in zip(
+            candidate_links, self.segments[candidate_links].tolist()
+        ):
+            # the same arithmetic as _point_to_segment
+            dx, dy = x1 - x0, y1 - y0
+            length_squared = dx * dx + dy * dy
+            t = ((x - x0) * dx + (y - y0) * dy) / length_squared if length_squared > 0 else 0.0
+            t = min(max(t, 0.0), 1.0)
+            cx, cy = x - (x0 + t * dx), y - (y0 + t * dy)
+            candidate = (math.sqrt(cx * cx + cy * cy) + _TIE_TOLERANCE_M * t, link)
+            best = min(best, candidate)
+        return best[1]
+
+    def save(self, file: Union[str, Path], source_digest: str = ""):
+        """
+        writes the projected link segments to an uncompressed .npz file
+
+        :param file: the file to write
+        :param source_digest: identifies the road network file the index was built from
+        """
+        with Path(file).open("wb") as f:
+            np.savez(
+                f,
+                origin=np.array(self.origin),
+                link_ids=np.array(self.link_ids, dtype=np.str_),
+                segments=self.segments,
+                sample_spacing_m=np.array(self.sample_spacing_m),
+                source_digest=np.array(source_digest, dtype=np.str_),
+            )
+
+    @classmethod
+    def load(cls, file: Union[str, Path]) -> Tuple[LinkSpatialIndex, str]:
+        """
+        reads a spatial index written by LinkSpatialIndex.save
+
+        :param file: the file to read
+        :return: the spatial index, and the digest of the road network file it was built from
+        :raises: IOError if the file is not a valid link spatial index file
+        """
+        try:
+            with np.load(file) as data:
+                lat, lon = data["origin"]
+                index = cls.from_segments(
+                    origin=(float(lat), float(lon)),
+                    link_ids=tuple(str(link_id) for link_id in data["link_ids"]),
+                    segments=data["segments"].reshape(-1, 4),
+                    sample_spacing_m=float(data["sample_spacing_m"]),
+                )
+                return index, str(data["source_digest"])
+        except (KeyError, ValueError) as e:
+            raise IOError(f"{file} is not a valid link spatial index file") from e
+
+
+def _project(latlon: np.ndarray, origin: Tuple[float, float]) -> np.ndarray:
+    """
+    projects lat/lon pairs into meters east and north of an origin
+
+    :param latlon: an array of shape (n, 2) of lat/lon pairs
+    :param origin: the (lat, lon) origin of the projection
+    :return: an array of shape (n, 2) of (x, y) positions in meters
+    """
+    lat0, lon0 = origin
+    x = np.radians(latlon[:, 1] - lon0) * math.cos(math.radians(lat0)) * EARTH_RADIUS_M
+    y = np.radians(latlon[:, 0] - lat0) * EARTH_RADIUS_M
+    return np.column_stack([x, y])
+
+
+def _point_to_segment(points: np.ndarray, segments: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    computes the distance from each point to its paired segment
+
+    :param points: an array of shape (n, 2) of points
+    :param segments: an array of shape (n, 4) of segment endpoints
+    :return: the distance to each segment, and the position of the closest
+             point along each segment as a fraction of its length
+    """
+    start, end = segments[:, 0:2], segments[:, 2:4]
+    direction = end - start
+    length_squared = np.einsum("ij,ij->i", direction, direction)
+    along = np.einsum("ij,ij->i", points - start, direction)
+    # zero-length segments are treated as a point at their start
+    t = np.divide(along, length_squared, out=np.zeros_like(along), where=length_squared > 0)
+    t = np.clip(t, 0, 1)
+    closest = start + t[:, np.newaxis] * direction
+    return np.linalg.norm(points - closest, axis=1), t
@@ -1,15 +1,16 @@
 from __future__ import annotations
 
 import functools as ft
-from typing import Tuple, Optional, NamedTuple
+from typing import Tuple, Optional, NamedTuple, Sequence
 
 import h3
 import immutables
+import numpy as np
 from networkx import MultiDiGraph
-from scipy.spatial import cKDTree
 
 from nrel.hive.model.roadnetwork.link import Link
 from nrel.hive.model.roadnetwork.link_id import create_link_id
+from nrel.hive.model.roadnetwork.osm.link_spatial_index import LinkSpatialIndex
 from nrel.hive.model.roadnetwork.osm.osm_roadnetwork_ops import safe_get_node_coordinates
 from nrel.hive.util.typealiases import GeoId, LinkId
 from nrel.hive.util.units import M_TO_KM, Kmph
@@ -19,39 +20,79 @@ class OSMRoadNetworkLinkHelper(NamedTuple):
     """
     provides indexing functionality for an OSMRoadNetwork
     :param links: the lookup table for all road network Links by their LinkId
-    :param links_spatial_lookup: a spatial tree lookup for the nearest link search. returns an index
+    :param links_spatial_lookup: a spatial index for the nearest link search. returns an index
                                  to the links_linkid_lookup collection
-    :param links_linkid_lookup: used in conjunction with the cKDTree to provide the LinkId of the nearest Link
+    :param links_linkid_lookup: used in conjunction with the spatial index to provide the LinkId of the nearest Link
     :param link_count: the count of links
     """
 
     links: immutables.Map[LinkId, Link]
-    links_spatial_lookup: cKDTree
+    links_spatial_lookup: LinkSpatialIndex
     links_linkid_lookup: Tuple[LinkId, ...]
     link_count: int
 
     def link_by_geoid(self, geoid: GeoId) -> Tuple[Optional[Exception], Optional[Link]]:
         """
-        uses the CKDTree to find a nearest Link to some geoid
+        uses the spatial index to find a nearest Link to some geoid
 
         :param geoid: the geoid to query
         :return: an error or the nearest link to this GeoId
         """
         try:
-            query = h3.h3_to_geo(geoid)
-            _, index_result = self.links_spatial_lookup.query(query)
-            index = int(index_result)
-            link_id = self.links_linkid_lookup[index] if 0 <= index < self.link_count else None
-            link = self.links.get(link_id) if link_id else None
-            if not link_id or not link:
-                return (
-                    Exception(
-                        f"internal error on nearest link for geoid {geoid}: resulting spatial index value '{index}' is invalid"
-                    ),
-                    None,
-                )
-            else:
-                return None, link
+            lat, lon = h3.h3_to_geo(geoid)
+            index = self.links_spatial_lookup.nearest_link(lat, lon)
+        except Exception as e:
+            return e, None
+        link = self._link_from_ordinal(index)
+        if not link:
+            return (
+                Exception(
+                    f"internal error on nearest link for geoid {geoid}: resulting spatial index value '{index}' is invalid"
+                ),
+                None,
+            )
+        return None, link
+
+    def _link_from_ordinal(self, index: int) -> Optional[Link]:
+        link_id = self.links_linkid_lookup[index] if 0 <= index < self.link_count else None
+        return self.links.get(link_id) if link_id else None
+
+    def link_ordinals_from_latlon_array(self, latlon: np.ndarray) -> np.ndarray:
+        """
+        uses a single spatial index query, parallelized across all cores, to find the nearest
+        Link to each of a batch of coordinates
+
+        :param latlon: an array of shape (n, 2) of lat/lon pairs
+        :return: an array of shape (n,) of link ordinals, which index links_linkid_lookup
+        """
+        return self.links_spatial_lookup.nearest_links(latlon)
+
+    def links_by_geoids(
+        self, geoids: Sequence[GeoId]
+    ) -> Tuple[Optional[Exception], Optional[Tuple[Link, ...]]]:
+        """
+        uses a single spatial index query to find the nearest Link to each of a batch of geoids
+
+        :param geoids: the geoids to query
+        :return: an error or the nearest link to each GeoId
+        """
+        if len(geoids) == 0:
+            return None, ()
+        try:
+            query = np.array([h3.h3_to_geo(geoid) for geoid in geoids])
+            ordinals = self.link_ordinals_from_latlon_array(query)
+            links = []
+            for geoid, index in zip(geoids, ordinals):
+                link = self._link_from_ordinal(index)
+                if not link:
+                    return (
+                        Exception(
+                            f"internal error on nearest link for geoid {geoid}: resulting spatial index value '{index}' is invalid"
+                        ),
+                        None,
+                    )
+                links.append(link)
+            return None, tuple(links)
 
         except Exception as e:
             return e, None
@@ -62,12 +103,15 @@ class OSMRoadNetworkLinkHelper(NamedTuple):
         graph: MultiDiGraph,
         sim_h3_resolution: int,
         default_speed_kmph: Kmph = 40.0,
+        spatial_index: Optional[LinkSpatialIndex] = None,
     ) -> Tuple[Optional[Exception], Optional[OSMRoadNetworkLinkHelper]]:
         """
         reads in the graph links from a networkx graph and builds a table with Links by LinkId
         :param graph: the input graph
         :param sim_h3_resolution: h3 resolution for entities in sim
         :param default_speed_kmph: default link speed for unlabeled links
+        :param spatial_index: a previously built spatial index for this graph, which is
+                              rebuilt if it does not match the graph's links
         :return: either an error, or, the lookup table
         """
 
@@ -76,44 +120,28 @@ class OSMRoadNetworkLinkHelper(NamedTuple):
             builds data structures used to provide lookup features in the road network
 
             :param lookup: each Link by it's LinkId
-            :param link_ids: link ids which share a common array index to the link_centroids
-            :param link_centroids: link centroids (lat,lon) which share a common array index to the link_ids
+            :param coordinates: the (src_lat, src_lon, dst_lat, dst_lon) of each Link by it's LinkId
             """
 
             lookup: immutables.Map[LinkId, Link] = immutables.Map()
-            link_ids: Tuple[LinkId, ...] = ()
-            link_centroids: Tuple[Tuple[float, float], ...] = ()
+            coordinates: immutables.Map[LinkId, Tuple[float, float, float, float]] = (
+                immutables.Map()
+            )
 
-            def add_link(self, link: Link) -> Tuple[Optional[Exception], Optional[Accumulator]]:
+            def add_link(
+                self, link: Link, coordinates: Tuple[float, float, float, float]
+            ) -> Tuple[Optional[Exception], Optional[Accumulator]]:
                 """
                 adding a link to this accumulator creates an entry in the data structures used to
                 run spatial queries over the graph edge space
                 :param link: the link to add
+                :param coordinates: the link's endpoints as (src_lat, src_lon, dst_lat, dst_lon)
                 :return: an error or updated accumulator
                 """
                 try:
-                    h3_line = h3.h3_line(link.start, link.end)
-
-                    # we want to look up edges by their midpoint. that said, two edges will share the same
-                    # endpoints, one for each direction. since these two edges would share the same midpoint,
-                    # we aim here to make both centroids _just barely_ different by subtracting the midpoint index by 1.
-                    midpoint_h3_line_index = round(len(h3_line) / 2)
-                    src_oriented_midpoint_index = (
-                        midpoint_h3_line_index - 1
-                        if midpoint_h3_line_index > 0
-                        else midpoint_h3_line_index
-                    )
-                    midpoint_hex = (
-                        h3_line[src_oriented_midpoint_index]
-                        if src_oriented_midpoint_index
-                        else link.start
-                    )
-                    link_centroid_lat, link_centroid_lon = h3.h3_to_geo(midpoint_hex)
                     updated_acc = self._replace(
                         lookup=self.lookup.set(link.link_id, link),
-                        link_ids=self.link_ids + (link.link_id,),
-                        link_centroids=self.link_centroids
-                        + ((link_centroid_lat, link_centroid_lon),),
+                        coordinates=self.coordinates.set(link.link_id, coordinates),
                     )
                     return None, updated_acc
                 except Exception as e:
@@ -182,7 +210,7 @@ class OSMRoadNetworkLinkHelper(NamedTuple):
                         (
                             add_link_error,
                             updated_accumulator,
-                        ) = accumulator.add_link(link)
+                        ) = accumulator.add_link(link, (src_lat, src_lon, dst_lat, dst_lon))
                         if add_link_error:
                             response = Exception(
                                 f"failure adding link while building OSMRoadNetworkLinkHelper"
@@ -195,7 +223,7 @@ class OSMRoadNetworkLinkHelper(NamedTuple):
                     return e, None
 
         # process each link, building the collection of Links by LinkId, and
-        # the collections which will be used to build a spatial index over the edge centroids
+        # the collections which will be used to build a spatial index over the edge segments
         initial: Tuple[Optional[Exception], Optional[Accumulator]] = (None, Accumulator())
         error, accumulator = ft.reduce(create_link_entry, graph.edges, initial)
         if error:
@@ -206,12 +234,15 @@ class OSMRoadNetworkLinkHelper(NamedTuple):
             response = Exception(f"failure building OSMRoadNetworkLinkHelper")
             return response, None
         else:
-            # construct the spatial index
-            tree = cKDTree(accumulator.link_centroids)
+            # links are ordered as the graph edges, which is stable for a given graph
+            link_ids = tuple(dict.fromkeys(create_link_id(src, dst) for src, dst, _ in graph.edges))
+            if spatial_index is None or spatial_index.link_ids != link_ids:
+                coordinates = np.array([accumulator.coordinates[link_id] for link_id in link_ids])
+                spatial_index = LinkSpatialIndex.build(link_ids, coordinates)
             osm_road_network_links = OSMRoadNetworkLinkHelper(
                 accumulator.lookup,
-                tree,
-                accumulator.link_ids,
-                len(accumulator.link_ids),
+                spatial_index,
+                link_ids,
+                len(link_ids),
             )
             return None, osm_road_network_links
@@ -1,23 +1,32 @@
 from __future__ import annotations
 
+import hashlib
+import heapq
+import itertools
 import json
 import logging
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from math import ceil
 from pathlib import Path
-from typing import Optional, Union
+from typing import Dict, List, Optional, Sequence, Set, Tuple, Union
 
 import h3
 import networkx as nx
+import numpy as np
 
 from nrel.hive.model.entity_position import EntityPosition
+from nrel.hive.model.roadnetwork.compact_route import CompactRoute, LinkTable
 from nrel.hive.model.roadnetwork.link import Link
-from nrel.hive.model.roadnetwork.link_id import extract_node_ids_int
+from nrel.hive.model.roadnetwork.link_id import create_link_id, extract_node_ids_int
+from nrel.hive.model.roadnetwork.osm.link_spatial_index import LinkSpatialIndex
 from nrel.hive.model.roadnetwork.osm.osm_builders import osm_graph_from_polygon
 from nrel.hive.model.roadnetwork.osm.osm_road_network_link_helper import OSMRoadNetworkLinkHelper
 from nrel.hive.model.roadnetwork.osm.osm_roadnetwork_ops import (
     route_from_nx_path,
     resolve_route_src_dst_positions,
 )
-from nrel.hive.model.roadnetwork.roadnetwork import RoadNetwork
+from nrel.hive.model.roadnetwork.roadnetwork import RoadNetwork, position_on_link
 from nrel.hive.model.roadnetwork.route import (
     Route,
     route_distance_km,
@@ -26,12 +35,18 @@ from nrel.hive.model.roadnetwork.route import (
 from nrel.hive.model.sim_time import SimTime
 from nrel.hive.util import LinkId, H3Ops
 from nrel.hive.util.typealiases import GeoId, H3Resolution
-from nrel.hive.util.units import Hours, Kmph, Kilometers, SECONDS_IN_HOUR
+from nrel.hive.util.units import Hours, Kmph, Kilometers, Seconds, SECONDS_IN_HOUR
 
 log = logging.getLogger(__name__)
 
 TIME_WEIGHT = "travel_time"
 
+# the fewest distinct shortest path searches which are worth sending to the routing processes
+MIN_PARALLEL_ROUTES = 16
+
+# a link out of a graph node: (next node, search weight, travel time seconds, distance km)
+LinkCost = Tuple[int, float, Seconds, Kilometers]
+
 
 class OSMRoadNetwork(RoadNetwork):
     """
@@ -44,8 +59,13 @@ class OSMRoadNetwork(RoadNetwork):
         graph: nx.MultiDiGraph,
         sim_h3_resolution: H3Resolution = 15,
         default_speed_kmph: Kmph = 40.0,
+        spatial_index: Optional[LinkSpatialIndex] = None,
+        routing_processes: int = 0,
     ):
         self.sim_h3_resolution = sim_h3_resolution
+        self.routing_processes = routing_processes
+        self._pool: Optional[ProcessPoolExecutor] = None
+        self._adjacency: Optional[Dict[int, Tuple[LinkCost, ...]]] = None
 
         # validate network
 
@@ -102,7 +122,7 @@ class OSMRoadNetwork(RoadNetwork):
         # build tables on the network edges for spatial lookup and LinkId lookup
         log.info(f"building spatial index for graph")
         link_helper_error, link_helper = OSMRoadNetworkLinkHelper.build(
-            graph, sim_h3_resolution, default_speed_kmph
+            graph, sim_h3_resolution, default_speed_kmph, spatial_index
         )
 
         for _, node_data in graph.nodes(data=True):
@@ -124,6 +144,7 @@ class OSMRoadNetwork(RoadNetwork):
             # finish constructing OSMRoadNetwork instance
             self.graph = graph
             self.link_helper = link_helper
+            self.link_table = LinkTable.build(link_helper.links_linkid_lookup, link_helper.links)
 
     @classmethod
     def from_polygon(
@@ -132,6 +153,7 @@ class OSMRoadNetwork(RoadNetwork):
         sim_h3_resolution: H3Resolution = 15,
         default_speed_kmph: Kmph = 40.0,
         cache_dir=Path.home(),
+        routing_processes: int = 0,
     ) -> OSMRoadNetwork:
         """
         Build an OSMRoadNetwork from a shapely polygon
@@ -139,9 +161,12 @@ class OSMRoadNetwork(RoadNetwork):
         :param polygon: The polygon to build the road network from
         :param sim_h3_resolution: The h3 resolution of the simulation
         :param default_speed_kmph: The network will fill in missing speed values with this
+        :param routing_processes: the number of processes to search batches of routes in
         """
         graph = osm_graph_from_polygon(polygon, cache_dir)
-        return OSMRoadNetwork(graph, sim_h3_resolution, default_speed_kmph)
+        return OSMRoadNetwork(
+            graph, sim_h3_resolution, default_speed_kmph, routing_processes=routing_processes
+        )
 
     @classmethod
     def from_file(
@@ -149,17 +174,32 @@ class OSMRoadNetwork(RoadNetwork):
         road_network_file: Union[Path, str],
         sim_h3_resolution: H3Resolution = 15,
         default_speed_kmph: Kmph = 40.0,
+        routing_processes: int = 0,
     ) -> OSMRoadNetwork:
         """
-        Build an OSMRoadNetwork from file
+        Build an OSMRoadNetwork from file. if a link spatial index was saved alongside
+        the file (see save_link_index), it is used instead of building a new one.
+        with more than one routing process, batches of routes are searched in parallel,
+        see OSMRoadNetwork.routes.
         """
         road_network_path = Path(road_network_file)
         # read in the network file
         if road_network_path.suffix == ".json":
-            with road_network_path.open("r") as f:
-                graph = nx.node_link_graph(json.load(f))
-                log.info(f"loaded graph with {len(graph.edges)} edges")
-            return OSMRoadNetwork(graph, sim_h3_resolution, default_speed_kmph)
+            contents = road_network_path.read_bytes()
+            graph = nx.node_link_graph(json.loads(contents))
+            log.info(f"loaded graph with {len(graph.edges)} edges")
+
+            spatial_index = None
+            index_path = link_index_path(road_network_path)
+            if index_path.is_file():
+                saved_index, source_digest = LinkSpatialIndex.load(index_path)
+                if source_digest == hashlib.sha1(contents).hexdigest():
+                    spatial_index = saved_index
+                else:
+                    log.warning(f"ignoring {index_path}, which was built for a different network")
+            return OSMRoadNetwork(
+                graph, sim_h3_resolution, default_speed_kmph, spatial_index, routing_processes
+            )
         else:
             raise TypeError(
                 f"road network file of type {road_network_path.suffix} not supported by "
@@ -172,9 +212,24 @@ class OSMRoadNetwork(RoadNetwork):
         with path.open("w") as f:
             json.dump(nx.node_link_data(self.graph), f)
 
+    def save_link_index(self, road_network_file: Union[str, Path]) -> Path:
+        """
+        saves the link spatial index next to the road network file this network was
+        loaded from, so that OSMRoadNetwork.from_file can skip building it
+
+        :param road_network_file: the road network file this network was loaded from
+        :return: the path to the saved link index
+        """
+        road_network_path = Path(road_network_file)
+        source_digest = hashlib.sha1(road_network_path.read_bytes()).hexdigest()
+        index_path = link_index_path(road_network_path)
+        self.link_helper.links_spatial_lookup.save(index_path, source_digest)
+        return index_path
+
     def route(self, origin: EntityPosition, destination: EntityPosition) -> Route:
         """
         Returns a route containing road network links between the origin and destination geoids.
+        routes are stored as CompactRoutes over the link table of this road network.
 
         :param origin: the origin Link
         :param destination: the destination Link
@@ -182,66 +237,308 @@ class OSMRoadNetwork(RoadNetwork):
         """
         if origin == destination:
             return empty_route()
+        node_pair = self._route_node_pair(origin, destination)
+        if node_pair is None:
+            return empty_route()
+        nx_path = astar_node_path(self.graph, self.min_speed_kmph, *node_pair)
+        return self._route_from_node_path(origin, destination, nx_path)
+
+    def routes(
+        self, pairs: Sequence[Tuple[EntityPosition, EntityPosition]]
+    ) -> Tuple[Route, ...]:
+        """
+        returns the route between each pair of origins and destinations, see route.
+        if this network has routing processes, the shortest path searches of a large
+        enough batch run in a process pool, and the routes are built from the paths
+        in order, so the result is the same as routing each pair in turn.
 
-        def _astar_cost_heuristic(source, dest) -> float:
-            dist: Kilometers = H3Ops.great_circle_distance(
-                self.graph.nodes[source]["geoid"], self.graph.nodes[dest]["geoid"]
+        :param pairs: the (origin, destination) of each route
+        :return: the route for each pair
+        """
+        node_pairs: Dict[Tuple[int, int], None] = {}
+        for origin, destination in pairs:
+            if origin != destination:
+                node_pair = self._route_node_pair(origin, destination)
+                if node_pair is not None:
+                    node_pairs[node_pair] = None
+        if self.routing_processes < 2 or len(node_pairs) < MIN_PARALLEL_ROUTES:
+            return tuple(self.route(o, d) for o, d in pairs)
+
+        batch = tuple(node_pairs.keys())
+        chunk_size = ceil(len(batch) / self.routing_processes)
+        chunks = [batch[i : i + chunk_size] for i in range(0, len(batch), chunk_size)]
+        results = self._routing_pool().map(_astar_node_paths, chunks)
+        paths = [path for chunk in results for path in chunk]
+        nx_paths = dict(zip(batch, paths))
+
+        def _route(origin: EntityPosition, destination: EntityPosition) -> Route:
+            if origin == destination:
+                return empty_route()
+            node_pair = self._route_node_pair(origin, destination)
+            if node_pair is None:
+                return empty_route()
+            return self._route_from_node_path(origin, destination, nx_paths[node_pair])
+
+        return tuple(_route(o, d) for o, d in pairs)
+
+    def _routing_pool(self) -> ProcessPoolExecutor:
+        """
+        starts the routing processes on first use. where fork is available the workers
+        inherit the graph, otherwise it is copied to each worker once.
+        """
+        if self._pool is None:
+            methods = multiprocessing.get_all_start_methods()
+            context = multiprocessing.get_context("fork" if "fork" in methods else None)
+            self._pool = ProcessPoolExecutor(
+                max_workers=self.routing_processes,
+                mp_context=context,
+                initializer=_init_routing_worker,
+                initargs=(self.graph, self.min_speed_kmph),
             )
-            time: Hours = dist / self.min_speed_kmph
-            return time * SECONDS_IN_HOUR
+        return self._pool
 
-        # start path search from the end of the origin link, terminate search at the start of the
-        # destination link
+    def close(self):
+        """
+        shuts down the routing processes, if they were started
+        """
+        if self._pool is not None:
+            self._pool.shutdown()
+            self._pool = None
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        state["_pool"] = None
+        return state
+
+    def _route_node_pair(
+        self, origin: EntityPosition, destination: EntityPosition
+    ) -> Optional[Tuple[int, int]]:
+        """
+        the graph nodes the shortest path search of a route runs between, which starts
+        from the end of the origin link and terminates at the start of the destination link
+
+        :param origin: the origin of the route
+        :param destination: the destination of the route
+        :return: the (origin node, destination node), or None if a link id is invalid
+        """
         extract_src_err, src_nodes = extract_node_ids_int(origin.link_id)
         extract_dst_err, dst_nodes = extract_node_ids_int(destination.link_id)
         if extract_src_err:
             log.error(extract_src_err)
-            return empty_route()
+            return None
         elif extract_dst_err:
             log.error(extract_dst_err)
-            return empty_route()
+            return None
         elif src_nodes is None:
-            return empty_route()
+            return None
         elif dst_nodes is None:
-            return empty_route()
+            return None
         else:
             _, origin_node_id = src_nodes
             destination_node_id, _ = dst_nodes
+            return origin_node_id, destination_node_id
 
-            # node-oriented shortest path from the end of the origin link to the beginning of the
-            # destination link
-            nx_path = nx.astar_path(
-                self.graph,
-                origin_node_id,
-                destination_node_id,
-                heuristic=_astar_cost_heuristic,
-                weight=TIME_WEIGHT,
-            )
-            link_path_error, inner_link_path = route_from_nx_path(nx_path, self.link_helper.links)
+    def _route_from_node_path(
+        self, origin: EntityPosition, destination: EntityPosition, nx_path: List[int]
+    ) -> Route:
+        """
+        builds a route from a node-oriented shortest path between the origin and destination
+
+        :param origin: the origin of the route
+        :param destination: the destination of the route
+        :param nx_path: the shortest path from the end of the origin link to the start of
+                        the destination link
+        :return: the route, or an empty route if one cannot be built
+        """
+        link_path_error, inner_link_path = route_from_nx_path(nx_path, self.link_helper.links)
 
-            if link_path_error:
-                log.error(f"unable to build route from {origin} to {destination}")
-                log.error(link_path_error)
+        if link_path_error:
+            log.error(f"unable to build route from {origin} to {destination}")
+            log.error(link_path_error)
+            log.error(f"shortest path node list result: {nx_path}")
+            return empty_route()
+        elif inner_link_path is None:
+            return empty_route()
+        else:
+            # modify the start and end GeoIds based on the positions in the src/dst links
+            resolved_route = resolve_route_src_dst_positions(
+                inner_link_path, origin, destination, self
+            )
+            if not resolved_route:
                 log.error(
-                    f"origin node {origin_node_id}, destination node {destination_node_id}, "
-                    f"shortest path node list result: {nx_path}"
+                    f"unable to resolve the route from/to/via:\n"
+                    f"{origin}\n{destination}\n{inner_link_path}"
                 )
                 return empty_route()
-            elif inner_link_path is None:
-                return empty_route()
             else:
-                # modify the start and end GeoIds based on the positions in the src/dst links
-                resolved_route = resolve_route_src_dst_positions(
-                    inner_link_path, origin, destination, self
-                )
-                if not resolved_route:
-                    log.error(
-                        f"unable to resolve the route from/to/via:\n"
-                        f"{origin}\n{destination}\n{inner_link_path}"
+                return CompactRoute.from_route(resolved_route, self.link_table)
+
+    def travel_time_matrix(
+        self,
+        origins: Sequence[EntityPosition],
+        destinations: Sequence[EntityPosition],
+        max_travel_time_seconds: Optional[Seconds] = None,
+    ) -> np.ndarray:
+        """
+        the travel time of the route from each origin to each destination, found with one
+        shortest path search per distinct origin node, see path_cost_matrices
+
+        :param origins: the origin positions
+        :param destinations: the destination positions
+        :param max_travel_time_seconds: if provided, routes which take longer are left out
+        :return: an array of shape (len(origins), len(destinations)) of travel times in seconds,
+                 with inf where no route was found
+        """
+        times, _ = self.path_cost_matrices(origins, destinations, max_travel_time_seconds)
+        return times
+
+    def distance_matrix(
+        self,
+        origins: Sequence[EntityPosition],
+        destinations: Sequence[EntityPosition],
+        max_travel_time_seconds: Optional[Seconds] = None,
+    ) -> np.ndarray:
+        """
+        the distance of the route from each origin to each destination, found with one
+        shortest path search per distinct origin node, see path_cost_matrices
+
+        :param origins: the origin positions
+        :param destinations: the destination positions
+        :param max_travel_time_seconds: if provided, routes which take longer are left out
+        :return: an array of shape (len(origins), len(destinations)) of distances in kilometers,
+                 with inf where no route was found
+        """
+        _, distances = self.path_cost_matrices(origins, destinations, max_travel_time_seconds)
+        return distances
+
+    def path_cost_matrices(
+        self,
+        origins: Sequence[EntityPosition],
+        destinations: Sequence[EntityPosition],
+        max_travel_time_seconds: Optional[Seconds] = None,
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        the travel time and distance of the route from each origin to each destination.
+
+        as with route, a route runs from the end of the origin link to the start of the
+        destination link and includes both links. a Dijkstra search runs from each distinct
+        origin link end node on the same travel time weight as route, and stops once every
+        destination link start node is settled, or once the max travel time is exceeded.
+        the search is exact, while the A* heuristic of route can overestimate on networks
+        with travel times that are faster than the slowest link speed suggests, so a route
+        may be slightly slower than its entry here.
+
+        :param origins: the origin positions
+        :param destinations: the destination positions
+        :param max_travel_time_seconds: if provided, routes which take longer are left out
+        :return: the travel time (seconds) and distance (kilometers) matrices, each of shape
+                 (len(origins), len(destinations)), with inf where no route was found
+        """
+        times = np.full((len(origins), len(destinations)), np.inf)
+        distances = np.full((len(origins), len(destinations)), np.inf)
+
+        def _end_link(position: EntityPosition) -> Optional[Tuple[int, int, Link]]:
+            err, nodes = extract_node_ids_int(position.link_id)
+            link = self.link_helper.links.get(position.link_id)
+            if err or nodes is None or link is None:
+                log.error(f"unable to find link {position.link_id} for a path cost matrix")
+                return None
+            return nodes[0], nodes[1], link
+
+        destination_links = [_end_link(d) for d in destinations]
+        target_nodes = {link[0] for link in destination_links if link is not None}
+        searches: Dict[int, Dict[int, Tuple[Seconds, Kilometers]]] = {}
+        for i, origin in enumerate(origins):
+            origin_link = _end_link(origin)
+            if origin_link is None:
+                continue
+            _, source, src_link = origin_link
+            settled = searches.get(source)
+            if settled is None:
+                settled = self._bounded_dijkstra(source, target_nodes, max_travel_time_seconds)
+                searches[source] = settled
+            src = src_link.to_link_traversal()
+            for j, destination in enumerate(destinations):
+                if origin == destination:
+                    times[i, j], distances[i, j] = 0, 0.0
+                    continue
+                destination_link = destination_links[j]
+                if destination_link is None:
+                    continue
+                target, _, dst_link = destination_link
+                inner = settled.get(target)
+                if inner is None:
+                    continue
+                dst = dst_link.to_link_traversal()
+                time = src.travel_time_seconds + inner[0] + dst.travel_time_seconds
+                if max_travel_time_seconds is None or time <= max_travel_time_seconds:
+                    times[i, j] = time
+                    distances[i, j] = src.distance_km + inner[1] + dst.distance_km
+        return times, distances
+
+    def _bounded_dijkstra(
+        self, source: int, targets: Set[int], cutoff: Optional[Seconds]
+    ) -> Dict[int, Tuple[Seconds, Kilometers]]:
+        """
+        settles the nodes reachable from a source, nearest first by travel time weight,
+        until every target is settled or the cutoff is exceeded
+
+        :param source: the node to search from
+        :param targets: the nodes to search for
+        :param cutoff: the max search weight in seconds, if any
+        :return: the travel time and distance of the links along the path to each settled node
+        """
+        adjacency = self._link_adjacency()
+        remaining = set(targets)
+        settled: Dict[int, Tuple[Seconds, Kilometers]] = {}
+        best = {source: 0.0}
+        counter = itertools.count()
+        frontier = [(0.0, next(counter), source, 0, 0.0)]
+        while frontier and remaining:
+            weight, _, node, time, distance = heapq.heappop(frontier)
+            if node in settled:
+                continue
+            elif cutoff is not None and weight > cutoff:
+                break
+            settled[node] = (time, distance)
+            remaining.discard(node)
+            for next_node, link_weight, link_time, link_distance in adjacency.get(node, ()):
+                next_weight = weight + link_weight
+                if next_node not in settled and next_weight < best.get(next_node, np.inf):
+                    best[next_node] = next_weight
+                    heapq.heappush(
+                        frontier,
+                        (
+                            next_weight,
+                            next(counter),
+                            next_node,
+                            time + link_time,
+                            distance + link_distance,
+                        ),
                     )
-                    return empty_route()
-                else:
-                    return resolved_route
+        return settled
+
+    def _link_adjacency(self) -> Dict[int, Tuple[LinkCost, ...]]:
+        """
+        the links out of each graph node, built on first use
+        """
+        if self._adjacency is None:
+            adjacency = {}
+            for node, neighbors in self.graph.adj.items():
+                costs = []
+                for next_node, edges in neighbors.items():
+                    link = self.link_helper.links.get(create_link_id(node, next_node))
+                    if link is None:
+                        continue
+                    # parallel edges are searched by their fastest edge, as in route
+                    weight = min(e.get(TIME_WEIGHT, 1) for e in edges.values())
+                    traversal = link.to_link_traversal()
+                    costs.append(
+                        (next_node, weight, traversal.travel_time_seconds, traversal.distance_km)
+                    )
+                adjacency[node] = tuple(costs)
+            self._adjacency = adjacency
+        return self._adjacency
 
     def distance_by_geoid_km(self, origin: GeoId, destination: GeoId) -> Kilometers:
         """
@@ -278,6 +575,71 @@ class OSMRoadNetwork(RoadNetwork):
         else:
             return link
 
+    def links_from_latlon_array(self, latlon: np.ndarray) -> np.ndarray:
+        """
+        finds the closest link to each of a batch of coordinates with a single spatial index query
+
+        :param latlon: an array of shape (n, 2) of lat/lon pairs
+        :return: an array of shape (n,) of link ordinals, see link_from_ordinal
+        """
+        return self.link_helper.link_ordinals_from_latlon_array(latlon)
+
+    def link_from_ordinal(self, ordinal: int) -> Optional[Link]:
+        """
+        look up a link by its ordinal in the spatial index
+
+        :param ordinal: the link ordinal, as returned by links_from_latlon_array
+        :return: the Link if it exists, otherwise None
+        """
+        if not 0 <= ordinal < self.link_helper.link_count:
+            return None
+        return self.link_helper.links.get(self.link_helper.links_linkid_lookup[ordinal])
+
+    def positions_from_geoids(
+        self, geoids: Sequence[GeoId]
+    ) -> Tuple[Optional[EntityPosition], ...]:
+        """
+        positions a batch of geoids on their nearest links with a single spatial index query
+
+        :param geoids: the locations to position
+        :return: the position on the nearest link for each GeoId, or None where one cannot be found
+        """
+        error, links = self.link_helper.links_by_geoids(geoids)
+        if error or links is None:
+            log.warning(f"unable to find nearest links for a batch of {len(geoids)} geoids")
+            log.error(error)
+            return tuple(self.position_from_geoid(geoid) for geoid in geoids)
+        else:
+            return tuple(position_on_link(link, geoid) for link, geoid in zip(links, geoids))
+
+    def distances_by_geoid_km(
+        self, origins: Sequence[GeoId], destinations: Sequence[GeoId]
+    ) -> Tuple[Kilometers, ...]:
+        """
+        returns the road network distance between each pair of origins and destinations.
+        all locations are snapped to the network in one spatial index query and each
+        distinct pair of positions is routed once.
+
+        :param origins: the origin of each pair
+        :param destinations: the destination of each pair
+        :return: the distance in kilometers for each pair
+        """
+        positions = self.positions_from_geoids(tuple(origins) + tuple(destinations))
+        pairs = zip(positions[: len(origins)], positions[len(origins) :])
+        distances: Dict[Tuple[EntityPosition, EntityPosition], Kilometers] = {}
+
+        def _distance(o: Optional[EntityPosition], d: Optional[EntityPosition]) -> Kilometers:
+            if not o or not d:
+                log.error("failed finding nearest links to distance query between positions")
+                return 0.0
+            distance = distances.get((o, d))
+            if distance is None:
+                distance = route_distance_km(self.route(o, d))
+                distances[(o, d)] = distance
+            return distance
+
+        return tuple(_distance(o, d) for o, d in pairs)
+
     def link_from_link_id(self, link_id: LinkId) -> Optional[Link]:
         """
         look up the provided LinkId in the LinkHelper table
@@ -301,3 +663,59 @@ class OSMRoadNetwork(RoadNetwork):
 
     def update(self, sim_time: SimTime) -> RoadNetwork:
         raise NotImplementedError("updates are not implemented")
+
+
+def link_index_path(road_network_file: Union[str, Path]) -> Path:
+    """
+    the path where the link spatial index for a road network file is saved
+
+    :param road_network_file: the road network file
+    :return: the link index path
+    """
+    road_network_path = Path(road_network_file)
+    return road_network_path.with_name(f"{road_network_path.stem}.link_index.npz")
+
+
+def astar_node_path(
+    graph: nx.MultiDiGraph, min_speed_kmph: Kmph, origin_node_id, destination_node_id
+) -> List:
+    """
+    the fastest node path between two graph nodes, guided by the travel time at the
+    slowest speed on the network over the great circle distance
+
+    :param graph: the road network graph
+    :param min_speed_kmph: the slowest link speed on the graph
+    :param origin_node_id: the node to start from
+    :param destination_node_id: the node to end at
+    :return: the nodes of the path
+    """
+
+    def _astar_cost_heuristic(source, dest) -> float:
+        dist: Kilometers = H3Ops.great_circle_distance(
+            graph.nodes[source]["geoid"], graph.nodes[dest]["geoid"]
+        )
+        time: Hours = dist / min_speed_kmph
+        return time * SECONDS_IN_HOUR
+
+    return nx.astar_path(
+        graph,
+        origin_node_id,
+        destination_node_id,
+        heuristic=_astar_cost_heuristic,
+        weight=TIME_WEIGHT,
+    )
+
+
+# the graph of a routing process, see OSMRoadNetwork.routes
+_worker_graph: Optional[nx.MultiDiGraph] = None
+_worker_min_speed_kmph: Kmph = 0.0
+
+
+def _init_routing_worker(graph: nx.MultiDiGraph, min_speed_kmph: Kmph):
+    global _worker_graph, _worker_min_speed_kmph
+    _worker_graph = graph
+    _worker_min_speed_kmph = min_speed_kmph
+
+
+def _astar_node_paths(node_pairs: Sequence[Tuple[int, int]]) -> List[List[int]]:
+    return [astar_node_path(_worker_graph, _worker_min_speed_kmph, o, d) for o, d in node_pairs]
@@ -10,7 +10,6 @@ from nrel.hive.model.entity_position import EntityPosition
 from nrel.hive.model.roadnetwork.link import Link
 from nrel.hive.model.roadnetwork.link_id import *
 from nrel.hive.model.roadnetwork.linktraversal import LinkTraversal
-from nrel.hive.model.roadnetwork.route import Route
 
 if TYPE_CHECKING:
     from nrel.hive.model.roadnetwork.osm.osm_roadnetwork import OSMRoadNetwork
@@ -39,7 +38,7 @@ def safe_get_node_coordinates(
 
 def route_from_nx_path(
     nx_path: Union[list, dict], link_lookup: immutables.Map[LinkId, Link]
-) -> Tuple[Optional[Exception], Optional[Route]]:
+) -> Tuple[Optional[Exception], Optional[Tuple[LinkTraversal, ...]]]:
     """
     takes a networkx shortest path result (a list of node ids) and turns it into a Route (list of Links)
     :param nx_path: the networkx path result
@@ -83,11 +82,11 @@ def route_from_nx_path(
 
 
 def resolve_route_src_dst_positions(
-    inner_route: Route,
+    inner_route: Tuple[LinkTraversal, ...],
     src_link_pos: EntityPosition,
     dst_link_pos: EntityPosition,
     road_network: OSMRoadNetwork,
-) -> Optional[Route]:
+) -> Optional[Tuple[LinkTraversal, ...]]:
     """
     our inner_route is a shortest path from the destination of the source link to the start
     of the destination link. a 'positional' Link has been provided in the search query, assumed
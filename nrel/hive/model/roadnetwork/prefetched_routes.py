@@ -0,0 +1,100 @@
+from __future__ import annotations
+
+from typing import Dict, Optional, Sequence, Tuple
+
+import numpy as np
+
+from nrel.hive.model.entity_position import EntityPosition
+from nrel.hive.model.roadnetwork.link import Link
+from nrel.hive.model.roadnetwork.roadnetwork import RoadNetwork
+from nrel.hive.model.roadnetwork.route import Route
+from nrel.hive.model.sim_time import SimTime
+from nrel.hive.util.typealiases import GeoId, LinkId
+from nrel.hive.util.units import Kilometers
+
+
+class PrefetchedRoutes(RoadNetwork):
+    """
+    a road network which answers route queries from a batch of routes computed ahead of
+    time, such as with RoadNetwork.routes, and passes everything else to the road network
+    the routes were computed on.
+
+    :param road_network: the road network the routes were computed on
+    :param routes: the prefetched routes, by (origin, destination)
+    """
+
+    def __init__(
+        self,
+        road_network: RoadNetwork,
+        routes: Dict[Tuple[EntityPosition, EntityPosition], Route],
+    ):
+        self.road_network = road_network
+        self.routes_table = routes
+        self.sim_h3_resolution = road_network.sim_h3_resolution
+
+    @classmethod
+    def build(
+        cls, road_network: RoadNetwork, pairs: Sequence[Tuple[EntityPosition, EntityPosition]]
+    ) -> PrefetchedRoutes:
+        """
+        computes a batch of routes on a road network
+
+        :param road_network: the road network to route on
+        :param pairs: the (origin, destination) of each route
+        :return: the road network with the routes prefetched
+        """
+        distinct = tuple(dict.fromkeys(pairs))
+        routes = road_network.routes(distinct)
+        return PrefetchedRoutes(road_network, dict(zip(distinct, routes)))
+
+    def route(self, origin: EntityPosition, destination: EntityPosition) -> Route:
+        route = self.routes_table.get((origin, destination))
+        if route is None:
+            return self.road_network.route(origin, destination)
+        return route
+
+    def routes(
+        self, pairs: Sequence[Tuple[EntityPosition, EntityPosition]]
+    ) -> Tuple[Route, ...]:
+        return tuple(self.route(o, d) for o, d in pairs)
+
+    def travel_time_matrix(
+        self, origins: Sequence[EntityPosition], destinations: Sequence[EntityPosition]
+    ) -> np.ndarray:
+        return self.road_network.travel_time_matrix(origins, destinations)
+
+    def distance_matrix(
+        self, origins: Sequence[EntityPosition], destinations: Sequence[EntityPosition]
+    ) -> np.ndarray:
+        return self.road_network.distance_matrix(origins, destinations)
+
+    def distance_by_geoid_km(self, origin: GeoId, destination: GeoId) -> Kilometers:
+        return self.road_network.distance_by_geoid_km(origin, destination)
+
+    def distances_by_geoid_km(
+        self, origins: Sequence[GeoId], destinations: Sequence[GeoId]
+    ) -> Tuple[Kilometers, ...]:
+        return self.road_network.distances_by_geoid_km(origins, destinations)
+
+    def link_from_link_id(self, link_id: LinkId) -> Optional[Link]:
+        return self.road_network.link_from_link_id(link_id)
+
+    def link_from_geoid(self, geoid: GeoId) -> Optional[Link]:
+        return self.road_network.link_from_geoid(geoid)
+
+    def position_from_geoid(self, geoid: GeoId) -> Optional[EntityPosition]:
+        return self.road_network.position_from_geoid(geoid)
+
+    def positions_from_geoids(
+        self, geoids: Sequence[GeoId]
+    ) -> Tuple[Optional[EntityPosition], ...]:
+        return self.road_network.positions_from_geoids(geoids)
+
+    def geoid_within_geofence(self, geoid: GeoId) -> bool:
+        return self.road_network.geoid_within_geofence(geoid)
+
+    def update(self, sim_time: SimTime) -> RoadNetwork:
+        return self.road_network.update(sim_time)
+
+    def close(self):
+        self.road_network.close()
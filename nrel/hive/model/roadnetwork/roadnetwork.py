@@ -1,13 +1,14 @@
 from __future__ import annotations
 
 from abc import ABC, abstractmethod
-from typing import Optional
+from typing import Optional, Sequence, Tuple
 
 import h3
+import numpy as np
 
 from nrel.hive.model.entity_position import EntityPosition
 from nrel.hive.model.roadnetwork.link import Link
-from nrel.hive.model.roadnetwork.route import Route
+from nrel.hive.model.roadnetwork.route import Route, route_distance_km
 from nrel.hive.model.sim_time import SimTime
 from nrel.hive.util.typealiases import GeoId, H3Resolution, LinkId
 from nrel.hive.util.units import Kilometers
@@ -32,6 +33,51 @@ class RoadNetwork(ABC):
         :return: A route.
         """
 
+    def routes(
+        self, pairs: Sequence[Tuple[EntityPosition, EntityPosition]]
+    ) -> Tuple[Route, ...]:
+        """
+        returns the route between each pair of origins and destinations, see route.
+        road networks which can route a batch in parallel may override this.
+
+        :param pairs: the (origin, destination) of each route
+        :return: the route for each pair
+        """
+        return tuple(self.route(o, d) for o, d in pairs)
+
+    def travel_time_matrix(
+        self, origins: Sequence[EntityPosition], destinations: Sequence[EntityPosition]
+    ) -> np.ndarray:
+        """
+        the travel time of the route from each origin to each destination, see route.
+        road networks which can find many routes at once should override this.
+
+        :param origins: the origin positions
+        :param destinations: the destination positions
+        :return: an array of shape (len(origins), len(destinations)) of travel times in seconds
+        """
+        return self._route_matrix(
+            origins, destinations, lambda r: sum(l.travel_time_seconds for l in r)
+        )
+
+    def distance_matrix(
+        self, origins: Sequence[EntityPosition], destinations: Sequence[EntityPosition]
+    ) -> np.ndarray:
+        """
+        the distance of the route from each origin to each destination, see route.
+        road networks which can find many routes at once should override this.
+
+        :param origins: the origin positions
+        :param destinations: the destination positions
+        :return: an array of shape (len(origins), len(destinations)) of distances in kilometers
+        """
+        return self._route_matrix(origins, destinations, route_distance_km)
+
+    def _route_matrix(self, origins, destinations, route_cost) -> np.ndarray:
+        pairs = [(o, d) for o in origins for d in destinations]
+        costs = [route_cost(route) for route in self.routes(pairs)]
+        return np.array(costs, dtype=np.float64).reshape(len(origins), len(destinations))
+
     @abstractmethod
     def distance_by_geoid_km(self, origin: GeoId, destination: GeoId) -> Kilometers:
         """
@@ -74,15 +120,32 @@ class RoadNetwork(ABC):
         if not link:
             return None
         else:
-            hexes_on_link = h3.h3_line(link.start, link.end)
-            if geoid in hexes_on_link:
-                position = EntityPosition(link.link_id, geoid)
-                return position
-            else:
-                hexes_by_dist = sorted(hexes_on_link, key=lambda h: (h3.h3_distance(geoid, h), h))
-                closest_hex_to_query = hexes_by_dist[0]
-                position = EntityPosition(link.link_id, closest_hex_to_query)
-                return position
+            return position_on_link(link, geoid)
+
+    def positions_from_geoids(
+        self, geoids: Sequence[GeoId]
+    ) -> Tuple[Optional[EntityPosition], ...]:
+        """
+        returns the positions for a batch of GeoIds, see position_from_geoid.
+        road networks with a spatial index may override this to snap the batch in a single query.
+
+        :param geoids: the locations to position
+        :return: the position on the nearest link for each GeoId, or None where one cannot be found
+        """
+        return tuple(self.position_from_geoid(geoid) for geoid in geoids)
+
+    def distances_by_geoid_km(
+        self, origins: Sequence[GeoId], destinations: Sequence[GeoId]
+    ) -> Tuple[Kilometers, ...]:
+        """
+        returns the road network distance between each pair of origins and destinations,
+        see distance_by_geoid_km
+
+        :param origins: the origin of each pair
+        :param destinations: the destination of each pair
+        :return: the distance in kilometers for each pair
+        """
+        return tuple(self.distance_by_geoid_km(o, d) for o, d in zip(origins, destinations))
 
     @abstractmethod
     def geoid_within_geofence(self, geoid: GeoId) -> bool:
@@ -102,3 +165,27 @@ class RoadNetwork(ABC):
         :param sim_time:
         :return:
         """
+
+    def close(self):
+        """
+        releases any resources held by this road network, such as routing processes.
+        called at the end of the simulation.
+        """
+        pass
+
+
+def position_on_link(link: Link, geoid: GeoId) -> EntityPosition:
+    """
+    positions a GeoId on a link. if the GeoId does not exist on the line of
+    GeoIds coincident with the Link, then the nearest one is selected
+
+    :param link: the link to position on
+    :param geoid: the location to position
+    :return: the position on the link nearest to the GeoId
+    """
+    hexes_on_link = h3.h3_line(link.start, link.end)
+    if geoid in hexes_on_link:
+        return EntityPosition(link.link_id, geoid)
+    else:
+        closest_hex_to_query = min(hexes_on_link, key=lambda h: (h3.h3_distance(geoid, h), h))
+        return EntityPosition(link.link_id, closest_hex_to_query)
@@ -1,21 +1,35 @@
 import functools as ft
-from typing import Any, Tuple, Optional
-
-import h3
+from typing import Any, Tuple, Optional, Sequence
 
 from nrel.hive.model.entity_position import EntityPosition
+from nrel.hive.model.roadnetwork.compact_route import CompactRoute
 from nrel.hive.model.roadnetwork.linktraversal import LinkTraversal
 from nrel.hive.runner import Environment
-from nrel.hive.util import TupleOps, wkt
+from nrel.hive.util import h3_cells, wkt
 from nrel.hive.util.units import Kilometers, Seconds
 
-Route = Tuple[LinkTraversal, ...]
+# a route is a tuple of LinkTraversals, or a CompactRoute from a road network which
+# stores them compactly; both are read-only sequences of LinkTraversals
+Route = Sequence[LinkTraversal]
 
 
 def empty_route() -> Route:
     return ()
 
 
+def prepend_link(link: LinkTraversal, route: Route) -> Route:
+    """
+    adds a link to the front of a route, keeping a CompactRoute compact where possible
+
+    :param link: the link to add
+    :param route: the route
+    :return: the route starting with the link
+    """
+    if isinstance(route, CompactRoute):
+        return route.prepend(link)
+    return (link,) + tuple(route)
+
+
 def route_distance_km(route: Route) -> Kilometers:
     """
     Return the distance of the route in kilometers
@@ -54,7 +68,7 @@ def route_cooresponds_with_entities(
     :param dst: an optional destination position
     :return: if the route is valid for this src(/dst)
     """
-    if TupleOps.is_empty(route):
+    if len(route) == 0:
         # an empty route is valid if no destination is being confirmed or if the src matches the dst
         is_valid = not dst or src == dst
         return is_valid
@@ -79,18 +93,20 @@ def to_linestring(route: Route, env: Environment) -> str:
     :param route: a route
     :return: a linestring or an empty WKT
     """
+    # materialize any compact route
+    route = tuple(route)
     if len(route) == 0:
         return wkt.polygon_empty()
     elif len(route) == 1:
         link = route[0]
-        src = h3.h3_to_geo(link.start)
-        dst = h3.h3_to_geo(link.end)
+        src = h3_cells.h3_to_geo(link.start)
+        dst = h3_cells.h3_to_geo(link.end)
         linestring = wkt.linestring_2d((src, dst), env.config.global_config.wkt_x_y_ordering)
         return linestring
     else:
         inital: Tuple[Any, ...] = ()
         points = ft.reduce(
-            lambda acc, l: acc + (h3.h3_to_geo(l.start), h3.h3_to_geo(l.end)),
+            lambda acc, l: acc + (h3_cells.h3_to_geo(l.start), h3_cells.h3_to_geo(l.end)),
             route,
             inital,
         )
@@ -110,7 +126,7 @@ def routes_are_connected(prev_route: Route, next_route: Route) -> bool:
     :return: true if the routes are connected, or if at least one route is empty
     """
 
-    prev_link = TupleOps.head_optional(prev_route)
-    next_link = TupleOps.last(next_route)
+    prev_link = prev_route[0] if len(prev_route) > 0 else None
+    next_link = next_route[-1]
     connected = prev_link.end == next_link.start if prev_link and next_link else True
     return connected
@@ -1,7 +1,6 @@
 from __future__ import annotations
 
-import functools as ft
-from typing import Optional, NamedTuple, Tuple
+from typing import List, Optional, NamedTuple, Tuple
 
 from nrel.hive.model.roadnetwork.linktraversal import (
     LinkTraversalResult,
@@ -9,8 +8,7 @@ from nrel.hive.model.roadnetwork.linktraversal import (
 )
 from nrel.hive.model.roadnetwork.linktraversal import traverse_up_to
 from nrel.hive.model.roadnetwork.roadnetwork import RoadNetwork
-from nrel.hive.model.roadnetwork.route import Route
-from nrel.hive.util import TupleOps
+from nrel.hive.model.roadnetwork.route import Route, prepend_link
 from nrel.hive.util.units import Kilometers, Seconds
 
 
@@ -56,10 +54,12 @@ class RouteTraversal(NamedTuple):
         updated_experienced_route = (
             self.experienced_route
             if t.traversed is None
-            else self.experienced_route + (t.traversed,)
+            else tuple(self.experienced_route) + (t.traversed,)
         )
         updated_remaining_route = (
-            self.remaining_route if t.remaining is None else self.remaining_route + (t.remaining,)
+            self.remaining_route
+            if t.remaining is None
+            else tuple(self.remaining_route) + (t.remaining,)
         )
         if t.traversed:
             traversal_distance = self.traversal_distance_km + t.traversed.distance_km
@@ -80,7 +80,7 @@ class RouteTraversal(NamedTuple):
         :param link: a link traversal for the remaining route
         :return: the updated RouteTraversal
         """
-        return self._replace(remaining_route=self.remaining_route + (link,))
+        return self._replace(remaining_route=tuple(self.remaining_route) + (link,))
 
 
 def traverse(
@@ -102,22 +102,20 @@ def traverse(
     """
     if len(route_estimate) == 0:
         return None, RouteTraversal()
-    elif TupleOps.head(route_estimate).start == TupleOps.last(route_estimate).end:
+    elif route_estimate[0].start == route_estimate[-1].end:
         return None, RouteTraversal()
     else:
-        # function that steps through the route
-        def _traverse(
-            acc: Tuple[Optional[Exception], Optional[RouteTraversal]],
-            link: LinkTraversal,
-        ) -> Tuple[Optional[Exception], Optional[RouteTraversal]]:
-            acc_failures, acc_traversal = acc
-            if acc_failures:
-                return acc
-            elif acc_traversal is None:
-                return acc
-
-            if acc_traversal.no_time_left():
-                return acc_failures, acc_traversal.add_link_not_traversed(link)
+        # step through the route until the time runs out. links past the cursor, where the
+        # time ran out, are not visited and are carried over to the remaining route as-is.
+        remaining_time_seconds = duration_seconds
+        traversal_distance_km = 0.0
+        experienced_route: List[LinkTraversal] = []
+        partial_link: Optional[LinkTraversal] = None
+        cursor = len(route_estimate)
+        for index, link in enumerate(route_estimate):
+            if remaining_time_seconds == 0.0:
+                cursor = index
+                break
 
             # update the link traversal speed with a current speed from the road network
             ground_truth_link = road_network.link_from_link_id(link.link_id)
@@ -128,9 +126,7 @@ def traverse(
             updated_speed_link = link._replace(speed_kmph=ground_truth_link.speed_kmph)
 
             # traverse this link as far as we can go
-            error, traverse_result = traverse_up_to(
-                updated_speed_link, acc_traversal.remaining_time_seconds
-            )
+            error, traverse_result = traverse_up_to(updated_speed_link, remaining_time_seconds)
             if error:
                 response = Exception("failure during traverse")
                 response.__cause__ = error
@@ -138,16 +134,21 @@ def traverse(
             elif traverse_result is None:
                 response = Exception("failure during traverse")
                 return response, None
-            else:
-                updated_experienced_route = acc_traversal.add_traversal(traverse_result)
-                return acc_failures, updated_experienced_route
-
-        # initial search state has a route traversal and an Optional[Exception]
-        initial: Tuple[Optional[Exception], Optional[RouteTraversal]] = (
-            None,
-            RouteTraversal(remaining_time_seconds=duration_seconds),
-        )
-
-        result = ft.reduce(_traverse, route_estimate, initial)
 
-        return result
+            if traverse_result.traversed is not None:
+                experienced_route.append(traverse_result.traversed)
+                traversal_distance_km += traverse_result.traversed.distance_km
+            if traverse_result.remaining is not None:
+                partial_link = traverse_result.remaining
+            remaining_time_seconds = traverse_result.remaining_time_seconds
+
+        remaining_route = route_estimate[cursor:]
+        result = RouteTraversal(
+            remaining_time_seconds=remaining_time_seconds,
+            traversal_distance_km=traversal_distance_km,
+            experienced_route=tuple(experienced_route),
+            remaining_route=remaining_route
+            if partial_link is None
+            else prepend_link(partial_link, remaining_route),
+        )
+        return None, result
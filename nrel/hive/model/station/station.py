@@ -51,6 +51,9 @@ class Station(Entity):
     :param on_shift_access_chargers: Lists the charger ids for chargers that can be used while on-shift (in a station charging search)
     :type on_shift_access_chargers: :py:obj`FrozenSet[ChargerId]`
 
+    :param charger_mask: the bitmask of the chargers at this station, see ChargerCompatibility
+    :type charger_mask: :py:obj`int`
+
     :param balance: the net income of this station
     :type balance: :py:obj:`Currency`
     """
@@ -61,6 +64,7 @@ class Station(Entity):
     state: immutables.Map[ChargerId, ChargerState]
     energy_dispensed: immutables.Map[EnergyType, float]
     on_shift_access_chargers: FrozenSet[ChargerId]
+    charger_mask: int
     balance: Currency = 0.0
 
     @property
@@ -77,6 +81,7 @@ class Station(Entity):
         on_shift_access: FrozenSet[ChargerId],
         membership: Membership,
         env: Environment,
+        position: Optional[EntityPosition] = None,
     ):
         # TODO
         # problems with this
@@ -118,7 +123,8 @@ class Station(Entity):
             raise Exception(msg)
 
         energy_dispensed = immutables.Map({energy_type: 0.0 for energy_type in EnergyType})
-        position = road_network.position_from_geoid(geoid)
+        if position is None:
+            position = road_network.position_from_geoid(geoid)
         if position is None:
             msg = (
                 "could not find a road network position matching the position "
@@ -132,6 +138,7 @@ class Station(Entity):
             state=charger_states,
             energy_dispensed=energy_dispensed,
             on_shift_access_chargers=on_shift_access,
+            charger_mask=env.get_charger_compatibility().charger_mask(charger_states.keys()),
             membership=membership,
         )
 
@@ -165,10 +172,12 @@ class Station(Entity):
 
         updated_station_state = self.state.update({charger_id: append_cs})
         updated_on_shift = self.on_shift_access_chargers.union([charger_id])
+        updated_mask = env.get_charger_compatibility().charger_mask(updated_station_state.keys())
         updated_station = replace(
             self,
             state=updated_station_state,
             on_shift_access_chargers=updated_on_shift,
+            charger_mask=updated_mask,
         )
         return None, updated_station
 
@@ -179,6 +188,7 @@ class Station(Entity):
         builder: Union[immutables.Map[StationId, Station], Dict[StationId, Station]],
         road_network: RoadNetwork,
         env: Environment,
+        position: Optional[EntityPosition] = None,
     ) -> Station:
         """
         takes a csv row and turns it into a Station
@@ -189,6 +199,7 @@ class Station(Entity):
         that there already was a row parsed for this station
 
         :param road_network: the road network
+        :param position: the row's location already positioned on the road network, if known
         :return: a Station, or an error
         """
         _EXPECTED_FIELDS = [
@@ -229,6 +240,7 @@ class Station(Entity):
                 on_shift_access=frozenset([charger_id]) if on_shift_access else frozenset(),
                 membership=Membership(),
                 env=env,
+                position=position,
             )
         else:
             # add this charger to the existing station
@@ -0,0 +1,135 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, NamedTuple, Optional, Tuple
+
+import immutables
+import numpy as np
+
+from nrel.hive.model.vehicle.schedules.time_range_schedule import TimeRangeSchedule
+
+if TYPE_CHECKING:
+    from nrel.hive.model.sim_time import SimTime
+    from nrel.hive.model.vehicle.schedules.schedule import ScheduleFunction
+    from nrel.hive.util.typealiases import ScheduleId
+
+SECONDS_IN_DAY = 86400
+
+
+def _seconds_of_day(t) -> int:
+    return t.hour * 3600 + t.minute * 60 + t.second
+
+
+class ScheduleTable(NamedTuple):
+    """
+    the time range schedules of the environment, compiled into arrays of seconds-of-day so
+    that every schedule can be evaluated at once.
+
+    schedule functions which are not time ranges depend on the vehicle they are called
+    for, and are left out of the table.
+
+    :param schedules: the schedules table this was built from
+    :param schedule_ids: the order of the arrays
+    :param start_seconds: the start of each schedule's time range, in seconds of the day
+    :param end_seconds: the (exclusive) end of each schedule's time range
+    """
+
+    schedules: immutables.Map[ScheduleId, ScheduleFunction]
+    schedule_ids: Tuple[ScheduleId, ...]
+    start_seconds: np.ndarray
+    end_seconds: np.ndarray
+
+    @classmethod
+    def build(cls, schedules: immutables.Map[ScheduleId, ScheduleFunction]) -> ScheduleTable:
+        """
+        compiles the time range schedules of a schedules table
+
+        :param schedules: the environment schedules table
+        :return: the schedule table
+        """
+        time_ranges = [
+            (schedule_id, schedule_fn)
+            for schedule_id, schedule_fn in sorted(schedules.items(), key=lambda t: t[0])
+            if isinstance(schedule_fn, TimeRangeSchedule)
+        ]
+        start_seconds = np.array(
+            [_seconds_of_day(s.start_time) for _, s in time_ranges], dtype=np.int64
+        )
+        end_seconds = np.array(
+            [_seconds_of_day(s.end_time) for _, s in time_ranges], dtype=np.int64
+        )
+        return ScheduleTable(
+            schedules=schedules,
+            schedule_ids=tuple(schedule_id for schedule_id, _ in time_ranges),
+            start_seconds=start_seconds,
+            end_seconds=end_seconds,
+        )
+
+    def built_for(self, schedules: immutables.Map[ScheduleId, ScheduleFunction]) -> bool:
+        """
+        tests if this table was built from this schedules table
+
+        :param schedules: a schedules table
+        :return: True if this table describes it
+        """
+        return self.schedules is schedules
+
+    def on_shift(self, sim_time: SimTime) -> immutables.Map[ScheduleId, bool]:
+        """
+        evaluates every compiled schedule at a simulation time, as each schedule function
+        would when called
+
+        :param sim_time: the simulation time
+        :return: whether each compiled schedule is on, by ScheduleId
+        """
+        seconds = int(sim_time) % SECONDS_IN_DAY
+        start, end = self.start_seconds, self.end_seconds
+        on = np.where(
+            start <= end,
+            (start <= seconds) & (seconds < end),
+            (start <= seconds) | (seconds < end),
+        )
+        return immutables.Map(zip(self.schedule_ids, on.tolist()))
+
+    def is_on(self, schedule_id: ScheduleId, sim_time: SimTime) -> Optional[bool]:
+        """
+        evaluates one compiled schedule at a simulation time, see on_shift
+
+        :param schedule_id: the schedule
+        :param sim_time: the simulation time
+        :return: whether the schedule is on, or None if the schedule is not compiled
+        """
+        try:
+            i = self.schedule_ids.index(schedule_id)
+        except ValueError:
+            return None
+        seconds = int(sim_time) % SECONDS_IN_DAY
+        start, end = int(self.start_seconds[i]), int(self.end_seconds[i])
+        if start <= end:
+            return start <= seconds < end
+        else:
+            return start <= seconds or seconds < end
+
+    def next_transition_time(
+        self, schedule_id: ScheduleId, sim_time: SimTime
+    ) -> Optional[SimTime]:
+        """
+        finds the next time after sim_time when a schedule turns on or off
+
+        :param schedule_id: the schedule
+        :param sim_time: the simulation time
+        :return: the next transition time, or None if the schedule is not compiled or never
+                 changes
+        """
+        try:
+            i = self.schedule_ids.index(schedule_id)
+        except ValueError:
+            return None
+        start, end = int(self.start_seconds[i]), int(self.end_seconds[i])
+        if start == end:
+            # an empty range is never on
+            return None
+
+        seconds = int(sim_time) % SECONDS_IN_DAY
+        # a boundary at the current second is next crossed a day from now
+        delta = min((b - seconds - 1) % SECONDS_IN_DAY + 1 for b in (start, end))
+        return sim_time + delta
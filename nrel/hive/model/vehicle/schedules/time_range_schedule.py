@@ -1,15 +1,38 @@
+from __future__ import annotations
+
 import functools as ft
 from csv import DictReader
-from datetime import datetime
+from dataclasses import dataclass
+from datetime import datetime, time
 from pathlib import Path
-from typing import Dict, Optional
+from typing import TYPE_CHECKING, Dict, Optional
 
 from immutables import Map
 
-from nrel.hive.model.vehicle.schedules.schedule import ScheduleFunction
 from nrel.hive.util.time_helpers import read_time_string, time_in_range
 from nrel.hive.util.typealiases import VehicleId, ScheduleId
 
+if TYPE_CHECKING:
+    from nrel.hive.model.vehicle.schedules.schedule import ScheduleFunction
+    from nrel.hive.state.simulation_state.simulation_state import SimulationState
+
+
+@dataclass(frozen=True)
+class TimeRangeSchedule:
+    """
+    a schedule function which is on during a daily time range [start_time, end_time),
+    which may wrap past midnight. the range is kept so that schedules can be compiled,
+    see ScheduleTable.
+    """
+
+    start_time: time
+    end_time: time
+
+    def __call__(self, sim: SimulationState, vehicle_id: VehicleId) -> bool:
+        sim_time = datetime.utcfromtimestamp(sim.sim_time).time()
+        within_scheduled_time = time_in_range(self.start_time, self.end_time, sim_time)
+        return within_scheduled_time
+
 
 def time_range_schedules_from_file(
     file: str,
@@ -23,7 +46,7 @@ def time_range_schedules_from_file(
     file_path = Path(file)
     with file_path.open("r") as f:
         reader = DictReader(f)
-        initial = Map[ScheduleId, ScheduleFunction]()
+        initial: Map[ScheduleId, ScheduleFunction] = Map()
         result = ft.reduce(read_time_range_row, reader, initial)
 
     return result
@@ -39,7 +62,7 @@ def time_range_schedules_from_string(
     :return: the schedules
     """
     reader = DictReader(string.split())
-    initial = Map[ScheduleId, ScheduleFunction]()
+    initial: Map[ScheduleId, ScheduleFunction] = Map()
     result = ft.reduce(read_time_range_row, reader, initial)
 
     return result
@@ -68,10 +91,7 @@ def read_time_range_row(acc: Map[ScheduleId, ScheduleFunction], row: Dict):
     start_time = read_time_string(start_time_string)
     end_time = read_time_string(end_time_string)
 
-    def _schedule_fn(sim, vehicle_id: VehicleId) -> bool:
-        sim_time = datetime.utcfromtimestamp(sim.sim_time).time()
-        within_scheduled_time = time_in_range(start_time, end_time, sim_time)
-        return within_scheduled_time
+    schedule_fn = TimeRangeSchedule(start_time, end_time)
 
-    updated_schedules = acc.set(schedule_id, _schedule_fn)
+    updated_schedules = acc.set(schedule_id, schedule_fn)
     return updated_schedules
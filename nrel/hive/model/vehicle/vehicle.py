@@ -1,7 +1,7 @@
 from __future__ import annotations
 
 from dataclasses import dataclass, replace
-from typing import Dict
+from typing import Dict, Optional
 
 import h3
 import immutables
@@ -68,6 +68,7 @@ class Vehicle(Entity):
         row: Dict[str, str],
         road_network: RoadNetwork,
         environment: Environment,
+        position: Optional[EntityPosition] = None,
     ) -> Vehicle:
         """
         reads a csv row from file to generate a Vehicle
@@ -78,6 +79,7 @@ class Vehicle(Entity):
         this string will be stripped of whitespace characters (no spaces allowed in names!)
 
         :param road_network: the road network, used to find the vehicle's location in the sim
+        :param position: the row's location already positioned on the road network, if known
         :return: a vehicle, or, an IOError if failure occurred.
         """
 
@@ -122,8 +124,11 @@ class Vehicle(Entity):
                     vehicle_id, schedule_id, home_base_id, allows_pooling
                 )
 
-                geoid = h3.geo_to_h3(lat, lon, road_network.sim_h3_resolution)
-                start_position = road_network.position_from_geoid(geoid)
+                if position is not None:
+                    start_position: Optional[EntityPosition] = position
+                else:
+                    geoid = h3.geo_to_h3(lat, lon, road_network.sim_h3_resolution)
+                    start_position = road_network.position_from_geoid(geoid)
 
                 if start_position is None:
                     raise IOError(
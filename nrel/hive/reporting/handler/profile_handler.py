@@ -0,0 +1,146 @@
+from __future__ import annotations
+
+import csv
+import logging
+from pathlib import Path
+from typing import TYPE_CHECKING, Dict, List
+
+from rich.console import Console
+from rich.table import Table
+
+from nrel.hive.reporting.handler.handler import Handler
+from nrel.hive.reporting.profiler import Profiler
+from nrel.hive.reporting.report_type import ReportType
+
+if TYPE_CHECKING:
+    from nrel.hive.reporting.reporter import Report
+    from nrel.hive.runner.runner_payload import RunnerPayload
+
+log = logging.getLogger(__name__)
+
+
+class ProfileHandler(Handler):
+    """
+    writes STEP_PROFILE reports to the profile.csv output file and prints a
+    summary of where the step time went when the simulation closes, along with the
+    hit rates of the h3 memos over the run, which are written to cache_profile.csv
+    """
+
+    FIELDNAMES = ("sim_time", "phase", "calls", "wall_time_seconds")
+    CACHE_FIELDNAMES = ("cache", "hits", "misses", "size", "hit_rate")
+
+    def __init__(self, scenario_output_directory: Path):
+        self.log_path = scenario_output_directory / "profile.csv"
+        self.log_file = open(self.log_path, "w", newline="")
+        self.writer = csv.DictWriter(self.log_file, fieldnames=self.FIELDNAMES)
+        self.writer.writeheader()
+
+        # phase -> [total wall time seconds, total calls]
+        self.totals: Dict[str, List[float]] = {}
+
+        # the memos are shared by the process, so usage is reported relative to this run's start
+        self.cache_path = scenario_output_directory / "cache_profile.csv"
+        self.cache_baseline = Profiler.cache_info()
+
+    def handle(self, reports: List[Report], runner_payload: RunnerPayload):
+        for report in reports:
+            if report.report_type != ReportType.STEP_PROFILE:
+                continue
+            row = report.report
+            self.writer.writerow(
+                {
+                    "sim_time": row["sim_time"],
+                    "phase": row["phase"],
+                    "calls": row["calls"],
+                    "wall_time_seconds": row["wall_time_seconds"],
+                }
+            )
+            totals = self.totals.setdefault(row["phase"], [0.0, 0])
+            totals[0] += float(row["wall_time_seconds"])
+            totals[1] += int(row["calls"])
+
+    def close(self, runner_payload: RunnerPayload):
+        self.log_file.close()
+        cache_rows = self.cache_rows()
+        with open(self.cache_path, "w", newline="") as f:
+            writer = csv.DictWriter(f, fieldnames=self.CACHE_FIELDNAMES)
+            writer.writeheader()
+            writer.writerows(cache_rows)
+        self.log()
+        self.log_caches(cache_rows)
+        log.info(f"step profile written to {self.log_path}")
+
+    def cache_rows(self) -> List[Dict]:
+        """
+        the usage of each h3 memo since this handler was created
+
+        :return: one row of cache_profile.csv per memo
+        """
+        rows = []
+        for name, info in Profiler.cache_info().items():
+            baseline = self.cache_baseline.get(name)
+            hits = info.hits - baseline.hits if baseline else info.hits
+            misses = info.misses - baseline.misses if baseline else info.misses
+            lookups = hits + misses
+            rows.append(
+                {
+                    "cache": name,
+                    "hits": hits,
+                    "misses": misses,
+                    "size": info.size,
+                    "hit_rate": hits / lookups if lookups > 0 else 0.0,
+                }
+            )
+        return rows
+
+    def log(self):
+        """
+        prints a table of total time, call count, and share of total time per phase
+        """
+        table = Table(title="Step Profile")
+        table.add_column("Phase")
+        table.add_column("Calls")
+        table.add_column("Total (s)")
+        table.add_column("Mean (ms)")
+        table.add_column("Share")
+
+        # profiled phases do not overlap, so each share is relative to the total profiled time
+        profiled_time = sum(t for t, _ in self.totals.values())
+        ranked = sorted(self.totals.items(), key=lambda kv: kv[1][0], reverse=True)
+        for phase, (total, calls) in ranked:
+            mean_ms = total / calls * 1000 if calls > 0 else 0.0
+            share = total / profiled_time * 100 if profiled_time > 0 else 0.0
+            table.add_row(
+                phase,
+                str(int(calls)),
+                f"{total:.3f}",
+                f"{mean_ms:.3f}",
+                f"{share:.1f}%",
+            )
+
+        console = Console()
+        console.print(table)
+
+    def log_caches(self, cache_rows: List[Dict]):
+        """
+        prints a table of the usage of each h3 memo
+
+        :param cache_rows: the rows from cache_rows
+        """
+        table = Table(title="H3 Cache")
+        table.add_column("Cache")
+        table.add_column("Hits")
+        table.add_column("Misses")
+        table.add_column("Size")
+        table.add_column("Hit Rate")
+        for row in cache_rows:
+            table.add_row(
+                row["cache"],
+                str(row["hits"]),
+                str(row["misses"]),
+                str(row["size"]),
+                f"{row['hit_rate'] * 100:.1f}%",
+            )
+
+        console = Console()
+        console.print(table)
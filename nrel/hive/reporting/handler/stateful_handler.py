@@ -103,6 +103,7 @@ class StatefulHandler(Handler):
         del out_dict["id"]
         del out_dict["state"]
         del out_dict["energy_dispensed"]
+        del out_dict["charger_mask"]
 
         out_dict["station_id"] = station.id
         out_dict["memberships"] = str(station.membership)
@@ -4,7 +4,7 @@ import json
 import logging
 from collections import Counter
 from pathlib import Path
-from typing import TYPE_CHECKING, List, Dict
+from typing import TYPE_CHECKING, List, Dict, Optional
 
 from nrel.hive.reporting.handler.handler import Handler
 from nrel.hive.reporting.handler.summary_stats import SummaryStats
@@ -24,6 +24,8 @@ class StatsHandler(Handler):
 
     def __init__(self):
         self.stats = SummaryStats()
+        self._last_state_counts: Counter = Counter()
+        self._last_sim_time: Optional[int] = None
 
     def get_stats(self, rp: RunnerPayload) -> Dict:
         """
@@ -31,6 +33,7 @@ class StatsHandler(Handler):
         summary file output
         :return: the compiled stats for this simulation run
         """
+        self._count_skipped_steps(rp.s.sim_time, rp.e.config.sim.timestep_duration_seconds)
         return self.stats.compile_stats(rp)
 
     def handle(self, reports: List[Report], runner_payload: RunnerPayload):
@@ -46,6 +49,8 @@ class StatsHandler(Handler):
 
         # update the proportion of time spent by vehicles in each vehicle state
         sim_state = runner_payload.s
+        timestep = runner_payload.e.config.sim.timestep_duration_seconds
+        self._count_skipped_steps(sim_state.sim_time - timestep, timestep)
         state_counts = Counter(
             map(
                 lambda v: v.vehicle_state.__class__.__name__,
@@ -53,6 +58,8 @@ class StatsHandler(Handler):
             )
         )
         self.stats.state_count += state_counts
+        self._last_state_counts = state_counts
+        self._last_sim_time = sim_state.sim_time
 
         # capture the distance traveled in move states
         move_events = list(
@@ -75,7 +82,7 @@ class StatsHandler(Handler):
 
         :return:
         """
-        output = self.stats.compile_stats(runner_payload)
+        output = self.get_stats(runner_payload)
         self.stats.log()
         output_path = Path(runner_payload.e.config.scenario_output_directory).joinpath(
             "summary_stats.json"
@@ -83,3 +90,19 @@ class StatsHandler(Handler):
         with output_path.open(mode="w") as f:
             json.dump(output, f, indent=4)
             log.info(f"summary stats written to {output_path}")
+
+    def _count_skipped_steps(self, sim_time: int, timestep: int):
+        """
+        the event-driven runner skips time steps where nothing changes, so they are never
+        flushed. vehicles hold the states last reported through those steps, so the last
+        state counts are added once for each step skipped between the last report and sim_time.
+
+        :param sim_time: the time up to which skipped steps are counted
+        :param timestep: the duration of a time step, in seconds
+        """
+        if self._last_sim_time is None or sim_time <= self._last_sim_time:
+            return
+        skipped = -(-(sim_time - self._last_sim_time) // timestep)
+        for state, count in self._last_state_counts.items():
+            self.stats.state_count[state] += count * skipped
+        self._last_sim_time = sim_time
@@ -0,0 +1,77 @@
+from __future__ import annotations
+
+import time
+from contextlib import contextmanager, nullcontext
+from typing import Dict, Iterator, List, Tuple
+
+from nrel.hive.util import h3_cells
+
+# a single, reusable no-op context for when profiling is disabled
+_NO_OP = nullcontext()
+
+
+class Profiler:
+    """
+    accumulates wall time and call counts for named phases of a simulation step.
+
+    when disabled, timing a phase returns a shared no-op context manager, so the
+    instrumentation left in the step loop costs one attribute check per phase.
+    """
+
+    def __init__(self, enabled: bool = False):
+        self.enabled = enabled
+        self._step_timings: Dict[str, List[float]] = {}
+
+    def timed(self, phase: str):
+        """
+        context manager which times the enclosed block and records it under the phase name
+
+        :param phase: the name of the phase being timed
+        :return: a context manager
+        """
+        if not self.enabled:
+            return _NO_OP
+        return self._timed(phase)
+
+    @contextmanager
+    def _timed(self, phase: str) -> Iterator[None]:
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(phase, time.perf_counter() - start)
+
+    def record(self, phase: str, elapsed_seconds: float, calls: int = 1):
+        """
+        adds a timing observation for a phase
+
+        :param phase: the name of the phase
+        :param elapsed_seconds: the wall time spent in the phase
+        :param calls: the number of calls this observation covers
+        """
+        timing = self._step_timings.get(phase)
+        if timing is None:
+            self._step_timings[phase] = [elapsed_seconds, calls]
+        else:
+            timing[0] += elapsed_seconds
+            timing[1] += calls
+
+    def drain(self) -> Tuple[Tuple[str, float, int], ...]:
+        """
+        removes and returns all timings recorded since the last drain
+
+        :return: tuples of (phase, wall time seconds, calls) in the order phases were first observed
+        """
+        drained = tuple((phase, t[0], int(t[1])) for phase, t in self._step_timings.items())
+        self._step_timings = {}
+        return drained
+
+    @staticmethod
+    def cache_info() -> Dict[str, h3_cells.CacheInfo]:
+        """
+        the usage of the memoized h3 conversions since the process started, which is
+        recorded whether or not profiling is enabled
+
+        :return: the usage of each memo, by name
+        """
+        return h3_cells.cache_info()
@@ -21,6 +21,7 @@ class ReportType(Enum):
     STATION_LOAD_EVENT = 11
     REFUEL_SEARCH_EVENT = 12
     DRIVER_SCHEDULE_EVENT = 13
+    STEP_PROFILE = 14
 
     @classmethod
     def from_string(cls, s: str) -> ReportType:
@@ -38,6 +39,7 @@ class ReportType(Enum):
             "station_load_event": cls.STATION_LOAD_EVENT,
             "refuel_search_event": cls.REFUEL_SEARCH_EVENT,
             "driver_schedule_event": cls.DRIVER_SCHEDULE_EVENT,
+            "step_profile": cls.STEP_PROFILE,
         }
         try:
             return values[s]
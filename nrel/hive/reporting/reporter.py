@@ -1,11 +1,13 @@
 from __future__ import annotations
 
-from typing import TYPE_CHECKING, Dict, NamedTuple, Optional, Tuple, Any
+from typing import TYPE_CHECKING, Dict, List, NamedTuple, Optional, Tuple, Any
 
 from immutables import Map
 
+from nrel.hive.reporting.handler.profile_handler import ProfileHandler
 from nrel.hive.reporting.handler.stats_handler import StatsHandler
 from nrel.hive.reporting.handler.time_step_stats_handler import TimeStepStatsHandler
+from nrel.hive.reporting.profiler import Profiler
 from nrel.hive.reporting.report_type import ReportType
 
 if TYPE_CHECKING:
@@ -29,9 +31,10 @@ class Reporter:
     A class that generates reports for the simulation.
     """
 
-    def __init__(self):
-        self.reports = []
-        self.handlers = []
+    def __init__(self, profiler: Optional[Profiler] = None):
+        self.reports: List[Report] = []
+        self.handlers: List[Handler] = []
+        self.profiler = profiler if profiler is not None else Profiler()
 
     def add_handler(self, handler: Handler):
         self.handlers.append(handler)
@@ -44,8 +47,16 @@ class Reporter:
         :param runner_payload: The runner payload.
         :return: Does not return a value.
         """
-        for handler in self.handlers:
-            handler.handle(self.reports, runner_payload)
+        if self.profiler.enabled:
+            # timings of this flush are recorded after the profile reports are filed,
+            # so handler timings are reported along with the following time step
+            self.reports.extend(self._profile_reports(runner_payload))
+            for handler in self.handlers:
+                with self.profiler.timed(f"reporter.flush.{handler.__class__.__name__}"):
+                    handler.handle(self.reports, runner_payload)
+        else:
+            for handler in self.handlers:
+                handler.handle(self.reports, runner_payload)
 
         self.reports = []
 
@@ -59,6 +70,25 @@ class Reporter:
         """
         self.reports.append(report)
 
+    def _profile_reports(self, runner_payload: RunnerPayload) -> Tuple[Report, ...]:
+        """
+        drains the profiler, packaging each phase timing as a STEP_PROFILE report
+
+        :param runner_payload: the runner payload, used for the current sim time
+        :return: one report per profiled phase
+        """
+        sim_time = runner_payload.s.sim_time
+        reports = []
+        for phase, elapsed, calls in self.profiler.drain():
+            report_data: Dict[str, Any] = {
+                "sim_time": sim_time,
+                "phase": phase,
+                "calls": calls,
+                "wall_time_seconds": elapsed,
+            }
+            reports.append(Report(ReportType.STEP_PROFILE, report_data))
+        return tuple(reports)
+
     def get_summary_stats(self, rp: RunnerPayload) -> Optional[Dict]:
         """
         if a summary StatsHandler exists, return the final report from the collection of statistics
@@ -90,5 +120,11 @@ class Reporter:
 
         :return:
         """
+        if self.profiler.enabled:
+            # the timings of the final flush have not been reported yet
+            final_reports = list(self._profile_reports(runner_payload))
+            for handler in self.handlers:
+                if isinstance(handler, ProfileHandler):
+                    handler.handle(final_reports, runner_payload)
         for handler in self.handlers:
             handler.close(runner_payload)
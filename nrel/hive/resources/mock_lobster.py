@@ -259,7 +259,9 @@ def mock_osm_route() -> Route:
     )
 
 
-def mock_osm_network(h3_res: H3Resolution = 15, geofence_res: H3Resolution = 10) -> OSMRoadNetwork:
+def mock_osm_network(
+    h3_res: H3Resolution = 15, geofence_res: H3Resolution = 10, routing_processes: int = 0
+) -> OSMRoadNetwork:
     road_network_file = resource_filename(
         "nrel.hive.resources.scenarios.denver_downtown.road_network",
         "downtown_denver_network.json",
@@ -267,6 +269,7 @@ def mock_osm_network(h3_res: H3Resolution = 15, geofence_res: H3Resolution = 10)
     return OSMRoadNetwork.from_file(
         road_network_file=Path(road_network_file),
         sim_h3_resolution=h3_res,
+        routing_processes=routing_processes,
     )
 
 
@@ -583,6 +586,7 @@ def mock_sim(
     sim_timestep_duration_seconds: Seconds = 60,
     h3_location_res: int = 15,
     h3_search_res: int = 10,
+    h3_int_search: bool = False,
     vehicles: Tuple[Vehicle, ...] = (),
     stations: Tuple[Station, ...] = (),
     bases: Tuple[Base, ...] = (),
@@ -594,6 +598,7 @@ def mock_sim(
         sim_timestep_duration_seconds=sim_timestep_duration_seconds,
         sim_h3_location_resolution=h3_location_res,
         sim_h3_search_resolution=h3_search_res,
+        sim_h3_int_search=h3_int_search,
     )
 
     sim_v = simulation_state_ops.add_entities(sim, vehicles)
@@ -693,6 +698,7 @@ def mock_env(
         schedules=immutables.Map(schedules),
         fleet_ids=fleet_ids,
     )
+    initial_env = initial_env.build_charger_compatibility().build_schedule_table()
 
     return initial_env
 
@@ -4,10 +4,13 @@ from typing import NamedTuple, TYPE_CHECKING, FrozenSet, Optional
 
 import immutables
 
+from nrel.hive.model.energy.charger.charger_compatibility import ChargerCompatibility
+from nrel.hive.model.vehicle.schedules.schedule_table import ScheduleTable
 from nrel.hive.reporting.reporter import Reporter
 
 if TYPE_CHECKING:
     from nrel.hive.model.energy.charger.charger import Charger
+    from nrel.hive.model.station.station import Station
     from nrel.hive.model.vehicle.mechatronics.mechatronics_interface import MechatronicsInterface
     from nrel.hive.config import HiveConfig
     from nrel.hive.model.vehicle.schedules.schedule import ScheduleFunction
@@ -32,6 +35,8 @@ class Environment(NamedTuple):
     fleet_ids: FrozenSet[Optional[MembershipId]] = frozenset()
 
     reporter: Reporter = Reporter()
+    charger_compatibility: Optional[ChargerCompatibility] = None
+    schedule_table: Optional[ScheduleTable] = None
 
     def set_reporter(self, reporter: Reporter) -> Environment:
         """
@@ -42,3 +47,69 @@ class Environment(NamedTuple):
         :return: the updated environment
         """
         return self._replace(reporter=reporter)
+
+    def build_charger_compatibility(self) -> Environment:
+        """
+        precomputes which chargers each mechatronics type can use. this should be called
+        again whenever the mechatronics or chargers tables are replaced.
+
+        :return: the updated environment
+        """
+        compatibility = ChargerCompatibility.build(self.mechatronics, self.chargers)
+        return self._replace(charger_compatibility=compatibility)
+
+    def get_charger_compatibility(self) -> ChargerCompatibility:
+        """
+        gets the precomputed charger compatibility table
+
+        :return: the charger compatibility table
+        :raises Exception: if the table was not built for the current mechatronics and
+                           chargers tables, see build_charger_compatibility
+        """
+        compatibility = self.charger_compatibility
+        if compatibility is None or not compatibility.built_for(self.mechatronics, self.chargers):
+            msg = (
+                "the charger compatibility table was not built for the current mechatronics "
+                "and chargers; call Environment.build_charger_compatibility after replacing them"
+            )
+            raise Exception(msg)
+        return compatibility
+
+    def build_schedule_table(self) -> Environment:
+        """
+        compiles the time range schedules. this should be called again whenever the
+        schedules table is replaced.
+
+        :return: the updated environment
+        """
+        return self._replace(schedule_table=ScheduleTable.build(self.schedules))
+
+    def get_schedule_table(self) -> ScheduleTable:
+        """
+        gets the compiled schedule table
+
+        :return: the schedule table
+        :raises Exception: if the table was not compiled for the current schedules table,
+                           see build_schedule_table
+        """
+        schedule_table = self.schedule_table
+        if schedule_table is None or not schedule_table.built_for(self.schedules):
+            msg = (
+                "the schedule table was not compiled for the current schedules; "
+                "call Environment.build_schedule_table after replacing them"
+            )
+            raise Exception(msg)
+        return schedule_table
+
+    def station_has_compatible_charger(
+        self, mechatronics_id: MechatronicsId, station: Station
+    ) -> bool:
+        """
+        tests if a station offers any charger that a mechatronics type can use
+
+        :param mechatronics_id: the mechatronics type
+        :param station: the station
+        :return: True if the station has at least one compatible charger
+        """
+        compatibility = self.get_charger_compatibility()
+        return (compatibility.mechatronics_mask(mechatronics_id) & station.charger_mask) != 0
@@ -6,6 +6,7 @@ from typing import NamedTuple, TYPE_CHECKING, Callable, Optional
 
 from tqdm import tqdm
 
+from nrel.hive.model.sim_time import SimTime
 from nrel.hive.runner.runner_payload import RunnerPayload
 
 log = logging.getLogger(__name__)
@@ -30,6 +31,8 @@ class LocalSimulationRunner(NamedTuple):
         :param runner_payload: the initial state of the simulation
         :return: the final simulation state and dispatcher state
         """
+        if runner_payload.e.config.sim.event_driven:
+            return cls.run_event_driven(runner_payload)
 
         time_steps = tqdm(
             range(
@@ -45,6 +48,43 @@ class LocalSimulationRunner(NamedTuple):
 
         return final_payload
 
+    @classmethod
+    def run_event_driven(
+        cls,
+        runner_payload: RunnerPayload,
+    ) -> RunnerPayload:
+        """
+        steps through time like run, but after a step where nothing changed, skips ahead
+        to the time step of the next event. events are reported by each update function,
+        see Update.next_event_time. skipped time steps are not flushed to the reporter; the
+        StatsHandler counts them with the vehicle states from the step before the skip.
+
+        :param runner_payload: the initial state of the simulation
+        :return: the final simulation state and dispatcher state
+        """
+        sim_config = runner_payload.e.config.sim
+        start_time = int(sim_config.start_time)
+        end_time = int(sim_config.end_time)
+        timestep = sim_config.timestep_duration_seconds
+        run_step = _run_step_in_context(runner_payload.e)
+
+        payload = runner_payload
+        with tqdm(total=len(range(start_time, end_time, timestep))) as progress:
+            while payload.s.sim_time < end_time:
+                payload = run_step(payload)
+                progress.update(1)
+
+                next_event_time = payload.u.next_event_time(payload)
+                next_time = _next_time_step(start_time, timestep, next_event_time, end_time)
+                if next_time > payload.s.sim_time:
+                    skipped = len(range(payload.s.sim_time, next_time, timestep))
+                    payload = payload._replace(
+                        s=payload.s._replace(sim_time=SimTime(next_time))
+                    )
+                    progress.update(skipped)
+
+        return payload
+
     @classmethod
     def step(cls, runner_payload: RunnerPayload) -> Optional[RunnerPayload]:
         """
@@ -59,6 +99,18 @@ class LocalSimulationRunner(NamedTuple):
             return _run_step_in_context(runner_payload.e)(runner_payload)
 
 
+def _next_time_step(
+    start_time: int, timestep: int, event_time: Optional[int], end_time: int
+) -> int:
+    """
+    the first time step at or after an event, or the end time if there is no event before it
+    """
+    if event_time is None or event_time >= end_time:
+        return end_time
+    steps = -(-(int(event_time) - start_time) // timestep)
+    return min(start_time + steps * timestep, end_time)
+
+
 def _run_step_in_context(env: Environment) -> Callable:
     def _run_step(payload: RunnerPayload, t: int = -1) -> RunnerPayload:
         # applies the most recent version of each update function
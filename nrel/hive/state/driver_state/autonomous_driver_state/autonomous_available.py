@@ -20,9 +20,14 @@ from nrel.hive.state.vehicle_state.reserve_base import ReserveBase
 from nrel.hive.util import BaseId
 
 if TYPE_CHECKING:
+    from nrel.hive.model.sim_time import SimTime
     from nrel.hive.state.simulation_state.simulation_state import SimulationState
     from nrel.hive.runner.environment import Environment
     from nrel.hive.util.typealiases import ScheduleId
+    from nrel.hive.state.driver_state.demand_heatmap import DemandHeatmap
+    from nrel.hive.dispatcher.instruction_generator.charge_time_estimates import (
+        ChargeTimeEstimates,
+    )
 
 log = logging.getLogger(__name__)
 
@@ -56,6 +61,8 @@ class AutonomousAvailable(DriverState):
         sim: SimulationState,
         env: Environment,
         previous_instructions: Optional[Tuple[Instruction, ...]] = None,
+        demand_heatmap: Optional[DemandHeatmap] = None,
+        charge_time_estimates: Optional[ChargeTimeEstimates] = None,
     ) -> Optional[Instruction]:
         my_vehicle = sim.vehicles.get(self.attributes.vehicle_id)
 
@@ -73,7 +80,14 @@ class AutonomousAvailable(DriverState):
             return None
 
     def update(
-        self, sim: SimulationState, env: Environment
+        self,
+        sim: SimulationState,
+        env: Environment,
+        charge_time_estimates: Optional[ChargeTimeEstimates] = None,
     ) -> Tuple[Optional[Exception], Optional[SimulationState]]:
         # there is no other state for an autonomous driver, so, this is a noop
         return None, sim
+
+    def next_wake_time(self, sim: SimulationState, env: Environment) -> Optional[SimTime]:
+        # the update is a noop, so there is never a reason to wake
+        return None
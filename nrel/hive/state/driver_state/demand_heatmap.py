@@ -0,0 +1,72 @@
+from __future__ import annotations
+
+import heapq
+from typing import TYPE_CHECKING, NamedTuple, Optional, Tuple
+
+import h3
+
+from nrel.hive.util import h3_cells
+from nrel.hive.util.h3_ops import H3Ops
+
+if TYPE_CHECKING:
+    from nrel.hive.model.entity_position import EntityPosition
+    from nrel.hive.state.simulation_state.simulation_state import SimulationState
+    from nrel.hive.util.typealiases import GeoId
+
+
+class DemandHeatmap(NamedTuple):
+    """
+    the request search cells with the most requests in one simulation state, which human
+    drivers reposition towards when looking for requests. it is built once per time step
+    and handed to every driver, see InstructionGenerationResult.add_driver_instructions.
+
+    cells are ranked by request count, with ties broken by the greater GeoId, and the
+    center of each ranked cell is snapped to the road network once when the heatmap is built.
+
+    :param cells: the densest search cells with their request counts, densest first
+    :param positions: the snapped position of the center of each cell
+    """
+
+    cells: Tuple[Tuple[GeoId, int], ...]
+    positions: Tuple[Optional[EntityPosition], ...]
+
+    @classmethod
+    def build(cls, sim: SimulationState, top_k: int = 1) -> DemandHeatmap:
+        """
+        ranks the request search cells of a simulation state
+
+        :param sim: the simulation state
+        :param top_k: the number of densest cells to keep
+        :return: the demand heatmap
+        """
+        ranked = heapq.nlargest(
+            max(top_k, 1),
+            ((cell, len(request_ids)) for cell, request_ids in sim.r_search.items()),
+            key=lambda t: (t[1], t[0]),  # fallback to geoid (index 0) to break ties
+        )
+        cells = tuple((h3_cells.cell_to_geoid(cell), count) for cell, count in ranked)
+        positions = tuple(
+            sim.road_network.position_from_geoid(
+                h3.h3_to_center_child(geoid, sim.sim_h3_location_resolution)
+            )
+            for geoid, _ in cells
+        )
+        return DemandHeatmap(cells=cells, positions=positions)
+
+    def reposition_location(self, geoid: Optional[GeoId] = None) -> Optional[EntityPosition]:
+        """
+        picks a high demand location to reposition to
+
+        :param geoid: if provided, pick the ranked cell nearest to this location, otherwise
+                      the densest cell
+        :return: the snapped center of the picked cell, or None if there are no requests
+        """
+        if len(self.positions) == 0:
+            return None
+        elif geoid is None or len(self.positions) == 1:
+            return self.positions[0]
+        else:
+            # the nearest cell, falling back to the densest cell to break ties
+            distances = [H3Ops.great_circle_distance(geoid, cell) for cell, _ in self.cells]
+            return self.positions[distances.index(min(distances))]
+
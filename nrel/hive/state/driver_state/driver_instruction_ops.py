@@ -3,8 +3,6 @@ from __future__ import annotations
 import logging
 from typing import Optional, TYPE_CHECKING, Tuple
 
-import h3
-
 from nrel.hive.dispatcher.instruction.instruction import Instruction
 from nrel.hive.dispatcher.instruction.instructions import (
     ChargeBaseInstruction,
@@ -17,6 +15,7 @@ from nrel.hive.dispatcher.instruction_generator.instruction_generator_ops import
 )
 from nrel.hive.model.energy.energytype import EnergyType
 from nrel.hive.model.entity import Entity
+from nrel.hive.state.driver_state.demand_heatmap import DemandHeatmap
 from nrel.hive.state.vehicle_state.charging_base import ChargingBase
 from nrel.hive.state.vehicle_state.idle import Idle
 from nrel.hive.state.vehicle_state.reserve_base import ReserveBase
@@ -29,6 +28,9 @@ if TYPE_CHECKING:
     from nrel.hive.model.vehicle.vehicle import Vehicle
     from nrel.hive.model.base import Base
     from nrel.hive.model.energy.charger import Charger
+    from nrel.hive.dispatcher.instruction_generator.charge_time_estimates import (
+        ChargeTimeEstimates,
+    )
     from nrel.hive.model.entity_position import EntityPosition
 
 log = logging.getLogger(__name__)
@@ -86,6 +88,7 @@ def human_go_home(
     home_base: Base,
     sim: SimulationState,
     env: Environment,
+    charge_time_estimates: Optional[ChargeTimeEstimates] = None,
 ) -> Optional[Instruction]:
     """
     Human drivers go home at the end of their shift.
@@ -96,6 +99,9 @@ def human_go_home(
     :param home_base: the vehicle's home
     :param sim: the current simulation state
     :param env: the environment for this simulation
+    :param charge_time_estimates: this time step's charge time estimates to the
+                                  human_driver_off_shift_charge_target, built from sim
+                                  if not provided
     :return: the instruction for this driver
     """
     mechatronics = env.mechatronics.get(veh.mechatronics_id)
@@ -124,6 +130,7 @@ def human_go_home(
             environment=env,
             target_soc=env.config.dispatcher.human_driver_off_shift_charge_target,
             charging_search_type=env.config.dispatcher.charging_search_type,
+            charge_time_estimates=charge_time_estimates,
         )
         return TupleOps.head_optional(charge_instructions)
     else:
@@ -135,35 +142,25 @@ def human_go_home(
 def human_look_for_requests(
     veh: Vehicle,
     sim: SimulationState,
+    env: Optional[Environment] = None,
+    demand_heatmap: Optional[DemandHeatmap] = None,
 ) -> Optional[RepositionInstruction]:
     """
     Human driver relocates in search of greener request pastures.
 
+    the most dense request search hexes are a proxy for high demand areas, see DemandHeatmap.
+
     :param veh:
     :param sim:
+    :param env: if provided, drivers pick the nearest of the
+                env.config.dispatcher.human_driver_reposition_top_k densest hexes
+    :param demand_heatmap: this time step's demand heatmap, built from sim if not provided
     :return:
     """
-
-    def _get_reposition_location() -> Optional[EntityPosition]:
-        """
-        takes the most dense request search hex as a proxy for high demand areas
-        :return:
-        """
-        if len(sim.r_search) == 0:
-            # no requests in system, do nothing
-            return None
-        else:
-            # find the most dense request search hex and sends vehicles to the center
-            best_search_hex = sorted(
-                [(k, len(v)) for k, v in sim.r_search.items()],
-                key=lambda t: (t[1], t[0]),  # fallback to geoid (index 0) to break ties
-                reverse=True,
-            )[0][0]
-        destination = h3.h3_to_center_child(best_search_hex, sim.sim_h3_location_resolution)
-        destination_link = sim.road_network.position_from_geoid(destination)
-        return destination_link
-
-    dest = _get_reposition_location()
+    if demand_heatmap is None:
+        top_k = env.config.dispatcher.human_driver_reposition_top_k if env is not None else 1
+        demand_heatmap = DemandHeatmap.build(sim, top_k)
+    dest = demand_heatmap.reposition_location(veh.geoid)
     if dest:
         return RepositionInstruction(veh.id, dest.link_id)
     else:
@@ -276,6 +273,7 @@ def av_dispatch_base_instruction(
             entity_search=sim.b_search,
             is_valid=valid_fn,
             sim_h3_search_resolution=sim.sim_h3_search_resolution,
+            sim_h3_int_search=sim.sim_h3_int_search,
             max_search_distance_km=env.config.dispatcher.max_search_radius_km,
         )
 
@@ -7,10 +7,15 @@ from nrel.hive.state.simulation_state import simulation_state_ops
 from nrel.hive.util import SimulationStateError
 
 if TYPE_CHECKING:
+    from nrel.hive.model.sim_time import SimTime
     from nrel.hive.state.simulation_state.simulation_state import SimulationState
     from nrel.hive.runner.environment import Environment
     from nrel.hive.util.typealiases import ScheduleId, BaseId, VehicleId
     from nrel.hive.dispatcher.instruction.instruction import Instruction
+    from nrel.hive.state.driver_state.demand_heatmap import DemandHeatmap
+    from nrel.hive.dispatcher.instruction_generator.charge_time_estimates import (
+        ChargeTimeEstimates,
+    )
 
 
 class DriverState(ABC):
@@ -44,16 +49,42 @@ class DriverState(ABC):
 
     @abstractmethod
     def update(
-        self, sim: SimulationState, env: Environment
+        self,
+        sim: SimulationState,
+        env: Environment,
+        charge_time_estimates: Optional[ChargeTimeEstimates] = None,
     ) -> Tuple[Optional[Exception], Optional[SimulationState]]:
+        """
+        updates the driver state for this time step
+
+        :param sim: the simulation state
+        :param env: the simulation environment
+        :param charge_time_estimates: this time step's charge time estimates to the
+                                      ideal_fastcharge_soc_limit, shared by all drivers
+        :return: an error, or the updated simulation state
+        """
         pass
 
+    def next_wake_time(self, sim: SimulationState, env: Environment) -> Optional[SimTime]:
+        """
+        the earliest time at which updating this driver state could change the simulation.
+        a state that returns None promises that its update is a no-op until it is replaced.
+        by default, a driver state is updated at every time step.
+
+        :param sim: the simulation state
+        :param env: the simulation environment
+        :return: the next time this state needs an update, or None to wait for an external event
+        """
+        return sim.sim_time
+
     @abstractmethod
     def generate_instruction(
         self,
         sim: SimulationState,
         env: Environment,
         previous_instructions: Optional[Tuple[Instruction, ...]] = None,
+        demand_heatmap: Optional[DemandHeatmap] = None,
+        charge_time_estimates: Optional[ChargeTimeEstimates] = None,
     ) -> Optional[Instruction]:
         """
         allows the driver state to issue an optional instruction for the vehicle considering all the
@@ -63,6 +94,9 @@ class DriverState(ABC):
         :param sim:
         :param env:
         :param previous_instructions:
+        :param demand_heatmap: the demand heatmap of this time step, shared by all drivers
+        :param charge_time_estimates: this time step's charge time estimates to the
+                                      human_driver_off_shift_charge_target, shared by all drivers
         :return:
         """
         return None
@@ -37,13 +37,32 @@ from nrel.hive.state.vehicle_state.servicing_trip import ServicingTrip
 from nrel.hive.util import SimulationStateError, BaseId
 
 if TYPE_CHECKING:
+    from nrel.hive.model.sim_time import SimTime
     from nrel.hive.state.simulation_state.simulation_state import SimulationState
     from nrel.hive.runner.environment import Environment
     from nrel.hive.util.typealiases import ScheduleId
+    from nrel.hive.state.driver_state.demand_heatmap import DemandHeatmap
+    from nrel.hive.dispatcher.instruction_generator.charge_time_estimates import (
+        ChargeTimeEstimates,
+    )
 
 log = logging.getLogger(__name__)
 
 
+def _next_schedule_wake_time(
+    driver_state: DriverState, sim: SimulationState, env: Environment
+) -> Optional[SimTime]:
+    schedule_id = driver_state.schedule_id
+    if schedule_id is None:
+        return sim.sim_time
+    schedule_table = env.get_schedule_table()
+    on_shift = schedule_table.is_on(schedule_id, sim.sim_time)
+    if on_shift is None or on_shift != driver_state.available:
+        return sim.sim_time
+    else:
+        return schedule_table.next_transition_time(schedule_id, sim.sim_time)
+
+
 # these two classes (HumanAvailable, HumanUnavailable) are in the same file in order to avoid circular references
 
 
@@ -77,6 +96,8 @@ class HumanAvailable(DriverState):
         sim: SimulationState,
         env: Environment,
         previous_instructions: Optional[Tuple[Instruction, ...]] = None,
+        demand_heatmap: Optional[DemandHeatmap] = None,
+        charge_time_estimates: Optional[ChargeTimeEstimates] = None,
     ) -> Optional[Instruction]:
         my_vehicle = sim.vehicles.get(self.attributes.vehicle_id)
         if not my_vehicle:
@@ -94,7 +115,7 @@ class HumanAvailable(DriverState):
         # once the vehicle is available it should reposition to seek out requests.
         elif isinstance(state, ReserveBase) or isinstance(state, ChargingBase):
             # if the driver is sitting at home we try to seek out requests
-            return human_look_for_requests(my_vehicle, sim)
+            return human_look_for_requests(my_vehicle, sim, env, demand_heatmap)
         elif isinstance(my_vehicle.vehicle_state, ChargingStation):
             # if the driver is charging we unplug if we reach the soc limit
             return idle_if_at_soc_limit(my_vehicle, env)
@@ -102,12 +123,15 @@ class HumanAvailable(DriverState):
             # if the driver has been idle for longer than the idle_time_out_seconds limit, we move to seek out greener
             # pastures
             if state.idle_duration > env.config.dispatcher.idle_time_out_seconds:
-                return human_look_for_requests(my_vehicle, sim)
+                return human_look_for_requests(my_vehicle, sim, env, demand_heatmap)
 
         return None
 
     def update(
-        self, sim: SimulationState, env: Environment
+        self,
+        sim: SimulationState,
+        env: Environment,
+        charge_time_estimates: Optional[ChargeTimeEstimates] = None,
     ) -> Tuple[Optional[Exception], Optional[SimulationState]]:
         """
         test that the agent is available to work. if unavailable, transition to an unavailable state.
@@ -115,6 +139,7 @@ class HumanAvailable(DriverState):
 
         :param sim: the current simulation state
         :param env: the simulation environment
+        :param charge_time_estimates: this time step's charge time estimates, shared by all drivers
         :return: the updated simulation state with a possible state transition for this driver
         """
         schedule_function = env.schedules.get(self.attributes.schedule_id)
@@ -136,12 +161,23 @@ class HumanAvailable(DriverState):
 
             # transition to unavailable
             charge_params = HumanUnavailableChargeParameters.build(
-                vehicle, self.attributes.home_base_id, sim, env
+                vehicle, self.attributes.home_base_id, sim, env, charge_time_estimates
             )
             next_state = HumanUnavailable(self.attributes, charge_params)
             result = DriverState.apply_new_driver_state(sim, self.attributes.vehicle_id, next_state)
             return result
 
+    def next_wake_time(self, sim: SimulationState, env: Environment) -> Optional[SimTime]:
+        """
+        the driver only needs an update when their schedule turns off
+
+        :param sim: the current simulation state
+        :param env: the simulation environment
+        :return: the next schedule transition, or the current time if the schedule is not
+                 compiled or already disagrees with this state
+        """
+        return _next_schedule_wake_time(self, sim, env)
+
 
 @dataclass(frozen=True)
 class HumanUnavailable(DriverState):
@@ -173,6 +209,8 @@ class HumanUnavailable(DriverState):
         sim: SimulationState,
         env: Environment,
         previous_instructions: Optional[Tuple[Instruction, ...]] = None,
+        demand_heatmap: Optional[DemandHeatmap] = None,
+        charge_time_estimates: Optional[ChargeTimeEstimates] = None,
     ) -> Optional[Instruction]:
         """
         while in this state, the driver checks the vehicle location; if the vehicle is not at the home base,
@@ -182,6 +220,8 @@ class HumanUnavailable(DriverState):
         :param sim:
         :param env:
         :param previous_instructions:
+        :param demand_heatmap:
+        :param charge_time_estimates:
         :return:
         """
 
@@ -237,7 +277,7 @@ class HumanUnavailable(DriverState):
                         return instruction
                 else:
                     # go home or charge on the way home if you need to
-                    return human_go_home(my_vehicle, my_base, sim, env)
+                    return human_go_home(my_vehicle, my_base, sim, env, charge_time_estimates)
             else:
                 not_full = (
                     my_mechatronics.fuel_source_soc(my_vehicle)
@@ -260,7 +300,10 @@ class HumanUnavailable(DriverState):
                     return None
 
     def update(
-        self, sim: "SimulationState", env: "Environment"
+        self,
+        sim: "SimulationState",
+        env: "Environment",
+        charge_time_estimates: Optional[ChargeTimeEstimates] = None,
     ) -> Tuple[Optional[Exception], Optional["SimulationState"]]:
         """
         test that the agent is unavailable to work. if not, transition to an available state.
@@ -268,6 +311,7 @@ class HumanUnavailable(DriverState):
 
         :param sim: the current simulation state
         :param env: the simulation environment
+        :param charge_time_estimates: unused, an unavailable driver does not search for stations
         :return: the updated simulation state with a possible state transition for this driver
         """
         schedule_function = env.schedules.get(self.attributes.schedule_id)
@@ -293,3 +337,14 @@ class HumanUnavailable(DriverState):
         else:
             # stay unavailable
             return None, sim
+
+    def next_wake_time(self, sim: SimulationState, env: Environment) -> Optional[SimTime]:
+        """
+        the driver only needs an update when their schedule turns on
+
+        :param sim: the current simulation state
+        :param env: the simulation environment
+        :return: the next schedule transition, or the current time if the schedule is not
+                 compiled or already disagrees with this state
+        """
+        return _next_schedule_wake_time(self, sim, env)
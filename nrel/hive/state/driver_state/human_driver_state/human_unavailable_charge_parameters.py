@@ -7,6 +7,9 @@ from nrel.hive.dispatcher.instruction_generator.instruction_generator_ops import
 )
 
 if TYPE_CHECKING:
+    from nrel.hive.dispatcher.instruction_generator.charge_time_estimates import (
+        ChargeTimeEstimates,
+    )
     from nrel.hive.state.simulation_state.simulation_state import SimulationState
     from nrel.hive.model.vehicle.vehicle import Vehicle
     from nrel.hive.runner.environment import Environment
@@ -27,6 +30,7 @@ class HumanUnavailableChargeParameters(NamedTuple):
         home_base_id: BaseId,
         sim: SimulationState,
         env: Environment,
+        charge_time_estimates: Optional[ChargeTimeEstimates] = None,
     ) -> HumanUnavailableChargeParameters:
         """
         builds the parameters used to track our vehicle's need for charging. captures
@@ -38,6 +42,8 @@ class HumanUnavailableChargeParameters(NamedTuple):
         :param home_base_id: the home base for this driver
         :param sim: the simulation state
         :param env: the simulation environment
+        :param charge_time_estimates: this time step's charge time estimates to the
+                                      ideal_fastcharge_soc_limit, built from sim if not provided
         :return: charge parameters if the vehicle needs to charge on the way home, otherwise None
         """
 
@@ -61,6 +67,7 @@ class HumanUnavailableChargeParameters(NamedTuple):
                     environment=env,
                     target_soc=env.config.dispatcher.ideal_fastcharge_soc_limit,
                     charging_search_type=env.config.dispatcher.charging_search_type,
+                    charge_time_estimates=charge_time_estimates,
                 )
                 if my_base.station_id is None
                 else 0.0
@@ -15,7 +15,7 @@ import immutables
 from nrel.hive.model.roadnetwork.haversine_roadnetwork import HaversineRoadNetwork
 from nrel.hive.model.sim_time import SimTime
 from nrel.hive.state.simulation_state.at_location_response import AtLocationResponse
-from nrel.hive.util import geo
+from nrel.hive.util import geo, h3_cells
 from nrel.hive.util.dict_ops import DictOps
 from nrel.hive.util.typealiases import (
     RequestId,
@@ -23,6 +23,7 @@ from nrel.hive.util.typealiases import (
     BaseId,
     StationId,
     GeoId,
+    H3Cell,
 )
 
 if TYPE_CHECKING:
@@ -51,6 +52,7 @@ class SimulationState(NamedTuple):
     sim_timestep_duration_seconds: Seconds = 60
     sim_h3_location_resolution: int = 15
     sim_h3_search_resolution: int = 7
+    sim_h3_int_search: bool = False
 
     # objects of the simulation.
     # note: if you need to iterate on these collections, prefer the get methods
@@ -69,11 +71,25 @@ class SimulationState(NamedTuple):
     s_locations: immutables.Map[GeoId, FrozenSet[StationId]] = immutables.Map()
     b_locations: immutables.Map[GeoId, FrozenSet[StationId]] = immutables.Map()
 
-    # search collections   - a higher-level spatial representation used for ring search
-    v_search: immutables.Map[GeoId, FrozenSet[VehicleId]] = immutables.Map()
-    r_search: immutables.Map[GeoId, FrozenSet[RequestId]] = immutables.Map()
-    s_search: immutables.Map[GeoId, FrozenSet[StationId]] = immutables.Map()
-    b_search: immutables.Map[GeoId, FrozenSet[BaseId]] = immutables.Map()
+    # search collections   - a higher-level spatial representation used for ring search,
+    #                        keyed by integer h3 indices if sim_h3_int_search is set
+    v_search: immutables.Map[H3Cell, FrozenSet[VehicleId]] = immutables.Map()
+    r_search: immutables.Map[H3Cell, FrozenSet[RequestId]] = immutables.Map()
+    s_search: immutables.Map[H3Cell, FrozenSet[StationId]] = immutables.Map()
+    b_search: immutables.Map[H3Cell, FrozenSet[BaseId]] = immutables.Map()
+
+    # request ids by departure time, bucketed by time step, so that cancellation
+    # only needs to visit the buckets of requests which may have expired
+    r_departure_buckets: immutables.Map[SimTime, FrozenSet[RequestId]] = immutables.Map()
+
+    def search_cell(self, geoid: GeoId) -> H3Cell:
+        """
+        the key of a location in the search collections
+
+        :param geoid: the location
+        :return: the search cell containing the location
+        """
+        return h3_cells.search_cell(geoid, self.sim_h3_search_resolution, self.sim_h3_int_search)
 
     def get_station_ids(self) -> Tuple[StationId, ...]:
         return tuple(sorted(self.stations.keys()))
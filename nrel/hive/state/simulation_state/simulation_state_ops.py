@@ -1,8 +1,7 @@
 from __future__ import annotations
 
-from typing import Iterable, Optional, TYPE_CHECKING, Tuple
+from typing import Iterable, Optional, Sequence, TYPE_CHECKING, Tuple
 
-import h3
 from returns.result import Success, Failure, ResultE
 
 from nrel.hive.model.sim_time import SimTime
@@ -189,16 +188,72 @@ def add_request_safe(sim: SimulationState, request: Request) -> ResultE[Simulati
             SimulationStateError(f"origin {request.origin} not within road network geofence")
         )
     else:
-        search_geoid = h3.h3_to_parent(request.geoid, sim.sim_h3_search_resolution)
+        search_geoid = sim.search_cell(request.geoid)
+        departure_bucket = request_departure_bucket(sim, request)
 
         updated_sim = sim._replace(
             requests=DictOps.add_to_dict(sim.requests, request.id, request),
             r_locations=DictOps.add_to_collection_dict(sim.r_locations, request.geoid, request.id),
             r_search=DictOps.add_to_collection_dict(sim.r_search, search_geoid, request.id),
+            r_departure_buckets=DictOps.add_to_collection_dict(
+                sim.r_departure_buckets, departure_bucket, request.id
+            ),
         )
         return Success(updated_sim)
 
 
+def add_requests_safe(sim: SimulationState, requests: Sequence[Request]) -> ResultE[SimulationState]:
+    """
+    adds a batch of requests to the SimulationState in one bulk mutation of the request collections
+
+    :param sim: the simulation state
+    :param requests: the requests to add
+
+    :return: the updated simulation state, or an error if any request is invalid
+    """
+    for request in requests:
+        if not sim.road_network.geoid_within_geofence(request.origin):
+            return Failure(
+                SimulationStateError(f"origin {request.origin} not within road network geofence")
+            )
+
+    requests_mut = sim.requests.mutate()
+    locations_mut = sim.r_locations.mutate()
+    search_mut = sim.r_search.mutate()
+    departures_mut = sim.r_departure_buckets.mutate()
+    for request in requests:
+        search_geoid = sim.search_cell(request.geoid)
+        departure_bucket = request_departure_bucket(sim, request)
+        requests_mut.set(request.id, request)
+        locations_mut.set(
+            request.geoid, locations_mut.get(request.geoid, frozenset()).union([request.id])
+        )
+        search_mut.set(search_geoid, search_mut.get(search_geoid, frozenset()).union([request.id]))
+        departures_mut.set(
+            departure_bucket,
+            departures_mut.get(departure_bucket, frozenset()).union([request.id]),
+        )
+
+    updated_sim = sim._replace(
+        requests=requests_mut.finish(),
+        r_locations=locations_mut.finish(),
+        r_search=search_mut.finish(),
+        r_departure_buckets=departures_mut.finish(),
+    )
+    return Success(updated_sim)
+
+
+def request_departure_bucket(sim: SimulationState, request: Request) -> SimTime:
+    """
+    the time step bucket which a request is stored under in SimulationState.r_departure_buckets
+
+    :param sim: the simulation state
+    :param request: the request
+    :return: the start of the time step window containing the request departure time
+    """
+    return request.departure_time - request.departure_time % sim.sim_timestep_duration_seconds
+
+
 def remove_request_safe(sim: SimulationState, request_id: RequestId) -> ResultE[SimulationState]:
     """
     removes a request from this simulation.
@@ -218,7 +273,7 @@ def remove_request_safe(sim: SimulationState, request_id: RequestId) -> ResultE[
         return Failure(error)
     else:
         request = sim.requests[request_id]
-        search_geoid = h3.h3_to_parent(request.geoid, sim.sim_h3_search_resolution)
+        search_geoid = sim.search_cell(request.geoid)
         updated_requests = DictOps.remove_from_dict(sim.requests, request.id)
         updated_r_locations = DictOps.remove_from_collection_dict(
             sim.r_locations, request.geoid, request.id
@@ -226,11 +281,15 @@ def remove_request_safe(sim: SimulationState, request_id: RequestId) -> ResultE[
         updated_r_search = DictOps.remove_from_collection_dict(
             sim.r_search, search_geoid, request.id
         )
+        updated_r_departure_buckets = DictOps.remove_from_collection_dict(
+            sim.r_departure_buckets, request_departure_bucket(sim, request), request.id
+        )
 
         updated_sim = sim._replace(
             requests=updated_requests,
             r_locations=updated_r_locations,
             r_search=updated_r_search,
+            r_departure_buckets=updated_r_departure_buckets,
         )
 
         return Success(updated_sim)
@@ -278,6 +337,7 @@ def modify_request_safe(sim: SimulationState, updated_request: Request) -> Resul
             sim.r_locations,
             sim.r_search,
             sim.sim_h3_search_resolution,
+            sim.sim_h3_int_search,
         )
 
         updated_sim = sim._replace(
@@ -314,7 +374,7 @@ def add_vehicle_safe(sim: SimulationState, vehicle: Vehicle) -> ResultE[Simulati
         )
         return Failure(error)
     else:
-        search_geoid = h3.h3_to_parent(vehicle.geoid, sim.sim_h3_search_resolution)
+        search_geoid = sim.search_cell(vehicle.geoid)
         updated_v_locations = DictOps.add_to_collection_dict(
             sim.v_locations, vehicle.geoid, vehicle.id
         )
@@ -357,6 +417,7 @@ def modify_vehicle_safe(sim: SimulationState, updated_vehicle: Vehicle) -> Resul
             sim.v_locations,
             sim.v_search,
             sim.sim_h3_search_resolution,
+            sim.sim_h3_int_search,
         )
 
         updated_sim = sim._replace(
@@ -403,7 +464,7 @@ def remove_vehicle_safe(sim: SimulationState, vehicle_id: VehicleId) -> ResultE[
         return Failure(error)
     else:
         vehicle = sim.vehicles[vehicle_id]
-        search_geoid = h3.h3_to_parent(vehicle.geoid, sim.sim_h3_search_resolution)
+        search_geoid = sim.search_cell(vehicle.geoid)
 
         updated_sim = sim._replace(
             vehicles=DictOps.remove_from_dict(sim.vehicles, vehicle_id),
@@ -480,7 +541,7 @@ def add_station_safe(sim: SimulationState, station: Station) -> ResultE[Simulati
         )
         return Failure(error)
     else:
-        search_geoid = h3.h3_to_parent(station.geoid, sim.sim_h3_search_resolution)
+        search_geoid = sim.search_cell(station.geoid)
         updated_s_locations = DictOps.add_to_collection_dict(
             sim.s_locations, station.geoid, station.id
         )
@@ -507,7 +568,7 @@ def remove_station_safe(sim: SimulationState, station_id: StationId) -> ResultE[
         error = SimulationStateError(f"cannot remove station {station_id}, it does not exist")
         return Failure(error)
     else:
-        search_geoid = h3.h3_to_parent(station.geoid, sim.sim_h3_search_resolution)
+        search_geoid = sim.search_cell(station.geoid)
         updated_s_locations = DictOps.remove_from_collection_dict(
             sim.s_locations, station.geoid, station_id
         )
@@ -576,6 +637,35 @@ def modify_station(
         return None, result.unwrap()
 
 
+def modify_stations_safe(
+    sim: SimulationState, updated_stations: Iterable[Station]
+) -> ResultE[SimulationState]:
+    """
+    given a batch of updated stations, update the SimulationState with those stations
+    in one bulk mutation of the stations collection. since stations cannot move, the
+    station location and search collections are left untouched.
+
+    :param sim: the simulation state
+    :param updated_stations: the revised station data
+    :return: the updated simulation, or an error if any station is invalid
+    """
+    stations_mut = sim.stations.mutate()
+    for updated_station in updated_stations:
+        station = stations_mut.get(updated_station.id)
+        if not station:
+            error = SimulationStateError(
+                f"cannot update station {updated_station.id}, it was not already in the sim"
+            )
+            return Failure(error)
+        elif station.geoid != updated_station.geoid:
+            msg = f"station {station.id} attempting to move from {station.geoid} to {updated_station.geoid}, which is not permitted"
+            error = SimulationStateError(msg)
+            return Failure(error)
+        stations_mut.set(updated_station.id, updated_station)
+
+    return Success(sim._replace(stations=stations_mut.finish()))
+
+
 def add_base_safe(sim: SimulationState, base: Base) -> ResultE[SimulationState]:
     """
     adds a base to the simulation
@@ -591,7 +681,7 @@ def add_base_safe(sim: SimulationState, base: Base) -> ResultE[SimulationState]:
         )
         return Failure(error)
     else:
-        search_geoid = h3.h3_to_parent(base.geoid, sim.sim_h3_search_resolution)
+        search_geoid = sim.search_cell(base.geoid)
         updated_b_locations = DictOps.add_to_collection_dict(sim.b_locations, base.geoid, base.id)
         updated_b_search = DictOps.add_to_collection_dict(sim.b_search, search_geoid, base.id)
 
@@ -617,7 +707,7 @@ def remove_base_safe(sim: SimulationState, base_id: BaseId) -> ResultE[Simulatio
         error = SimulationStateError(f"cannot remove base {base_id}, it does not exist")
         return Failure(error)
     else:
-        search_geoid = h3.h3_to_parent(base.geoid, sim.sim_h3_search_resolution)
+        search_geoid = sim.search_cell(base.geoid)
         updated_b_locations = DictOps.remove_from_collection_dict(
             sim.b_locations, base.geoid, base_id
         )
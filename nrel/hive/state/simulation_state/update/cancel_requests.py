@@ -5,6 +5,7 @@ import logging
 from dataclasses import dataclass
 from typing import Tuple, Optional
 
+from nrel.hive.model.sim_time import SimTime
 from nrel.hive.reporting.reporter import Report, ReportType
 from nrel.hive.runner.environment import Environment
 from nrel.hive.state.simulation_state import simulation_state_ops
@@ -59,14 +60,48 @@ class CancelRequests(SimulationUpdateFunction):
                     env.reporter.file_report(_gen_report(request_id, sim))
                     return updated_sim
 
+        # only requests in departure buckets which began at least a cancel time ago can expire
+        cancel_time_seconds = env.config.sim.request_cancel_time_seconds
+        expiring_request_ids = sorted(
+            request_id
+            for bucket, request_ids in simulation_state.r_departure_buckets.items()
+            if bucket + cancel_time_seconds <= simulation_state.sim_time
+            for request_id in request_ids
+            if request_id in simulation_state.requests
+        )
+
         updated = ft.reduce(
             _remove_from_sim,
-            simulation_state.get_request_ids(),
+            expiring_request_ids,
             simulation_state,
         )
 
         return updated, None
 
+    def next_event_time(
+        self, simulation_state: SimulationState, env: Environment
+    ) -> Optional[SimTime]:
+        """
+        the next request to be cancelled is cancelled at its cancel time
+
+        :param simulation_state: the current sim state
+        :param env: the scenario environment
+        :return: the earliest cancel time of the requests in the simulation, if any
+        """
+        # the earliest departure is in the earliest departure bucket
+        buckets = simulation_state.r_departure_buckets
+        if len(buckets) == 0:
+            return None
+        earliest_bucket = buckets[min(buckets.keys())]
+        departures = [
+            simulation_state.requests[request_id].departure_time
+            for request_id in earliest_bucket
+            if request_id in simulation_state.requests
+        ]
+        if len(departures) == 0:
+            return None
+        return min(departures) + env.config.sim.request_cancel_time_seconds
+
 
 def _gen_report(r_id: RequestId, sim: SimulationState) -> Report:
     """
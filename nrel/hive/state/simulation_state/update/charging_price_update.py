@@ -3,12 +3,13 @@ from __future__ import annotations
 import functools as ft
 import logging
 from csv import DictReader
-from dataclasses import dataclass
+from dataclasses import dataclass, replace
 from pathlib import Path
-from typing import Any, Tuple, Optional, Dict
+from typing import Any, Dict, FrozenSet, Iterable, Optional, Tuple
 
 import h3
 import immutables
+from returns.result import Failure
 
 from nrel.hive.model.energy.charger import build_chargers_table
 from nrel.hive.model.sim_time import SimTime
@@ -18,7 +19,7 @@ from nrel.hive.state.simulation_state.simulation_state import SimulationState
 from nrel.hive.state.simulation_state.update.simulation_update import SimulationUpdateFunction
 from nrel.hive.util import DictOps
 from nrel.hive.util.iterators import DictReaderStepper
-from nrel.hive.util.typealiases import StationId, ChargerId
+from nrel.hive.util.typealiases import ChargerId, H3Cell, StationId
 from nrel.hive.util.units import Currency
 
 log = logging.getLogger(__name__)
@@ -32,6 +33,10 @@ class ChargingPriceUpdate(SimulationUpdateFunction):
 
     reader: DictReaderStepper
     use_defaults: bool
+    # the StationIds that each price update key (a StationId or GeoId) applies to,
+    # valid for the station search collection it was built from
+    station_lookup: immutables.Map[str, Tuple[StationId, ...]] = immutables.Map()
+    station_search: Optional[immutables.Map[H3Cell, FrozenSet[StationId]]] = None
 
     @classmethod
     def build(
@@ -129,28 +134,46 @@ class ChargingPriceUpdate(SimulationUpdateFunction):
             # we are applying the same values across all Stations
             # the default constructor creates one station_id called "default" and we
             # apply it to every station here.
-            result = ft.reduce(
-                lambda sim, s_id: _update_station_prices(sim, s_id, charger_update["default"]),
-                sim_state.get_station_ids(),
-                sim_state,
-            )
-            return result, self
+            default_prices = charger_update["default"]
+            station_updates: Dict[StationId, immutables.Map[ChargerId, Currency]] = {
+                s_id: default_prices for s_id in sim_state.stations.keys()
+            }
+            return _update_station_prices(sim_state, station_updates), self
 
         else:
-            # apply update to all stations
-            # if these updates are in the form of GeoIds, map them to StationIds
-            as_station_updates = _map_to_station_ids(charger_update, sim_state)
-            station_ids_to_update = set(sim_state.get_station_ids()).union(
-                as_station_updates.keys()
+            # if these updates are in the form of GeoIds, map them to StationIds. the
+            # mapping only changes when stations are added or removed, so it is kept
+            # between updates for as long as the station search collection is unchanged.
+            if self.station_search is sim_state.s_search:
+                updated_self = self
+            else:
+                updated_self = replace(
+                    self, station_lookup=immutables.Map(), station_search=sim_state.s_search
+                )
+            station_lookup = _extend_station_lookup(
+                updated_self.station_lookup, charger_update.keys(), sim_state
             )
+            if station_lookup is not updated_self.station_lookup:
+                updated_self = replace(updated_self, station_lookup=station_lookup)
 
             # we are applying only the updates related to valid StationIds with updates
-            result = ft.reduce(
-                lambda sim, s_id: _update_station_prices(sim, s_id, as_station_updates[s_id]),
-                station_ids_to_update,
-                sim_state,
-            )
-            return result, self
+            station_updates = {}
+            for k, prices in charger_update.items():
+                for station_id in station_lookup[k]:
+                    station_updates[station_id] = prices
+
+            return _update_station_prices(sim_state, station_updates), updated_self
+
+    def next_event_time(self, sim_state: SimulationState, env: Environment) -> Optional[SimTime]:
+        """
+        the next price update is read once the simulation passes its time
+
+        :param sim_state: the current sim state
+        :param env: static environment variables
+        :return: the first sim time after the next price update, if any
+        """
+        next_time = self.reader.peek_step_value()
+        return None if next_time is None else next_time + 1
 
 
 def _add_row_to_this_update(
@@ -191,82 +214,95 @@ def _add_row_to_this_update(
 
 def _update_station_prices(
     simulation_state: SimulationState,
-    station_id: StationId,
-    prices_update: immutables.Map[ChargerId, Currency],
+    station_updates: Dict[StationId, immutables.Map[ChargerId, Currency]],
 ) -> SimulationState:
     """
-    updates a simulation state with prices for a station by station id
+    updates a simulation state with prices for a set of stations by station id,
+    writing all updated stations back in one bulk mutation
 
-    :param result: the simulation state in a partial update state
-    :param station_id: the station id of the station to update (assumed to be valid)
-    :param prices_update: the prices in Currency that we are updating for each Charger
+    :param simulation_state: the simulation state to update
+    :param station_updates: the prices in Currency that we are updating for each Charger,
+                            by the StationId of the station to update (assumed to be valid)
     :return: the updated SimulationState with station prices modified
     """
-    station = simulation_state.stations.get(station_id)
-    if not station:
-        return simulation_state
-    else:
+    updated_stations = []
+    for station_id, prices_update in station_updates.items():
+        station = simulation_state.stations.get(station_id)
+        if not station:
+            continue
         error, updated_station = station.update_prices(prices_update)
         if error is not None:
             log.error(error)
-            return simulation_state
-        elif updated_station is None:
-            return simulation_state
-        else:
-            error, updated_sim = simulation_state_ops.modify_station(
-                simulation_state, updated_station
-            )
-            if error:
-                log.error(error)
-                return simulation_state
-            elif updated_sim is None:
-                return simulation_state
-            else:
-                return updated_sim
+        elif updated_station is not None:
+            updated_stations.append(updated_station)
 
+    result = simulation_state_ops.modify_stations_safe(simulation_state, updated_stations)
+    if isinstance(result, Failure):
+        log.error(result.failure())
+        return simulation_state
+    else:
+        return result.unwrap()
 
-def _map_to_station_ids(
-    this_update: immutables.Map[str, immutables.Map[ChargerId, Currency]],
+
+def _extend_station_lookup(
+    station_lookup: immutables.Map[str, Tuple[StationId, ...]],
+    keys: Iterable[str],
     sim: SimulationState,
-) -> immutables.Map[StationId, immutables.Map[ChargerId, Currency]]:
+) -> immutables.Map[str, Tuple[StationId, ...]]:
     """
-    in the case that updates are written by GeoId, map those to StationIds
+    adds any price update keys which have not been seen before to the lookup
+    from price update keys to the StationIds they apply to
 
-    :param this_update: the update, which may be by StationId or GeoId
+    :param station_lookup: the lookup built so far
+    :param keys: the keys of a price update, which may be StationIds or GeoIds
     :param sim: the SimulationState provides h3 resolution and lookup tables
-    :return: the price data organized by StationId
+    :return: the lookup, extended with the new keys
     """
-    updated = {}  # refactor using immutables.Map()?
-    for k in this_update.keys():
-        if k in sim.stations:
-            # k is a StationId; leave as is
-            updated.update({k: this_update[k]})
-        else:
-            # k may be a geoid
-            try:
-                res = h3.h3_get_resolution(k)
-
-                # find the set of all station search geoids corresponding with the
-                # provided station charge price geoid
-                search_geoids: Tuple[Any, ...] = (k,)
-                if res > sim.sim_h3_search_resolution:
-                    search_geoids = (h3.h3_to_parent(k, sim.sim_h3_search_resolution),)
-                elif res < sim.sim_h3_search_resolution:
-                    search_geoids = tuple(h3.h3_to_children(k, sim.sim_h3_search_resolution))
-
-                station_ids = (
-                    station_id
-                    for search_geoid in search_geoids
-                    if sim.s_search.get(search_geoid)
-                    for station_id in sim.s_search[search_geoid]
-                )
+    new_keys = [k for k in keys if k not in station_lookup]
+    if not new_keys:
+        return station_lookup
 
-                # all of these station ids should get entries managers the provided geoid
-                for station_id in station_ids:
-                    updated.update({station_id: this_update[k]})
+    lookup_mut = station_lookup.mutate()
+    for k in new_keys:
+        lookup_mut.set(k, _map_to_station_ids(k, sim))
+    return lookup_mut.finish()
 
-            except ValueError as e:
-                # todo: handle failure here
-                log.debug(f"tried to update charging price for key {k} but failed.")
 
-    return immutables.Map(updated)
+def _map_to_station_ids(key: str, sim: SimulationState) -> Tuple[StationId, ...]:
+    """
+    in the case that updates are written by GeoId, map those to StationIds
+
+    :param key: the update key, which may be a StationId or a GeoId
+    :param sim: the SimulationState provides h3 resolution and lookup tables
+    :return: the StationIds that the update applies to
+    """
+    if key in sim.stations:
+        # key is a StationId; leave as is
+        return (key,)
+
+    # key may be a geoid
+    try:
+        res = h3.h3_get_resolution(key)
+
+        # find the set of all station search geoids corresponding with the
+        # provided station charge price geoid
+        search_geoids: Tuple[Any, ...] = (key,)
+        if res > sim.sim_h3_search_resolution:
+            search_geoids = (h3.h3_to_parent(key, sim.sim_h3_search_resolution),)
+        elif res < sim.sim_h3_search_resolution:
+            search_geoids = tuple(h3.h3_to_children(key, sim.sim_h3_search_resolution))
+        if sim.sim_h3_int_search:
+            search_geoids = tuple(h3.string_to_h3(geoid) for geoid in search_geoids)
+
+        # all of these station ids should get entries managers the provided geoid
+        return tuple(
+            station_id
+            for search_geoid in search_geoids
+            if sim.s_search.get(search_geoid)
+            for station_id in sim.s_search[search_geoid]
+        )
+
+    except ValueError:
+        # todo: handle failure here
+        log.debug(f"tried to update charging price for key {key} but failed.")
+        return ()
@@ -4,6 +4,7 @@ from abc import abstractmethod, ABC
 from typing import Optional, Tuple, TYPE_CHECKING
 
 if TYPE_CHECKING:
+    from nrel.hive.model.sim_time import SimTime
     from nrel.hive.state.simulation_state.simulation_state import SimulationState
     from nrel.hive.runner.environment import Environment
 
@@ -22,3 +23,16 @@ class SimulationUpdateFunction(ABC):
         :return: the updated sim state, along with any reporting;
         as well, an Optionally-updated SimulationUpdate function
         """
+
+    def next_event_time(
+        self, simulation_state: SimulationState, env: Environment
+    ) -> Optional[SimTime]:
+        """
+        the earliest time at which this update could change the simulation state, assuming
+        nothing else changes it first. by default, an update may act at every time step.
+
+        :param simulation_state: the current simulation state
+        :param env: the environmental variables for this run
+        :return: the time of the next event, or None if this update has no further events
+        """
+        return simulation_state.sim_time
@@ -3,7 +3,7 @@ from __future__ import annotations
 import inspect
 import logging
 from dataclasses import dataclass, replace
-from typing import Tuple, TYPE_CHECKING, Type, Union
+from typing import Optional, Tuple, TYPE_CHECKING, Type, Union
 
 import immutables
 from returns.result import ResultE, Failure, Success
@@ -25,9 +25,11 @@ from nrel.hive.state.simulation_state.update.step_simulation_ops import (
     log_instructions,
     perform_driver_state_updates,
 )
+from nrel.hive.state.simulation_state.update.wake_calendar import WakeCalendar
 from nrel.hive.util.dict_ops import DictOps
 
 if TYPE_CHECKING:
+    from nrel.hive.model.sim_time import SimTime
     from nrel.hive.runner.environment import Environment
 
 log = logging.getLogger(__name__)
@@ -37,6 +39,10 @@ log = logging.getLogger(__name__)
 class StepSimulation(SimulationUpdateFunction):
     instruction_generators: immutables.Map[InstructionGeneratorId, InstructionGenerator]
     instruction_generator_order: Tuple[InstructionGeneratorId, ...]
+    wake_calendar: WakeCalendar = WakeCalendar()
+    # True if the last step applied no instructions and updated no vehicles, in which case
+    # the next step would find the simulation unchanged
+    quiet: bool = False
 
     @property
     def ordered_instruction_generators(
@@ -89,7 +95,13 @@ class StepSimulation(SimulationUpdateFunction):
         :param env: the sim environment
         :return: updated simulation state, with reports, along with the (optionally) updated StepSimulation
         """
-        sim_with_drivers_updated = perform_driver_state_updates(simulation_state, env)
+        profiler = env.reporter.profiler
+
+        with profiler.timed("perform_driver_state_updates"):
+            sim_with_drivers_updated = perform_driver_state_updates(
+                simulation_state, env, self.wake_calendar
+            )
+            calendar = self.wake_calendar.schedule_drivers(sim_with_drivers_updated, env)
 
         i_stack, updated_i_gens = generate_instructions(
             self.ordered_instruction_generators, sim_with_drivers_updated, env
@@ -106,20 +118,49 @@ class StepSimulation(SimulationUpdateFunction):
 
         log_instructions(final_instructions, env, simulation_state.sim_time)
 
-        # update drivers, update vehicles
-        sim_with_instructions = apply_instructions(
-            sim_with_drivers_updated, env, final_instructions
-        )
-        sim_vehicles_updated = perform_vehicle_state_updates(
-            simulation_state=sim_with_instructions, env=env
+        quiet = len(final_instructions) == 0 and not any(
+            calendar.vehicle_due(v, simulation_state.sim_time)
+            for v in sim_with_drivers_updated.vehicles.values()
         )
 
+        # update drivers, update vehicles
+        with profiler.timed("apply_instructions"):
+            sim_with_instructions = apply_instructions(
+                sim_with_drivers_updated, env, final_instructions
+            )
+        with profiler.timed("perform_vehicle_state_updates"):
+            sim_vehicles_updated = perform_vehicle_state_updates(
+                simulation_state=sim_with_instructions, env=env, wake_calendar=calendar
+            )
+            calendar = calendar.schedule_vehicles(sim_vehicles_updated, env)
+
         # advance the simulation one time step
         sim_next_time_step = simulation_state_ops.tick(sim_vehicles_updated)
 
-        updated_step_simulation = self.update_instruction_generators(updated_i_gens)
+        updated_step_simulation = replace(
+            self.update_instruction_generators(updated_i_gens), wake_calendar=calendar, quiet=quiet
+        )
         return sim_next_time_step, updated_step_simulation
 
+    def next_event_time(
+        self, simulation_state: SimulationState, env: Environment
+    ) -> Optional[SimTime]:
+        """
+        after a quiet step, nothing happens until a vehicle or driver wakes, or until an
+        instruction generator depends on the time
+
+        :param simulation_state: the current simulation state
+        :param env: the sim environment
+        :return: the time of the next event, or None if there are no further events
+        """
+        if not self.quiet:
+            return simulation_state.sim_time
+        event_times = [self.wake_calendar.next_wake_time()] + [
+            i_gen.next_event_time(simulation_state, env)
+            for i_gen in self.ordered_instruction_generators
+        ]
+        return min((t for t in event_times if t is not None), default=None)
+
     def get_instruction_generator(
         self,
         identifier: Union[InstructionGeneratorId, Type[InstructionGenerator]],
@@ -7,7 +7,9 @@ from typing import List, Tuple, Optional, TYPE_CHECKING, Callable, NamedTuple
 
 from nrel.hive.dispatcher.instruction.instruction import Instruction
 from nrel.hive.dispatcher.instruction.instruction_result import InstructionResult
+from nrel.hive.dispatcher.instruction_generator.charge_time_estimates import ChargeTimeEstimates
 from nrel.hive.dispatcher.instruction_generator.instruction_generator import InstructionGenerator
+from nrel.hive.model.roadnetwork.prefetched_routes import PrefetchedRoutes
 from nrel.hive.model.vehicle.vehicle import Vehicle
 from nrel.hive.reporting.report_type import ReportType
 from nrel.hive.reporting.reporter import Report
@@ -18,6 +20,7 @@ from nrel.hive.util import TupleOps
 
 if TYPE_CHECKING:
     from nrel.hive.runner.environment import Environment
+    from nrel.hive.state.simulation_state.update.wake_calendar import WakeCalendar
     from nrel.hive.state.simulation_state.simulation_state import SimulationState
     from nrel.hive.model.sim_time import SimTime
 
@@ -49,19 +52,34 @@ def step_vehicle(s: SimulationState, env: Environment, vehicle: Vehicle) -> Simu
 
 
 def perform_driver_state_updates(
-    simulation_state: SimulationState, env: Environment
+    simulation_state: SimulationState,
+    env: Environment,
+    wake_calendar: Optional[WakeCalendar] = None,
 ) -> SimulationState:
     """
     helper function for StepSimulation which runs the update function for all driver states
 
     :param simulation_state: the simulation state to update
     :param env: the simulation environment
+    :param wake_calendar: if provided, only drivers that are due are updated
     :return: the sim after all vehicle update functions have been called
     """
 
+    # evaluate all time range schedules at once. a driver whose availability already matches
+    # its schedule would not change state, so its update is skipped
+    on_shift = env.get_schedule_table().on_shift(simulation_state.sim_time)
+    # drivers going off shift share one set of charge time estimates
+    charge_time_estimates = ChargeTimeEstimates(
+        simulation_state, env, env.config.dispatcher.ideal_fastcharge_soc_limit
+    )
+
     def _step_drivers(s: SimulationState, vehicle: Vehicle) -> SimulationState:
         driver_state = vehicle.driver_state
-        error, updated_sim = driver_state.update(s, env)
+        schedule_id = driver_state.schedule_id
+        scheduled = on_shift.get(schedule_id) if schedule_id is not None else None
+        if scheduled is not None and scheduled == driver_state.available:
+            return s
+        error, updated_sim = driver_state.update(s, env, charge_time_estimates)
         if error:
             log.error(error)
             return simulation_state
@@ -70,18 +88,26 @@ def perform_driver_state_updates(
         else:
             return updated_sim
 
-    next_state = ft.reduce(_step_drivers, simulation_state.get_vehicles(), simulation_state)
+    vehicles = simulation_state.get_vehicles()
+    if wake_calendar is not None:
+        sim_time = simulation_state.sim_time
+        vehicles = tuple(v for v in vehicles if wake_calendar.driver_due(v, sim_time))
+
+    next_state = ft.reduce(_step_drivers, vehicles, simulation_state)
     return next_state
 
 
 def perform_vehicle_state_updates(
-    simulation_state: SimulationState, env: Environment
+    simulation_state: SimulationState,
+    env: Environment,
+    wake_calendar: Optional[WakeCalendar] = None,
 ) -> SimulationState:
     """
     helper function for StepSimulation which applies a vehicle state update to each vehicle
 
     :param simulation_state: the simulation state to update
     :param env: the simulation environment
+    :param wake_calendar: if provided, only vehicles that are due are updated
     :return: the sim after all vehicle update functions have been called
     """
 
@@ -117,7 +143,11 @@ def perform_vehicle_state_updates(
     # why sort here? see _sort_by_vehicle_state (above) for an explanation
     # this code doesn't use built-in sorting iterator methods because of the
     # initial partitioning step required.
-    vehicles = _sort_by_vehicle_state(tuple(simulation_state.vehicles.values()))
+    vehicles = tuple(simulation_state.vehicles.values())
+    if wake_calendar is not None:
+        sim_time = simulation_state.sim_time
+        vehicles = tuple(v for v in vehicles if wake_calendar.vehicle_due(v, sim_time))
+    vehicles = _sort_by_vehicle_state(vehicles)
 
     for veh in vehicles:
         simulation_state = step_vehicle(simulation_state, env, veh)
@@ -128,6 +158,28 @@ def perform_vehicle_state_updates(
 InstructionApplicationResult = Tuple[Optional[Exception], Optional[InstructionResult]]
 
 
+def prefetch_routes(
+    sim: SimulationState, env: Environment, instructions: Tuple[Instruction, ...]
+) -> Optional[PrefetchedRoutes]:
+    """
+    computes the routes requested by a batch of instructions together, which the road
+    network can do in parallel (see network.routing_processes). the instructions are still
+    applied one at a time, reading their routes from the batch.
+
+    :param sim: the current simulation state
+    :param env: the sim environment
+    :param instructions: the instructions to be applied at this time step
+    :return: the road network with the batch of routes, or None if there is no batch to route
+    """
+    if env.config.network.routing_processes < 2:
+        return None
+    requests = [instruction.route_request(sim) for instruction in instructions]
+    pairs = [request for request in requests if request is not None]
+    if len(pairs) < 2:
+        return None
+    return PrefetchedRoutes.build(sim.road_network, pairs)
+
+
 def apply_instructions(
     sim: SimulationState, env: Environment, instructions: Tuple[Instruction, ...]
 ) -> SimulationState:
@@ -142,9 +194,11 @@ def apply_instructions(
     """
     # construct the vehicle state transitions
 
+    prefetched = prefetch_routes(sim, env, instructions)
     results: List[InstructionResult] = []
     for instruction in instructions:
-        err, instruction_result = instruction.apply_instruction(sim, env)
+        instruction_sim = sim if prefetched is None else sim._replace(road_network=prefetched)
+        err, instruction_result = instruction.apply_instruction(instruction_sim, env)
         if err is not None:
             log.error(err)
             continue
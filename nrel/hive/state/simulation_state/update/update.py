@@ -1,7 +1,7 @@
 from __future__ import annotations
 
 import functools as ft
-from typing import NamedTuple, Tuple, TYPE_CHECKING
+from typing import NamedTuple, Optional, Tuple, TYPE_CHECKING
 
 import immutables
 
@@ -11,9 +11,13 @@ from nrel.hive.state.simulation_state.update.cancel_requests import CancelReques
 from nrel.hive.state.simulation_state.update.charging_price_update import ChargingPriceUpdate
 from nrel.hive.state.simulation_state.update.simulation_update import SimulationUpdateFunction
 from nrel.hive.state.simulation_state.update.step_simulation import StepSimulation
-from nrel.hive.state.simulation_state.update.update_requests_from_file import UpdateRequestsFromFile
+from nrel.hive.state.simulation_state.update.update_requests_from_file import (
+    UpdateRequestsFromArrays,
+    UpdateRequestsFromFile,
+)
 
 if TYPE_CHECKING:
+    from nrel.hive.model.sim_time import SimTime
     from nrel.hive.runner import RunnerPayload
 
 
@@ -40,6 +44,21 @@ class Update(NamedTuple):
         :return: the Update that will be applied at each time step
         """
 
+        # preprocessed request arrays are memory-mapped, otherwise requests are read from csv
+        update_requests: SimulationUpdateFunction
+        if config.input_config.requests_file.endswith(".npz"):
+            update_requests = UpdateRequestsFromArrays.build(
+                config.input_config.requests_file,
+                config.input_config.rate_structure_file,
+                sim_h3_resolution=config.sim.sim_h3_resolution,
+            )
+        else:
+            update_requests = UpdateRequestsFromFile.build(
+                config.input_config.requests_file,
+                config.input_config.rate_structure_file,
+                lazy_file_reading=config.global_config.lazy_file_reading,
+            )
+
         # the basic, built-in set of updates which advance time of the supply and demand
         pre_step_update = (
             ChargingPriceUpdate.build(
@@ -47,11 +66,7 @@ class Update(NamedTuple):
                 config.input_config.chargers_file,
                 lazy_file_reading=config.global_config.lazy_file_reading,
             ),
-            UpdateRequestsFromFile.build(
-                config.input_config.requests_file,
-                config.input_config.rate_structure_file,
-                lazy_file_reading=config.global_config.lazy_file_reading,
-            ),
+            update_requests,
             CancelRequests(),
         )
 
@@ -90,6 +105,18 @@ class Update(NamedTuple):
 
         return updated_payload
 
+    def next_event_time(self, runner_payload: RunnerPayload) -> Optional[SimTime]:
+        """
+        the earliest time at which any update function could change the simulation
+
+        :param runner_payload: the current SimulationState and assets at the current simtime
+        :return: the time of the next event, or None if there are no further events
+        """
+        sim, env = runner_payload.s, runner_payload.e
+        event_times = [fn.next_event_time(sim, env) for fn in self.pre_step_update]
+        event_times.append(self.step_update.next_event_time(sim, env))
+        return min((t for t in event_times if t is not None), default=None)
+
 
 def _apply_fn(p: UpdatePayload, fn: SimulationUpdateFunction) -> UpdatePayload:
     """
@@ -104,7 +131,9 @@ def _apply_fn(p: UpdatePayload, fn: SimulationUpdateFunction) -> UpdatePayload:
     :return: the updated payload, with update function applied to the simulation,
     and the update function possibly updated itself
     """
-    result, updated_fn = fn.update(p.runner_payload.s, p.runner_payload.e)
+    env = p.runner_payload.e
+    with env.reporter.profiler.timed(f"pre_step_update.{fn.__class__.__name__}"):
+        result, updated_fn = fn.update(p.runner_payload.s, env)
 
     # if we received an updated version of this SimulationUpdateFunction, store it
     next_update_fns = (
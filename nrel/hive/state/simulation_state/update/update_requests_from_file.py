@@ -1,15 +1,15 @@
 from __future__ import annotations
 
-import functools as ft
 import logging
 from csv import DictReader
-from dataclasses import dataclass
+from dataclasses import dataclass, replace
 from pathlib import Path
-from typing import Tuple, Optional, Iterator, Dict
+from typing import Dict, Iterator, Optional, Sequence, Tuple
 
 from returns.result import Failure
 
 from nrel.hive.model.request import Request, RequestRateStructure
+from nrel.hive.model.request.request_arrays import RequestArrays
 from nrel.hive.model.sim_time import SimTime
 from nrel.hive.reporting.reporter import Report, ReportType
 from nrel.hive.runner.environment import Environment
@@ -17,6 +17,7 @@ from nrel.hive.state.simulation_state import simulation_state_ops
 from nrel.hive.state.simulation_state.simulation_state import SimulationState
 from nrel.hive.state.simulation_state.update.simulation_update import SimulationUpdateFunction
 from nrel.hive.util.iterators import DictReaderStepper
+from nrel.hive.util.typealiases import H3Resolution
 
 log = logging.getLogger(__name__)
 
@@ -47,14 +48,7 @@ class UpdateRequestsFromFile(SimulationUpdateFunction):
         :return: a SimulationUpdate function pointing at the first line of a request file
         :raises: an exception if there were issues loading the file
         """
-        rate_structure = RequestRateStructure()
-        if rate_structure_file:
-            rate_structure_path = Path(rate_structure_file)
-            if not rate_structure_path.is_file():
-                raise IOError(f"{rate_structure_file} is not a valid path to a request file")
-            with open(rate_structure_file, "r", encoding="utf-8-sig") as rsf:
-                reader = DictReader(rsf)
-                rate_structure = RequestRateStructure.from_row(next(reader))
+        rate_structure = _load_rate_structure(rate_structure_file)
 
         req_path = Path(request_file)
         if not req_path.is_file():
@@ -106,6 +100,94 @@ class UpdateRequestsFromFile(SimulationUpdateFunction):
 
         return result, None
 
+    def next_event_time(self, sim_state: SimulationState, env: Environment) -> Optional[SimTime]:
+        """
+        the next request is added once the simulation passes its departure time
+
+        :param sim_state: the current sim state
+        :param env: the static environment variables
+        :return: the first sim time after the next departure, if any
+        """
+        next_departure = self.reader.peek_step_value()
+        return None if next_departure is None else next_departure + 1
+
+
+@dataclass(frozen=True)
+class UpdateRequestsFromArrays(SimulationUpdateFunction):
+    """
+    loads requests from a preprocessed request arrays (.npz) file, see RequestArrays
+    """
+
+    arrays: RequestArrays
+    rate_structure: RequestRateStructure
+    cursor: int = 0
+
+    @classmethod
+    def build(
+        cls,
+        request_file: str,
+        rate_structure_file: Optional[str] = None,
+        sim_h3_resolution: Optional[H3Resolution] = None,
+    ) -> UpdateRequestsFromArrays:
+        """
+        memory-maps a request arrays file and builds a UpdateRequestsFromArrays SimulationUpdateFunction
+
+        :param request_file: file path for the request arrays
+        :param rate_structure_file:
+        :param sim_h3_resolution: if provided, the resolution the request geoids are expected to be stored at
+        :return: a SimulationUpdate function pointing at the first request in the file
+        :raises: an exception if there were issues loading the file
+        """
+        rate_structure = _load_rate_structure(rate_structure_file)
+
+        if not Path(request_file).is_file():
+            raise IOError(f"{request_file} is not a valid path to a request file")
+        arrays = RequestArrays.load(request_file)
+        if sim_h3_resolution is not None and arrays.sim_h3_resolution != sim_h3_resolution:
+            raise IOError(
+                f"{request_file} was converted at h3 resolution {arrays.sim_h3_resolution} "
+                f"but the simulation uses h3 resolution {sim_h3_resolution}"
+            )
+
+        return UpdateRequestsFromArrays(arrays=arrays, rate_structure=rate_structure)
+
+    def update(
+        self, sim_state: SimulationState, env: Environment
+    ) -> Tuple[SimulationState, Optional[UpdateRequestsFromArrays]]:
+        """
+        add the requests departing before the current sim time
+
+        :param env: the static environment variables
+        :param sim_state: the current sim state
+        :return: sim state plus new requests, and this update advanced past them
+        """
+        end = self.arrays.departing_before(self.cursor, sim_state.sim_time)
+        if end == self.cursor:
+            return sim_state, None
+
+        requests = []
+        for error, req in self.arrays.build_requests(self.cursor, end, sim_state.road_network):
+            if error:
+                log.error(error)
+            elif req:
+                requests.append(req)
+
+        updated_sim = _add_requests(sim_state, requests, env, self.rate_structure)
+
+        return updated_sim, replace(self, cursor=end)
+
+    def next_event_time(self, sim_state: SimulationState, env: Environment) -> Optional[SimTime]:
+        """
+        the next request is added once the simulation passes its departure time
+
+        :param sim_state: the current sim state
+        :param env: the static environment variables
+        :return: the first sim time after the next departure, if any
+        """
+        if self.cursor >= len(self.arrays.departure_time):
+            return None
+        return SimTime(int(self.arrays.departure_time[self.cursor]) + 1)
+
 
 def update_requests_from_iterator(
     it: Iterator[Dict[str, str]],
@@ -114,7 +196,8 @@ def update_requests_from_iterator(
     rate_structure: RequestRateStructure,
 ) -> SimulationState:
     """
-    add requests from file when the simulation reaches the request's time
+    add requests from file when the simulation reaches the request's time.
+    the rows are ingested as one batch, see Request.from_rows.
 
 
     :param it: expected to be a Request iterator which streams in row data taken from a DictReader
@@ -123,79 +206,117 @@ def update_requests_from_iterator(
     :param env:
     :return: sim state plus new requests
     """
+    # stream in all Requests that occur before the sim time of the provided SimulationState
+    rows = tuple(it)
+    if len(rows) == 0:
+        return initial_sim_state
 
-    def _update(
-        sim: SimulationState,
-        row: Dict[str, str],
-        env: Environment,
-        rate_structure: RequestRateStructure,
-    ) -> SimulationState:
-        """
-        takes one row, attempts to parse it as a Request, and attempts to add it to the simulation
-
-
-        :param sim: latest SimulationState
-        :param row: one row as loaded via DictReader
-        :param env: the simulation environment
-        :param rate_structure: the rate structure for requests in the simulation
-        :return: the updated sim and updated reporting
-        """
-        error, req = Request.from_row(row, env, sim.road_network)
-        this_req_cancel_time = (
-            req.departure_time + env.config.sim.request_cancel_time_seconds if req else None
-        )
+    requests = []
+    for row, (error, req) in zip(rows, Request.from_rows(rows, env, initial_sim_state.road_network)):
         if error:
             log.error(error)
-            return sim
         elif not req:
             log.error(f"an unexpected error occurred with request row: {row}")
-            return sim
-        elif this_req_cancel_time <= sim.sim_time:
-            # cannot add request that should already be cancelled
-            current_time = sim.sim_time
-            warning = f"request {req.id} with cancel_time {this_req_cancel_time} cannot be added at time {current_time}"
-            log.warning(warning)
-            return sim
-        elif len(env.fleet_ids) > 0 and len(req.membership.memberships) == 0:
-            warning = f"request {req.id} is missing membership and will not be be added"
-            log.warning(warning)
-            return sim
-        elif len(env.fleet_ids) == 0 and len(req.membership.memberships) > 0:
-            warning = f"request {req.id} has membership but there is no fleets file. This request will not be added"
-            log.warning(warning)
-            return sim
         else:
-            req_updated = req.assign_value(rate_structure, sim.road_network)
-            sim_or_error = simulation_state_ops.add_request_safe(sim, req_updated)
-            if isinstance(sim, Failure):
-                error = sim_or_error.failure()
-                log.error(error)
-                return sim
-            else:
-                # successfully added request
-                sim_updated = sim_or_error.unwrap()
-                req_in_sim = sim_updated.requests.get(req.id)
-                if not req_in_sim:
-                    warning = (
-                        f"adding new request {req.id} to sim succeeded but now request is not found"
-                    )
-                    log.warning(warning)
-                    return sim
-                else:
-                    dep_t = req_in_sim.departure_time
-                    report_data = {
-                        "request_id": req.id,
-                        "departure_time": str(dep_t),
-                        "fleet_id": str(req.membership),
-                    }
-                    env.reporter.file_report(Report(ReportType.ADD_REQUEST_EVENT, report_data))
-                    return sim_updated
+            requests.append(req)
 
-    # stream in all Requests that occur before the sim time of the provided SimulationState
-    updated_sim = ft.reduce(
-        ft.partial(_update, env=env, rate_structure=rate_structure),
-        it,
-        initial_sim_state,
-    )
+    return _add_requests(initial_sim_state, requests, env, rate_structure)
+
+
+def _add_requests(
+    sim: SimulationState,
+    requests: Sequence[Request],
+    env: Environment,
+    rate_structure: RequestRateStructure,
+) -> SimulationState:
+    """
+    validates a batch of new requests, assigns their values and adds them to the simulation
+    in one bulk update, reporting an ADD_REQUEST_EVENT for each. invalid requests are logged and skipped.
+
+    :param sim: latest SimulationState
+    :param requests: the requests to add
+    :param env: the simulation environment
+    :param rate_structure: the rate structure for requests in the simulation
+    :return: the updated sim
+    """
+    valid_requests = [req for req in requests if _is_valid_new_request(sim, req, env)]
+    if len(valid_requests) == 0:
+        return sim
+
+    if rate_structure.price_per_mile > 0:
+        distances = sim.road_network.distances_by_geoid_km(
+            [req.origin for req in valid_requests],
+            [req.destination for req in valid_requests],
+        )
+    else:
+        distances = (0,) * len(valid_requests)
+    valued_requests = [
+        req.assign_value_by_distance(rate_structure, distance)
+        for req, distance in zip(valid_requests, distances)
+    ]
+
+    sim_or_error = simulation_state_ops.add_requests_safe(sim, valued_requests)
+    if isinstance(sim_or_error, Failure):
+        error = sim_or_error.failure()
+        log.error(error)
+        return sim
+
+    # successfully added requests
+    for req in valued_requests:
+        report_data = {
+            "request_id": req.id,
+            "departure_time": str(req.departure_time),
+            "fleet_id": str(req.membership),
+        }
+        env.reporter.file_report(Report(ReportType.ADD_REQUEST_EVENT, report_data))
+
+    return sim_or_error.unwrap()
 
-    return updated_sim
+
+def _is_valid_new_request(sim: SimulationState, req: Request, env: Environment) -> bool:
+    """
+    tests if a request can be added to the simulation, logging why not if it can't
+
+    :param sim: latest SimulationState
+    :param req: the new request
+    :param env: the simulation environment
+    :return: True if the request can be added
+    """
+    this_req_cancel_time = req.departure_time + env.config.sim.request_cancel_time_seconds
+    if this_req_cancel_time <= sim.sim_time:
+        # cannot add request that should already be cancelled
+        current_time = sim.sim_time
+        warning = f"request {req.id} with cancel_time {this_req_cancel_time} cannot be added at time {current_time}"
+        log.warning(warning)
+        return False
+    elif len(env.fleet_ids) > 0 and len(req.membership.memberships) == 0:
+        warning = f"request {req.id} is missing membership and will not be be added"
+        log.warning(warning)
+        return False
+    elif len(env.fleet_ids) == 0 and len(req.membership.memberships) > 0:
+        warning = f"request {req.id} has membership but there is no fleets file. This request will not be added"
+        log.warning(warning)
+        return False
+    elif not sim.road_network.geoid_within_geofence(req.origin):
+        log.error(f"origin {req.origin} of request {req.id} not within road network geofence")
+        return False
+    else:
+        return True
+
+
+def _load_rate_structure(rate_structure_file: Optional[str]) -> RequestRateStructure:
+    """
+    loads the request rate structure, or the default (free) rate structure if no file is provided
+
+    :param rate_structure_file: the optional rate structure file
+    :return: the rate structure
+    :raises: IOError if the file does not exist
+    """
+    if not rate_structure_file:
+        return RequestRateStructure()
+    rate_structure_path = Path(rate_structure_file)
+    if not rate_structure_path.is_file():
+        raise IOError(f"{rate_structure_file} is not a valid path to a request file")
+    with open(rate_structure_file, "r", encoding="utf-8-sig") as rsf:
+        reader = DictReader(rsf)
+        return RequestRateStructure.from_row(next(reader))
@@ -0,0 +1,125 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, NamedTuple, Optional, Tuple
+
+import immutables
+
+if TYPE_CHECKING:
+    from nrel.hive.model.sim_time import SimTime
+    from nrel.hive.model.vehicle.vehicle import Vehicle
+    from nrel.hive.runner.environment import Environment
+    from nrel.hive.state.driver_state.driver_state import DriverState
+    from nrel.hive.state.simulation_state.simulation_state import SimulationState
+    from nrel.hive.state.vehicle_state.vehicle_state import VehicleState
+    from nrel.hive.util.typealiases import VehicleId
+
+# the state a wake time was computed for, and the wake time
+VehicleWakeEntry = Tuple["VehicleState", Optional["SimTime"]]
+DriverWakeEntry = Tuple["DriverState", Optional["SimTime"]]
+
+
+class WakeCalendar(NamedTuple):
+    """
+    the next time each vehicle and driver needs an update, see VehicleState.next_wake_time
+    and DriverState.next_wake_time.
+
+    an entry is only valid for the state object it was computed for. any change to a
+    vehicle's state, such as from an instruction, replaces that object, which makes the
+    vehicle due again. vehicles without an entry are always due.
+
+    :param vehicle_entries: the vehicle state wake times, by VehicleId
+    :param driver_entries: the driver state wake times, by VehicleId
+    """
+
+    vehicle_entries: immutables.Map[VehicleId, VehicleWakeEntry] = immutables.Map()
+    driver_entries: immutables.Map[VehicleId, DriverWakeEntry] = immutables.Map()
+
+    def vehicle_due(self, vehicle: Vehicle, sim_time: SimTime) -> bool:
+        """
+        tests if a vehicle state needs an update at this time
+
+        :param vehicle: the vehicle
+        :param sim_time: the current simulation time
+        :return: True if the vehicle state should be updated
+        """
+        entry = self.vehicle_entries.get(vehicle.id)
+        return _due(entry, vehicle.vehicle_state, sim_time)
+
+    def driver_due(self, vehicle: Vehicle, sim_time: SimTime) -> bool:
+        """
+        tests if a vehicle's driver state needs an update at this time
+
+        :param vehicle: the vehicle
+        :param sim_time: the current simulation time
+        :return: True if the driver state should be updated
+        """
+        entry = self.driver_entries.get(vehicle.id)
+        return _due(entry, vehicle.driver_state, sim_time)
+
+    def next_wake_time(self) -> Optional[SimTime]:
+        """
+        the earliest wake time of any vehicle or driver in the calendar
+
+        :return: the earliest wake time, or None if every entry waits for an external event
+        """
+        wake_times = [
+            wake_time
+            for entries in (self.vehicle_entries, self.driver_entries)
+            for _, wake_time in entries.values()
+            if wake_time is not None
+        ]
+        return min(wake_times) if wake_times else None
+
+    def schedule_vehicles(self, sim: SimulationState, env: Environment) -> WakeCalendar:
+        """
+        records the next wake time of every vehicle state which was due or has changed
+
+        :param sim: the simulation state after the vehicle state updates
+        :param env: the simulation environment
+        :return: the updated calendar
+        """
+        entries = _schedule(
+            self.vehicle_entries,
+            sim,
+            lambda v: v.vehicle_state,
+            lambda v: v.vehicle_state.next_wake_time(sim, env),
+        )
+        return self._replace(vehicle_entries=entries)
+
+    def schedule_drivers(self, sim: SimulationState, env: Environment) -> WakeCalendar:
+        """
+        records the next wake time of every driver state which was due or has changed
+
+        :param sim: the simulation state after the driver state updates
+        :param env: the simulation environment
+        :return: the updated calendar
+        """
+        entries = _schedule(
+            self.driver_entries,
+            sim,
+            lambda v: v.driver_state,
+            lambda v: v.driver_state.next_wake_time(sim, env),
+        )
+        return self._replace(driver_entries=entries)
+
+
+def _due(entry, state, sim_time: SimTime) -> bool:
+    if entry is None:
+        return True
+    entry_state, wake_time = entry
+    if entry_state is not state:
+        return True
+    return wake_time is not None and wake_time <= sim_time
+
+
+def _schedule(entries: immutables.Map, sim: SimulationState, get_state, get_wake_time):
+    with entries.mutate() as mutable:
+        for vehicle in sim.vehicles.values():
+            if _due(entries.get(vehicle.id), get_state(vehicle), sim.sim_time):
+                mutable[vehicle.id] = (get_state(vehicle), get_wake_time(vehicle))
+        if len(mutable) != len(sim.vehicles):
+            # drop vehicles which have left the simulation
+            for vehicle_id in entries.keys():
+                if vehicle_id not in sim.vehicles:
+                    del mutable[vehicle_id]
+        return mutable.finish()
@@ -13,6 +13,7 @@ from nrel.hive.state.vehicle_state.vehicle_state_type import VehicleStateType
 from nrel.hive.util.typealiases import VehicleId
 
 if TYPE_CHECKING:
+    from nrel.hive.model.sim_time import SimTime
     from nrel.hive.state.simulation_state.simulation_state import SimulationState
 
 
@@ -52,6 +53,16 @@ class OutOfService(VehicleState):
     ) -> Tuple[Optional[Exception], Optional[SimulationState]]:
         return None, sim
 
+    def next_wake_time(self, sim: SimulationState, env: Environment) -> Optional[SimTime]:
+        """
+        a vehicle in OutOfService does not change until it is instructed to leave
+
+        :param sim: the sim state
+        :param env: the sim environment
+        :return: None
+        """
+        return None
+
     def _has_reached_terminal_state_condition(self, sim: SimulationState, env: Environment) -> bool:
         """
         There is no terminal state for OutOfService
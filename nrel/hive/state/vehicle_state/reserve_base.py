@@ -16,6 +16,7 @@ from nrel.hive.util.exception import SimulationStateError
 from nrel.hive.util.typealiases import VehicleId, BaseId
 
 if TYPE_CHECKING:
+    from nrel.hive.model.sim_time import SimTime
     from nrel.hive.state.simulation_state.simulation_state import SimulationState
 
 log = logging.getLogger(__name__)
@@ -113,6 +114,16 @@ class ReserveBase(VehicleState):
                 return None, None
             return simulation_state_ops.modify_base(sim, updated_base)
 
+    def next_wake_time(self, sim: SimulationState, env: Environment) -> Optional[SimTime]:
+        """
+        a vehicle in ReserveBase does not change until it is instructed to leave
+
+        :param sim: the sim state
+        :param env: the sim environment
+        :return: None
+        """
+        return None
+
     def _has_reached_terminal_state_condition(self, sim: SimulationState, env: Environment) -> bool:
         """
         There is no terminal state for ReserveBase
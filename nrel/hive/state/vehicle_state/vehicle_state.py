@@ -13,6 +13,7 @@ from nrel.hive.util.exception import SimulationStateError, StateTransitionError
 from nrel.hive.util.typealiases import VehicleId
 
 if TYPE_CHECKING:
+    from nrel.hive.model.sim_time import SimTime
     from nrel.hive.runner.environment import Environment
     from nrel.hive.state.simulation_state.simulation_state import SimulationState
 
@@ -110,6 +111,18 @@ class VehicleStateABC(ABC):
         else:
             return state._perform_update(sim, env)
 
+    def next_wake_time(self, sim: SimulationState, env: Environment) -> Optional[SimTime]:
+        """
+        the earliest time at which updating this state could change the simulation. a state
+        that returns None promises that its update is a no-op until an external event, such as
+        an instruction, replaces it. by default, a state is updated at every time step.
+
+        :param sim: the simulation state
+        :param env: the simulation environment
+        :return: the next time this state needs an update, or None to wait for an external event
+        """
+        return sim.sim_time
+
     @classmethod
     def apply_new_vehicle_state(
         mcs,
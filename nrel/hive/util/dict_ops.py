@@ -15,11 +15,12 @@ from typing import (
     Union,
 )
 
-import h3
 import immutables
 
+from nrel.hive.util import h3_cells
+
 if TYPE_CHECKING:
-    from nrel.hive.util.typealiases import EntityId, GeoId
+    from nrel.hive.util.typealiases import EntityId, GeoId, H3Cell
     from nrel.hive.model.entity import Entity
     from _typeshed import SupportsRichComparison
 
@@ -27,7 +28,7 @@ if TYPE_CHECKING:
 class EntityUpdateResult(NamedTuple):
     entities: Optional[immutables.Map[EntityId, Entity]] = None
     locations: Optional[immutables.Map[GeoId, FrozenSet[EntityId]]] = None
-    search: Optional[immutables.Map[GeoId, FrozenSet[EntityId]]] = None
+    search: Optional[immutables.Map[H3Cell, FrozenSet[EntityId]]] = None
 
 
 class DictOps:
@@ -163,10 +164,10 @@ class DictOps:
     @classmethod
     def add_to_collection_dict(
         cls,
-        xs: immutables.Map[str, FrozenSet[V]],
-        collection_id: str,
+        xs: immutables.Map[K, FrozenSet[V]],
+        collection_id: K,
         obj_id: V,
-    ) -> immutables.Map[str, FrozenSet[V]]:
+    ) -> immutables.Map[K, FrozenSet[V]]:
         """
         updates Dicts that track collections of entities
         performs a shallow copy and update, treating Dict as an immutable hash table
@@ -227,10 +228,10 @@ class DictOps:
     @classmethod
     def remove_from_collection_dict(
         cls,
-        xs: immutables.Map[str, FrozenSet[V]],
-        collection_id: str,
-        obj_id: str,
-    ) -> immutables.Map[str, FrozenSet[V]]:
+        xs: immutables.Map[K, FrozenSet[V]],
+        collection_id: K,
+        obj_id: V,
+    ) -> immutables.Map[K, FrozenSet[V]]:
         """
         updates Dicts that track collections of entities
         performs a shallow copy and update, treating Dict as an immutable hash table
@@ -256,8 +257,9 @@ class DictOps:
         updated_entity: Entity,
         entities: immutables.Map[EntityId, Entity],
         locations: immutables.Map[GeoId, FrozenSet[EntityId]],
-        search: immutables.Map[GeoId, FrozenSet[EntityId]],
+        search: immutables.Map[H3Cell, FrozenSet[EntityId]],
         sim_h3_search_resolution: int,
+        sim_h3_int_search: bool = False,
     ) -> EntityUpdateResult:
         """
         updates all dictionaries related to an entity
@@ -267,6 +269,7 @@ class DictOps:
         :param locations: the finest-resolution geoindex of this entity type
         :param search: the upper-level resolution geoindex
         :param sim_h3_search_resolution: the h3 resolution of the search collection
+        :param sim_h3_int_search: if the search collection is keyed by integer h3 indices
         :return: the updated dictionaries
         """
         old_entity = entities[updated_entity.id]
@@ -282,8 +285,12 @@ class DictOps:
             locations_removed, updated_entity.geoid, updated_entity.id
         )
 
-        old_search_geoid = h3.h3_to_parent(old_entity.geoid, sim_h3_search_resolution)
-        updated_search_geoid = h3.h3_to_parent(updated_entity.geoid, sim_h3_search_resolution)
+        old_search_geoid = h3_cells.search_cell(
+            old_entity.geoid, sim_h3_search_resolution, sim_h3_int_search
+        )
+        updated_search_geoid = h3_cells.search_cell(
+            updated_entity.geoid, sim_h3_search_resolution, sim_h3_int_search
+        )
 
         if old_search_geoid == updated_search_geoid:
             # no update to search location
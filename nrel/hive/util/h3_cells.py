@@ -0,0 +1,131 @@
+"""
+the cells of the simulation search collections. by default these are keyed by GeoId, and
+in integer mode (sim.h3_int_search) by integer h3 indices, which are cheaper to hash, compare
+and pass to h3. entity positions are always GeoIds; convert cells back with cell_to_geoid
+wherever they leave the search collections.
+
+the station, base and road network node cells are looked up over and over during a run, so
+the conversions here are memoized in bounded least-recently-used caches. cache_info reports
+their hit rates, which the profiler shows.
+"""
+from functools import lru_cache
+from typing import Dict, FrozenSet, NamedTuple, Tuple
+
+import h3
+import h3.api.basic_int as h3_int
+
+from nrel.hive.util.typealiases import GeoId, H3Cell
+
+# the max number of entries of each memoized conversion
+H3_CACHE_SIZE = 2**16
+
+
+class CacheInfo(NamedTuple):
+    """
+    the usage of one h3 memo since the process started
+
+    :param hits: lookups which were found in the memo
+    :param misses: lookups which called h3
+    :param size: the current number of entries
+    """
+
+    hits: int
+    misses: int
+    size: int
+
+
+@lru_cache(maxsize=H3_CACHE_SIZE)
+def h3_to_geo(geoid: GeoId) -> Tuple[float, float]:
+    """
+    memoized h3.h3_to_geo
+
+    :param geoid: a location
+    :return: the (lat, lon) of the center of the cell
+    """
+    return h3.h3_to_geo(geoid)
+
+
+@lru_cache(maxsize=H3_CACHE_SIZE)
+def search_cell(geoid: GeoId, resolution: int, int_mode: bool = False) -> H3Cell:
+    """
+    finds the search cell which contains a location, memoized
+
+    :param geoid: the location
+    :param resolution: the h3 resolution of the search collection
+    :param int_mode: if True, return an integer h3 index, otherwise a GeoId
+    :return: the search cell
+    """
+    if int_mode:
+        return h3_int.h3_to_parent(int(geoid, 16), resolution)
+    else:
+        return h3.h3_to_parent(geoid, resolution)
+
+
+def cell_to_geoid(cell: H3Cell) -> GeoId:
+    """
+    converts a search cell to a GeoId
+
+    :param cell: a search cell in either mode
+    :return: the cell as a GeoId
+    """
+    return cell if isinstance(cell, str) else h3.h3_to_string(cell)
+
+
+@lru_cache(maxsize=H3_CACHE_SIZE)
+def k_ring(cell: H3Cell, k: int) -> FrozenSet[H3Cell]:
+    """
+    the cells within k grid steps of a cell, in the same mode as the cell, memoized
+
+    :param cell: the center cell
+    :param k: the grid distance
+    :return: the cells within the ring
+    """
+    if isinstance(cell, str):
+        return frozenset(h3.k_ring(cell, k))
+    else:
+        return frozenset(h3_int.k_ring(cell, k))
+
+
+@lru_cache(maxsize=H3_CACHE_SIZE)
+def k_ring_distances(cell: H3Cell, k: int) -> Tuple[FrozenSet[H3Cell], ...]:
+    """
+    the cells within k grid steps of a cell, grouped by grid distance, in the same mode as the
+    cell, memoized
+
+    :param cell: the center cell
+    :param k: the max grid distance
+    :return: the cells at each grid distance from 0 to k
+    """
+    if isinstance(cell, str):
+        return tuple(frozenset(ring) for ring in h3.k_ring_distances(cell, k))
+    else:
+        return tuple(frozenset(ring) for ring in h3_int.k_ring_distances(cell, k))
+
+
+_CACHES = {
+    "h3_to_geo": h3_to_geo,
+    "search_cell": search_cell,
+    "k_ring": k_ring,
+    "k_ring_distances": k_ring_distances,
+}
+
+
+def cache_info() -> Dict[str, CacheInfo]:
+    """
+    reports the usage of each h3 memo
+
+    :return: the usage of each memo, by name
+    """
+    infos = {}
+    for name, fn in _CACHES.items():
+        info = fn.cache_info()
+        infos[name] = CacheInfo(hits=info.hits, misses=info.misses, size=info.currsize)
+    return infos
+
+
+def cache_clear():
+    """
+    empties every h3 memo and resets its usage
+    """
+    for fn in _CACHES.values():
+        fn.cache_clear()
@@ -4,11 +4,13 @@ from typing import Any, Dict, Optional, TYPE_CHECKING, FrozenSet, Iterable, Call
 
 import h3
 import immutables
+import numpy as np
 from math import radians, cos, sin, asin, sqrt, ceil
+from nrel.hive.util import h3_cells
 from nrel.hive.util.dict_ops import DictOps
 
 from nrel.hive.util.exception import H3Error
-from nrel.hive.util.typealiases import EntityId, GeoId
+from nrel.hive.util.typealiases import EntityId, GeoId, H3Cell
 from nrel.hive.util.units import Kilometers, Seconds, SECONDS_TO_HOURS
 
 if TYPE_CHECKING:
@@ -22,10 +24,11 @@ class H3Ops:
         cls,
         geoid: GeoId,
         entities: Iterable[Entity],
-        entity_search: immutables.Map[GeoId, FrozenSet[EntityId]],
+        entity_search: immutables.Map[H3Cell, FrozenSet[EntityId]],
         sim_h3_search_resolution: int,
         is_valid: Callable[[Any], bool] = lambda x: True,
         max_search_distance_km: Kilometers = 10,  # kilometers
+        sim_h3_int_search: bool = False,
     ) -> Optional[Entity]:
         """
         returns the closest entity to the given geoid. In the case of a tie, the first entity encountered is returned.
@@ -39,6 +42,7 @@ class H3Ops:
         :param is_valid: a function used to filter valid search results, such as checking stations for charger_id availability
         :param k: the number of concentric rings to check in the high-level search
         :param max_search_distance_km: the maximum distance a result can be from the search origin
+        :param sim_h3_int_search: if the entity_search collection is keyed by integer h3 indices
         :return: the nearest entity, or, None if not found within the constraints
         """
         return cls.nearest_entity(
@@ -49,6 +53,7 @@ class H3Ops:
             is_valid=is_valid,
             distance_function=lambda e: cls.great_circle_distance(geoid, e.geoid),
             max_search_distance_km=max_search_distance_km,
+            sim_h3_int_search=sim_h3_int_search,
         )
 
     @classmethod
@@ -56,11 +61,12 @@ class H3Ops:
         cls,
         geoid: GeoId,
         entities: Iterable[Entity],
-        entity_search: immutables.Map[GeoId, FrozenSet[EntityId]],
+        entity_search: immutables.Map[H3Cell, FrozenSet[EntityId]],
         sim_h3_search_resolution: int,
         distance_function: Callable[[Any], float],
         is_valid: Callable[[Any], bool] = lambda x: True,
         max_search_distance_km: Kilometers = 10,  # kilometers
+        sim_h3_int_search: bool = False,
     ) -> Optional[Entity]:
         """
         returns the closest entity to the given geoid. In the case of a tie, the first entity encountered is returned.
@@ -75,6 +81,7 @@ class H3Ops:
         :param distance_function: a function used to evaluate the distance metric for selection
         :param k: the number of concentric rings to check in the high-level search
         :param max_search_distance_km: the maximum distance a result can be from the search origin
+        :param sim_h3_int_search: if the entity_search collection is keyed by integer h3 indices
         :return: the nearest entity, or, None if not found within the constraints
         """
         if not entities:
@@ -85,7 +92,7 @@ class H3Ops:
 
         k_dist_km = h3.edge_length(sim_h3_search_resolution, unit="km") * 2  # kilometers
         max_k = ceil(max_search_distance_km / k_dist_km)
-        search_geoid = h3.h3_to_parent(geoid, sim_h3_search_resolution)
+        search_geoid = h3_cells.search_cell(geoid, sim_h3_search_resolution, sim_h3_int_search)
 
         def _search(current_k: int = 0) -> Optional[Entity]:
             if current_k > max_k:
@@ -93,7 +100,7 @@ class H3Ops:
                 return None
             else:
                 # get the kth ring
-                ring = h3.k_ring(search_geoid, current_k)
+                ring = h3_cells.k_ring(search_geoid, current_k)
 
                 # get all entities in this ring
                 found = (
@@ -124,8 +131,8 @@ class H3Ops:
     @classmethod
     def get_entities_at_cell(
         cls,
-        search_cell: GeoId,
-        entity_search: immutables.Map[GeoId, FrozenSet[EntityId]],
+        search_cell: H3Cell,
+        entity_search: immutables.Map[H3Cell, FrozenSet[EntityId]],
         entities: Iterable[Entity],
     ) -> Tuple[Entity, ...]:
         """
@@ -189,8 +196,8 @@ class H3Ops:
         """
         avg_earth_radius_km = 6371
 
-        lat1, lon1 = h3.h3_to_geo(a)
-        lat2, lon2 = h3.h3_to_geo(b)
+        lat1, lon1 = h3_cells.h3_to_geo(a)
+        lat2, lon2 = h3_cells.h3_to_geo(b)
 
         # convert all latitudes/longitudes from decimal degrees to radians
         lat1, lon1, lat2, lon2 = map(radians, (lat1, lon1, lat2, lon2))
@@ -202,6 +209,60 @@ class H3Ops:
 
         return 2 * avg_earth_radius_km * asin(sqrt(d))
 
+    @classmethod
+    def coordinates(cls, geoids: Iterable[GeoId]) -> np.ndarray:
+        """
+        the (lat, lon) of a collection of geoids, for use with great_circle_distances
+
+
+        :param geoids: the geoids
+        :return: an array of shape (n, 2) of decimal degrees
+        """
+        coords = [h3_cells.h3_to_geo(geoid) for geoid in geoids]
+        return np.array(coords, dtype=np.float64).reshape(len(coords), 2)
+
+    @classmethod
+    def great_circle_distances(cls, a: GeoId, b: np.ndarray) -> np.ndarray:
+        """
+        computes the distance between one geoid and many coordinates at once
+
+
+        :param a: one geoid
+        :param b: an array of (lat, lon) coordinates, see H3Ops.coordinates
+        :return: the haversine distance from the GeoId to each coordinate
+        """
+        avg_earth_radius_km = 6371
+
+        lat1, lon1 = map(radians, h3_cells.h3_to_geo(a))
+        lat2, lon2 = np.radians(b[:, 0]), np.radians(b[:, 1])
+
+        lat = lat2 - lat1
+        lon = lon2 - lon1
+        d = np.sin(lat * 0.5) ** 2 + cos(lat1) * np.cos(lat2) * np.sin(lon * 0.5) ** 2
+
+        return 2 * avg_earth_radius_km * np.arcsin(np.sqrt(d))
+
+    @classmethod
+    def great_circle_distance_matrix(cls, a: np.ndarray, b: np.ndarray) -> np.ndarray:
+        """
+        computes the distance between every pair of two sets of coordinates
+
+
+        :param a: an array of (lat, lon) coordinates, see H3Ops.coordinates
+        :param b: another array of (lat, lon) coordinates
+        :return: an array of shape (len(a), len(b)) of haversine distances
+        """
+        avg_earth_radius_km = 6371
+
+        lat1, lon1 = np.radians(a[:, 0])[:, None], np.radians(a[:, 1])[:, None]
+        lat2, lon2 = np.radians(b[:, 0])[None, :], np.radians(b[:, 1])[None, :]
+
+        lat = lat2 - lat1
+        lon = lon2 - lon1
+        d = np.sin(lat * 0.5) ** 2 + np.cos(lat1) * np.cos(lat2) * np.sin(lon * 0.5) ** 2
+
+        return 2 * avg_earth_radius_km * np.arcsin(np.sqrt(d))
+
     @classmethod
     def point_along_link(cls, link: LinkTraversal, available_time_seconds: Seconds) -> GeoId:
         """
@@ -222,8 +283,8 @@ class H3Ops:
             return link.end
         else:
             # find the point along the line
-            start = h3.h3_to_geo(link.start)
-            end = h3.h3_to_geo(link.end)
+            start = h3_cells.h3_to_geo(link.start)
+            end = h3_cells.h3_to_geo(link.end)
             res = h3.h3_get_resolution(link.start)
             lat = start[0] + ((end[0] - start[0]) * ratio_trip_experienced)
             lon = start[1] + ((end[1] - start[1]) * ratio_trip_experienced)
@@ -79,7 +79,7 @@ class DictReaderIterator:
         parser: Callable,
     ):
         self.reader = reader
-        self.history = None
+        self.history: Optional[Dict[str, str]] = None
         self.step_column_name = step_column_name
         self.stop_condition = stop_condition
         self.parser = parser
@@ -118,6 +118,22 @@ class DictReaderIterator:
                 self.history = row
                 raise StopIteration
 
+    def peek(self) -> Optional[Any]:
+        """
+        the parsed step value of the next row, without consuming it
+
+        :return: the next step value, or None if the reader is exhausted
+        """
+        if not self.history:
+            try:
+                self.history = next(self.reader)
+            except StopIteration:
+                return None
+        value = self.parser(self.history[self.step_column_name])
+        if isinstance(value, Exception):
+            raise value
+        return value
+
 
 class DictReaderStepper:
     """
@@ -218,6 +234,14 @@ class DictReaderStepper:
         self._iterator.update_stop_condition(stop_condition)
         return self._iterator
 
+    def peek_step_value(self) -> Optional[Any]:
+        """
+        the step column value of the next unread row
+
+        :return: the parsed value, or None if all rows have been read
+        """
+        return self._iterator.peek()
+
     def close(self):
         if self._file:
             self._file.close()
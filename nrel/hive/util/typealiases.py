@@ -1,4 +1,4 @@
-from typing import Tuple, FrozenSet
+from typing import Tuple, FrozenSet, Union
 
 from immutables import Map
 
@@ -23,6 +23,7 @@ MembershipMap = Map[EntityId, Tuple[MembershipId, ...]]
 
 # POSITIONAL
 GeoId = str  # h3 geohash
+H3Cell = Union[GeoId, int]  # a search collection key, see nrel.hive.util.h3_cells
 LinkId = str  # road network link
 RouteStepPointer = int
 H3Resolution = int
@@ -1,6 +1,9 @@
 from unittest import TestCase
 
 from returns.result import Success
+
+from nrel.hive.model.sim_time import SimTime
+from nrel.hive.reporting.reporter import Reporter
 from nrel.hive.resources.mock_lobster import mock_env, mock_request, mock_sim
 from nrel.hive.state.simulation_state import simulation_state_ops
 
@@ -37,3 +40,44 @@ class TestCancelRequests(TestCase):
             result.r_locations,
             "request location should not have been removed",
         )
+
+    def test_update_only_expired_departure_buckets(self):
+        reqs = tuple(
+            mock_request(request_id=f"r{t}", departure_time=SimTime(t))
+            for t in (0, 30, 59, 60, 90, 120)
+        )
+        sim = simulation_state_ops.add_entities(mock_sim(sim_time=660), reqs)
+        env = mock_env()
+
+        result, _ = CancelRequests().update(sim, env)
+
+        # requests are cancelled once sim time reaches departure time + 600 seconds
+        self.assertEqual(set(result.requests.keys()), {"r90", "r120"})
+        self.assertEqual(
+            set(result.r_departure_buckets.keys()),
+            {SimTime(60), SimTime(120)},
+            "emptied departure buckets should be removed",
+        )
+
+    def test_update_cancels_in_request_id_order(self):
+        reqs = tuple(mock_request(request_id=r_id) for r_id in ("c", "a", "b"))
+        sim = simulation_state_ops.add_entities(mock_sim(sim_time=600), reqs)
+        reporter = Reporter()
+        env = mock_env()._replace(reporter=reporter)
+
+        result, _ = CancelRequests().update(sim, env)
+
+        self.assertEqual(len(result.requests), 0, "all requests should be cancelled")
+        self.assertEqual(len(result.r_departure_buckets), 0, "should clear departure buckets")
+        cancelled = [r.report["request_id"] for r in reporter.reports]
+        self.assertEqual(cancelled, ["a", "b", "c"], "should cancel in request id order")
+
+    def test_next_event_time(self):
+        reqs = tuple(
+            mock_request(request_id=f"r{t}", departure_time=SimTime(t)) for t in (90, 150, 30, 59)
+        )
+        sim = simulation_state_ops.add_entities(mock_sim(), reqs)
+        env = mock_env()
+
+        self.assertEqual(CancelRequests().next_event_time(sim, env), SimTime(630))
+        self.assertIsNone(CancelRequests().next_event_time(mock_sim(), env))
@@ -0,0 +1,61 @@
+from unittest import TestCase
+
+from nrel.hive.dispatcher.instruction_generator import assignment_ops
+from nrel.hive.dispatcher.instruction_generator.charge_time_estimates import (
+    ChargeTimeEstimates,
+)
+from nrel.hive.resources.mock_lobster import (
+    mock_dcfc_charger_id,
+    mock_env,
+    mock_ice,
+    mock_sim,
+    mock_station,
+    mock_vehicle,
+)
+from nrel.hive.state.vehicle_state.charge_queueing import ChargeQueueing
+from nrel.hive.state.vehicle_state.charging_station import ChargingStation
+
+
+class TestChargeTimeEstimates(TestCase):
+    def test_rank_stations(self):
+        busy = mock_station("busy", chargers={mock_dcfc_charger_id(): 1})
+        free = mock_station("free", chargers={mock_dcfc_charger_id(): 1})
+        charging = mock_vehicle(
+            "charging",
+            soc=0.5,
+            vehicle_state=ChargingStation.build("charging", "busy", mock_dcfc_charger_id()),
+        )
+        queued = mock_vehicle(
+            "queued",
+            soc=0.5,
+            vehicle_state=ChargeQueueing.build("queued", "busy", mock_dcfc_charger_id(), 0),
+        )
+        vehicle = mock_vehicle("ranked", soc=0.2)
+        sim = mock_sim(vehicles=(charging, queued, vehicle), stations=(busy, free))
+        env = mock_env()
+
+        estimates = ChargeTimeEstimates(sim, env, target_soc=0.8)
+        ranks, chargers = estimates.rank_stations(vehicle, (busy, free))
+
+        self.assertGreater(estimates.wait_time(busy, mock_dcfc_charger_id()), 0)
+        self.assertEqual(estimates.wait_time(free, mock_dcfc_charger_id()), 0)
+        self.assertGreater(ranks[0], ranks[1], "busy station should rank below free station")
+        self.assertEqual(chargers, (mock_dcfc_charger_id(), mock_dcfc_charger_id()))
+
+        for station, rank, charger_id in zip((busy, free), ranks, chargers):
+            single = assignment_ops.shortest_time_to_charge_ranking(vehicle, station, estimates)
+            self.assertEqual(single, (charger_id, rank))
+
+    def test_rank_stations_no_compatible_charger(self):
+        ice = mock_ice()
+        vehicle = mock_vehicle(mechatronics=ice, soc=0.2)
+        station = mock_station()
+        sim = mock_sim(vehicles=(vehicle,), stations=(station,))
+        env = mock_env(mechatronics={ice.mechatronics_id: ice})
+
+        estimates = ChargeTimeEstimates(sim, env, target_soc=0.8)
+        ranks, chargers = estimates.rank_stations(vehicle, (station,), max_dist=1000.0)
+
+        self.assertEqual(list(ranks), [1000.0])
+        self.assertEqual(chargers, (None,))
+        self.assertIsNone(estimates.rank_station(vehicle, station))
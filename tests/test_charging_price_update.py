@@ -148,3 +148,45 @@ class TestChargingPriceUpdate(TestCase):
             0.0,
             "DCFC charging should be free by default",
         )
+
+    def test_charge_price_update_reuses_geoid_station_lookup(self):
+        stations = (
+            mock_station(
+                "s1",
+                39.752233,
+                -104.976061,
+                chargers=immutables.Map({mock_dcfc_charger_id(): 10}),
+            ),
+            # outside of the geoid in the price file
+            mock_station(
+                "s_far",
+                39.60,
+                -104.80,
+                chargers=immutables.Map({mock_dcfc_charger_id(): 10}),
+            ),
+        )
+        sim = mock_sim(stations=stations, sim_time=28801)
+        env = mock_env()
+        file = resource_filename(
+            "nrel.hive.resources.scenarios.denver_downtown.charging_prices",
+            "denver_charging_prices_by_geoid.csv",
+        )
+        fn = ChargingPriceUpdate.build(file, env.config.input_config.chargers_file)
+        result, fn2 = fn.update(sim, env)
+        self.assertEqual(result.stations["s1"].get_price(mock_dcfc_charger_id()), 0.5)
+        self.assertEqual(
+            result.stations["s_far"].get_price(mock_dcfc_charger_id()),
+            sim.stations["s_far"].get_price(mock_dcfc_charger_id()),
+            "stations without a price update should be unchanged",
+        )
+        self.assertEqual(fn2.station_lookup.get("86268cdafffffff"), ("s1",))
+
+        next_sim = result._replace(sim_time=36001)
+        result2, fn3 = fn2.update(next_sim, env)
+        self.assertEqual(result2.stations["s1"].get_price(mock_dcfc_charger_id()), 0.3)
+        self.assertIs(
+            fn3.station_lookup,
+            fn2.station_lookup,
+            "the geoid lookup should be reused while the stations are unchanged",
+        )
+        fn.reader.close()
@@ -1,13 +1,37 @@
 from unittest import TestCase
+from unittest.mock import patch
+
+import h3
+
 from nrel.hive.dispatcher.instruction.instructions import (
     DispatchBaseInstruction,
     DispatchStationInstruction,
+    RepositionInstruction,
 )
 
-from nrel.hive.state.driver_state.driver_instruction_ops import human_go_home
+from nrel.hive.dispatcher.instruction_generator.charge_time_estimates import ChargeTimeEstimates
+from nrel.hive.dispatcher.instruction_generator.charging_search_type import ChargingSearchType
+from nrel.hive.dispatcher.instruction_generator.instruction_generator_ops import (
+    generate_instructions,
+)
+from nrel.hive.state.driver_state.demand_heatmap import DemandHeatmap
+from nrel.hive.state.driver_state.driver_instruction_ops import (
+    human_go_home,
+    human_look_for_requests,
+)
+from nrel.hive.state.driver_state.human_driver_state.human_driver_attributes import (
+    HumanDriverAttributes,
+)
+from nrel.hive.state.driver_state.human_driver_state.human_driver_state import (
+    HumanAvailable,
+    HumanUnavailable,
+)
+from nrel.hive.state.simulation_state import simulation_state_ops
+from nrel.hive.state.vehicle_state.reserve_base import ReserveBase
 from nrel.hive.resources.mock_lobster import (
     mock_base,
     mock_env,
+    mock_request,
     mock_sim,
     mock_station,
     mock_vehicle,
@@ -48,3 +72,94 @@ class TestDriverInstructionOps(TestCase):
         self.assertIsInstance(result, DispatchStationInstruction)
         self.assertEqual(result.station_id, station.id)
         self.assertEqual(result.vehicle_id, veh.id)
+
+    def test_human_look_for_requests(self):
+        near = mock_request("near", o_lat=39.7539, o_lon=-104.974)
+        far_a = mock_request("far_a", o_lat=39.70, o_lon=-104.90)
+        far_b = mock_request("far_b", o_lat=39.70, o_lon=-104.90)
+        veh = mock_vehicle(lat=39.7539, lon=-104.974)
+        sim = mock_sim(vehicles=(veh,))
+        sim = simulation_state_ops.add_entities(sim, (near, far_a, far_b))
+        env = mock_env()
+        dispatcher = env.config.dispatcher._replace(human_driver_reposition_top_k=2)
+        nearest_env = mock_env(config=env.config._replace(dispatcher=dispatcher))
+
+        densest = human_look_for_requests(veh, sim, env)
+        nearest = human_look_for_requests(veh, sim, nearest_env)
+
+        def _center(geoid):
+            search_cell = h3.h3_to_parent(geoid, sim.sim_h3_search_resolution)
+            center = h3.h3_to_center_child(search_cell, sim.sim_h3_location_resolution)
+            return sim.road_network.position_from_geoid(center)
+
+        far_position = _center(far_a.origin)
+        near_position = _center(near.origin)
+        self.assertEqual(densest, RepositionInstruction(veh.id, far_position.link_id))
+        self.assertEqual(nearest, RepositionInstruction(veh.id, near_position.link_id))
+
+    def test_driver_instructions_share_demand_heatmap(self):
+        base = mock_base()
+        vehicles = tuple(
+            mock_vehicle(
+                vehicle_id=vehicle_id,
+                vehicle_state=ReserveBase.build(vehicle_id, base.id),
+                driver_state=HumanAvailable(
+                    HumanDriverAttributes(vehicle_id, "schedule", base.id, True)
+                ),
+            )
+            for vehicle_id in ("v1", "v2", "v3")
+        )
+        request = mock_request(o_lat=39.70, o_lon=-104.90)
+        sim = mock_sim(vehicles=vehicles, bases=(base,))
+        sim = simulation_state_ops.add_entities(sim, (request,))
+        env = mock_env()
+
+        with patch.object(DemandHeatmap, "build", wraps=DemandHeatmap.build) as build:
+            result = generate_instructions((), sim, env)
+
+        build.assert_called_once()
+        for veh in vehicles:
+            expected = human_look_for_requests(veh, sim, env)
+            self.assertEqual(result.instruction_stack.get(veh.id), (expected,))
+
+    def test_driver_instructions_share_charge_time_estimates(self):
+        base = mock_base(lat=0.04, lon=0.04, station_id=None)
+        station = mock_station(lat=0.01, lon=0.01)
+        vehicles = tuple(
+            mock_vehicle(
+                vehicle_id=vehicle_id,
+                soc=0.02,
+                lat=0,
+                lon=0,
+                driver_state=HumanUnavailable(
+                    HumanDriverAttributes(vehicle_id, "schedule", base.id, True)
+                ),
+            )
+            for vehicle_id in ("v1", "v2", "v3")
+        )
+        sim = mock_sim(vehicles=vehicles, bases=(base,), stations=(station,))
+        env = mock_env()
+        dispatcher = env.config.dispatcher._replace(
+            charging_search_type=ChargingSearchType.SHORTEST_TIME_TO_CHARGE
+        )
+        env = mock_env(config=env.config._replace(dispatcher=dispatcher))
+
+        with patch.object(
+            ChargeTimeEstimates,
+            "__init__",
+            autospec=True,
+            side_effect=ChargeTimeEstimates.__init__,
+        ) as init:
+            result = generate_instructions((), sim, env)
+
+        init.assert_called_once()
+        for veh in vehicles:
+            expected = human_go_home(veh, base, sim, env)
+            self.assertIsInstance(expected, DispatchStationInstruction)
+            self.assertEqual(result.instruction_stack.get(veh.id), (expected,))
+
+    def test_human_look_for_requests_no_requests(self):
+        veh = mock_vehicle()
+        sim = mock_sim(vehicles=(veh,))
+
+        self.assertIsNone(human_look_for_requests(veh, sim, mock_env()))
@@ -3,9 +3,10 @@ from unittest import TestCase
 import h3
 import immutables
 from nrel.hive.model.roadnetwork.link import Link
-from nrel.hive.resources.mock_lobster import mock_request_from_geoids, mock_sim
+from nrel.hive.resources.mock_lobster import mock_request_from_geoids, mock_sim, mock_vehicle
 from nrel.hive.state.simulation_state import simulation_state_ops
 
+from nrel.hive.util import h3_cells
 from nrel.hive.util.h3_ops import H3Ops
 from nrel.hive.util.fp import throw_or_return
 from nrel.hive.util.units import hours_to_seconds
@@ -75,6 +76,30 @@ class TestH3Ops(TestCase):
 
         self.assertEqual(nearest.geoid, req_near.geoid)
 
+    def test_nearest_entity_int_search(self):
+        near = mock_vehicle("near", lat=39.754, lon=-104.975)
+        far = mock_vehicle("far", lat=39.78, lon=-104.99)
+        sim = mock_sim(h3_search_res=7, h3_int_search=True, vehicles=(near, far))
+        somewhere = h3.geo_to_h3(39.7539, -104.974, 15)
+
+        self.assertTrue(all(isinstance(cell, int) for cell in sim.v_search.keys()))
+
+        nearest = H3Ops.nearest_entity_by_great_circle_distance(
+            geoid=somewhere,
+            entities=sim.get_vehicles(),
+            entity_search=sim.v_search,
+            sim_h3_search_resolution=sim.sim_h3_search_resolution,
+            sim_h3_int_search=sim.sim_h3_int_search,
+        )
+        self.assertEqual(nearest.id, "near")
+
+        # moving the near vehicle away updates the integer search collection
+        moved = near.modify_position(far.position)
+        sim_moved = throw_or_return(simulation_state_ops.modify_vehicle_safe(sim, moved))
+        self.assertEqual(
+            dict(sim_moved.v_search), {sim.search_cell(far.geoid): frozenset({"near", "far"})}
+        )
+
     def test_great_circle_distance(self):
         london = h3.geo_to_h3(51.5007, 0.1246, 10)
         new_york = h3.geo_to_h3(40.6892, 74.0445, 10)
@@ -82,3 +107,28 @@ class TestH3Ops(TestCase):
         distance_km = H3Ops.great_circle_distance(london, new_york)
 
         self.assertAlmostEqual(distance_km, 5574.8, places=1)
+
+    def test_great_circle_distances(self):
+        london = h3.geo_to_h3(51.5007, 0.1246, 10)
+        new_york = h3.geo_to_h3(40.6892, 74.0445, 10)
+        paris = h3.geo_to_h3(48.8584, 2.2945, 10)
+
+        distances_km = H3Ops.great_circle_distances(london, H3Ops.coordinates((new_york, paris)))
+
+        self.assertEqual(len(distances_km), 2)
+        self.assertAlmostEqual(distances_km[0], H3Ops.great_circle_distance(london, new_york))
+        self.assertAlmostEqual(distances_km[1], H3Ops.great_circle_distance(london, paris))
+        self.assertEqual(len(H3Ops.great_circle_distances(london, H3Ops.coordinates(()))), 0)
+
+    def test_h3_cache_info(self):
+        geoid = h3.geo_to_h3(39.7539, -104.974, 15)
+        before = h3_cells.cache_info()["h3_to_geo"]
+
+        first = h3_cells.h3_to_geo(geoid)
+        second = h3_cells.h3_to_geo(geoid)
+
+        after = h3_cells.cache_info()["h3_to_geo"]
+        self.assertEqual(first, h3.h3_to_geo(geoid))
+        self.assertEqual(first, second)
+        self.assertGreaterEqual(after.hits - before.hits, 1, "second lookup should hit the memo")
+        self.assertLessEqual(after.size, h3_cells.H3_CACHE_SIZE)
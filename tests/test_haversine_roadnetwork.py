@@ -2,6 +2,7 @@ from unittest import TestCase, skip
 
 import h3
 
+from nrel.hive.model.roadnetwork.route import route_distance_km
 from nrel.hive.resources.mock_lobster import mock_network
 
 
@@ -41,3 +42,19 @@ class TestHaversineRoadNetwork(TestCase):
             places=1,
             msg="Route should be approx. 1.1km",
         )
+
+    def test_travel_time_matrix(self):
+        sim_h3_resolution = 15
+        network = mock_network(h3_res=sim_h3_resolution)
+        geoids = [h3.geo_to_h3(37 + i * 0.01, 122, sim_h3_resolution) for i in range(3)]
+        positions = [network.position_from_geoid(geoid) for geoid in geoids]
+
+        times = network.travel_time_matrix(positions[:2], positions)
+        distances = network.distance_matrix(positions[:2], positions)
+
+        self.assertEqual(times.shape, (2, 3))
+        for i, o in enumerate(positions[:2]):
+            for j, d in enumerate(positions):
+                route = network.route(o, d)
+                self.assertEqual(times[i, j], sum(l.travel_time_seconds for l in route))
+                self.assertAlmostEqual(distances[i, j], route_distance_km(route))
@@ -1,14 +1,30 @@
 from unittest import TestCase
+from unittest.mock import patch
 
+import numpy as np
+
+from nrel.hive.dispatcher.instruction_generator import assignment_ops
+from nrel.hive.dispatcher.instruction_generator.charge_time_estimates import ChargeTimeEstimates
 from nrel.hive.dispatcher.instruction_generator.instruction_generator_ops import (
+    instruct_vehicles_to_charge_by_assignment,
     instruct_vehicles_to_dispatch_to_station,
+    valid_station_for_vehicle,
 )
 from nrel.hive.dispatcher.instruction_generator.charging_search_type import ChargingSearchType
+from nrel.hive.dispatcher.instruction_generator.nearest_station_search import (
+    NearestStationSearch,
+)
 from nrel.hive.resources.mock_lobster import (
+    mock_bev,
+    mock_dcfc_charger_id,
     mock_env,
+    mock_gasoline_pump,
     mock_ice,
+    mock_l2_charger,
+    mock_l2_charger_id,
     mock_sim,
     mock_station,
+    mock_station_from_geoid,
     mock_vehicle,
 )
 
@@ -79,3 +95,165 @@ class TestInstructionGenerators(TestCase):
         )
 
         self.assertEqual(len(instructions), 0, "should not have generated any instructions")
+
+    def test_dispatch_station_ops_shortest_time_builds_estimates_once(self):
+        near = mock_station("near", lat=39.7539, lon=-104.974)
+        far = mock_station("far", lat=39.7639, lon=-104.974)
+        vehicles = (
+            mock_vehicle("v1", lat=39.7549, lon=-104.974, soc=0.1),
+            mock_vehicle("v2", lat=39.7629, lon=-104.974, soc=0.1),
+            mock_vehicle("v3", lat=39.7589, lon=-104.974, soc=0.1),
+        )
+        sim = mock_sim(vehicles=vehicles, stations=(near, far))
+
+        with patch.object(
+            ChargeTimeEstimates, "__init__", autospec=True, side_effect=ChargeTimeEstimates.__init__
+        ) as init:
+            instructions = instruct_vehicles_to_dispatch_to_station(
+                n=3,
+                max_search_radius_km=10,
+                vehicles=vehicles,
+                simulation_state=sim,
+                environment=mock_env(),
+                target_soc=0.8,
+                charging_search_type=ChargingSearchType.SHORTEST_TIME_TO_CHARGE,
+            )
+
+        self.assertEqual(len(instructions), 3)
+        self.assertEqual(init.call_count, 1, "should share one set of estimates")
+
+    def test_dispatch_station_ops_with_station_search(self):
+        near = mock_station("near", lat=39.7539, lon=-104.974)
+        far = mock_station("far", lat=39.7639, lon=-104.974)
+        vehicles = (
+            mock_vehicle("v1", lat=39.7549, lon=-104.974, soc=0.1),
+            mock_vehicle("v2", lat=39.7629, lon=-104.974, soc=0.1),
+        )
+        sim = mock_sim(vehicles=vehicles, stations=(near, far))
+        env = mock_env()
+
+        for search_type in ChargingSearchType:
+            station_search = NearestStationSearch(sim, env, 10, 0.8, search_type)
+            memoized = instruct_vehicles_to_dispatch_to_station(
+                n=2,
+                max_search_radius_km=10,
+                vehicles=vehicles,
+                simulation_state=sim,
+                environment=env,
+                target_soc=0.8,
+                charging_search_type=search_type,
+                station_search=station_search,
+            )
+            expected = instruct_vehicles_to_dispatch_to_station(
+                n=2,
+                max_search_radius_km=10,
+                vehicles=vehicles,
+                simulation_state=sim,
+                environment=env,
+                target_soc=0.8,
+                charging_search_type=search_type,
+            )
+            self.assertEqual(memoized, expected)
+            self.assertEqual([i.station_id for i in memoized], ["near", "far"])
+
+    def test_charge_by_assignment_spreads_vehicles(self):
+        chargers = {mock_dcfc_charger_id(): 1}
+        near = mock_station("near", lat=39.7549, lon=-104.974, chargers=chargers)
+        far = mock_station("far", lat=39.7524, lon=-104.974, chargers=chargers)
+        bev, ice = mock_bev(), mock_ice()
+        vehicles = (
+            mock_vehicle("v1", soc=0.1, mechatronics=bev),
+            mock_vehicle("v2", soc=0.1, mechatronics=bev),
+            mock_vehicle("v3", soc=0.1, mechatronics=ice),
+        )
+        sim = mock_sim(vehicles=vehicles, stations=(near, far))
+        env = mock_env(mechatronics={bev.mechatronics_id: bev, ice.mechatronics_id: ice})
+
+        for search_type in ChargingSearchType:
+            greedy = instruct_vehicles_to_dispatch_to_station(
+                n=3,
+                max_search_radius_km=10,
+                vehicles=vehicles,
+                simulation_state=sim,
+                environment=env,
+                target_soc=0.8,
+                charging_search_type=search_type,
+            )
+            assigned = instruct_vehicles_to_charge_by_assignment(
+                max_search_radius_km=10,
+                vehicles=vehicles,
+                simulation_state=sim,
+                environment=env,
+                target_soc=0.8,
+                charging_search_type=search_type,
+            )
+            self.assertEqual([i.station_id for i in greedy], ["near", "near"])
+            self.assertEqual(
+                sorted(i.station_id for i in assigned),
+                ["far", "near"],
+                "each single-plug station should get one vehicle, and the ice vehicle none",
+            )
+            self.assertTrue(all(i.charger_id == mock_dcfc_charger_id() for i in assigned))
+
+        no_range = instruct_vehicles_to_charge_by_assignment(
+            max_search_radius_km=0.01,
+            vehicles=vehicles,
+            simulation_state=sim,
+            environment=env,
+            target_soc=0.8,
+            charging_search_type=ChargingSearchType.NEAREST_SHORTEST_QUEUE,
+        )
+        self.assertEqual(no_range, ())
+
+    def test_charging_assignment_table_bounds_slots(self):
+        chargers = {mock_dcfc_charger_id(): 1}
+        near = mock_station("near", lat=39.7549, lon=-104.974, chargers=chargers)
+        far = mock_station("far", lat=40.7549, lon=-104.974, chargers=chargers)
+        bev = mock_bev()
+        vehicles = tuple(mock_vehicle(f"v{i}", soc=0.1, mechatronics=bev) for i in range(10))
+        sim = mock_sim(vehicles=vehicles, stations=(near, far))
+        env = mock_env(mechatronics={bev.mechatronics_id: bev})
+
+        for search_type in ChargingSearchType:
+            for n_vehicles, n_slots in ((10, assignment_ops.MAX_QUEUE_ROUNDS), (2, 2)):
+                slots, table = assignment_ops.charging_assignment_table(
+                    vehicles=vehicles[:n_vehicles],
+                    sim=sim,
+                    env=env,
+                    max_search_radius_km=10,
+                    target_soc=0.8,
+                    charging_search_type=search_type,
+                )
+                self.assertEqual(
+                    [s.station_id for s in slots],
+                    ["near"] * n_slots,
+                    "should only have slots for vehicles in range, up to the queue rounds bound",
+                )
+                self.assertEqual([s.slot for s in slots], list(range(n_slots)))
+                self.assertEqual(table.shape, (n_vehicles, n_slots))
+                self.assertTrue(np.all(np.diff(table, axis=1) >= 0), "later slots cost more")
+
+    def test_valid_station_for_vehicle_charger_compatibility(self):
+        bev, ice = mock_bev(), mock_ice()
+        gas_pump = mock_gasoline_pump()
+        env = mock_env(
+            mechatronics={bev.mechatronics_id: bev, ice.mechatronics_id: ice},
+            chargers={mock_l2_charger_id(): mock_l2_charger(), gas_pump.id: gas_pump},
+        )
+        electric = mock_station_from_geoid("electric", chargers={mock_l2_charger_id(): 1}, env=env)
+        gas = mock_station_from_geoid("gas", chargers={gas_pump.id: 1}, env=env)
+        both = mock_station_from_geoid(
+            "both", chargers={mock_l2_charger_id(): 1, gas_pump.id: 1}, env=env
+        )
+
+        bev_valid = valid_station_for_vehicle(mock_vehicle(mechatronics=bev), env)
+        ice_valid = valid_station_for_vehicle(mock_vehicle(mechatronics=ice), env)
+
+        self.assertEqual([bev_valid(s) for s in (electric, gas, both)], [True, False, True])
+        self.assertEqual([ice_valid(s) for s in (electric, gas, both)], [False, True, True])
+
+        # replacing the chargers table without rebuilding the compatibility table
+        # should fail instead of using the stale table
+        ice_only_env = env._replace(chargers=env.chargers.delete(gas_pump.id))
+        with self.assertRaises(Exception):
+            valid_station_for_vehicle(mock_vehicle(mechatronics=ice), ice_only_env)
@@ -1,12 +1,15 @@
 from unittest import TestCase
 import h3
+import numpy as np
 
 from nrel.hive.dispatcher.instruction.instructions import (
     DispatchStationInstruction,
     DispatchTripInstruction,
 )
+from nrel.hive.dispatcher.instruction_generator import assignment_ops
 from nrel.hive.dispatcher.instruction_generator.charging_fleet_manager import ChargingFleetManager
 from nrel.hive.dispatcher.instruction_generator.dispatcher import Dispatcher
+from nrel.hive.dispatcher.instruction_generator.matching_cost_type import MatchingCostType
 from nrel.hive.resources.mock_lobster import (
     DefaultIds,
     mock_config,
@@ -65,6 +68,128 @@ class TestInstructionGenerators(TestCase):
             "Should have picked closest vehicle",
         )
 
+    def test_dispatcher_reuses_cost_table(self):
+        somewhere = h3.geo_to_h3(39.7539, -104.974, 15)
+        near_to_somewhere = h3.geo_to_h3(39.754, -104.975, 15)
+        far_from_somewhere = h3.geo_to_h3(39.755, -104.976, 15)
+
+        req = mock_request_from_geoids(origin=somewhere, fleet_id=DefaultIds.mock_membership_id())
+        close_veh = mock_vehicle_from_geoid(
+            vehicle_id="close_veh", geoid=near_to_somewhere, membership=mock_membership()
+        )
+        far_veh = mock_vehicle_from_geoid(
+            vehicle_id="far_veh", geoid=far_from_somewhere, membership=mock_membership()
+        )
+        sim = mock_sim(h3_location_res=9, h3_search_res=9, vehicles=(close_veh, far_veh))
+        sim = simulation_state_ops.add_request_safe(sim, req).unwrap()
+        env = mock_env()
+
+        dispatcher, _ = Dispatcher(mock_config().dispatcher).generate_instructions(sim, env)
+        cost_table = dispatcher.cost_tables.get(DefaultIds.mock_membership_id())
+        self.assertEqual(cost_table.table.shape, (2, 1))
+
+        # the far vehicle moves next to the request, the close vehicle keeps its costs
+        moved_veh = far_veh.modify_position(close_veh.position._replace(geoid=somewhere))
+        _, moved_sim = simulation_state_ops.modify_vehicle(sim, moved_veh)
+        cost_calls = []
+
+        def _cost(a, b):
+            cost_calls.append((a.id, b.id))
+            return assignment_ops.h3_distance_cost(a, b)
+
+        updated = cost_table.update(
+            moved_sim.get_vehicles(), moved_sim.get_requests(), cost_fn=_cost
+        )
+        self.assertEqual(cost_calls, [("far_veh", req.id)], "only the moved vehicle is costed")
+
+        _, instructions = dispatcher.generate_instructions(moved_sim, env)
+        _, fresh_instructions = Dispatcher(mock_config().dispatcher).generate_instructions(
+            moved_sim, env
+        )
+        self.assertEqual(instructions, fresh_instructions)
+        self.assertEqual(instructions[0].vehicle_id, "far_veh")
+        np.testing.assert_array_equal(
+            updated.table,
+            assignment_ops.AssignmentCostTable()
+            .update(moved_sim.get_vehicles(), moved_sim.get_requests(), _cost)
+            .table,
+        )
+
+    def test_dispatcher_travel_time_cost(self):
+        config = mock_config().dispatcher._replace(
+            matching_cost_type=MatchingCostType.TRAVEL_TIME
+        )
+        somewhere = h3.geo_to_h3(39.7539, -104.974, 15)
+        near_to_somewhere = h3.geo_to_h3(39.754, -104.975, 15)
+        far_from_somewhere = h3.geo_to_h3(39.755, -104.976, 15)
+
+        req = mock_request_from_geoids(origin=somewhere, fleet_id=DefaultIds.mock_membership_id())
+        close_veh = mock_vehicle_from_geoid(
+            vehicle_id="close_veh", geoid=near_to_somewhere, membership=mock_membership()
+        )
+        far_veh = mock_vehicle_from_geoid(
+            vehicle_id="far_veh", geoid=far_from_somewhere, membership=mock_membership()
+        )
+        sim = mock_sim(h3_location_res=9, h3_search_res=9, vehicles=(close_veh, far_veh))
+        sim = simulation_state_ops.add_request_safe(sim, req).unwrap()
+
+        dispatcher, instructions = Dispatcher(config).generate_instructions(sim, mock_env())
+
+        self.assertEqual(instructions[0].vehicle_id, close_veh.id)
+        cost_table = dispatcher.cost_tables.get(DefaultIds.mock_membership_id())
+        np.testing.assert_array_equal(
+            cost_table.table,
+            sim.road_network.travel_time_matrix(
+                [close_veh.position, far_veh.position], [req.position]
+            ),
+        )
+
+        # only the moved vehicle is costed again
+        moved_veh = far_veh.modify_position(close_veh.position._replace(geoid=somewhere))
+        _, moved_sim = simulation_state_ops.modify_vehicle(sim, moved_veh)
+        cost_rows = []
+
+        def _costs(a, b):
+            cost_rows.extend(v.id for v in a)
+            return assignment_ops.travel_time_cost_matrix(moved_sim.road_network)(a, b)
+
+        updated = cost_table.update_by_matrix(
+            moved_sim.get_vehicles(), moved_sim.get_requests(), _costs
+        )
+        self.assertEqual(cost_rows, ["far_veh"])
+        np.testing.assert_array_equal(
+            updated.table,
+            assignment_ops.AssignmentCostTable()
+            .update_by_matrix(moved_sim.get_vehicles(), moved_sim.get_requests(), _costs)
+            .table,
+        )
+
+        # a vehicle at the same geoid on another link may have a different travel time
+        relinked_veh = close_veh.modify_position(close_veh.position._replace(link_id="other"))
+        _, relinked_sim = simulation_state_ops.modify_vehicle(moved_sim, relinked_veh)
+        cost_rows.clear()
+        updated.update_by_matrix(relinked_sim.get_vehicles(), relinked_sim.get_requests(), _costs)
+        self.assertEqual(cost_rows, ["close_veh"])
+
+    def test_dispatcher_matching_window(self):
+        config = mock_config().dispatcher._replace(matching_window_seconds=120)
+        somewhere = h3.geo_to_h3(39.7539, -104.974, 15)
+        req = mock_request_from_geoids(origin=somewhere, fleet_id=DefaultIds.mock_membership_id())
+        veh = mock_vehicle_from_geoid(geoid=somewhere, membership=mock_membership())
+        sim = mock_sim(h3_location_res=9, h3_search_res=9, vehicles=(veh,))
+        sim = simulation_state_ops.add_request_safe(sim, req).unwrap()
+        env = mock_env()
+
+        dispatcher, instructions = Dispatcher(config).generate_instructions(sim, env)
+        self.assertEqual(len(instructions), 1, "the first time step starts a matching window")
+
+        results = []
+        for seconds in (60, 119, 120):
+            later_sim = sim._replace(sim_time=sim.sim_time + seconds)
+            _, instructions = dispatcher.generate_instructions(later_sim, env)
+            results.append(len(instructions))
+        self.assertEqual(results, [0, 0, 1], "should only match once the window has passed")
+
     def test_dispatcher_no_vehicles(self):
         dispatcher = Dispatcher(mock_config().dispatcher)
 
@@ -114,6 +239,29 @@ class TestInstructionGenerators(TestCase):
             "Should have instructed vehicle to dispatch to station",
         )
 
+    def test_charging_fleet_manager_keeps_station_rings(self):
+        charging_fleet_manager = ChargingFleetManager(mock_config().dispatcher)
+
+        somewhere = h3.geo_to_h3(39.7539, -104.974, 15)
+        somewhere_else = h3.geo_to_h3(39.75, -104.976, 15)
+        veh = mock_vehicle_from_geoid(geoid=somewhere, soc=0.01)
+        station = mock_station_from_geoid(geoid=somewhere_else)
+        sim = mock_sim(h3_search_res=9, vehicles=(veh,), stations=(station,))
+        env = mock_env()
+
+        updated_manager, _ = charging_fleet_manager.generate_instructions(sim, env)
+        search_cell = h3.h3_to_parent(somewhere, 9)
+        self.assertIn(search_cell, updated_manager.station_rings)
+
+        next_sim = simulation_state_ops.tick(sim)
+        next_manager, instructions = updated_manager.generate_instructions(next_sim, env)
+        self.assertIs(
+            next_manager.station_rings,
+            updated_manager.station_rings,
+            "station rings should be reused while the stations are unchanged",
+        )
+        self.assertEqual(instructions[0].station_id, station.id)
+
     def test_charging_fleet_manager_queues(self):
         charging_fleet_manager = ChargingFleetManager(mock_config().dispatcher)
 
@@ -0,0 +1,110 @@
+import shutil
+import tempfile
+from pathlib import Path
+from unittest import TestCase
+
+import numpy as np
+from pkg_resources import resource_filename
+
+from nrel.hive.model.roadnetwork.osm.link_spatial_index import LinkSpatialIndex
+from nrel.hive.model.roadnetwork.osm.osm_roadnetwork import OSMRoadNetwork, link_index_path
+
+
+class TestLinkSpatialIndex(TestCase):
+    def test_nearest_links_long_link(self):
+        # a long east-west link, and a short link whose midpoint is nearer to the
+        # far end of the long link than the long link's own midpoint is
+        coordinates = np.array(
+            [
+                [39.75, -104.99, 39.75, -104.95],
+                [39.752, -104.9501, 39.753, -104.9501],
+            ]
+        )
+        index = LinkSpatialIndex.build(("long", "short"), coordinates)
+
+        result = index.nearest_links(np.array([[39.7501, -104.951], [39.7525, -104.9502]]))
+
+        self.assertEqual(list(result), [0, 1])
+
+    def test_nearest_links_prefers_link_starting_nearby(self):
+        coordinates = np.array(
+            [
+                [39.75, -104.99, 39.75, -104.98],
+                [39.75, -104.98, 39.75, -104.99],
+            ]
+        )
+        index = LinkSpatialIndex.build(("forward", "reverse"), coordinates)
+
+        result = index.nearest_links(np.array([[39.7501, -104.988], [39.7501, -104.982]]))
+
+        self.assertEqual(list(result), [0, 1], "points should snap to the link starting near them")
+        self.assertEqual(len(index.nearest_links(np.zeros((0, 2)))), 0)
+
+    def test_nearest_link_matches_nearest_links(self):
+        network_file = resource_filename(
+            "nrel.hive.resources.scenarios.denver_downtown.road_network",
+            "downtown_denver_network.json",
+        )
+        index = OSMRoadNetwork.from_file(network_file).link_helper.links_spatial_lookup
+        rng = np.random.default_rng(0)
+        points = np.column_stack(
+            [rng.uniform(39.735, 39.765, 500), rng.uniform(-105.01, -104.97, 500)]
+        )
+
+        expected = index.nearest_links(points)
+        result = [index.nearest_link(lat, lon) for lat, lon in points]
+
+        self.assertEqual(result, list(expected))
+
+    def test_nearest_link_prefers_link_starting_nearby(self):
+        coordinates = np.array(
+            [
+                [39.75, -104.99, 39.75, -104.98],
+                [39.75, -104.98, 39.75, -104.99],
+            ]
+        )
+        index = LinkSpatialIndex.build(("forward", "reverse"), coordinates)
+        empty = LinkSpatialIndex.build((), np.zeros((0, 4)))
+
+        self.assertEqual(index.nearest_link(39.7501, -104.988), 0)
+        self.assertEqual(index.nearest_link(39.7501, -104.982), 1)
+        self.assertEqual(empty.nearest_link(39.75, -104.99), -1)
+
+    def test_save_and_load(self):
+        coordinates = np.array([[39.75, -104.99, 39.75, -104.95]])
+        index = LinkSpatialIndex.build(("a",), coordinates)
+        with tempfile.TemporaryDirectory() as tmp:
+            file = Path(tmp) / "index.npz"
+            index.save(file, "digest")
+            loaded, digest = LinkSpatialIndex.load(file)
+
+        self.assertEqual(digest, "digest")
+        self.assertEqual(loaded.link_ids, index.link_ids)
+        self.assertEqual(loaded.origin, index.origin)
+        np.testing.assert_array_equal(loaded.segments, index.segments)
+        np.testing.assert_array_equal(loaded.tree.data, index.tree.data)
+
+    def test_road_network_loads_saved_index(self):
+        network_file = resource_filename(
+            "nrel.hive.resources.scenarios.denver_downtown.road_network",
+            "downtown_denver_network.json",
+        )
+        with tempfile.TemporaryDirectory() as tmp:
+            file = Path(tmp) / "network.json"
+            shutil.copy(network_file, file)
+            network = OSMRoadNetwork.from_file(file)
+            index_file = network.save_link_index(file)
+            self.assertEqual(index_file, link_index_path(file))
+
+            reloaded = OSMRoadNetwork.from_file(file)
+            index = reloaded.link_helper.links_spatial_lookup
+            self.assertEqual(index.link_ids, network.link_helper.links_linkid_lookup)
+            np.testing.assert_array_equal(
+                index.segments, network.link_helper.links_spatial_lookup.segments
+            )
+
+            # a changed network file invalidates the saved index
+            file.write_text(file.read_text() + " ")
+            with self.assertLogs(level="WARNING"):
+                rebuilt = OSMRoadNetwork.from_file(file)
+            self.assertEqual(rebuilt.link_helper.link_count, network.link_helper.link_count)
@@ -1,4 +1,6 @@
 from unittest import TestCase
+from unittest.mock import patch
+
 from nrel.hive.model.sim_time import SimTime
 from nrel.hive.resources.mock_lobster import (
     DefaultIds,
@@ -13,12 +15,15 @@ from nrel.hive.resources.mock_lobster import (
     mock_vehicle,
 )
 
+from nrel.hive.reporting.handler.stats_handler import StatsHandler
+from nrel.hive.reporting.reporter import Reporter
 from nrel.hive.runner import LocalSimulationRunner
 from nrel.hive.runner import RunnerPayload
 from nrel.hive.state.simulation_state import simulation_state_ops
 from nrel.hive.state.simulation_state.update.cancel_requests import CancelRequests
 from nrel.hive.state.simulation_state.update.step_simulation import StepSimulation
 from nrel.hive.state.simulation_state.update.update import Update
+from nrel.hive.state.vehicle_state.reserve_base import ReserveBase
 
 
 class TestLocalSimulationRunner(TestCase):
@@ -60,6 +65,89 @@ class TestLocalSimulationRunner(TestCase):
             places=1,
         )
 
+    def test_run_event_driven(self):
+        config = mock_config(end_time=600, timestep_duration_seconds=60)
+        config = config._replace(sim=config.sim._replace(event_driven=True))
+        env = mock_env(config)
+        req = mock_request(request_id="1", departure_time=SimTime.build(0), passengers=2)
+        initial_sim = mock_sim(
+            vehicles=(mock_vehicle(),),
+            stations=(mock_station(),),
+            bases=(mock_base(stall_count=5),),
+        )
+        initial_sim = simulation_state_ops.add_request_safe(initial_sim, req).unwrap()
+        runner_payload = RunnerPayload(initial_sim, env, mock_update())
+
+        result = LocalSimulationRunner.run(runner_payload)
+
+        vehicle = result.s.vehicles[DefaultIds.mock_vehicle_id()]
+        self.assertEqual(result.s.sim_time, 600, "should run to the end time")
+        self.assertEqual(
+            vehicle.geoid,
+            req.destination,
+            "Vehicle should be at request destination",
+        )
+        self.assertAlmostEqual(0.56, vehicle.distance_traveled_km, places=1)
+
+    def test_run_event_driven_skips_quiet_steps(self):
+        config = mock_config(end_time=6000, timestep_duration_seconds=60)
+        config = config._replace(sim=config.sim._replace(event_driven=True))
+        env = mock_env(config)
+        base = mock_base(stall_count=5)
+        vehicle = mock_vehicle(
+            vehicle_state=ReserveBase.build(DefaultIds.mock_vehicle_id(), base.id)
+        )
+        initial_sim = mock_sim(vehicles=(vehicle,), bases=(base,))
+        runner_payload = RunnerPayload(initial_sim, env, mock_update())
+
+        with patch.object(
+            Update, "apply_update", autospec=True, side_effect=Update.apply_update
+        ) as apply_update:
+            result = LocalSimulationRunner.run(runner_payload)
+
+        self.assertEqual(result.s.sim_time, 6000, "should run to the end time")
+        self.assertLess(apply_update.call_count, 10, "should skip the quiet time steps")
+        self.assertIsInstance(
+            result.s.vehicles[DefaultIds.mock_vehicle_id()].vehicle_state, ReserveBase
+        )
+
+    def test_run_event_driven_stats_match_fixed_step(self):
+        def run_stats(event_driven: bool):
+            config = mock_config(end_time=6000, timestep_duration_seconds=60)
+            config = config._replace(sim=config.sim._replace(event_driven=event_driven))
+            stats_handler = StatsHandler()
+            reporter = Reporter()
+            reporter.add_handler(stats_handler)
+            env = mock_env(config).set_reporter(reporter)
+            base = mock_base(stall_count=5)
+            reserve_vehicle = mock_vehicle(
+                vehicle_id="reserve",
+                vehicle_state=ReserveBase.build("reserve", base.id),
+            )
+            idle_vehicle = mock_vehicle(vehicle_id="idle")
+            initial_sim = mock_sim(vehicles=(reserve_vehicle, idle_vehicle), bases=(base,))
+            req = mock_request(request_id="1", departure_time=SimTime.build(0), passengers=2)
+            initial_sim = simulation_state_ops.add_request_safe(initial_sim, req).unwrap()
+            runner_payload = RunnerPayload(initial_sim, env, mock_update())
+
+            with patch.object(
+                Update, "apply_update", autospec=True, side_effect=Update.apply_update
+            ) as apply_update:
+                result = LocalSimulationRunner.run(runner_payload)
+
+            return stats_handler.get_stats(result), apply_update.call_count
+
+        fixed_step_stats, fixed_step_count = run_stats(event_driven=False)
+        event_driven_stats, event_driven_count = run_stats(event_driven=True)
+
+        self.assertLess(event_driven_count, fixed_step_count, "should skip the quiet steps")
+        self.assertEqual(
+            fixed_step_stats["vehicle_state"],
+            event_driven_stats["vehicle_state"],
+            "time in each state should match the fixed step run",
+        )
+        self.assertEqual(fixed_step_stats, event_driven_stats)
+
     def test_step(self):
         config = mock_config()
         env = mock_env(config)
@@ -1,7 +1,15 @@
 from unittest import TestCase, skip
+from unittest.mock import patch
 
 import h3
+import networkx as nx
+import numpy as np
 
+from nrel.hive.model.roadnetwork.compact_route import CompactRoute
+from nrel.hive.model.roadnetwork.osm import osm_roadnetwork
+from nrel.hive.model.roadnetwork.osm.osm_roadnetwork import TIME_WEIGHT
+from nrel.hive.model.roadnetwork.route import prepend_link, route_distance_km
+from nrel.hive.model.roadnetwork.routetraversal import traverse
 from nrel.hive.resources.mock_lobster import mock_osm_network
 
 
@@ -53,3 +61,139 @@ class TestOSMRoadNetwork(TestCase):
             route[-1].end,
             "route should end at destination GeoId (stationary road network location)",
         )
+
+    def test_compact_route(self):
+        sim_h3_resolution = 15
+        network = mock_osm_network(h3_res=sim_h3_resolution)
+
+        origin = h3.geo_to_h3(39.7481388, -104.9935966, sim_h3_resolution)
+        destination = h3.geo_to_h3(39.7613596, -104.981728, sim_h3_resolution)
+        route = network.route(
+            network.position_from_geoid(origin), network.position_from_geoid(destination)
+        )
+        links = route.to_route()
+
+        self.assertIsInstance(route, CompactRoute, "osm routes should be compact")
+        self.assertEqual(route, links, "should compare equal to the materialized route")
+        self.assertEqual(route[-1], links[-1], "should keep the partial last link")
+        self.assertEqual(route[2:5], links[2:5], "should slice like a tuple")
+        self.assertIsInstance(prepend_link(links[0], route[1:]), CompactRoute)
+        self.assertEqual(prepend_link(links[0], route[1:]), links)
+        self.assertEqual(prepend_link(links[0], links[1:]), links)
+
+        _, result = traverse(route, 60, network)
+
+        self.assertIsInstance(result.remaining_route, CompactRoute, "should stay compact")
+        self.assertEqual(
+            result.remaining_route[1:],
+            links[len(result.experienced_route) :],
+            "should split the route at the current link",
+        )
+        self.assertEqual(
+            result.experienced_route[-1].end,
+            result.remaining_route[0].start,
+            "should continue from the traversed position",
+        )
+
+    def test_positions_from_geoids(self):
+        sim_h3_resolution = 15
+        network = mock_osm_network(h3_res=sim_h3_resolution)
+        geoids = [
+            h3.geo_to_h3(39.7481388, -104.9935966, sim_h3_resolution),
+            h3.geo_to_h3(39.7613596, -104.981728, sim_h3_resolution),
+            h3.geo_to_h3(39.7539, -104.974, sim_h3_resolution),
+        ]
+
+        positions = network.positions_from_geoids(geoids)
+
+        self.assertEqual(positions, tuple(network.position_from_geoid(g) for g in geoids))
+        self.assertEqual(network.positions_from_geoids([]), ())
+
+    def test_links_from_latlon_array(self):
+        sim_h3_resolution = 15
+        network = mock_osm_network(h3_res=sim_h3_resolution)
+        geoids = [
+            h3.geo_to_h3(39.7481388, -104.9935966, sim_h3_resolution),
+            h3.geo_to_h3(39.7613596, -104.981728, sim_h3_resolution),
+        ]
+        latlon = np.array([h3.h3_to_geo(g) for g in geoids])
+
+        ordinals = network.links_from_latlon_array(latlon)
+
+        self.assertEqual(ordinals.shape, (2,))
+        links = [network.link_from_ordinal(int(o)) for o in ordinals]
+        self.assertEqual(links, [network.link_from_geoid(g) for g in geoids])
+        self.assertIsNone(network.link_from_ordinal(-1))
+
+    def test_distances_by_geoid_km(self):
+        sim_h3_resolution = 15
+        network = mock_osm_network(h3_res=sim_h3_resolution)
+        a = h3.geo_to_h3(39.7481388, -104.9935966, sim_h3_resolution)
+        b = h3.geo_to_h3(39.7613596, -104.981728, sim_h3_resolution)
+
+        distances = network.distances_by_geoid_km([a, b, a], [b, a, b])
+
+        self.assertEqual(distances[0], network.distance_by_geoid_km(a, b))
+        self.assertEqual(distances[1], network.distance_by_geoid_km(b, a))
+        self.assertEqual(distances[2], distances[0], "repeated pairs should match")
+
+    def test_routes_in_parallel(self):
+        sim_h3_resolution = 15
+        network = mock_osm_network(h3_res=sim_h3_resolution, routing_processes=2)
+        sequential = mock_osm_network(h3_res=sim_h3_resolution)
+        coords = [
+            (39.7481388, -104.9935966),
+            (39.7613596, -104.981728),
+            (39.7539, -104.974),
+            (39.7525, -104.9895),
+        ]
+        positions = network.positions_from_geoids(
+            [h3.geo_to_h3(lat, lon, sim_h3_resolution) for lat, lon in coords]
+        )
+        pairs = [(o, d) for o in positions for d in positions]
+
+        with patch.object(osm_roadnetwork, "MIN_PARALLEL_ROUTES", 2):
+            routes = network.routes(pairs)
+
+        self.assertIsNotNone(network._pool, "the batch should have been routed in the pool")
+        network.close()
+        self.assertIsNone(network._pool, "closing should shut down the pool")
+        self.assertEqual(len(routes), len(pairs))
+        for (o, d), route in zip(pairs, routes):
+            self.assertEqual(tuple(route), tuple(sequential.route(o, d)))
+
+    def test_travel_time_matrix(self):
+        sim_h3_resolution = 15
+        network = mock_osm_network(h3_res=sim_h3_resolution)
+        coords = [
+            (39.7481388, -104.9935966),
+            (39.7613596, -104.981728),
+            (39.7539, -104.974),
+            (39.7525, -104.9895),
+        ]
+        positions = network.positions_from_geoids(
+            [h3.geo_to_h3(lat, lon, sim_h3_resolution) for lat, lon in coords]
+        )
+
+        times = network.travel_time_matrix(positions[:2], positions)
+        distances = network.distance_matrix(positions[:2], positions)
+
+        self.assertEqual(times.shape, (2, 4))
+        for i, o in enumerate(positions[:2]):
+            for j, d in enumerate(positions):
+                if o == d:
+                    self.assertEqual(times[i, j], 0)
+                    self.assertEqual(distances[i, j], 0)
+                    continue
+                # the fastest path, as found by networkx
+                source, target = network._route_node_pair(o, d)
+                nx_path = nx.dijkstra_path(network.graph, source, target, weight=TIME_WEIGHT)
+                route = network._route_from_node_path(o, d, nx_path)
+                self.assertEqual(times[i, j], sum(l.travel_time_seconds for l in route))
+                self.assertAlmostEqual(distances[i, j], route_distance_km(route))
+
+        bounded = network.travel_time_matrix(
+            positions[:2], positions, max_travel_time_seconds=times[0, 1] - 1
+        )
+        self.assertEqual(bounded[0, 1], np.inf, "routes over the max travel time are left out")
+        self.assertEqual(bounded[0, 0], 0)
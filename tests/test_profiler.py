@@ -0,0 +1,85 @@
+import csv
+import tempfile
+from pathlib import Path
+from unittest import TestCase
+
+from nrel.hive.reporting.handler.profile_handler import ProfileHandler
+from nrel.hive.reporting.profiler import Profiler
+from nrel.hive.reporting.report_type import ReportType
+from nrel.hive.reporting.reporter import Reporter
+from nrel.hive.resources.mock_lobster import (
+    mock_config,
+    mock_env,
+    mock_request,
+    mock_sim,
+    mock_update,
+    mock_vehicle,
+)
+from nrel.hive.runner import LocalSimulationRunner, RunnerPayload
+from nrel.hive.state.simulation_state import simulation_state_ops
+
+
+class TestProfiler(TestCase):
+    def test_disabled_profiler_records_nothing(self):
+        profiler = Profiler()
+        with profiler.timed("phase"):
+            pass
+
+        self.assertEqual(profiler.drain(), (), "disabled profiler should not record timings")
+
+    def test_enabled_profiler_accumulates_calls(self):
+        profiler = Profiler(enabled=True)
+        for _ in range(3):
+            with profiler.timed("phase"):
+                pass
+
+        drained = profiler.drain()
+        self.assertEqual(len(drained), 1)
+        phase, elapsed, calls = drained[0]
+        self.assertEqual(phase, "phase")
+        self.assertEqual(calls, 3)
+        self.assertGreaterEqual(elapsed, 0.0)
+        self.assertEqual(profiler.drain(), (), "drain should reset the step timings")
+
+    def test_run_writes_profile(self):
+        output_directory = Path(tempfile.mkdtemp())
+        config = mock_config(end_time=180, timestep_duration_seconds=60)
+        reporter = Reporter(Profiler(enabled=True))
+        handler = ProfileHandler(output_directory)
+        reporter.add_handler(handler)
+        env = mock_env(config)._replace(reporter=reporter)
+
+        sim = mock_sim(vehicles=(mock_vehicle(),))
+        sim = simulation_state_ops.add_request_safe(sim, mock_request()).unwrap()
+
+        result = LocalSimulationRunner.run(RunnerPayload(sim, env, mock_update()))
+        reporter.close(result)
+
+        with (output_directory / "profile.csv").open() as f:
+            rows = list(csv.DictReader(f))
+
+        phases = {row["phase"] for row in rows}
+        self.assertIn("perform_driver_state_updates", phases)
+        self.assertIn("generate_instructions.Dispatcher", phases)
+        self.assertIn("apply_instructions", phases)
+        self.assertIn("perform_vehicle_state_updates", phases)
+        self.assertIn("reporter.flush.ProfileHandler", phases)
+        self.assertIn("apply_instructions", handler.totals)
+
+        def _calls(phase):
+            return sum(int(row["calls"]) for row in rows if row["phase"] == phase)
+
+        self.assertEqual(
+            _calls("reporter.flush.ProfileHandler"),
+            _calls("apply_instructions"),
+            "every flush should be reported, including the last one",
+        )
+
+        with (output_directory / "cache_profile.csv").open() as f:
+            cache_rows = {row["cache"]: row for row in csv.DictReader(f)}
+
+        self.assertIn("search_cell", cache_rows)
+        self.assertGreater(int(cache_rows["search_cell"]["hits"]), 0)
+
+    def test_profile_report_type(self):
+        self.assertEqual(ReportType.from_string("step_profile"), ReportType.STEP_PROFILE)
@@ -37,6 +37,24 @@ class TestRequest(TestCase):
         self.assertEqual(self.request.departure_time, self.departure_time)
         self.assertEqual(len(self.request.passengers), self.passengers)
 
+    def test_from_rows(self):
+        source = """request_id,o_lat,o_lon,d_lat,d_lon,departure_time,cancel_time,passengers
+        1_a,31.2074449,121.4294263,31.2109091,121.4532226,61200,61800,4
+        1_b,31.2074449,121.4294263,31.2109091,121.4532226,not_a_time,61800,4
+        1_c,31.2109091,121.4532226,31.2074449,121.4294263,61260,61860,1
+        """
+        rows = list(DictReader(source.split()))
+        env = mock_env()
+        network = mock_network()
+
+        results = Request.from_rows(rows, env, network)
+
+        self.assertEqual(len(results), 3, "should have a result for each row")
+        self.assertEqual(results[0], Request.from_row(rows[0], env, network))
+        self.assertIsInstance(results[1][0], TimeParseError, "should fail on the bad row")
+        self.assertIsNone(results[1][1])
+        self.assertEqual(results[2], Request.from_row(rows[2], env, network))
+
     def test_from_row(self):
         source = """request_id,o_lat,o_lon,d_lat,d_lon,departure_time,cancel_time,passengers
         1_a,31.2074449,121.4294263,31.2109091,121.4532226,61200,61800,4
@@ -1,4 +1,5 @@
 from unittest import TestCase
+from unittest.mock import patch
 
 from nrel.hive.model.roadnetwork.linktraversal import traverse_up_to
 from nrel.hive.model.roadnetwork.routetraversal import traverse
@@ -41,6 +42,28 @@ class TestRouteTraversal(TestCase):
         )
         self.assertEqual(len(result.experienced_route), midway, "should have hit half the links")
 
+    def test_traverse_stops_at_time_budget(self):
+        """
+        links past the point where the time runs out are not looked up in the road network
+        """
+        rn = mock_osm_network()
+        route = mock_osm_route()
+        first_link_time = route[0].travel_time_seconds
+
+        with patch.object(
+            rn, "link_from_link_id", wraps=rn.link_from_link_id
+        ) as link_from_link_id:
+            _, result = traverse(
+                route_estimate=route,
+                duration_seconds=first_link_time * 1.5,
+                road_network=rn,
+            )
+
+        self.assertLessEqual(link_from_link_id.call_count, 2, "should only visit two links")
+        self.assertEqual(len(result.experienced_route), 2, "should have hit two links")
+        self.assertEqual(result.remaining_route[0].end, route[1].end, "should be on link 2")
+        self.assertEqual(result.remaining_route[1:], route[2:], "should keep unvisited links")
+
     def test_traverse_up_to_split(self):
         links = mock_route()
         test_link = links[0]
@@ -1,15 +1,25 @@
+import tempfile
 from unittest import TestCase
 
+import h3
+
+from pkg_resources import resource_filename
+
 from returns.primitives.exceptions import UnwrapFailedError
 
-from nrel.hive.initialization.sample_requests import default_request_sampler
+from nrel.hive.app.generate_scenario import generate_scenario
+from nrel.hive.initialization.initialize_simulation import initialize
+from nrel.hive.initialization.load import load_config
+from nrel.hive.initialization.sample_requests import default_request_sampler, poisson_request_rows
 from nrel.hive.initialization.sample_vehicles import (
     sample_vehicles,
+    sample_vehicle_rows,
     build_default_location_sampling_fn,
     build_default_soc_sampling_fn,
 )
 from nrel.hive.model.energy.energytype import EnergyType
 from nrel.hive.model.roadnetwork.link import Link
+from nrel.hive.model.sim_time import SimTime
 from nrel.hive.model.vehicle.vehicle import Vehicle
 from nrel.hive.resources.mock_lobster import (
     DefaultIds,
@@ -107,3 +117,76 @@ class TestSampleVehicles(TestCase):
         with self.assertRaises(UnwrapFailedError):
             result.unwrap()
         self.assertEqual(result._inner_value.args[0], failure_msg)
+
+
+class TestSampleScenario(TestCase):
+    def test_poisson_request_rows_follow_departure_order(self):
+        links = list(mock_osm_network().link_helper.links.values())
+        rows = list(
+            poisson_request_rows(
+                links,
+                requests_per_day=14400,
+                start_time=SimTime(0),
+                end_time=SimTime(3600),
+                timestep_duration_seconds=60,
+            )
+        )
+
+        # the midnight hour of the default profile has ~0.47x the mean daily demand
+        self.assertGreater(len(rows), 100, "should have sampled requests in the first hour")
+        self.assertLess(len(rows), 500, "should follow the diurnal profile")
+        departures = [SimTime.build(r["departure_time"]) for r in rows]
+        self.assertEqual(departures, sorted(departures), "rows should be in departure order")
+        self.assertEqual(len({r["request_id"] for r in rows}), len(rows), "ids should be unique")
+        for r in rows:
+            self.assertNotEqual((r["o_lat"], r["o_lon"]), (r["d_lat"], r["d_lon"]))
+
+    def test_poisson_request_rows_reproducible(self):
+        links = list(mock_osm_network().link_helper.links.values())
+
+        def _sample():
+            return list(poisson_request_rows(links, 20000, SimTime(0), SimTime(600), 60))
+
+        self.assertEqual(_sample(), _sample(), "same seed should sample the same requests")
+
+    def test_poisson_request_rows_no_valid_destination(self):
+        geoid = h3.geo_to_h3(39.7539, -104.976, 15)
+        links = [Link.build("loop", geoid, geoid, 40), Link.build("loop2", geoid, geoid, 40)]
+
+        with self.assertRaises(ValueError):
+            list(poisson_request_rows(links, 20000, SimTime(0), SimTime(600), 60))
+
+    def test_sample_vehicle_rows(self):
+        locations = [(39.7539, -104.976), (39.7481, -104.9923)]
+        rows = list(
+            sample_vehicle_rows(
+                5, locations, ["leaf_50"], build_default_soc_sampling_fn(0.5, 1.0), offset=2
+            )
+        )
+
+        self.assertEqual([r["vehicle_id"] for r in rows], ["v2", "v3", "v4", "v5", "v6"])
+        for r in rows:
+            self.assertIn((r["lat"], r["lon"]), locations)
+            self.assertTrue(0.5 <= r["initial_soc"] <= 1.0)
+
+    def test_generate_scenario_loads(self):
+        road_network_file = resource_filename(
+            "nrel.hive.resources.scenarios.denver_downtown.road_network",
+            "downtown_denver_network.json",
+        )
+        scenario_file = generate_scenario(
+            road_network_file,
+            tempfile.mkdtemp(),
+            vehicle_count=20,
+            base_count=2,
+            station_count=3,
+            requests_per_day=10000,
+            end_time="1970-01-01T01:00:00",
+        )
+
+        config = load_config(scenario_file).suppress_logging()
+        sim, env = initialize(config)
+
+        self.assertEqual(len(sim.vehicles), 20, "should load all sampled vehicles")
+        self.assertEqual(len(sim.bases), 2, "should load all sampled bases")
+        self.assertEqual(len(sim.stations), 5, "should load sampled and base stations")
@@ -1,7 +1,9 @@
 from unittest import TestCase
 
+from nrel.hive.model.sim_time import SimTime
+from nrel.hive.model.vehicle.schedules.schedule_table import ScheduleTable
 from nrel.hive.model.vehicle.schedules.time_range_schedule import time_range_schedules_from_string
-from nrel.hive.resources.mock_lobster import DefaultIds, mock_sim
+from nrel.hive.resources.mock_lobster import DefaultIds, mock_env, mock_sim
 
 
 class TestSchedules(TestCase):
@@ -47,3 +49,40 @@ class TestSchedules(TestCase):
             third_shift_schedule_fn(mock_sim(sim_time=eleven_fifty_nine_fifty_nine), unused)
         )
         # self.assertFalse(third_shift_schedule_fn(mock_sim(sim_time=not_a_time), unused))
+
+    def test_schedule_table(self):
+        schedules_input = """schedule_id,start_time,end_time
+                             first,"09:00:00","17:00:00"
+                             second,"17:00:00","01:00:00"
+                             third,"00:00:00","08:00:00"
+                             """
+        time_range_schedules = time_range_schedules_from_string(schedules_input)
+        table = ScheduleTable.build(time_range_schedules)
+        unused = DefaultIds.mock_vehicle_id()
+
+        for sim_time in (0, 3600 * 8, 3600 * 9 - 1, 3600 * 10, 3600 * 17, 86399, 86400 + 3600):
+            on_shift = table.on_shift(SimTime(sim_time))
+            for schedule_id, schedule_fn in time_range_schedules.items():
+                self.assertEqual(
+                    on_shift[schedule_id],
+                    schedule_fn(mock_sim(sim_time=sim_time), unused),
+                    f"schedule {schedule_id} at {sim_time}",
+                )
+
+        self.assertEqual(table.next_transition_time("first", SimTime(0)), 3600 * 9)
+        self.assertEqual(table.next_transition_time("first", SimTime(3600 * 9)), 3600 * 17)
+        self.assertEqual(table.next_transition_time("second", SimTime(3600 * 2)), 3600 * 17)
+        self.assertEqual(table.next_transition_time("third", SimTime(3600 * 20)), 86400)
+        self.assertIsNone(table.next_transition_time("unknown", SimTime(0)))
+
+    def test_schedule_table_not_built_for_schedules(self):
+        schedules_input = """schedule_id,start_time,end_time
+                             first,"09:00:00","17:00:00"
+                             """
+        env = mock_env()
+        replaced = env._replace(schedules=time_range_schedules_from_string(schedules_input))
+
+        with self.assertRaises(Exception):
+            replaced.get_schedule_table()
+
+        self.assertIn("first", replaced.build_schedule_table().get_schedule_table().schedule_ids)
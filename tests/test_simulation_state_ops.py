@@ -80,6 +80,22 @@ class TestSimulationStateOps(TestCase):
             all(["test!" in s.membership.memberships for s in sim_w_new_stations.get_stations()])
         )
 
+    def test_modify_stations(self):
+        sim = mock_sim()
+        stations = [mock_station(i) for i in range(10)]
+        sim_w_stations = simulation_state_ops.add_entities(sim, stations)
+
+        updated_stations = [s.add_membership("test!") for s in sim_w_stations.get_stations()]
+        result = simulation_state_ops.modify_stations_safe(sim_w_stations, updated_stations)
+
+        self.assertTrue(
+            all(["test!" in s.membership.memberships for s in result.unwrap().get_stations()])
+        )
+        self.assertIs(result.unwrap().s_search, sim_w_stations.s_search)
+
+        missing = simulation_state_ops.modify_stations_safe(sim, updated_stations)
+        self.assertNotIsInstance(missing, Success, "stations must already be in the sim")
+
     def test_add_request(self):
         req = mock_request()
         sim = mock_sim()
@@ -100,6 +116,22 @@ class TestSimulationStateOps(TestCase):
         self.assertEqual(len(at_loc), 1, "should only have 1 request at this location")
         self.assertIn(req.id, at_loc, "the request's id should be found at it's geoid")
 
+    def test_add_requests(self):
+        reqs = (
+            mock_request(request_id="r1"),
+            mock_request(request_id="r2"),
+            mock_request(request_id="r3", o_lat=39.7481, o_lon=-104.9923),
+        )
+        sim = mock_sim()
+        sim_with_reqs = simulation_state_ops.add_requests_safe(sim, reqs).unwrap()
+        expected = simulation_state_ops.add_entities(sim, reqs)
+
+        self.assertEqual(len(sim.requests), 0, "the original sim should not have been mutated")
+        self.assertEqual(sim_with_reqs.requests, expected.requests)
+        self.assertEqual(sim_with_reqs.r_locations, expected.r_locations)
+        self.assertEqual(sim_with_reqs.r_search, expected.r_search)
+        self.assertEqual(len(sim_with_reqs.r_locations[reqs[0].origin]), 2)
+
     def test_remove_request(self):
         req = mock_request()
         sim = mock_sim()
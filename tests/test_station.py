@@ -7,6 +7,7 @@ import immutables
 
 from returns.result import Failure
 from nrel.hive.model.station.station import Station
+from nrel.hive.reporting.handler.stateful_handler import StatefulHandler
 
 from nrel.hive.resources.mock_lobster import (
     mock_dcfc_charger_id,
@@ -212,3 +213,27 @@ class TestStation(TestCase):
             frozenset(["fleet_1", "fleet_3"]),
             "should have membership for fleet_1 and fleet_3",
         )
+
+    def test_charger_mask(self):
+        env = mock_env()
+        compatibility = env.get_charger_compatibility()
+        station = mock_station(chargers={mock_l2_charger_id(): 1})
+
+        self.assertEqual(
+            station.charger_mask,
+            compatibility.charger_mask([mock_l2_charger_id()]),
+            "should have the bit of its charger",
+        )
+
+        _, updated = station.append_chargers(mock_dcfc_charger_id(), 1, env)
+
+        self.assertEqual(
+            updated.charger_mask,
+            compatibility.charger_mask([mock_l2_charger_id(), mock_dcfc_charger_id()]),
+            "should add the bit of the appended charger",
+        )
+        self.assertNotIn(
+            "charger_mask",
+            StatefulHandler.station_asdict(updated),
+            "should leave the bitmask out of the station report",
+        )
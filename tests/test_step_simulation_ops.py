@@ -1,8 +1,27 @@
 from unittest import TestCase
-from nrel.hive.resources.mock_lobster import mock_env, mock_sim, mock_vehicle
+from unittest.mock import patch
+
+from nrel.hive.dispatcher.instruction.instructions import DispatchTripInstruction
+from nrel.hive.model.roadnetwork.prefetched_routes import PrefetchedRoutes
+from nrel.hive.model.vehicle.schedules.time_range_schedule import time_range_schedules_from_string
+from nrel.hive.resources.mock_lobster import (
+    mock_base,
+    mock_config,
+    mock_env,
+    mock_human_driver,
+    mock_request,
+    mock_sim,
+    mock_vehicle,
+)
+from nrel.hive.state.driver_state.human_driver_state.human_driver_state import HumanAvailable
+from nrel.hive.state.simulation_state import simulation_state_ops
 from nrel.hive.state.simulation_state.update.step_simulation_ops import (
+    apply_instructions,
+    perform_driver_state_updates,
     perform_vehicle_state_updates,
 )
+from nrel.hive.state.simulation_state.update.wake_calendar import WakeCalendar
+from nrel.hive.state.vehicle_state.reserve_base import ReserveBase
 
 
 class TestStepSimulationOps(TestCase):
@@ -35,3 +54,98 @@ class TestStepSimulationOps(TestCase):
             60,
             "vehicle 2 should have idled for 1 time step (60 s)",
         )
+
+    def test_perform_driver_state_updates(self):
+        """
+        at 10am, a driver on the 9am-5pm schedule who is unavailable should become available,
+        and a driver who is already available should not be updated
+        """
+        schedules = time_range_schedules_from_string(
+            """schedule_id,start_time,end_time
+               day,"09:00:00","17:00:00"
+               """
+        )
+        # mock_human_driver drives the default vehicle
+        off = mock_vehicle(driver_state=mock_human_driver(available=False, schedule_id="day"))
+        on = mock_vehicle(
+            vehicle_id="on", driver_state=mock_human_driver(available=True, schedule_id="day")
+        )
+        sim = mock_sim(sim_time=3600 * 10, vehicles=(off, on))
+        env = mock_env(schedules=schedules)
+
+        updated_sim = perform_driver_state_updates(sim, env)
+
+        self.assertIsInstance(updated_sim.vehicles[off.id].driver_state, HumanAvailable)
+        self.assertIs(updated_sim.vehicles["on"], sim.vehicles["on"])
+
+    def test_wake_calendar_skips_sleeping_vehicles(self):
+        """
+        a vehicle in ReserveBase sleeps until its state changes, and an available driver
+        sleeps until their schedule ends at 5pm
+        """
+        schedules = time_range_schedules_from_string(
+            """schedule_id,start_time,end_time
+               day,"09:00:00","17:00:00"
+               """
+        )
+        base = mock_base()
+        driver = mock_human_driver(available=True, schedule_id="day")
+        reserved = mock_vehicle(vehicle_id="reserved", driver_state=driver)
+        reserved = reserved.modify_vehicle_state(ReserveBase.build(reserved.id, base.id))
+        idle = mock_vehicle(vehicle_id="idle")
+        sim = mock_sim(sim_time=3600 * 10, vehicles=(reserved, idle), bases=(base,))
+        env = mock_env(schedules=schedules)
+
+        calendar = WakeCalendar().schedule_vehicles(sim, env).schedule_drivers(sim, env)
+        updated_sim = perform_vehicle_state_updates(sim, env, calendar)
+
+        self.assertFalse(calendar.vehicle_due(reserved, sim.sim_time))
+        self.assertTrue(calendar.vehicle_due(idle, sim.sim_time))
+        self.assertIs(updated_sim.vehicles["reserved"], sim.vehicles["reserved"])
+        self.assertEqual(updated_sim.vehicles["idle"].vehicle_state.idle_duration, 60)
+
+        self.assertEqual(calendar.driver_entries["reserved"], (driver, 3600 * 17))
+        self.assertFalse(calendar.driver_due(reserved, sim.sim_time))
+        self.assertTrue(calendar.driver_due(reserved, sim.sim_time + 3600 * 7))
+
+        woken = reserved.modify_vehicle_state(ReserveBase.build(reserved.id, base.id))
+        self.assertTrue(calendar.vehicle_due(woken, sim.sim_time))
+
+    def test_wake_calendar_drops_removed_vehicles(self):
+        stays = mock_vehicle(vehicle_id="stays")
+        leaves = mock_vehicle(vehicle_id="leaves")
+        sim = mock_sim(vehicles=(stays, leaves))
+        env = mock_env()
+        calendar = WakeCalendar().schedule_vehicles(sim, env).schedule_drivers(sim, env)
+
+        err, updated_sim = simulation_state_ops.remove_vehicle(sim, leaves.id)
+        self.assertIsNone(err)
+        updated = calendar.schedule_vehicles(updated_sim, env).schedule_drivers(updated_sim, env)
+
+        self.assertEqual(set(updated.vehicle_entries.keys()), {"stays"})
+        self.assertEqual(set(updated.driver_entries.keys()), {"stays"})
+
+    def test_apply_instructions_prefetches_routes(self):
+        sim = mock_sim(vehicles=(mock_vehicle(vehicle_id="1"), mock_vehicle(vehicle_id="2")))
+        for request in (mock_request(request_id="a"), mock_request(request_id="b", o_lat=39.76)):
+            sim = simulation_state_ops.add_request_safe(sim, request).unwrap()
+        instructions = (
+            DispatchTripInstruction(vehicle_id="1", request_id="a"),
+            DispatchTripInstruction(vehicle_id="2", request_id="b"),
+        )
+        config = mock_config()
+        parallel_config = config._replace(network=config.network._replace(routing_processes=2))
+
+        expected = apply_instructions(sim, mock_env(config), instructions)
+        with patch.object(
+            PrefetchedRoutes, "build", autospec=True, side_effect=PrefetchedRoutes.build
+        ) as build:
+            result = apply_instructions(sim, mock_env(parallel_config), instructions)
+
+        self.assertEqual(build.call_count, 1, "routes should be computed in one batch")
+        self.assertIs(result.road_network, sim.road_network)
+        for vehicle_id in ("1", "2"):
+            self.assertEqual(
+                result.vehicles[vehicle_id].vehicle_state.route,
+                expected.vehicles[vehicle_id].vehicle_state.route,
+            )
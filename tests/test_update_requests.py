@@ -1,10 +1,18 @@
+import tempfile
+from pathlib import Path
 from unittest import TestCase
 
+import numpy as np
 from pkg_resources import resource_filename
+
+from nrel.hive.model.request.request_arrays import RequestArrays
 from nrel.hive.model.sim_time import SimTime
 from nrel.hive.resources.mock_lobster import mock_config, mock_env, mock_sim
 
-from nrel.hive.state.simulation_state.update.update_requests_from_file import UpdateRequestsFromFile
+from nrel.hive.state.simulation_state.update.update_requests_from_file import (
+    UpdateRequestsFromArrays,
+    UpdateRequestsFromFile,
+)
 
 
 class TestUpdateRequests(TestCase):
@@ -122,3 +130,52 @@ class TestUpdateRequests(TestCase):
         self.assertEqual(len(result.requests), 2, "should have added the reqs")
         for req in result.get_requests():
             self.assertLess(req.departure_time, sim_time, f"should be less than {sim_time}")
+
+    def test_update_from_arrays(self):
+        """
+        request arrays converted from the csv add the same requests as the csv
+        test invariant: the below file resource exists
+        """
+        sim_time = SimTime.build(720)
+        sim = mock_sim(sim_time=sim_time, sim_timestep_duration_seconds=1)
+        config = mock_config(
+            start_time="2019-01-09T00:00:00",
+            end_time="2019-01-10T00:00:00",
+        )
+        env = mock_env(config, fleet_ids=frozenset())
+        req_file = resource_filename(
+            "nrel.hive.resources.scenarios.denver_downtown.requests",
+            "denver_demo_requests.csv",
+        )
+        rate_structure_file = resource_filename(
+            "nrel.hive.resources.scenarios.denver_downtown.service_prices",
+            "rate_structure.csv",
+        )
+        arrays_file = Path(tempfile.mkdtemp()) / "denver_demo_requests.npz"
+        RequestArrays.from_csv(req_file).save(arrays_file)
+
+        fn = UpdateRequestsFromArrays.build(str(arrays_file), rate_structure_file, 15)
+        self.assertIsInstance(fn.arrays.departure_time, np.memmap, "columns should be memory-mapped")
+
+        result, updated_fn = fn.update(sim, env)
+        expected, _ = UpdateRequestsFromFile.build(req_file, rate_structure_file).update(sim, env)
+
+        self.assertEqual(len(result.requests), 18, "should have added the reqs")
+        self.assertEqual(result.requests, expected.requests, "should match the csv requests")
+        self.assertEqual(updated_fn.cursor, 20, "should advance past all requests read")
+
+        # requests are only read once
+        result_again, updated_again = updated_fn.update(result, env)
+        self.assertEqual(result_again.requests, result.requests)
+        self.assertIsNone(updated_again, "nothing new to read")
+
+    def test_update_from_arrays_wrong_resolution(self):
+        req_file = resource_filename(
+            "nrel.hive.resources.scenarios.denver_downtown.requests",
+            "denver_demo_requests.csv",
+        )
+        arrays_file = Path(tempfile.mkdtemp()) / "denver_demo_requests.npz"
+        RequestArrays.from_csv(req_file, sim_h3_resolution=15).save(arrays_file)
+
+        with self.assertRaises(IOError):
+            UpdateRequestsFromArrays.build(str(arrays_file), sim_h3_resolution=12)